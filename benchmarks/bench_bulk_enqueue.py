@@ -0,0 +1,93 @@
+"""
+Benchmark queueing a rectangle plan: per-step add_to_queue vs add_many_to_queue.
+
+Builds the rectangle plan that /api/generate-rectangle would queue for an
+empty NxN-quadrant area, then queues every step into a fresh
+generation_queue two ways:
+
+  per-step - add_to_queue() once per step (one INSERT + commit each)
+  bulk     - add_many_to_queue() (one executemany in one transaction)
+
+Both run against a pooled WAL connection, like the app uses.
+
+Usage:
+  uv run python benchmarks/bench_bulk_enqueue.py [--size 50] [--repeats 5]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from isometric_hanford.generation.db_pool import SQLiteConnectionPool
+from isometric_hanford.generation.make_rectangle_plan import (
+  Point,
+  RectBounds,
+  create_rectangle_plan,
+)
+from isometric_hanford.generation.queue_db import (
+  QueueItemType,
+  add_many_to_queue,
+  add_to_queue,
+  init_queue_table,
+)
+
+
+def time_enqueue(
+  steps: list[list[tuple[int, int]]], bulk: bool, repeats: int
+) -> list[float]:
+  """Queue every step into a fresh DB `repeats` times. Returns ms per run."""
+  timings = []
+  for _ in range(repeats):
+    with tempfile.TemporaryDirectory() as tmp:
+      pool = SQLiteConnectionPool(Path(tmp) / "quadrants.db")
+      conn = pool.connect()
+      try:
+        init_queue_table(conn)
+        start = time.perf_counter()
+        if bulk:
+          add_many_to_queue(conn, QueueItemType.GENERATE, steps, "model")
+        else:
+          for quadrants in steps:
+            add_to_queue(conn, QueueItemType.GENERATE, quadrants, "model")
+        timings.append((time.perf_counter() - start) * 1000)
+
+        count = conn.execute("SELECT COUNT(*) FROM generation_queue").fetchone()[0]
+        assert count == len(steps), (count, len(steps))
+      finally:
+        conn.close()
+        pool.close()
+  return timings
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(
+    description="Benchmark queueing a rectangle plan (per-step vs bulk)."
+  )
+  parser.add_argument(
+    "--size", type=int, default=50, help="Rectangle side in quadrants"
+  )
+  parser.add_argument("--repeats", type=int, default=5, help="Runs per mode")
+  args = parser.parse_args()
+
+  bounds = RectBounds(Point(0, 0), Point(args.size - 1, args.size - 1))
+  plan = create_rectangle_plan(bounds, set(), set())
+  steps = [[(q.x, q.y) for q in step.quadrants] for step in plan.steps]
+  print(
+    f"🏁 {args.size}x{args.size} rectangle: {len(steps)} plan step(s), "
+    f"{args.repeats} run(s) per mode"
+  )
+
+  per_step = statistics.median(time_enqueue(steps, bulk=False, repeats=args.repeats))
+  bulk = statistics.median(time_enqueue(steps, bulk=True, repeats=args.repeats))
+
+  print(f"\n📊 per-step add_to_queue: {per_step:.1f}ms")
+  print(f"📊 bulk add_many_to_queue: {bulk:.1f}ms")
+  if bulk > 0:
+    print(f"\n✅ {per_step:.1f}ms -> {bulk:.1f}ms ({per_step / bulk:.0f}x)")
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
@@ -0,0 +1,76 @@
+"""
+Benchmark automatic_generation.create_generation_plan on large areas.
+
+Plans two NxN-quadrant layouts:
+
+  seed      - a small generated square in the middle, expanded outward by
+              the spiral (offset 2x2 tiles, then bridges and singles)
+  scattered - generated quadrants on a sparse lattice, so nearly the whole
+              area is interior gaps filled before any expansion
+
+Every plan is checked to cover each empty quadrant exactly once.
+
+Usage:
+  uv run python benchmarks/bench_generation_plan.py [--sizes 250,500,1000]
+"""
+
+import argparse
+import time
+
+from isometric_hanford.generation.automatic_generation import (
+  BoundingBox,
+  Point,
+  QuadrantGrid,
+  create_generation_plan,
+)
+
+
+def make_grid(size: int, layout: str) -> QuadrantGrid:
+  grid = QuadrantGrid(BoundingBox(Point(0, 0), Point(size - 1, size - 1)))
+  if layout == "seed":
+    center = size // 2
+    points = [
+      Point(x, y)
+      for x in range(center - 3, center + 3)
+      for y in range(center - 3, center + 3)
+    ]
+  else:
+    points = [Point(x, y) for x in range(0, size, 7) for y in range(0, size, 5)]
+  grid.mark_multiple_generated(points)
+  return grid
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(description="Benchmark create_generation_plan.")
+  parser.add_argument(
+    "--sizes",
+    default="250,500,1000",
+    help="Comma-separated square side lengths in quadrants",
+  )
+  args = parser.parse_args()
+
+  for size in [int(s) for s in args.sizes.split(",")]:
+    for layout in ["seed", "scattered"]:
+      grid = make_grid(size, layout)
+      empty = grid.count_empty()
+
+      start = time.perf_counter()
+      steps = create_generation_plan(grid)
+      elapsed = time.perf_counter() - start
+
+      planned = [q for step in steps for q in step.quadrants]
+      if len(planned) != empty or len(set(planned)) != empty or grid.count_empty():
+        print(f"❌ {size}x{size} {layout}: plan does not cover every quadrant once")
+        return 1
+
+      print(
+        f"📊 {size}x{size} {layout}: {len(steps)} steps for {empty} quadrants "
+        f"in {elapsed:.2f}s"
+      )
+
+  print("\n✅ All plans cover every empty quadrant once")
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
@@ -0,0 +1,376 @@
+"""
+Benchmark end-to-end generation throughput through the app's queue.
+
+Seeds a fresh quadrants.db (seed_tiles.py) with synthetic renders for a
+--size x --size block of quadrants, queues it with the app's
+/api/generate-rectangle endpoint, and lets the app's queue worker generate
+every step - template building, inference, and saving to the database -
+against the bundled stub inference server (stub_inference_server.py)
+instead of Oxen, Modal, GCS or Gemini:
+
+  oxen   - upload_png_to_gcs -> call_oxen_api -> download_image_to_pil
+           (with --inline-images: the template and result are sent inline)
+  local  - call_local_inference (edit_png / edit_b64)
+  gemini - nano banana (Gemini Files API upload + generateContent), with a
+           generated 2x2 reference tile outside the block
+
+The stub's latency, jitter and error rate stand in for the real APIs, so
+changes in the app's own overhead show up without API noise. The stub runs
+in its own process, so its image work doesn't compete with the app for the
+GIL. Reports
+quadrants/minute, how long items spent in each generation phase (the
+statuses the app reports: validating, rendering = template building,
+uploading, generating, saving), and the requests the stub served.
+
+Usage:
+  uv run python benchmarks/bench_generation_queue.py [--api oxen] [--size 6] \\
+    [--latency-ms 500] [--jitter-ms 100] [--error-rate 0] [--max-concurrency 4]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import requests
+from PIL import Image
+
+from isometric_hanford.generation import app as app_module
+from isometric_hanford.generation.gemini_upload_cache import (
+  configure_gemini_upload_cache,
+)
+from isometric_hanford.generation.model_config import AppConfig, ModelConfig
+from isometric_hanford.generation.queue_db import QueueItemStatus, init_queue_table
+from isometric_hanford.generation.seed_tiles import seed_database
+from isometric_hanford.generation.stub_inference_server import client_env_for
+
+# Phases in the order the app reports them
+PHASES = ("validating", "rendering", "uploading", "generating", "saving")
+
+
+def make_render(rng: np.random.Generator) -> bytes:
+  """A 512x512 pixel-art-like quadrant render (16px blocks, small palette)."""
+  palette = rng.integers(0, 256, size=(8, 3), dtype=np.uint8)
+  blocks = palette[rng.integers(0, len(palette), size=(32, 32))]
+  image = Image.fromarray(blocks.repeat(16, axis=0).repeat(16, axis=1), "RGB")
+  buffer = io.BytesIO()
+  image.save(buffer, format="PNG")
+  return buffer.getvalue()
+
+
+def seed_generation_dir(generation_dir: Path, size: int, seed: int) -> None:
+  """Seed quadrants.db with renders for quadrants (0..size+2, 0..size+2)."""
+  # Tiles cover quadrants (0..n, 0..n); leave room for a reference tile
+  n_tiles = size + 2
+  config = {
+    "name": "bench",
+    "seed": {"lat": 40.7128, "lng": -74.0060},
+    "n_tiles_x": n_tiles,
+    "n_tiles_y": n_tiles,
+    "camera_azimuth_degrees": -15,
+    "camera_elevation_degrees": -45,
+    "width_px": 1024,
+    "height_px": 1024,
+    "view_height_meters": 300,
+  }
+  (generation_dir / "generation_config.json").write_text(json.dumps(config))
+  with contextlib.redirect_stdout(io.StringIO()):
+    seed_database(generation_dir)
+    conn = app_module.get_db_connection()
+    app_module.run_schema_migrations(conn)
+
+  rng = np.random.default_rng(seed)
+  try:
+    init_queue_table(conn)
+    rows = conn.execute("SELECT quadrant_x, quadrant_y FROM quadrants").fetchall()
+    conn.executemany(
+      "UPDATE quadrants SET render = ? WHERE quadrant_x = ? AND quadrant_y = ?",
+      [(make_render(rng), x, y) for x, y in rows],
+    )
+    # A generated reference tile below the block (for nano banana)
+    reference = [(0, size + 1), (1, size + 1), (0, size + 2), (1, size + 2)]
+    conn.executemany(
+      """
+      UPDATE quadrants SET generation = render, is_reference = ?
+      WHERE quadrant_x = ? AND quadrant_y = ?
+      """,
+      [(int((x, y) == reference[0]), x, y) for x, y in reference],
+    )
+    conn.commit()
+  finally:
+    conn.close()
+
+
+@contextlib.contextmanager
+def stub_server(args: argparse.Namespace):
+  """Run stub_inference_server.py in a subprocess; yields its URL."""
+  # Let the OS pick a free port for the stub to bind
+  with socket.socket() as sock:
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+  url = f"http://127.0.0.1:{port}"
+
+  process = subprocess.Popen(
+    [
+      sys.executable,
+      "-m",
+      "isometric_hanford.generation.stub_inference_server",
+      f"--port={port}",
+      f"--latency-ms={args.latency_ms}",
+      f"--jitter-ms={args.jitter_ms}",
+      f"--error-rate={args.error_rate}",
+      f"--transfer-latency-ms={args.transfer_latency_ms}",
+      f"--seed={args.seed}",
+    ],
+    stdout=subprocess.DEVNULL,
+  )
+  try:
+    deadline = time.monotonic() + 30
+    while True:
+      try:
+        requests.get(f"{url}/stub/stats", timeout=1).raise_for_status()
+        break
+      except requests.ConnectionError:
+        if process.poll() is not None or time.monotonic() > deadline:
+          raise RuntimeError("Stub inference server did not start")
+        time.sleep(0.1)
+    yield url
+  finally:
+    process.terminate()
+    process.wait()
+
+
+def make_model(
+  api: str, stub_url: str, max_concurrency: int, inline_images: bool = False
+):
+  if api == "oxen":
+    return ModelConfig(
+      name="stub-oxen",
+      model_id="stub-oxen",
+      api_key_env="STUB_OXEN_API_KEY",
+      endpoint=f"{stub_url}/api/images/edit",
+      num_inference_steps=14,
+      inline_images=inline_images,
+      max_concurrency=max_concurrency,
+    )
+  if api == "local":
+    return ModelConfig(
+      name="stub-local",
+      model_id="stub-local",
+      api_key_env="",
+      endpoint=f"{stub_url}/edit-b64",
+      binary_endpoint=f"{stub_url}/edit-png",
+      num_inference_steps=14,
+      model_type="url",
+      max_concurrency=max_concurrency,
+    )
+  return ModelConfig(
+    name="stub-gemini",
+    model_id="stub-gemini",
+    api_key_env="GEMINI_API_KEY",
+    model_type="nano_banana",
+    max_concurrency=max_concurrency,
+  )
+
+
+class PhaseRecorder:
+  """Times each generation phase from the app's per-thread status updates."""
+
+  def __init__(self):
+    self.lock = threading.Lock()
+    self.current: dict[int, tuple[str, float]] = {}
+    self.durations: dict[str, list[float]] = {}
+
+  def record(self, status: str) -> None:
+    now = time.perf_counter()
+    thread_id = threading.get_ident()
+    with self.lock:
+      previous = self.current.pop(thread_id, None)
+      if previous is not None:
+        phase, started = previous
+        self.durations.setdefault(phase, []).append(now - started)
+      if status in PHASES:
+        self.current[thread_id] = (status, now)
+
+
+def percentile(values: list[float], pct: float) -> float:
+  values = sorted(values)
+  return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def run_queue(generation_dir: Path, model: ModelConfig, size: int, timeout: float):
+  """Queue the block and wait for the queue to drain. Returns (elapsed, phases)."""
+  recorder = PhaseRecorder()
+  update_generation_state = app_module.update_generation_state
+
+  def recording_update(status: str, message: str = "", error=None) -> None:
+    recorder.record(status)
+    update_generation_state(status, message, error)
+
+  saved = {
+    name: getattr(app_module, name)
+    for name in ("GENERATION_DIR", "APP_CONFIG", "NO_GENERATE_MODE")
+  }
+  app_module.GENERATION_DIR = generation_dir
+  app_module.APP_CONFIG = AppConfig(models=[model], default_model_id=model.model_id)
+  app_module.NO_GENERATE_MODE = False
+  app_module.update_generation_state = recording_update
+
+  # Silence the app's per-item logging
+  with contextlib.redirect_stdout(io.StringIO()):
+    try:
+      start = time.perf_counter()
+      response = app_module.app.test_client().post(
+        "/api/generate-rectangle",
+        json={"tl": [0, 0], "br": [size - 1, size - 1], "model_id": model.model_id},
+      )
+      if not response.get_json()["success"]:
+        raise RuntimeError(response.get_json()["error"])
+
+      while time.perf_counter() - start < timeout:
+        conn = app_module.get_db_connection()
+        try:
+          remaining = conn.execute(
+            "SELECT COUNT(*) FROM generation_queue WHERE status IN (?, ?)",
+            (QueueItemStatus.PENDING.value, QueueItemStatus.PROCESSING.value),
+          ).fetchone()[0]
+        finally:
+          conn.close()
+        if remaining == 0:
+          break
+        time.sleep(0.05)
+      elapsed = time.perf_counter() - start
+    finally:
+      app_module.stop_queue_worker()
+      if app_module.queue_worker_thread is not None:
+        app_module.queue_worker_thread.join()
+      app_module.update_generation_state = update_generation_state
+      for name, value in saved.items():
+        setattr(app_module, name, value)
+
+  return elapsed, recorder.durations
+
+
+def count_results(size: int) -> dict:
+  conn = app_module.get_db_connection()
+  try:
+    generated = conn.execute(
+      """
+      SELECT COUNT(*) FROM quadrants
+      WHERE generation IS NOT NULL AND quadrant_x < ? AND quadrant_y < ?
+      """,
+      (size, size),
+    ).fetchone()[0]
+    statuses = dict(
+      conn.execute(
+        "SELECT status, COUNT(*) FROM generation_queue GROUP BY status"
+      ).fetchall()
+    )
+  finally:
+    conn.close()
+  return {"generated": generated, "statuses": statuses}
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(
+    description="Benchmark generation throughput through the app's queue."
+  )
+  parser.add_argument(
+    "--api", choices=["oxen", "local", "gemini"], default="oxen", help="API path"
+  )
+  parser.add_argument(
+    "--size",
+    type=int,
+    default=6,
+    help="Block side in quadrants (4, 7, 10... plan tiles that fail seam checks)",
+  )
+  parser.add_argument(
+    "--latency-ms", type=float, default=500.0, help="Stub inference latency"
+  )
+  parser.add_argument(
+    "--jitter-ms", type=float, default=100.0, help="Stub inference jitter (+/-)"
+  )
+  parser.add_argument(
+    "--error-rate", type=float, default=0.0, help="Stub inference failure rate"
+  )
+  parser.add_argument(
+    "--transfer-latency-ms",
+    type=float,
+    default=50.0,
+    help="Stub upload/download latency",
+  )
+  parser.add_argument(
+    "--max-concurrency", type=int, default=4, help="Model's max_concurrency"
+  )
+  parser.add_argument(
+    "--inline-images",
+    action="store_true",
+    help="Send Oxen templates/results inline instead of via GCS",
+  )
+  parser.add_argument("--seed", type=int, default=0, help="Render/stub RNG seed")
+  parser.add_argument(
+    "--timeout", type=float, default=600.0, help="Give up after this many seconds"
+  )
+  args = parser.parse_args()
+
+  print(
+    f"🏁 {args.size}x{args.size} quadrants via {args.api}, "
+    f"stub latency {args.latency_ms:.0f}±{args.jitter_ms:.0f}ms, "
+    f"error rate {args.error_rate:.0%}, max_concurrency {args.max_concurrency}"
+  )
+
+  with stub_server(args) as stub_url:
+    os.environ.update(client_env_for(stub_url))
+    os.environ["STUB_OXEN_API_KEY"] = "stub"
+    os.environ["GEMINI_API_KEY"] = "stub"
+
+    with tempfile.TemporaryDirectory() as tmp:
+      generation_dir = Path(tmp)
+      app_module.GENERATION_DIR = generation_dir
+      # Start from an empty Gemini upload cache
+      configure_gemini_upload_cache(generation_dir / "gemini_uploads.db")
+      try:
+        seed_generation_dir(generation_dir, args.size, args.seed)
+        model = make_model(args.api, stub_url, args.max_concurrency, args.inline_images)
+        elapsed, phases = run_queue(generation_dir, model, args.size, args.timeout)
+        results = count_results(args.size)
+      finally:
+        app_module.close_db_pool()
+    stub_stats = requests.get(f"{stub_url}/stub/stats", timeout=5).json()
+
+  per_minute = results["generated"] / elapsed * 60
+  print(f"\n📊 {results['generated']} quadrant(s) in {elapsed:.1f}s")
+  print(f"   Queue items: {results['statuses']}")
+  print("   Phase           n     p50      p95     mean")
+  for phase in PHASES:
+    durations = phases.get(phase)
+    if durations:
+      print(
+        f"   {phase:<12} {len(durations):>4} "
+        f"{percentile(durations, 50) * 1000:>6.0f}ms "
+        f"{percentile(durations, 95) * 1000:>6.0f}ms "
+        f"{statistics.fmean(durations) * 1000:>6.0f}ms"
+      )
+  served = ", ".join(
+    f"{name} {stats['requests']}"
+    + (f" ({stats['errors']} failed)" if stats["errors"] else "")
+    for name, stats in stub_stats.items()
+    if stats["requests"]
+  )
+  print(f"   Stub requests: {served}")
+  print(f"\n✅ {per_minute:.1f} quadrants/minute")
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
@@ -0,0 +1,119 @@
+"""
+Benchmark per-request overhead: bare requests vs the shared pooled session.
+
+Fetches a small PNG repeatedly from a local stand-in HTTP server (or from
+--url) two ways:
+
+  bare   - requests.get() per call (new TCP connection each time)
+  pooled - http_session.get_session().get() (keep-alive connections)
+
+and reports the median per-request time and how many connections the
+server accepted. Against a TLS endpoint such as GCS the bare cost also
+includes a TLS handshake per call, so the gap is larger than locally.
+
+Usage:
+  uv run python benchmarks/bench_http_session.py [--requests 200] [--threads 8]
+  uv run python benchmarks/bench_http_session.py --url https://<host>/<image>
+"""
+
+import argparse
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import requests
+from PIL import Image
+
+from isometric_hanford.generation.http_session import get_session
+
+
+def make_png() -> bytes:
+  buffer = BytesIO()
+  Image.new("RGB", (512, 512), "white").save(buffer, format="PNG")
+  return buffer.getvalue()
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+  """Serves one PNG over keep-alive connections, counting connections."""
+
+  protocol_version = "HTTP/1.1"
+  body = make_png()
+  connections = 0
+  lock = threading.Lock()
+
+  def setup(self) -> None:
+    super().setup()
+    self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    with ImageHandler.lock:
+      ImageHandler.connections += 1
+
+  def log_message(self, format, *args) -> None:
+    pass
+
+  def do_GET(self) -> None:
+    self.send_response(200)
+    self.send_header("Content-Type", "image/png")
+    self.send_header("Content-Length", str(len(self.body)))
+    self.end_headers()
+    self.wfile.write(self.body)
+
+
+def time_requests(get, url: str, count: int, threads: int) -> list[float]:
+  """Issue `count` GETs over `threads` threads. Returns ms per request."""
+
+  def fetch(_) -> float:
+    start = time.perf_counter()
+    response = get(url, timeout=30)
+    response.raise_for_status()
+    return (time.perf_counter() - start) * 1000
+
+  with ThreadPoolExecutor(max_workers=threads) as executor:
+    return list(executor.map(fetch, range(count)))
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(
+    description="Benchmark bare requests vs the pooled HTTP session."
+  )
+  parser.add_argument("--requests", type=int, default=200, help="GETs per mode")
+  parser.add_argument("--threads", type=int, default=1, help="Concurrent callers")
+  parser.add_argument("--url", default=None, help="Endpoint (default: local server)")
+  args = parser.parse_args()
+
+  server = None
+  url = args.url
+  if url is None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/image.png"
+
+  print(f"🏁 {args.requests} GET(s) per mode, {args.threads} thread(s): {url}")
+
+  try:
+    results = {}
+    for label, get in [("bare", requests.get), ("pooled", get_session().get)]:
+      connections_before = ImageHandler.connections
+      timings = time_requests(get, url, args.requests, args.threads)
+      results[label] = statistics.median(timings)
+      connections = ImageHandler.connections - connections_before
+      summary = f"📊 {label:>6}: {results[label]:.2f}ms/request"
+      if server is not None:
+        summary += f", {connections} connection(s)"
+      print(summary)
+  finally:
+    if server is not None:
+      server.shutdown()
+      server.server_close()
+
+  saved = results["bare"] - results["pooled"]
+  print(f"\n✅ Pooled session saves {saved:.2f}ms per request")
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
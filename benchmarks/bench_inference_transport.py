@@ -0,0 +1,182 @@
+"""
+Benchmark local inference transports: base64 JSON vs raw image/png.
+
+Serves inference/server.py's two request contracts from a local HTTP server,
+with a stub editing pipeline (inverts the image) in place of the Qwen model:
+
+  base64 - POST JSON {"image_b64": ...}, response {"image_b64": ...}
+           (edit_b64, called with call_local_api_b64)
+  binary - POST the raw image, parameters in the query, raw PNG response
+           (edit_png, called with call_local_api_png)
+
+Each call sends a 1024x1024 pixel-art template and decodes the result, and
+the benchmark reports the median round trip and the bytes on the wire.
+Times are end to end as the app sees them; call_local_api_b64 also writes
+its input/output debug images to the temp dir.
+
+Usage:
+  uv run python benchmarks/bench_inference_transport.py [--calls 20] [--png]
+"""
+
+import argparse
+import base64
+import contextlib
+import io
+import json
+import socket
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from isometric_hanford.generation.generate_omni import (
+  call_local_api_b64,
+  call_local_api_png,
+)
+from isometric_hanford.generation.model_config import ModelConfig
+
+
+class StubEditPipeline:
+  """Stands in for QwenImageEditPipeline: returns the input image inverted."""
+
+  def __call__(self, prompt: str, image: Image.Image, num_inference_steps: int, **_):
+    return SimpleNamespace(images=[ImageOps.invert(image)])
+
+
+def png_bytes(image: Image.Image) -> bytes:
+  buffer = io.BytesIO()
+  image.save(buffer, format="PNG")
+  return buffer.getvalue()
+
+
+class StubServerHandler(BaseHTTPRequestHandler):
+  """The edit_b64 and edit_png contracts of inference/server.py."""
+
+  protocol_version = "HTTP/1.1"
+  pipe = StubEditPipeline()
+  bytes_in = 0
+  bytes_out = 0
+  lock = threading.Lock()
+
+  def setup(self) -> None:
+    super().setup()
+    self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+  def log_message(self, format, *args) -> None:
+    pass
+
+  def do_POST(self) -> None:
+    url = urlparse(self.path)
+    body = self.rfile.read(int(self.headers["Content-Length"]))
+
+    if url.path == "/edit-b64":
+      request = json.loads(body)
+      image = Image.open(io.BytesIO(base64.b64decode(request["image_b64"])))
+      steps = request["steps"]
+    else:
+      image = Image.open(io.BytesIO(body))
+      steps = int(parse_qs(url.query)["steps"][0])
+
+    result = self.pipe(
+      prompt="", image=image.convert("RGB"), num_inference_steps=steps
+    ).images[0]
+
+    if url.path == "/edit-b64":
+      response = json.dumps({"image_b64": base64.b64encode(png_bytes(result)).decode()})
+      content, content_type = response.encode(), "application/json"
+    else:
+      content, content_type = png_bytes(result), "image/png"
+
+    with StubServerHandler.lock:
+      StubServerHandler.bytes_in += len(body)
+      StubServerHandler.bytes_out += len(content)
+    self.send_response(200)
+    self.send_header("Content-Type", content_type)
+    self.send_header("Content-Length", str(len(content)))
+    self.end_headers()
+    self.wfile.write(content)
+
+
+def make_template(seed: int = 0) -> Image.Image:
+  """A 1024x1024 pixel-art-like template (16px blocks from a small palette)."""
+  rng = np.random.default_rng(seed)
+  palette = rng.integers(0, 256, size=(12, 4), dtype=np.uint8)
+  palette[:, 3] = 255
+  blocks = palette[rng.integers(0, len(palette), size=(64, 64))]
+  return Image.fromarray(blocks.repeat(16, axis=0).repeat(16, axis=1), "RGBA")
+
+
+def time_calls(
+  call, template: Image.Image, model: ModelConfig, calls: int, use_jpeg: bool
+) -> float:
+  """Median ms per call, with the client's progress output suppressed."""
+  timings = []
+  for _ in range(calls):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+      result = call(template, model, use_jpeg=use_jpeg)
+    result.load()
+    timings.append((time.perf_counter() - start) * 1000)
+  return statistics.median(timings)
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(
+    description="Benchmark base64 JSON vs raw PNG local inference transport."
+  )
+  parser.add_argument("--calls", type=int, default=20, help="Calls per transport")
+  parser.add_argument(
+    "--png", action="store_true", help="Send PNG templates instead of JPEG"
+  )
+  args = parser.parse_args()
+
+  server = ThreadingHTTPServer(("127.0.0.1", 0), StubServerHandler)
+  server.daemon_threads = True
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+  model = ModelConfig(
+    name="stub",
+    model_id="stub",
+    api_key_env="",
+    endpoint=f"{base_url}/edit-b64",
+    binary_endpoint=f"{base_url}/edit-png",
+    num_inference_steps=1,
+    model_type="url",
+  )
+  template = make_template()
+  print(
+    f"🏁 {args.calls} call(s) per transport, 1024x1024 "
+    f"{'PNG' if args.png else 'JPEG'} templates"
+  )
+
+  results = {}
+  try:
+    for label, call in [("base64", call_local_api_b64), ("binary", call_local_api_png)]:
+      StubServerHandler.bytes_in = StubServerHandler.bytes_out = 0
+      results[label] = time_calls(
+        call, template, model, args.calls, use_jpeg=not args.png
+      )
+      print(
+        f"📊 {label}: {results[label]:.1f}ms/call, "
+        f"{StubServerHandler.bytes_in / args.calls / 1024:.0f} KiB up, "
+        f"{StubServerHandler.bytes_out / args.calls / 1024:.0f} KiB down"
+      )
+  finally:
+    server.shutdown()
+    server.server_close()
+
+  print(
+    f"\n✅ {results['base64']:.1f}ms -> {results['binary']:.1f}ms per call "
+    f"({results['base64'] / results['binary']:.2f}x)"
+  )
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
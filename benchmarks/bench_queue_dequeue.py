@@ -0,0 +1,167 @@
+"""
+Benchmark model-aware dequeue cost as the generation queue grows.
+
+Fills a generation_queue with pending items spread round-robin across
+several models (plus the default/NULL model), marks every model but one as
+busy, and times three ways of finding the next dispatchable item:
+
+  python - the original approach: SELECT every pending row, filter in Python
+  select - get_next_pending_item_for_available_model (filter in SQL)
+  claim  - claim_next_pending_item_for_available_model (UPDATE ... RETURNING)
+
+With every model but the last busy, the Python filter has to walk most of
+the queue, while the SQL versions do one index seek per model.
+
+Usage:
+  uv run python benchmarks/bench_queue_dequeue.py [--sizes 1000,10000,100000] \\
+    [--models 4] [--iterations 200]
+"""
+
+import argparse
+import json
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from isometric_hanford.generation.queue_db import (
+  QueueItem,
+  QueueItemStatus,
+  claim_next_pending_item_for_available_model,
+  get_next_pending_item_for_available_model,
+  init_queue_table,
+)
+
+
+def create_queue(db_path: Path, queue_size: int, num_models: int) -> list[str | None]:
+  """Create a queue of pending items. Returns the model ids used (None first)."""
+  models: list[str | None] = [None] + [f"model-{i}" for i in range(num_models)]
+  conn = sqlite3.connect(db_path)
+  init_queue_table(conn)
+  now = time.time()
+  conn.executemany(
+    """
+    INSERT INTO generation_queue
+      (item_type, quadrants, model_id, status, created_at, context_quadrants)
+    VALUES ('generate', ?, ?, ?, ?, ?)
+    """,
+    (
+      (
+        json.dumps([[i, 0], [i + 1, 0], [i, 1], [i + 1, 1]]),
+        models[i % len(models)],
+        QueueItemStatus.PENDING.value,
+        now + i * 1e-6,
+        json.dumps([[i - 1, 0], [i - 1, 1]]),
+      )
+      for i in range(queue_size)
+    ),
+  )
+  conn.commit()
+  conn.close()
+  return models
+
+
+def python_filter_dequeue(
+  conn: sqlite3.Connection, busy_models: set[str | None]
+) -> QueueItem | None:
+  """The original implementation: load every pending row and filter in Python."""
+  cursor = conn.cursor()
+  cursor.execute(
+    """
+    SELECT id, item_type, quadrants, model_id, status,
+           created_at, started_at, completed_at, error_message, result_message,
+           context_quadrants, prompt, negative_prompt
+    FROM generation_queue
+    WHERE status = ?
+    ORDER BY created_at ASC
+    """,
+    (QueueItemStatus.PENDING.value,),
+  )
+  for row in cursor.fetchall():
+    item = QueueItem.from_row(row)
+    if item.model_id not in busy_models:
+      return item
+  return None
+
+
+def time_calls(fn, iterations: int) -> float:
+  """Mean milliseconds per call."""
+  start = time.perf_counter()
+  for _ in range(iterations):
+    fn()
+  return (time.perf_counter() - start) / iterations * 1000
+
+
+def bench_size(queue_size: int, num_models: int, iterations: int) -> dict:
+  with tempfile.TemporaryDirectory() as tmp:
+    db_path = Path(tmp) / "quadrants.db"
+    models = create_queue(db_path, queue_size, num_models)
+    busy = set(models[:-1])
+
+    conn = sqlite3.connect(db_path)
+    try:
+      expected = python_filter_dequeue(conn, busy)
+      selected = get_next_pending_item_for_available_model(conn, busy)
+      assert expected is not None and selected is not None
+      assert expected.id == selected.id, (expected.id, selected.id)
+
+      # The Python filter gets slow at 100k; cap its iterations
+      python_ms = time_calls(
+        lambda: python_filter_dequeue(conn, busy), max(1, min(iterations, 20))
+      )
+      select_ms = time_calls(
+        lambda: get_next_pending_item_for_available_model(conn, busy), iterations
+      )
+      claim_ms = time_calls(
+        lambda: claim_next_pending_item_for_available_model(conn, busy), iterations
+      )
+    finally:
+      conn.close()
+
+  return {"python_ms": python_ms, "select_ms": select_ms, "claim_ms": claim_ms}
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(
+    description="Benchmark model-aware dequeue cost vs queue length."
+  )
+  parser.add_argument(
+    "--sizes",
+    type=str,
+    default="1000,10000,100000",
+    help="Comma-separated queue sizes",
+  )
+  parser.add_argument("--models", type=int, default=4, help="Named models")
+  parser.add_argument(
+    "--iterations", type=int, default=200, help="Dequeues timed per size"
+  )
+  args = parser.parse_args()
+
+  sizes = [int(size) for size in args.sizes.split(",")]
+  print(
+    f"🏁 {args.models} named model(s) + default, all but one busy, "
+    f"{args.iterations} dequeue(s) per size"
+  )
+  print(f"\n{'queue size':>12} {'python':>12} {'sql select':>12} {'sql claim':>12}")
+
+  results = {}
+  for size in sizes:
+    results[size] = bench_size(size, args.models, args.iterations)
+    r = results[size]
+    print(
+      f"{size:>12} {r['python_ms']:>10.3f}ms {r['select_ms']:>10.3f}ms "
+      f"{r['claim_ms']:>10.3f}ms"
+    )
+
+  largest = results[max(sizes)]
+  if largest["claim_ms"] > 0:
+    print(
+      f"\n✅ dequeue at {max(sizes)} items: {largest['python_ms']:.2f}ms -> "
+      f"{largest['claim_ms']:.3f}ms "
+      f"({largest['python_ms'] / largest['claim_ms']:.0f}x)"
+    )
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
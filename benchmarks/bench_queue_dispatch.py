@@ -0,0 +1,201 @@
+"""
+Benchmark queue dispatch latency in the generation app's queue worker.
+
+Fills a fresh generation_queue with a backlog of pending items spread across
+several models, then runs the app's queue_worker with a fake item processor
+(sleeps for --work-ms, then marks the item complete). For every model, the
+dispatch latency is the gap between one item completing and that model's
+next item starting. Runs twice:
+
+  polling - notifications disabled, worker polls every 0.5s (the old design)
+  event   - notify_queue_worker() wakes the worker on completion
+
+Usage:
+  uv run python benchmarks/bench_queue_dispatch.py [--queue-size 5000] \\
+    [--models 2] [--dispatches 40] [--work-ms 200]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from isometric_hanford.generation import app as app_module
+from isometric_hanford.generation.queue_db import (
+  QueueItemStatus,
+  init_queue_table,
+  mark_item_complete,
+)
+
+
+def create_queue(db_path: Path, queue_size: int, num_models: int) -> None:
+  """Create a generation_queue with queue_size pending items, round-robin models."""
+  conn = sqlite3.connect(db_path)
+  init_queue_table(conn)
+  now = time.time()
+  conn.executemany(
+    """
+    INSERT INTO generation_queue (item_type, quadrants, model_id, status, created_at)
+    VALUES ('generate', ?, ?, ?, ?)
+    """,
+    (
+      (
+        json.dumps([[i * 10, 0]]),
+        f"model-{i % num_models}",
+        QueueItemStatus.PENDING.value,
+        now + i * 1e-6,
+      )
+      for i in range(queue_size)
+    ),
+  )
+  conn.commit()
+  conn.close()
+
+
+def percentile(values: list[float], pct: float) -> float:
+  if not values:
+    return 0.0
+  values = sorted(values)
+  index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+  return values[index]
+
+
+def run_dispatch(
+  generation_dir: Path, event_driven: bool, dispatches: int, work_s: float
+) -> dict:
+  """Run the app's queue worker until `dispatches` items have started."""
+  lock = threading.Lock()
+  done = threading.Event()
+  # model_id -> list of (started, completed) times
+  timings: dict[str | None, list[list[float]]] = {}
+
+  def fake_process(item_id: int) -> dict:
+    started = time.perf_counter()
+    conn = app_module.get_db_connection()
+    try:
+      model_id = conn.execute(
+        "SELECT model_id FROM generation_queue WHERE id = ?", (item_id,)
+      ).fetchone()[0]
+      with lock:
+        entries = timings.setdefault(model_id, [])
+        entries.append([started, 0.0])
+        if sum(len(e) for e in timings.values()) >= dispatches:
+          done.set()
+      time.sleep(work_s)
+      mark_item_complete(conn, item_id)
+      with lock:
+        entries[-1][1] = time.perf_counter()
+    finally:
+      conn.close()
+    return {"success": True}
+
+  saved = {
+    name: getattr(app_module, name)
+    for name in (
+      "GENERATION_DIR",
+      "NO_GENERATE_MODE",
+      "QUEUE_FALLBACK_POLL_SECONDS",
+      "process_queue_item_from_db",
+      "notify_queue_worker",
+    )
+  }
+  app_module.GENERATION_DIR = generation_dir
+  app_module.NO_GENERATE_MODE = False
+  app_module.process_queue_item_from_db = fake_process
+  if not event_driven:
+    app_module.QUEUE_FALLBACK_POLL_SECONDS = 0.5
+    app_module.notify_queue_worker = lambda: None
+
+  # Silence the worker's per-item logging
+  with contextlib.redirect_stdout(io.StringIO()):
+    start = time.perf_counter()
+    try:
+      app_module.start_queue_worker()
+      done.wait()
+      elapsed = time.perf_counter() - start
+    finally:
+      app_module.stop_queue_worker()
+      saved["notify_queue_worker"]()
+      app_module.queue_worker_thread.join()
+      for name, value in saved.items():
+        setattr(app_module, name, value)
+      app_module.in_flight_items.clear()
+      app_module.close_db_pool()
+
+  with lock:
+    gaps = [
+      (entries[i + 1][0] - entries[i][1]) * 1000
+      for entries in timings.values()
+      for i in range(len(entries) - 1)
+      if entries[i][1]
+    ]
+  return {
+    "dispatched": sum(len(e) for e in timings.values()),
+    "elapsed_s": elapsed,
+    "p50_ms": percentile(gaps, 50),
+    "p95_ms": percentile(gaps, 95),
+    "max_ms": max(gaps) if gaps else 0.0,
+    "mean_ms": statistics.fmean(gaps) if gaps else 0.0,
+  }
+
+
+def print_results(name: str, results: dict) -> None:
+  print(f"\n📊 {name}")
+  print(
+    f"   {results['dispatched']} item(s) dispatched in {results['elapsed_s']:.2f}s "
+    f"({results['dispatched'] / results['elapsed_s']:.1f}/s)"
+  )
+  print(
+    f"   dispatch latency: p50 {results['p50_ms']:.1f}ms, "
+    f"p95 {results['p95_ms']:.1f}ms, max {results['max_ms']:.1f}ms"
+  )
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(
+    description="Benchmark queue dispatch latency (polling vs event-driven)."
+  )
+  parser.add_argument(
+    "--queue-size", type=int, default=5000, help="Pending items in the queue"
+  )
+  parser.add_argument("--models", type=int, default=2, help="Distinct model ids")
+  parser.add_argument(
+    "--dispatches", type=int, default=40, help="Items to dispatch per mode"
+  )
+  parser.add_argument(
+    "--work-ms", type=float, default=200.0, help="Simulated generation time per item"
+  )
+  args = parser.parse_args()
+
+  print(
+    f"🏁 {args.queue_size} queued item(s) across {args.models} model(s), "
+    f"{args.dispatches} dispatch(es) per mode, {args.work_ms}ms per item"
+  )
+
+  results = {}
+  for name, event_driven in (("polling", False), ("event", True)):
+    with tempfile.TemporaryDirectory() as tmp:
+      create_queue(Path(tmp) / "quadrants.db", args.queue_size, args.models)
+      results[name] = run_dispatch(
+        Path(tmp), event_driven, args.dispatches, args.work_ms / 1000
+      )
+    label = "0.5s polling" if name == "polling" else "event-driven (notify)"
+    print_results(label, results[name])
+
+  polling, event = results["polling"], results["event"]
+  if event["p50_ms"] > 0:
+    print(
+      f"\n✅ p50 dispatch latency: {polling['p50_ms']:.1f}ms -> "
+      f"{event['p50_ms']:.1f}ms ({polling['p50_ms'] / event['p50_ms']:.1f}x)"
+    )
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
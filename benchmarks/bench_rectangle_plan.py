@@ -0,0 +1,90 @@
+"""
+Benchmark create_rectangle_plan on large rectangles.
+
+Plans an empty square rectangle and a square whose border ring is already
+generated (so the 2x1/1x2 and 1x1 phases have edges to extend from), and
+reports the time spent in each placement phase along with the step counts.
+Every plan is checked with validate_plan / validate_plan_context.
+
+Usage:
+  uv run python benchmarks/bench_rectangle_plan.py [--sizes 50,100,200]
+"""
+
+import argparse
+import time
+
+from isometric_hanford.generation.make_rectangle_plan import (
+  Point,
+  RectBounds,
+  create_rectangle_plan,
+  place_1x1_tiles,
+  place_2x1_tiles,
+  place_2x2_tiles,
+  validate_plan,
+  validate_plan_context,
+)
+
+
+def border_ring(size: int) -> set[Point]:
+  """Generated quadrants in a one-quadrant ring just outside the square."""
+  ring = set()
+  for i in range(-1, size + 1):
+    ring.update({Point(i, -1), Point(i, size), Point(-1, i), Point(size, i)})
+  return ring
+
+
+def time_phases(bounds: RectBounds, generated: set[Point]) -> dict[str, float]:
+  """Run the three placement phases, returning seconds spent in each."""
+  timings = {}
+  start = time.perf_counter()
+  _, scheduled = place_2x2_tiles(bounds, generated)
+  timings["2x2"] = time.perf_counter() - start
+
+  start = time.perf_counter()
+  _, scheduled = place_2x1_tiles(bounds, generated, scheduled)
+  timings["2x1"] = time.perf_counter() - start
+
+  start = time.perf_counter()
+  place_1x1_tiles(bounds, generated, scheduled)
+  timings["1x1"] = time.perf_counter() - start
+  return timings
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(description="Benchmark create_rectangle_plan.")
+  parser.add_argument(
+    "--sizes",
+    default="50,100,200",
+    help="Comma-separated rectangle side lengths in quadrants",
+  )
+  args = parser.parse_args()
+  sizes = [int(s) for s in args.sizes.split(",")]
+
+  for size in sizes:
+    bounds = RectBounds(Point(0, 0), Point(size - 1, size - 1))
+    for label, generated in [("empty", set()), ("bordered", border_ring(size))]:
+      start = time.perf_counter()
+      plan = create_rectangle_plan(bounds, generated)
+      elapsed = time.perf_counter() - start
+
+      valid, errors = validate_plan(plan)
+      context_valid, context_errors = validate_plan_context(plan)
+      if not (valid and context_valid):
+        print(f"❌ {size}x{size} {label}: invalid plan")
+        for error in (errors + context_errors)[:5]:
+          print(f"   {error}")
+        return 1
+
+      phases = time_phases(bounds, generated)
+      phase_summary = ", ".join(f"{k} {v:.2f}s" for k, v in phases.items())
+      print(
+        f"📊 {size}x{size} {label}: {len(plan.steps)} steps in {elapsed:.2f}s "
+        f"({phase_summary})"
+      )
+
+  print("\n✅ All plans valid")
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
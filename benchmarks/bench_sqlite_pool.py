@@ -0,0 +1,231 @@
+"""
+Benchmark tile read latency while generations are being written.
+
+Simulates the generation app: reader threads fetch random tile blobs (like
+the /tile route) while writer threads save generations (like the model
+workers). Runs the same workload against two fresh databases:
+
+  direct - a new sqlite3.connect() per operation, default rollback journal
+  pooled - SQLiteConnectionPool (WAL, busy_timeout, mmap/cache pragmas)
+
+and reports read latency percentiles, throughput, and lock errors.
+
+Usage:
+  uv run python benchmarks/bench_sqlite_pool.py [--duration 10] [--readers 8] \\
+    [--writers 2] [--quadrants 2000] [--blob-kb 64]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from isometric_hanford.generation.db_pool import SQLiteConnectionPool
+
+
+def create_database(db_path: Path, num_quadrants: int, blob_bytes: int) -> int:
+  """Create a quadrants DB with a square grid of random blobs. Returns grid side."""
+  side = max(1, int(num_quadrants**0.5))
+  conn = sqlite3.connect(db_path)
+  conn.execute("""
+    CREATE TABLE quadrants (
+      quadrant_x INTEGER NOT NULL,
+      quadrant_y INTEGER NOT NULL,
+      lat REAL NOT NULL,
+      lng REAL NOT NULL,
+      tile_row INTEGER NOT NULL,
+      tile_col INTEGER NOT NULL,
+      quadrant_index INTEGER NOT NULL,
+      render BLOB,
+      generation BLOB,
+      notes TEXT,
+      PRIMARY KEY (quadrant_x, quadrant_y)
+    )
+  """)
+  blob = os.urandom(blob_bytes)
+  conn.executemany(
+    "INSERT INTO quadrants VALUES (?, ?, 0, 0, 0, 0, 0, ?, ?, NULL)",
+    ((x, y, blob, blob) for x in range(side) for y in range(side)),
+  )
+  conn.commit()
+  conn.close()
+  return side
+
+
+def percentile(values: list[float], pct: float) -> float:
+  if not values:
+    return 0.0
+  values = sorted(values)
+  index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+  return values[index]
+
+
+def run_workload(
+  connect: Callable[[], sqlite3.Connection],
+  side: int,
+  blob_bytes: int,
+  duration: float,
+  num_readers: int,
+  num_writers: int,
+) -> dict:
+  """Run readers and writers concurrently for `duration` seconds."""
+  stop = threading.Event()
+  lock = threading.Lock()
+  read_latencies: list[float] = []
+  stats = {"reads": 0, "writes": 0, "read_errors": 0, "write_errors": 0}
+  new_blob = os.urandom(blob_bytes)
+
+  def reader(seed: int) -> None:
+    rng = random.Random(seed)
+    latencies = []
+    errors = 0
+    while not stop.is_set():
+      x, y = rng.randrange(side), rng.randrange(side)
+      start = time.perf_counter()
+      try:
+        conn = connect()
+        try:
+          row = conn.execute(
+            "SELECT generation FROM quadrants WHERE quadrant_x = ? AND quadrant_y = ?",
+            (x, y),
+          ).fetchone()
+          assert row is not None
+        finally:
+          conn.close()
+        latencies.append(time.perf_counter() - start)
+      except sqlite3.OperationalError:
+        errors += 1
+    with lock:
+      read_latencies.extend(latencies)
+      stats["reads"] += len(latencies)
+      stats["read_errors"] += errors
+
+  def writer(seed: int) -> None:
+    rng = random.Random(seed)
+    writes = 0
+    errors = 0
+    while not stop.is_set():
+      x, y = rng.randrange(side), rng.randrange(side)
+      try:
+        conn = connect()
+        try:
+          conn.execute(
+            "UPDATE quadrants SET generation = ? "
+            "WHERE quadrant_x = ? AND quadrant_y = ?",
+            (new_blob, x, y),
+          )
+          conn.commit()
+        finally:
+          conn.close()
+        writes += 1
+      except sqlite3.OperationalError:
+        errors += 1
+    with lock:
+      stats["writes"] += writes
+      stats["write_errors"] += errors
+
+  threads = [threading.Thread(target=reader, args=(i,)) for i in range(num_readers)] + [
+    threading.Thread(target=writer, args=(1000 + i,)) for i in range(num_writers)
+  ]
+  for thread in threads:
+    thread.start()
+  time.sleep(duration)
+  stop.set()
+  for thread in threads:
+    thread.join()
+
+  ms = [latency * 1000 for latency in read_latencies]
+  return {
+    **stats,
+    "reads_per_s": stats["reads"] / duration,
+    "writes_per_s": stats["writes"] / duration,
+    "p50_ms": percentile(ms, 50),
+    "p95_ms": percentile(ms, 95),
+    "p99_ms": percentile(ms, 99),
+    "max_ms": max(ms) if ms else 0.0,
+    "mean_ms": statistics.fmean(ms) if ms else 0.0,
+  }
+
+
+def print_results(name: str, results: dict) -> None:
+  print(f"\n📊 {name}")
+  print(
+    f"   reads:  {results['reads']:>7} ({results['reads_per_s']:.0f}/s), "
+    f"{results['read_errors']} lock error(s)"
+  )
+  print(
+    f"   writes: {results['writes']:>7} ({results['writes_per_s']:.0f}/s), "
+    f"{results['write_errors']} lock error(s)"
+  )
+  print(
+    f"   read latency: p50 {results['p50_ms']:.2f}ms, p95 {results['p95_ms']:.2f}ms, "
+    f"p99 {results['p99_ms']:.2f}ms, max {results['max_ms']:.2f}ms"
+  )
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(
+    description="Benchmark tile read latency under concurrent writes."
+  )
+  parser.add_argument("--duration", type=float, default=10.0, help="Seconds per mode")
+  parser.add_argument("--readers", type=int, default=8, help="Reader threads")
+  parser.add_argument("--writers", type=int, default=2, help="Writer threads")
+  parser.add_argument(
+    "--quadrants", type=int, default=2000, help="Approximate quadrant count"
+  )
+  parser.add_argument("--blob-kb", type=int, default=64, help="Blob size in KB")
+  args = parser.parse_args()
+
+  blob_bytes = args.blob_kb * 1024
+  print(
+    f"🏁 {args.readers} reader(s), {args.writers} writer(s), "
+    f"{args.duration}s per mode, {args.blob_kb}KB blobs"
+  )
+
+  with tempfile.TemporaryDirectory() as tmp:
+    # Direct connections with the default rollback journal
+    direct_path = Path(tmp) / "direct.db"
+    side = create_database(direct_path, args.quadrants, blob_bytes)
+    direct = run_workload(
+      lambda: sqlite3.connect(direct_path),
+      side,
+      blob_bytes,
+      args.duration,
+      args.readers,
+      args.writers,
+    )
+    print_results("direct sqlite3.connect (rollback journal)", direct)
+
+    # Pooled WAL connections
+    pooled_path = Path(tmp) / "pooled.db"
+    create_database(pooled_path, args.quadrants, blob_bytes)
+    pool = SQLiteConnectionPool(pooled_path)
+    try:
+      pooled = run_workload(
+        pool.connect,
+        side,
+        blob_bytes,
+        args.duration,
+        args.readers,
+        args.writers,
+      )
+    finally:
+      pool.close()
+    print_results("SQLiteConnectionPool (WAL)", pooled)
+
+  if pooled["p99_ms"] > 0:
+    print(
+      f"\n✅ p99 read latency: {direct['p99_ms']:.2f}ms -> {pooled['p99_ms']:.2f}ms "
+      f"({direct['p99_ms'] / pooled['p99_ms']:.1f}x)"
+    )
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
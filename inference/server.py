@@ -4,30 +4,48 @@ import random
 from io import BytesIO
 
 import modal
+from fastapi import Request, Response
 from pydantic import BaseModel
 
+from isometric_hanford.generation.edit_batching import (
+  DEFAULT_MAX_BATCH_SIZE,
+  DEFAULT_MAX_WAIT_MS,
+  EditBatcher,
+  EditJob,
+  run_pipeline_batch,
+)
+
 # Configuration via environment variables
 # Set LORA_MODEL_ID when deploying to use a different LoRA
 # Set LORA_WEIGHT_NAME to specify a checkpoint file (e.g., "checkpoint-500.safetensors")
 DEFAULT_LORA_MODEL_ID = "cannoneyed-dark-copper-flea"
 LORA_MODEL_ID = os.environ.get("LORA_MODEL_ID", DEFAULT_LORA_MODEL_ID)
 LORA_WEIGHT_NAME = os.environ.get("LORA_WEIGHT_NAME", None)  # None = use default
+# Micro-batching: most edits per pipeline call, and how long (ms) an idle
+# container waits for concurrent requests to batch with
+EDIT_MAX_BATCH_SIZE = int(os.environ.get("EDIT_MAX_BATCH_SIZE", DEFAULT_MAX_BATCH_SIZE))
+EDIT_MAX_WAIT_MS = float(os.environ.get("EDIT_MAX_WAIT_MS", DEFAULT_MAX_WAIT_MS))
 print(
   f"📦 Deploying with LORA_MODEL_ID={LORA_MODEL_ID}, LORA_WEIGHT_NAME={LORA_WEIGHT_NAME}"
 )
 
 # 1. Define the Environment
-image = modal.Image.debian_slim(python_version="3.11").pip_install(
-  "torch",
-  "torchvision",
-  "diffusers",
-  "transformers",
-  "accelerate",
-  "peft",
-  "pillow",
-  "fastapi",
-  "uvicorn",
-  "python-multipart",
+image = (
+  modal.Image.debian_slim(python_version="3.11")
+  .pip_install(
+    "torch",
+    "torchvision",
+    "diffusers",
+    "transformers",
+    "accelerate",
+    "peft",
+    "pillow",
+    "fastapi",
+    "uvicorn",
+    "python-multipart",
+  )
+  # Micro-batching (isometric_hanford.generation.edit_batching)
+  .add_local_python_source("isometric_hanford")
 )
 
 # Include short LoRA identifier in app name to ensure separate containers for different models
@@ -51,6 +69,30 @@ class EditRequest(BaseModel):
   guidance_scale: float = 3.0  # Default moved here
   seed: int | None = None
 
+  def to_job(self) -> EditJob:
+    from PIL import Image
+
+    image = Image.open(BytesIO(base64.b64decode(self.image_b64))).convert("RGB")
+    return EditJob(
+      image=image,
+      prompt=self.prompt,
+      negative_prompt=self.negative_prompt,
+      true_cfg_scale=self.true_cfg_scale,
+      steps=self.steps,
+      guidance_scale=self.guidance_scale,
+      seed=self.seed,
+    )
+
+
+class BatchEditRequest(BaseModel):
+  items: list[EditRequest]
+
+
+def encode_png(image) -> bytes:
+  buffer = BytesIO()
+  image.save(buffer, format="PNG")
+  return buffer.getvalue()
+
 
 # 4. The Serverless Class
 @app.cls(
@@ -64,10 +106,14 @@ class EditRequest(BaseModel):
       {
         "LORA_MODEL_ID": LORA_MODEL_ID,
         "LORA_WEIGHT_NAME": LORA_WEIGHT_NAME or "",
+        "EDIT_MAX_BATCH_SIZE": str(EDIT_MAX_BATCH_SIZE),
+        "EDIT_MAX_WAIT_MS": str(EDIT_MAX_WAIT_MS),
       }
     )
   ],
 )
+# Accept concurrent requests so the batcher has something to batch
+@modal.concurrent(max_inputs=EDIT_MAX_BATCH_SIZE * 2)
 class ImageEditor:
   @modal.enter()
   def setup(self):
@@ -114,37 +160,66 @@ class ImageEditor:
     # print("🔨 Compiling transformer...")
     # self.pipe.transformer = torch.compile(self.pipe.transformer, mode="default")
 
+    # Concurrent requests share pipeline calls (see edit_batching.py)
+    self.batcher = EditBatcher(
+      self._run_batch,
+      max_batch_size=EDIT_MAX_BATCH_SIZE,
+      max_wait_ms=EDIT_MAX_WAIT_MS,
+    )
+
     print("✅ Model loaded and ready!")
 
   @modal.fastapi_endpoint(method="POST")
   async def edit_b64(self, req: EditRequest):
     """Base64 JSON Endpoint"""
+    result_img = await self.batcher.submit(req.to_job())
+    result_b64 = base64.b64encode(encode_png(result_img)).decode()
+
+    return {"image_b64": result_b64}
+
+  @modal.fastapi_endpoint(method="POST")
+  async def edit_png(
+    self,
+    request: Request,
+    prompt: str,
+    negative_prompt: str | None = None,
+    true_cfg_scale: float = 2.0,
+    steps: int = 14,
+    guidance_scale: float = 3.0,
+    seed: int | None = None,
+  ):
+    """Binary Endpoint: raw image body in, raw PNG out, parameters in the query"""
     from PIL import Image
 
-    # Decode
-    image_data = base64.b64decode(req.image_b64)
-    input_image = Image.open(BytesIO(image_data)).convert("RGB")
-
-    # Run Inference
-    result_img = self._inference(
-      input_image,
-      req.prompt,
-      req.negative_prompt,
-      req.true_cfg_scale,
-      req.steps,
-      req.guidance_scale,
-      req.seed,
+    # Decode (PNG or JPEG body, no base64)
+    input_image = Image.open(BytesIO(await request.body())).convert("RGB")
+
+    # Run Inference (batched with any concurrent requests)
+    result_img = await self.batcher.submit(
+      EditJob(
+        image=input_image,
+        prompt=prompt,
+        negative_prompt=negative_prompt,
+        true_cfg_scale=true_cfg_scale,
+        steps=steps,
+        guidance_scale=guidance_scale,
+        seed=seed,
+      )
     )
 
-    # Encode Response
-    buffer = BytesIO()
-    result_img.save(buffer, format="PNG")
-    result_b64 = base64.b64encode(buffer.getvalue()).decode()
+    return Response(content=encode_png(result_img), media_type="image/png")
 
-    return {"image_b64": result_b64}
+  @modal.fastapi_endpoint(method="POST")
+  async def edit_batch(self, req: BatchEditRequest):
+    """Batch Endpoint: several base64 JSON edits in, their images out in order"""
+    results = await self.batcher.submit_many([item.to_job() for item in req.items])
+
+    return {
+      "images_b64": [base64.b64encode(encode_png(img)).decode() for img in results]
+    }
 
-  def _inference(self, image, prompt, neg_prompt, true_cfg, steps, guide_scale, seed):
-    """Internal helper to avoid code duplication"""
+  def _run_batch(self, jobs: list[EditJob]):
+    """Run one batch of compatible edits (on the batcher's thread)"""
     import gc
 
     import torch
@@ -152,20 +227,17 @@ class ImageEditor:
     gc.collect()
     torch.cuda.empty_cache()
 
-    if seed is None:
-      seed = random.randint(0, 2**32 - 1)
-
-    print(f"🎨 Edit: '{prompt}' | Model: {self.lora_model_id} | Seed: {seed}")
+    for job in jobs:
+      if job.seed is None:
+        job.seed = random.randint(0, 2**32 - 1)
+      print(f"🎨 Edit: '{job.prompt}' | Model: {self.lora_model_id} | Seed: {job.seed}")
+    if len(jobs) > 1:
+      print(f"📦 Batch of {len(jobs)} edits")
 
     with torch.inference_mode():
-      output = self.pipe(
-        prompt=prompt,
-        negative_prompt=neg_prompt,
-        true_cfg_scale=true_cfg,
-        image=image,
-        num_inference_steps=steps,
-        guidance_scale=guide_scale,
-        generator=torch.manual_seed(seed),
+      return run_pipeline_batch(
+        self.pipe,
+        jobs,
+        # A generator per job, so each edit gets the image its seed gives alone
+        make_generator=lambda seed: torch.Generator("cpu").manual_seed(seed),
       )
-
-    return output.images[0]
@@ -27,20 +27,23 @@ Keyboard shortcuts:
 """
 
 import argparse
-import hashlib
 import json
 import logging
 import sqlite3
 import threading
 import time
 import traceback
+from collections.abc import Iterator
+from concurrent.futures import Future
 from pathlib import Path
 
 from dotenv import load_dotenv
 from flask import Flask, Response, jsonify, render_template, request
 
 from isometric_hanford.generation.bounds import load_bounds
+from isometric_hanford.generation.db_pool import SQLiteConnectionPool
 from isometric_hanford.generation.generate_omni import run_generation_for_quadrants
+from isometric_hanford.generation.image_cache import get_decoded_image_cache
 from isometric_hanford.generation.make_rectangle_plan import (
   Point,
   RectBounds,
@@ -50,23 +53,35 @@ from isometric_hanford.generation.make_rectangle_plan import (
 )
 from isometric_hanford.generation.model_config import AppConfig, load_app_config
 from isometric_hanford.generation.queue_db import (
+  LeaseHeartbeat,
   QueueItemType,
+  add_many_to_queue,
   add_to_queue,
   cancel_processing_items,
   cancel_queue_item_by_id,
+  claim_next_pending_item_for_available_model,
   clear_completed_items,
   clear_pending_queue,
+  count_pending_items,
   get_all_processing_items,
-  get_next_pending_item_for_available_model,
+  get_in_flight_counts,
   get_pending_queue,
   get_queue_position_for_model,
   get_queue_status,
   get_queue_status_by_model,
   init_queue_table,
+  make_worker_id,
   mark_item_complete,
   mark_item_error,
-  mark_item_processing,
-  reset_all_processing_items,
+  reclaim_expired_leases,
+  release_claimed_item,
+)
+from isometric_hanford.generation.render_cache import (
+  DEFAULT_RENDER_CACHE_DIR,
+  DEFAULT_RENDER_CACHE_MAX_BYTES,
+  configure_render_cache,
+  get_render_cache,
+  get_render_cache_stats,
 )
 from isometric_hanford.generation.replace_color import hex_to_rgb
 from isometric_hanford.generation.replace_color import (
@@ -74,10 +89,14 @@ from isometric_hanford.generation.replace_color import (
 )
 from isometric_hanford.generation.shared import (
   DEFAULT_WEB_PORT,
+  ensure_content_hash_columns_exist,
   get_generation_config,
+  get_quadrant_content_hash,
   latlng_to_quadrant_coords,
 )
 from isometric_hanford.generation.web_renderer import (
+  DEFAULT_RENDER_WORKERS,
+  get_global_renderer_stats,
   start_global_renderer,
   stop_global_renderer,
 )
@@ -122,10 +141,6 @@ werkzeug_logger.addFilter(TileRequestFilter())
 # Generation lock - protects generation_state updates
 generation_lock = threading.Lock()
 
-# Per-model generation states
-# Key is model_id (None for default), value is state dict
-model_generation_states: dict[str | None, dict] = {}
-
 # Legacy global generation_state for backwards compatibility with API
 generation_state = {
   "is_generating": False,
@@ -138,14 +153,25 @@ generation_state = {
   "model_id": None,
 }
 
-# Track which models are currently processing
-busy_models: set[str | None] = set()
-busy_models_lock = threading.Lock()
+# Queue items being processed by this process's model workers
+# Key is item_id, value is {"model_id": ..., "started_at": ...}
+# Per-model limits are enforced by the queue claim, which sees every process
+in_flight_items: dict[int, dict] = {}
+in_flight_lock = threading.Lock()
 
 # Queue worker thread
 queue_worker_thread: threading.Thread | None = None
 queue_worker_running = False
 
+# Identifies this process's claims (leases) in the shared generation queue
+QUEUE_WORKER_ID = make_worker_id()
+
+# Wakes the queue worker as soon as an item is queued or a model frees up.
+# Polling only remains as a fallback (e.g. for items added by another process).
+queue_wakeup = threading.Condition()
+queue_wakeup_pending = False
+QUEUE_FALLBACK_POLL_SECONDS = 5.0
+
 # Cancellation flag - set to True to cancel all generations
 generation_cancelled = False
 
@@ -155,13 +181,48 @@ WEB_SERVER_PORT: int = DEFAULT_WEB_PORT
 APP_CONFIG: AppConfig | None = None
 NO_GENERATE_MODE: bool = False
 
+# Maximum time to wait for a single tile render
+RENDER_TIMEOUT_SECONDS = 120.0
+
+
+# Connection pool for quadrants.db (created on first use)
+_db_pool: SQLiteConnectionPool | None = None
+_db_pool_lock = threading.Lock()
+
+
+def get_db_pool() -> SQLiteConnectionPool:
+  """Get the connection pool for the generation directory's quadrants.db."""
+  global _db_pool
 
-def get_db_connection() -> sqlite3.Connection:
-  """Get a connection to the quadrants database."""
   if GENERATION_DIR is None:
     raise RuntimeError("GENERATION_DIR not set")
   db_path = GENERATION_DIR / "quadrants.db"
-  return sqlite3.connect(db_path)
+
+  with _db_pool_lock:
+    if _db_pool is None or _db_pool.db_path != db_path:
+      if _db_pool is not None:
+        _db_pool.close()
+      _db_pool = SQLiteConnectionPool(db_path)
+    return _db_pool
+
+
+def get_db_connection() -> sqlite3.Connection:
+  """
+  Get a pooled (WAL-mode) connection to the quadrants database.
+
+  Call conn.close() to return it to the pool.
+  """
+  return get_db_pool().connect()
+
+
+def close_db_pool() -> None:
+  """Close all idle pooled connections."""
+  global _db_pool
+
+  with _db_pool_lock:
+    if _db_pool is not None:
+      _db_pool.close()
+      _db_pool = None
 
 
 def ensure_flagged_column_exists(conn: sqlite3.Connection) -> None:
@@ -275,7 +336,6 @@ def get_quadrant_water_mask(x: int, y: int) -> bytes | None:
   """Get the water_mask bytes for a quadrant."""
   conn = get_db_connection()
   try:
-    ensure_water_mask_columns_exist(conn)
     cursor = conn.cursor()
     cursor.execute(
       "SELECT water_mask FROM quadrants WHERE quadrant_x = ? AND quadrant_y = ?",
@@ -291,7 +351,6 @@ def get_quadrant_dark_mode(x: int, y: int) -> bytes | None:
   """Get the dark_mode bytes for a quadrant."""
   conn = get_db_connection()
   try:
-    ensure_dark_mode_column_exists(conn)
     cursor = conn.cursor()
     cursor.execute(
       "SELECT dark_mode FROM quadrants WHERE quadrant_x = ? AND quadrant_y = ?",
@@ -324,77 +383,108 @@ def get_quadrant_data(x: int, y: int, tile_type: str = "generation") -> bytes |
   return get_quadrant_generation(x, y)
 
 
-def get_quadrant_info(x: int, y: int, tile_type: str = "generation") -> dict:
+def run_schema_migrations(conn: sqlite3.Connection) -> None:
   """
-  Get info about a quadrant including whether it has data, is flagged, starred, and water status.
+  Add any missing optional columns to the quadrants table.
 
-  Water status values:
-    -1: Explicitly NOT water (protected from auto-detection)
-     0: Not water (auto-detected, can be changed)
-     1: Water tile
+  Runs once at startup (see main), so request handlers can assume every
+  column exists.
+  """
+  ensure_flagged_column_exists(conn)
+  ensure_is_water_column_exists(conn)
+  ensure_starred_column_exists(conn)
+  ensure_is_reference_column_exists(conn)
+  ensure_water_mask_columns_exist(conn)
+  ensure_dark_mode_column_exists(conn)
+  ensure_content_hash_columns_exist(conn)
+
+
+def _tile_type_column(tile_type: str) -> str:
+  """Get the image column for a tile_type."""
+  if tile_type in ("render", "water_mask", "dark_mode"):
+    return tile_type
+  return "generation"
+
+
+def _empty_quadrant_info() -> dict:
+  """Info for a quadrant that doesn't exist in the database."""
+  return {
+    "has_data": False,
+    "flagged": False,
+    "is_water": False,
+    "is_explicit_not_water": False,
+    "water_status": 0,
+    "starred": False,
+    "is_reference": False,
+    "water_type": None,
+  }
+
+
+def get_quadrant_info_range(
+  x0: int, y0: int, nx: int, ny: int, tile_type: str = "generation"
+) -> dict[tuple[int, int], dict]:
+  """
+  Get info for every quadrant in the nx×ny block with (x0, y0) at the top-left.
 
-  Water type values (for water_mask):
-    ALL_WATER: Tile is 100% water
-    ALL_LAND: Tile has no water
-    WATER_EDGE: Tile has partial water (needs manual mask)
+  Runs a single query over the (quadrant_x, quadrant_y) primary key and only
+  checks image presence (no blobs are loaded).
+
+  Returns:
+    Dict mapping (x, y) to the same info dict as get_quadrant_info. Every
+    quadrant in the block is present; missing rows get default values.
   """
+  column = _tile_type_column(tile_type)
+  infos = {
+    (x0 + dx, y0 + dy): _empty_quadrant_info() for dx in range(nx) for dy in range(ny)
+  }
+
   conn = get_db_connection()
   try:
-    # Ensure columns exist
-    ensure_flagged_column_exists(conn)
-    ensure_is_water_column_exists(conn)
-    ensure_starred_column_exists(conn)
-    ensure_is_reference_column_exists(conn)
-    ensure_water_mask_columns_exist(conn)
-    ensure_dark_mode_column_exists(conn)
-
     cursor = conn.cursor()
-    # Select column based on tile_type
-    if tile_type == "render":
-      column = "render"
-    elif tile_type == "water_mask":
-      column = "water_mask"
-    elif tile_type == "dark_mode":
-      column = "dark_mode"
-    else:
-      column = "generation"
-
     cursor.execute(
       f"""
-      SELECT {column} IS NOT NULL, COALESCE(flagged, 0), COALESCE(is_water, 0),
-             COALESCE(starred, 0), COALESCE(is_reference, 0), water_type
+      SELECT quadrant_x, quadrant_y, {column} IS NOT NULL, COALESCE(flagged, 0),
+             COALESCE(is_water, 0), COALESCE(starred, 0),
+             COALESCE(is_reference, 0), water_type
       FROM quadrants
-      WHERE quadrant_x = ? AND quadrant_y = ?
+      WHERE quadrant_x BETWEEN ? AND ? AND quadrant_y BETWEEN ? AND ?
       """,
-      (x, y),
+      (x0, x0 + nx - 1, y0, y0 + ny - 1),
     )
-    row = cursor.fetchone()
-    if row:
-      water_status = row[2]
-      return {
-        "has_data": bool(row[0]),
-        "flagged": bool(row[1]),
+    for row in cursor.fetchall():
+      water_status = row[4]
+      infos[(row[0], row[1])] = {
+        "has_data": bool(row[2]),
+        "flagged": bool(row[3]),
         "is_water": water_status == 1,  # True if water
         "is_explicit_not_water": water_status == -1,  # True if explicitly not water
         "water_status": water_status,  # Raw value: -1, 0, or 1
-        "starred": bool(row[3]),
-        "is_reference": bool(row[4]),
-        "water_type": row[5],  # ALL_WATER, ALL_LAND, WATER_EDGE, or None
+        "starred": bool(row[5]),
+        "is_reference": bool(row[6]),
+        "water_type": row[7],  # ALL_WATER, ALL_LAND, WATER_EDGE, or None
       }
-    return {
-      "has_data": False,
-      "flagged": False,
-      "is_water": False,
-      "is_explicit_not_water": False,
-      "water_status": 0,
-      "starred": False,
-      "is_reference": False,
-      "water_type": None,
-    }
+    return infos
   finally:
     conn.close()
 
 
+def get_quadrant_info(x: int, y: int, tile_type: str = "generation") -> dict:
+  """
+  Get info about a quadrant including whether it has data, is flagged, starred, and water status.
+
+  Water status values:
+    -1: Explicitly NOT water (protected from auto-detection)
+     0: Not water (auto-detected, can be changed)
+     1: Water tile
+
+  Water type values (for water_mask):
+    ALL_WATER: Tile is 100% water
+    ALL_LAND: Tile has no water
+    WATER_EDGE: Tile has partial water (needs manual mask)
+  """
+  return get_quadrant_info_range(x, y, 1, 1, tile_type)[(x, y)]
+
+
 @app.route("/")
 def index():
   """Main page showing nx×ny grid of tiles."""
@@ -423,10 +513,10 @@ def index():
   explicit_not_water_tiles = {}
   reference_tiles = {}
   water_type_tiles = {}
+  infos = get_quadrant_info_range(x, y, nx, ny, tile_type=tile_type)
   for dx in range(nx):
     for dy in range(ny):
-      qx, qy = x + dx, y + dy
-      info = get_quadrant_info(qx, qy, tile_type=tile_type)
+      info = infos[(x + dx, y + dy)]
       tiles[(dx, dy)] = info["has_data"]
       flagged_tiles[(dx, dy)] = info["flagged"]
       starred_tiles[(dx, dy)] = info["starred"]
@@ -484,25 +574,65 @@ def tile(x: str, y: str):
   if request.args.get("render", "0") == "1":
     tile_type = "render"
 
-  data = get_quadrant_data(qx, qy, tile_type=tile_type)
-
-  if data is None:
-    return Response("Not found", status=404)
+  column = _tile_type_column(tile_type)
+  conn = get_db_connection()
+  try:
+    # Read the hash and open the blob in one read transaction, so the ETag
+    # always describes the bytes sent and a concurrent write can't change
+    # them mid-stream
+    conn.execute("BEGIN")
+    tile_info = get_quadrant_content_hash(conn, qx, qy, column, backfill=False)
+    while tile_info is not None and tile_info[1] is None:
+      # Backfill the missing hash in its own write transaction, then read
+      # again from a fresh snapshot
+      conn.rollback()
+      get_quadrant_content_hash(conn, qx, qy, column)
+      conn.execute("BEGIN")
+      tile_info = get_quadrant_content_hash(conn, qx, qy, column, backfill=False)
+    if tile_info is None:
+      conn.close()
+      return Response("Not found", status=404)
+    rowid, etag = tile_info
 
-  # Generate ETag from content hash for caching
-  etag = hashlib.md5(data).hexdigest()
+    # Answer revalidations from the stored hash without reading the blob
+    if_none_match = request.headers.get("If-None-Match", "")
+    if etag in {tag.strip().strip('"') for tag in if_none_match.split(",")}:
+      conn.close()
+      return Response(status=304)  # Not Modified
 
-  # Check if client has cached version
-  if_none_match = request.headers.get("If-None-Match")
-  if if_none_match and if_none_match == etag:
-    return Response(status=304)  # Not Modified
+    blob = conn.blobopen("quadrants", column, rowid, readonly=True)
+  except Exception:
+    conn.close()
+    raise
 
-  response = Response(data, mimetype="image/png")
+  # The response owns the blob and connection and releases them when it is
+  # closed, even if the body is never read (HEAD, early disconnect)
+  response = Response(stream_tile_blob(blob), mimetype="image/png")
+  response.call_on_close(lambda: release_tile_blob(conn, blob))
+  response.headers["Content-Length"] = str(len(blob))
   response.headers["ETag"] = etag
   response.headers["Cache-Control"] = "public, max-age=3600"  # Cache for 1 hour
   return response
 
 
+# Chunk size for streaming tile blobs
+TILE_STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def stream_tile_blob(blob: sqlite3.Blob) -> Iterator[bytes]:
+  """Stream an open blob in chunks."""
+  while chunk := blob.read(TILE_STREAM_CHUNK_BYTES):
+    yield chunk
+
+
+def release_tile_blob(conn: sqlite3.Connection, blob: sqlite3.Blob) -> None:
+  """Close a streamed blob, end its read transaction and release the connection."""
+  blob.close()
+  if conn.in_transaction:
+    conn.rollback()
+  conn.close()
+
+
 # =============================================================================
 # Generation API
 # =============================================================================
@@ -540,12 +670,10 @@ def calculate_context_quadrants(
     List of quadrant coordinates that have existing generations and can
     provide context for the current generation.
   """
-  from isometric_hanford.generation.shared import (
-    get_quadrant_generation as shared_get_quadrant_generation,
-  )
+  from isometric_hanford.generation.shared import has_generation_batch
 
   selected_set = set(selected_quadrants)
-  context = []
+  candidates = []
 
   # Find all quadrants adjacent to the selection that have generations
   # Check all potential 2x2 blocks that include any selected quadrant
@@ -578,13 +706,11 @@ def calculate_context_quadrants(
       if coord in checked or coord in selected_set:
         continue
       checked.add(coord)
+      candidates.append(coord)
 
-      # Check if this quadrant has an existing generation
-      gen = shared_get_quadrant_generation(conn, nx, ny)
-      if gen is not None:
-        context.append(coord)
-
-  return context
+  # Check which candidates have an existing generation in one query
+  generated = has_generation_batch(conn, candidates)
+  return [coord for coord in candidates if coord in generated]
 
 
 def run_nano_banana_generation_wrapper(
@@ -602,7 +728,6 @@ def run_nano_banana_generation_wrapper(
   )
 
   # Load all marked references from database
-  ensure_is_reference_column_exists(conn)
   cursor = conn.cursor()
   cursor.execute("SELECT quadrant_x, quadrant_y FROM quadrants WHERE is_reference = 1")
   reference_coords = [(row[0], row[1]) for row in cursor.fetchall()]
@@ -615,6 +740,10 @@ def run_nano_banana_generation_wrapper(
 
   print(f"   🍌 Loaded {len(reference_coords)} reference tile(s)")
 
+  # Create status callback that updates global state
+  def status_callback(status: str, message: str) -> None:
+    update_generation_state(status, message)
+
   # Call nano banana generation
   try:
     result = run_nano_banana_generation(
@@ -626,7 +755,7 @@ def run_nano_banana_generation_wrapper(
       prompt=prompt,
       negative_prompt=negative_prompt,
       save=True,
-      status_callback=None,
+      status_callback=status_callback,
       context_quadrants=context_quadrants,
       generation_dir=GENERATION_DIR,
       model_config=model_config,
@@ -710,21 +839,20 @@ def run_generation(
   )
 
 
-def render_quadrant_with_renderer(
+def submit_quadrant_render(
   conn: sqlite3.Connection,
   config: dict,
   x: int,
   y: int,
-) -> bytes | None:
+) -> "Future[dict[tuple[int, int], bytes]]":
   """
-  Render a quadrant using the global web renderer.
+  Queue a render of the tile at quadrant (x, y) on the global web renderer.
 
-  Returns the PNG bytes of the rendered quadrant.
+  Returns a Future for the tile's quadrant images; pass the result to
+  save_rendered_quadrants. Submitting several renders before waiting lets
+  the renderer's workers process them concurrently.
   """
-  from isometric_hanford.generation.shared import (
-    ensure_quadrant_exists,
-    save_quadrant_render,
-  )
+  from isometric_hanford.generation.shared import ensure_quadrant_exists
   from isometric_hanford.generation.web_renderer import get_web_renderer
 
   # Ensure the quadrant exists in the database
@@ -734,8 +862,7 @@ def render_quadrant_with_renderer(
 
   renderer = get_web_renderer(port=WEB_SERVER_PORT)
 
-  # Render the tile
-  quadrant_images = renderer.render_quadrant(
+  return renderer.submit_render(
     quadrant_x=x,
     quadrant_y=y,
     lat=quadrant["lat"],
@@ -747,7 +874,21 @@ def render_quadrant_with_renderer(
     view_height_meters=config.get("view_height_meters", 200),
   )
 
-  # Save all quadrants to database
+
+def save_rendered_quadrants(
+  conn: sqlite3.Connection,
+  config: dict,
+  x: int,
+  y: int,
+  quadrant_images: dict[tuple[int, int], bytes],
+) -> bytes | None:
+  """
+  Save the 4 quadrant renders of the tile at (x, y) to the database.
+
+  Returns the PNG bytes of quadrant (x, y) itself.
+  """
+  from isometric_hanford.generation.shared import save_quadrant_render
+
   result_bytes = None
   for (dx, dy), png_bytes in quadrant_images.items():
     qx, qy = x + dx, y + dy
@@ -761,6 +902,22 @@ def render_quadrant_with_renderer(
   return result_bytes
 
 
+def render_quadrant_with_renderer(
+  conn: sqlite3.Connection,
+  config: dict,
+  x: int,
+  y: int,
+) -> bytes | None:
+  """
+  Render a quadrant using the global web renderer.
+
+  Returns the PNG bytes of the rendered quadrant.
+  """
+  future = submit_quadrant_render(conn, config, x, y)
+  quadrant_images = future.result(timeout=RENDER_TIMEOUT_SECONDS)
+  return save_rendered_quadrants(conn, config, x, y, quadrant_images)
+
+
 def process_queue_item_from_db(item_id: int) -> dict:
   """Process a single queue item from the database."""
   global generation_state
@@ -809,9 +966,6 @@ def process_queue_item_from_db(item_id: int) -> dict:
           "   📋 No context quadrants (2x2 self-contained or no adjacent generations)"
         )
 
-    # Mark item as processing
-    mark_item_processing(conn, item_id)
-
     # Initialize generation state
     generation_state["is_generating"] = True
     generation_state["quadrants"] = selected_quadrants
@@ -865,7 +1019,9 @@ def process_queue_item_from_db(item_id: int) -> dict:
           print(f"✅ Generation complete: {result['message']}")
           generation_state["status"] = "complete"
           generation_state["message"] = result["message"]
-          mark_item_complete(conn, item_id, result["message"])
+          mark_item_complete(
+            conn, item_id, result["message"], worker_id=QUEUE_WORKER_ID
+          )
           return result
 
         # Generation failed
@@ -888,7 +1044,7 @@ def process_queue_item_from_db(item_id: int) -> dict:
           )
           generation_state["status"] = "error"
           generation_state["error"] = result["error"]
-          mark_item_error(conn, item_id, result["error"])
+          mark_item_error(conn, item_id, result["error"], worker_id=QUEUE_WORKER_ID)
           return result
 
       # Should not reach here, but just in case
@@ -900,14 +1056,27 @@ def process_queue_item_from_db(item_id: int) -> dict:
       rendered_count = 0
       total = len(selected_quadrants)
 
+      # Submit every render up front so the renderer's workers run them
+      # concurrently, then save results in order as they complete
+      futures = {}
+      for qx, qy in selected_quadrants:
+        try:
+          futures[(qx, qy)] = submit_quadrant_render(conn, config, qx, qy)
+        except Exception as e:
+          print(f"      ❌ Failed to queue render for ({qx}, {qy}): {e}")
+
       for i, (qx, qy) in enumerate(selected_quadrants):
         update_generation_state(
           "rendering", f"Rendering quadrant ({qx}, {qy})... ({i + 1}/{total})"
         )
         print(f"   🎨 Rendering quadrant ({qx}, {qy})...")
 
+        if (qx, qy) not in futures:
+          continue
+
         try:
-          render_bytes = render_quadrant_with_renderer(conn, config, qx, qy)
+          quadrant_images = futures[(qx, qy)].result(timeout=RENDER_TIMEOUT_SECONDS)
+          render_bytes = save_rendered_quadrants(conn, config, qx, qy, quadrant_images)
           if render_bytes:
             rendered_count += 1
             print(f"      ✓ Rendered quadrant ({qx}, {qy})")
@@ -920,7 +1089,7 @@ def process_queue_item_from_db(item_id: int) -> dict:
       result_message = f"Rendered {rendered_count} quadrant(s)"
       update_generation_state("complete", result_message)
       print(f"✅ Render complete: {rendered_count}/{total} quadrants")
-      mark_item_complete(conn, item_id, result_message)
+      mark_item_complete(conn, item_id, result_message, worker_id=QUEUE_WORKER_ID)
 
       return {
         "success": True,
@@ -932,7 +1101,7 @@ def process_queue_item_from_db(item_id: int) -> dict:
     traceback.print_exc()
     generation_state["status"] = "error"
     generation_state["error"] = str(e)
-    mark_item_error(conn, item_id, str(e))
+    mark_item_error(conn, item_id, str(e), worker_id=QUEUE_WORKER_ID)
     return {"success": False, "error": str(e)}
   finally:
     conn.close()
@@ -946,35 +1115,76 @@ def process_model_item(item_id: int, model_id: str | None):
     # Check cancellation before starting
     if generation_cancelled:
       print(f"⚠️  Item {item_id} cancelled before processing")
+      # Return it to the queue unless the cancellation was for this item
+      conn = get_db_connection()
+      try:
+        release_claimed_item(conn, item_id, worker_id=QUEUE_WORKER_ID)
+      finally:
+        conn.close()
       return
 
-    process_queue_item_from_db(item_id)
+    # Keep the claim's lease alive while the item is processed
+    with LeaseHeartbeat(get_db_connection, item_id, QUEUE_WORKER_ID):
+      process_queue_item_from_db(item_id)
 
   except Exception as e:
     print(f"❌ Model worker error for {model_id}: {e}")
     traceback.print_exc()
   finally:
-    # Remove model from busy set
-    with busy_models_lock:
-      busy_models.discard(model_id)
+    with in_flight_lock:
+      in_flight_items.pop(item_id, None)
+      model_still_running = any(
+        state["model_id"] == model_id for state in in_flight_items.values()
+      )
 
     # Update global state if this was the active model
     with generation_lock:
-      if generation_state.get("model_id") == model_id:
+      if generation_state.get("model_id") == model_id and not model_still_running:
         generation_state["is_generating"] = False
         generation_state["current_item_id"] = None
 
-    # Remove from per-model states
-    if model_id in model_generation_states:
-      del model_generation_states[model_id]
+    # A model slot is free again - let the worker dispatch the next item
+    notify_queue_worker()
+
+
+def notify_queue_worker() -> None:
+  """Wake the queue worker so it looks for dispatchable items immediately."""
+  global queue_wakeup_pending
+
+  with queue_wakeup:
+    queue_wakeup_pending = True
+    queue_wakeup.notify_all()
+
+
+def wait_for_queue_wakeup(timeout: float) -> bool:
+  """
+  Block until notify_queue_worker() is called or the timeout expires.
+
+  Notifications sent while the worker wasn't waiting are remembered, so a
+  wakeup between checking the queue and calling this is never lost.
+
+  Returns:
+    True if woken by a notification, False on timeout
+  """
+  global queue_wakeup_pending
+
+  with queue_wakeup:
+    woken = queue_wakeup.wait_for(lambda: queue_wakeup_pending, timeout)
+    queue_wakeup_pending = False
+  return woken
 
 
 def queue_worker():
   """Background worker that processes the generation queue from the database.
 
-  This worker supports parallel processing of different models - each model
-  can have one active generation at a time, but different models can run
-  concurrently.
+  This worker supports parallel processing - each model can have up to its
+  max_concurrency items in flight, and different models run concurrently.
+  Items that overlap (share quadrants or context) never run at the same
+  time; see claim_next_pending_item_for_available_model.
+
+  The worker sleeps until notify_queue_worker() is called (items queued, a
+  model finished, a cancellation) and only polls every
+  QUEUE_FALLBACK_POLL_SECONDS as a fallback.
 
   If NO_GENERATE_MODE is enabled, the worker will not process any items but
   will keep them preserved in the queue.
@@ -1003,25 +1213,26 @@ def queue_worker():
         with generation_lock:
           generation_state["is_generating"] = False
           generation_state["current_item_id"] = None
-        with busy_models_lock:
-          busy_models.clear()
-        model_generation_states.clear()
+        with in_flight_lock:
+          in_flight_items.clear()
         time.sleep(0.5)
         continue
 
       conn = get_db_connection()
 
-      # Get current busy models
-      with busy_models_lock:
-        current_busy = busy_models.copy()
-
-      # Get next pending item for an available model
-      item = get_next_pending_item_for_available_model(conn, current_busy)
+      # Claim the next pending item for a model with a free slot (marks it
+      # processing). In-flight counts come from the queue, across processes.
+      item = claim_next_pending_item_for_available_model(
+        conn,
+        worker_id=QUEUE_WORKER_ID,
+        max_concurrency=APP_CONFIG.get_max_concurrency() if APP_CONFIG else None,
+      )
 
       if item is None:
-        # No items available (either queue empty or all models busy)
+        # No items available (queue empty, models at their limit, or overlaps)
         conn.close()
-        time.sleep(0.5)
+        conn = None
+        wait_for_queue_wakeup(QUEUE_FALLBACK_POLL_SECONDS)
         continue
 
       item_id = item.id
@@ -1029,40 +1240,26 @@ def queue_worker():
       conn.close()
       conn = None
 
-      # Mark this model as busy
-      with busy_models_lock:
-        if model_id in busy_models:
-          # Another thread grabbed this model, skip
-          continue
-        busy_models.add(model_id)
+      with in_flight_lock:
+        in_flight_items[item_id] = {"model_id": model_id, "started_at": time.time()}
 
       # Update global state for display (use most recent)
       with generation_lock:
         generation_state["is_generating"] = True
         generation_state["model_id"] = model_id
 
-      # Initialize per-model state
-      model_generation_states[model_id] = {
-        "is_generating": True,
-        "item_id": item_id,
-        "started_at": time.time(),
-      }
-
-      # Spawn a thread to process this model's item
+      # Spawn a thread to process this item
       model_name = model_id or "default"
       worker_thread = threading.Thread(
         target=process_model_item,
         args=(item_id, model_id),
-        name=f"model-worker-{model_name}",
+        name=f"model-worker-{model_name}-{item_id}",
         daemon=True,
       )
       worker_thread.start()
 
       print(f"🚀 Started worker for model '{model_name}' (item {item_id})")
 
-      # Small delay before checking for more work
-      time.sleep(0.2)
-
     except Exception as e:
       print(f"❌ Queue worker error: {e}")
       traceback.print_exc()
@@ -1090,6 +1287,7 @@ def stop_queue_worker():
   """Stop the queue worker thread."""
   global queue_worker_running
   queue_worker_running = False
+  notify_queue_worker()
 
 
 def add_to_queue_db(
@@ -1112,13 +1310,13 @@ def add_to_queue_db(
       prompt,
       negative_prompt,
     )
+    notify_queue_worker()
 
     # Get model-specific queue position
     model_position = get_queue_position_for_model(conn, queue_item.id, model_id)
 
     # Get total queue length for backwards compatibility
-    pending = get_pending_queue(conn)
-    total_position = len(pending)
+    total_position = count_pending_items(conn)
 
     # Ensure the queue worker is running
     start_queue_worker()
@@ -1136,6 +1334,26 @@ def add_to_queue_db(
     conn.close()
 
 
+def get_in_flight_status(conn: sqlite3.Connection) -> dict[str, dict]:
+  """
+  Get live in-flight item counts (across all worker processes) and limits.
+
+  Returns a dict mapping model_id ("default" for items without a model) ->
+  {"in_flight": int, "max_concurrency": int} for every configured model and
+  every model with items in flight.
+  """
+  limits = APP_CONFIG.get_max_concurrency() if APP_CONFIG else {}
+  counts = get_in_flight_counts(conn)
+
+  status = {}
+  for model_id in dict.fromkeys([*limits, *counts]):
+    status[model_id or "default"] = {
+      "in_flight": counts.get(model_id, 0),
+      "max_concurrency": limits.get(model_id, 1),
+    }
+  return status
+
+
 @app.route("/api/status")
 def api_status():
   """API endpoint to check generation status including queue info."""
@@ -1144,9 +1362,11 @@ def api_status():
     queue_status = get_queue_status(conn)
     model_status = get_queue_status_by_model(conn)
 
-    # Get list of currently busy models
-    with busy_models_lock:
-      active_models = list(busy_models)
+    # Get list of models with items in flight in this process
+    with in_flight_lock:
+      active_models = list(
+        dict.fromkeys(state["model_id"] for state in in_flight_items.values())
+      )
 
     # Build the response
     response = {
@@ -1159,8 +1379,18 @@ def api_status():
       # All currently processing models (for parallel processing)
       "active_models": active_models,
       "active_model_count": len(active_models),
+      # Live in-flight item counts vs. each model's max_concurrency
+      "in_flight_by_model": get_in_flight_status(conn),
       # All quadrants being processed across all models
       "all_processing_quadrants": model_status["all_processing_quadrants"],
+      # Web renderer timings (browser reuse, per-phase averages)
+      "renderer": get_global_renderer_stats(),
+      # On-disk render cache hit/miss stats
+      "render_cache": get_render_cache_stats(),
+      # Pooled quadrants.db connections
+      "db_pool": get_db_pool().get_stats(),
+      # Decoded quadrant images reused across template builds
+      "image_cache": get_decoded_image_cache().get_stats(),
     }
 
     # Set is_generating based on whether any models are active
@@ -1207,12 +1437,9 @@ def api_clear_queue():
     if cancelled_count > 0:
       generation_cancelled = True
 
-    # Clear busy models
-    with busy_models_lock:
-      busy_models.clear()
-
-    # Clear per-model states
-    model_generation_states.clear()
+    # Clear in-flight items
+    with in_flight_lock:
+      in_flight_items.clear()
 
     # Reset the generation state
     generation_state["is_generating"] = False
@@ -1221,6 +1448,7 @@ def api_clear_queue():
     generation_state["message"] = "Queue cleared"
     generation_state["error"] = None
     generation_state["current_item_id"] = None
+    notify_queue_worker()
 
     if cleared_count > 0 or cancelled_count > 0:
       print(
@@ -1275,12 +1503,11 @@ def api_cancel_queue_item(item_id: int):
     # First check if this item was processing (not just pending)
     cursor = conn.cursor()
     cursor.execute(
-      "SELECT status, model_id FROM generation_queue WHERE id = ?",
+      "SELECT status FROM generation_queue WHERE id = ?",
       (item_id,),
     )
     row = cursor.fetchone()
     was_processing = row and row[0] == "processing"
-    cancelled_model_id = row[1] if row else None
 
     cancelled = cancel_queue_item_by_id(conn, item_id)
 
@@ -1293,10 +1520,11 @@ def api_cancel_queue_item(item_id: int):
         generation_cancelled = True
         print("   ⚠️  Item was processing, signaling cancellation")
 
-        # Also remove this model from busy set so it can pick up new work
-        if cancelled_model_id:
-          with busy_models_lock:
-            busy_models.discard(cancelled_model_id)
+        # The cancelled item no longer counts against its model's limit, so
+        # the model can pick up new work
+        with in_flight_lock:
+          in_flight_items.pop(item_id, None)
+        notify_queue_worker()
 
       return jsonify(
         {
@@ -1392,9 +1620,7 @@ def api_delete():
   if not quadrants:
     return jsonify({"success": False, "error": "Empty quadrants list"})
 
-  # Connect to database (quadrants.db, not tiles.db)
-  db_path = Path(GENERATION_DIR) / "quadrants.db"
-  conn = sqlite3.connect(db_path)
+  conn = get_db_connection()
 
   try:
     deleted_count = 0
@@ -1438,9 +1664,7 @@ def api_delete_render():
   if not quadrants:
     return jsonify({"success": False, "error": "Empty quadrants list"})
 
-  # Connect to database (quadrants.db, not tiles.db)
-  db_path = Path(GENERATION_DIR) / "quadrants.db"
-  conn = sqlite3.connect(db_path)
+  conn = get_db_connection()
 
   try:
     deleted_count = 0
@@ -1488,12 +1712,9 @@ def api_delete_water_mask():
   if not quadrants:
     return jsonify({"success": False, "error": "Empty quadrants list"})
 
-  db_path = Path(GENERATION_DIR) / "quadrants.db"
-  conn = sqlite3.connect(db_path)
+  conn = get_db_connection()
 
   try:
-    ensure_water_mask_columns_exist(conn)
-
     deleted_count = 0
     skipped_auto = []  # Track quadrants skipped due to ALL_WATER/ALL_LAND
 
@@ -1564,12 +1785,9 @@ def api_delete_dark_mode():
   if not quadrants:
     return jsonify({"success": False, "error": "Empty quadrants list"})
 
-  db_path = Path(GENERATION_DIR) / "quadrants.db"
-  conn = sqlite3.connect(db_path)
+  conn = get_db_connection()
 
   try:
-    ensure_dark_mode_column_exists(conn)
-
     deleted_count = 0
     for qx, qy in quadrants:
       # Clear the dark_mode column (set to NULL)
@@ -1616,9 +1834,6 @@ def api_flag():
   conn = get_db_connection()
 
   try:
-    # Ensure the flagged column exists
-    ensure_flagged_column_exists(conn)
-
     flagged_count = 0
     for qx, qy in quadrants:
       cursor = conn.execute(
@@ -1670,9 +1885,6 @@ def api_star():
   conn = get_db_connection()
 
   try:
-    # Ensure the starred column exists
-    ensure_starred_column_exists(conn)
-
     cursor = conn.execute(
       """
       UPDATE quadrants
@@ -1716,9 +1928,6 @@ def api_starred():
   conn = get_db_connection()
 
   try:
-    # Ensure the starred column exists
-    ensure_starred_column_exists(conn)
-
     cursor = conn.cursor()
     cursor.execute(
       """
@@ -1760,9 +1969,7 @@ def api_reference():
 
   Reference tiles are used for nano banana generation to provide style context.
   """
-  from isometric_hanford.generation.shared import (
-    get_quadrant_generation as shared_get_quadrant_generation,
-  )
+  from isometric_hanford.generation.shared import has_generation_batch
 
   data = request.get_json()
   if not data or "quadrant" not in data:
@@ -1778,16 +1985,14 @@ def api_reference():
   conn = get_db_connection()
 
   try:
-    # Ensure the is_reference column exists
-    ensure_is_reference_column_exists(conn)
-
     # Validate that this is a valid 2x2 tile (all 4 quadrants have generations)
     if reference_value == 1:
       # Check all 4 quadrants exist with generations
+      tile = [(qx + dx, qy + dy) for dy in [0, 1] for dx in [0, 1]]
+      generated = has_generation_batch(conn, tile)
       for dx in [0, 1]:
         for dy in [0, 1]:
-          gen = shared_get_quadrant_generation(conn, qx + dx, qy + dy)
-          if gen is None:
+          if (qx + dx, qy + dy) not in generated:
             return jsonify(
               {
                 "success": False,
@@ -1838,9 +2043,6 @@ def api_references():
   conn = get_db_connection()
 
   try:
-    # Ensure the is_reference column exists
-    ensure_is_reference_column_exists(conn)
-
     cursor = conn.cursor()
     cursor.execute(
       """
@@ -1876,9 +2078,6 @@ def api_clear_references():
   conn = get_db_connection()
 
   try:
-    # Ensure the is_reference column exists
-    ensure_is_reference_column_exists(conn)
-
     cursor = conn.execute(
       "UPDATE quadrants SET is_reference = 0 WHERE is_reference = 1"
     )
@@ -1941,9 +2140,6 @@ def api_water():
   conn = get_db_connection()
 
   try:
-    # Ensure the is_water column exists
-    ensure_is_water_column_exists(conn)
-
     water_count = 0
     for qx, qy in quadrants:
       # First ensure the quadrant exists in the database
@@ -2028,9 +2224,7 @@ def api_fix_water():
   print(f"   Softness: {softness}")
   print(f"{'=' * 60}")
 
-  # Connect to database
-  db_path = Path(GENERATION_DIR) / "quadrants.db"
-  conn = sqlite3.connect(db_path)
+  conn = get_db_connection()
 
   try:
     config = get_generation_config(conn)
@@ -2100,9 +2294,7 @@ def api_water_fill():
   print(f"   Fill color: {WATER_REPLACEMENT_COLOR}")
   print(f"{'=' * 60}")
 
-  # Connect to database
-  db_path = Path(GENERATION_DIR) / "quadrants.db"
-  conn = sqlite3.connect(db_path)
+  conn = get_db_connection()
 
   try:
     config = get_generation_config(conn)
@@ -2240,9 +2432,7 @@ def api_water_fill_rectangle():
   print(f"   Fill color: {WATER_REPLACEMENT_COLOR}")
   print(f"{'=' * 60}")
 
-  # Connect to database
-  db_path = Path(GENERATION_DIR) / "quadrants.db"
-  conn = sqlite3.connect(db_path)
+  conn = get_db_connection()
 
   try:
     config = get_generation_config(conn)
@@ -2680,6 +2870,8 @@ def api_generate_rectangle():
       "success": true,
       "plan_summary": {...},
       "queued_count": N,
+      "item_ids": [...],   // Queue item id of each step
+      "positions": [...],  // Each step's position in the model's queue
       "message": "Queued N generation steps"
     }
   """
@@ -2782,12 +2974,15 @@ def api_generate_rectangle():
         }
       )
 
-    # Queue all generation steps
-    queued_count = 0
-    for step in plan.steps:
-      quadrants = [(q.x, q.y) for q in step.quadrants]
-      add_to_queue(conn, QueueItemType.GENERATE, quadrants, model_id)
-      queued_count += 1
+    # Queue all generation steps in one transaction
+    queued = add_many_to_queue(
+      conn,
+      QueueItemType.GENERATE,
+      [[(q.x, q.y) for q in step.quadrants] for step in plan.steps],
+      model_id,
+    )
+    queued_count = len(queued)
+    notify_queue_worker()
 
     # Ensure queue worker is running
     start_queue_worker()
@@ -2800,6 +2995,9 @@ def api_generate_rectangle():
         "success": True,
         "plan_summary": summary,
         "queued_count": queued_count,
+        "item_ids": [item.id for item, _ in queued],
+        # Position of each step within this model's queue
+        "positions": [position for _, position in queued],
         "message": f"Queued {queued_count} generation step(s) for {summary['total_quadrants']} quadrant(s)",
       }
     )
@@ -2842,6 +3040,33 @@ def main():
     default=DEFAULT_WEB_PORT,
     help=f"Port for the Vite web server used for rendering (default: {DEFAULT_WEB_PORT})",
   )
+  parser.add_argument(
+    "--render-workers",
+    type=int,
+    default=DEFAULT_RENDER_WORKERS,
+    help=f"Number of concurrent render workers/pages (default: {DEFAULT_RENDER_WORKERS})",
+  )
+  parser.add_argument(
+    "--render-cache",
+    action="store_true",
+    default=False,
+    help="Serve repeated renders from an on-disk render cache",
+  )
+  parser.add_argument(
+    "--render-cache-dir",
+    type=Path,
+    default=None,
+    help=(
+      "Directory for the render cache; implies --render-cache "
+      f"(default: {DEFAULT_RENDER_CACHE_DIR})"
+    ),
+  )
+  parser.add_argument(
+    "--render-cache-max-gb",
+    type=float,
+    default=DEFAULT_RENDER_CACHE_MAX_BYTES / 1024**3,
+    help="Maximum size of the render cache in GB (default: 1)",
+  )
   parser.add_argument(
     "--config",
     type=Path,
@@ -2892,13 +3117,16 @@ def main():
   bounds_name = bounds_path.name if bounds_path else "NYC (default)"
   print(f"📍 Boundary: {bounds_name}")
 
-  # Initialize the generation queue table
+  # Migrate the schema and initialize the generation queue table
   conn = get_db_connection()
   try:
+    # Run schema migrations once instead of on every request
+    run_schema_migrations(conn)
     init_queue_table(conn)
-    # Reset any items that were mid-processing when server shut down
-    # These will be retried automatically
-    reset_count = reset_all_processing_items(conn)
+    # Reset items whose worker died mid-processing (their lease expired).
+    # Items still leased by a crashed run are reclaimed once their lease
+    # runs out; live claims of other worker processes are left alone.
+    reset_count = reclaim_expired_leases(conn)
     if reset_count > 0:
       print(f"🔄 Reset {reset_count} interrupted generation(s) - will be retried")
     # Clean up old completed items
@@ -2911,9 +3139,18 @@ def main():
   # Start the queue worker
   start_queue_worker()
 
+  # Configure the render cache before any renders happen (otherwise it is
+  # only used if RENDER_CACHE_DIR is set)
+  if args.render_cache or args.render_cache_dir:
+    configure_render_cache(
+      (args.render_cache_dir or DEFAULT_RENDER_CACHE_DIR).resolve(),
+      max_bytes=int(args.render_cache_max_gb * 1024**3),
+    )
+  render_cache = get_render_cache()
+
   # Start the global web renderer
   try:
-    start_global_renderer(port=WEB_SERVER_PORT)
+    start_global_renderer(port=WEB_SERVER_PORT, num_workers=args.render_workers)
   except Exception as e:
     print(f"⚠️  Failed to start web renderer: {e}")
     print("   Rendering will start on demand")
@@ -2922,6 +3159,11 @@ def main():
   print(f"   Generation dir: {GENERATION_DIR}")
   print(f"   Flask server: http://{args.host}:{args.port}/")
   print(f"   Web render port: {WEB_SERVER_PORT}")
+  print(f"   Render workers: {args.render_workers}")
+  if render_cache is not None:
+    print(f"   Render cache: {render_cache.cache_dir}")
+  else:
+    print("   Render cache: disabled")
   if NO_GENERATE_MODE:
     print("   ⚠️  NO-GENERATE MODE: Queue items preserved but not processed")
   print("   Press Ctrl+C to stop")
@@ -2937,6 +3179,8 @@ def main():
     print("🛑 Stopping web renderer...")
     stop_global_renderer()
 
+    close_db_pool()
+
   return 0
 
 
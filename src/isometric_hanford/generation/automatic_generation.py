@@ -21,10 +21,11 @@ Usage:
     --top-left <x>,<y> \\
     --bottom-right <x>,<y>
 
-  # Execute an existing plan:
+  # Execute an existing plan (independent steps run concurrently):
   uv run python src/isometric_hanford/generation/automatic_generation.py \\
     <generation_dir> \\
-    --plan-json <path_to_plan.json>
+    --plan-json <path_to_plan.json> \\
+    [--workers 4] [--max-retries 1]
 
 Example:
   # Create plan:
@@ -42,13 +43,17 @@ Example:
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
 import sqlite3
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+import numpy as np
 
 # =============================================================================
 # Data Structures
@@ -63,6 +68,18 @@ class QuadrantState(Enum):
   SELECTED = "selected"  # Selected for generation in current step
 
 
+# QuadrantGrid stores states as indices into this tuple, and marks the
+# border of cells it keeps around its bounds with _OUTSIDE_CODE
+_STATE_CODES = tuple(QuadrantState)
+_EMPTY_CODE = _STATE_CODES.index(QuadrantState.EMPTY)
+_GENERATED_CODE = _STATE_CODES.index(QuadrantState.GENERATED)
+_OUTSIDE_CODE = 255
+# In bounds and not generated
+_OPEN_CODES = frozenset(
+  code for code in range(len(_STATE_CODES)) if code != _GENERATED_CODE
+)
+
+
 class StepStatus(Enum):
   """Status of a generation step."""
 
@@ -237,28 +254,71 @@ class QuadrantGrid:
 
   This class manages the state of all quadrants within a bounding box
   and helps construct generation plans.
+
+  States are stored in a numpy array, so planning can check neighbors for a
+  whole row or the whole grid at once. The array keeps a border of
+  GRID_BORDER cells outside the bounds, which lets the tile checks that
+  planning runs for every quadrant look up neighbors by flat index without
+  bounds checks (see _flat_index).
   """
 
+  GRID_BORDER = 2
+
   def __init__(self, bounds: BoundingBox):
     self.bounds = bounds
-    self._states: dict[Point, QuadrantState] = {}
+    border = self.GRID_BORDER
+    self._cells = np.full(
+      (bounds.height + 2 * border, bounds.width + 2 * border),
+      _OUTSIDE_CODE,
+      dtype=np.uint8,
+    )
+    # The in-bounds quadrants, indexed by (y, x) relative to the top-left
+    self._states = self._cells[border:-border, border:-border]
+    self._states[:] = _EMPTY_CODE
+    # Writable flat view of _cells for per-quadrant access from Python
+    self._flat = memoryview(self._cells.reshape(-1))
+    self._stride = self._cells.shape[1]
+    self._x0, self._y0 = bounds.top_left.x, bounds.top_left.y
+    self._height, self._width = self._states.shape
+
+  def _flat_index(self, p: Point) -> int | None:
+    """Index of a quadrant in _flat, or None if it is out of bounds."""
+    row = p.y - self._y0
+    col = p.x - self._x0
+    if 0 <= row < self._height and 0 <= col < self._width:
+      return (row + self.GRID_BORDER) * self._stride + col + self.GRID_BORDER
+    return None
+
+  def _point_at(self, index: int) -> Point:
+    """Quadrant at an index in _flat."""
+    row, col = divmod(index, self._stride)
+    return Point(
+      self._x0 + col - self.GRID_BORDER, self._y0 + row - self.GRID_BORDER
+    )
 
-    # Initialize all quadrants as empty
-    for p in bounds.all_points():
-      self._states[p] = QuadrantState.EMPTY
+  def _points(self, mask: np.ndarray) -> list[Point]:
+    """Quadrants where mask is True, in row-major (y, then x) order."""
+    rows, cols = np.nonzero(mask)
+    x0, y0 = self._x0, self._y0
+    return [Point(x0 + c, y0 + r) for r, c in zip(rows.tolist(), cols.tolist())]
 
   def get_state(self, p: Point) -> QuadrantState:
     """Get the state of a quadrant."""
-    return self._states.get(p, QuadrantState.EMPTY)
+    index = self._flat_index(p)
+    if index is None:
+      return QuadrantState.EMPTY
+    return _STATE_CODES[self._flat[index]]
 
   def set_state(self, p: Point, state: QuadrantState) -> None:
     """Set the state of a quadrant."""
-    if p in self._states:
-      self._states[p] = state
+    index = self._flat_index(p)
+    if index is not None:
+      self._flat[index] = _STATE_CODES.index(state)
 
   def is_generated(self, p: Point) -> bool:
     """Check if a quadrant has been generated."""
-    return self.get_state(p) == QuadrantState.GENERATED
+    index = self._flat_index(p)
+    return index is not None and self._flat[index] == _GENERATED_CODE
 
   def mark_generated(self, p: Point) -> None:
     """Mark a quadrant as generated."""
@@ -271,24 +331,54 @@ class QuadrantGrid:
 
   def get_all_generated(self) -> list[Point]:
     """Get all generated quadrant positions."""
-    return [p for p, state in self._states.items() if state == QuadrantState.GENERATED]
+    return self._points(self.generated_mask())
 
   def get_all_empty(self) -> list[Point]:
     """Get all empty (not generated) quadrant positions."""
-    return [p for p, state in self._states.items() if state == QuadrantState.EMPTY]
+    return self._points(self.empty_mask())
+
+  def count_empty(self) -> int:
+    """Count the empty (not generated) quadrants."""
+    return int(np.count_nonzero(self.empty_mask()))
+
+  def generated_mask(self) -> np.ndarray:
+    """Boolean (height, width) array of generated quadrants."""
+    return self._states == _GENERATED_CODE
+
+  def empty_mask(self) -> np.ndarray:
+    """Boolean (height, width) array of empty quadrants."""
+    return self._states == _EMPTY_CODE
+
+  def is_generated_at(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """
+    Vectorized is_generated for arrays of quadrant coordinates.
+
+    Args:
+        xs: Quadrant x coordinates
+        ys: Quadrant y coordinates (same shape as xs)
+
+    Returns:
+        Boolean array, False for coordinates outside the bounds
+    """
+    rows = np.asarray(ys) - self._y0
+    cols = np.asarray(xs) - self._x0
+    inside = (rows >= 0) & (rows < self._height) & (cols >= 0) & (cols < self._width)
+    result = np.zeros(inside.shape, dtype=bool)
+    result[inside] = self._states[rows[inside], cols[inside]] == _GENERATED_CODE
+    return result
 
   def get_generated_bounds(self) -> BoundingBox | None:
     """Get the bounding box of all generated quadrants."""
-    generated = self.get_all_generated()
-    if not generated:
+    generated = self.generated_mask()
+    rows = np.flatnonzero(generated.any(axis=1))
+    if len(rows) == 0:
       return None
+    cols = np.flatnonzero(generated.any(axis=0))
 
-    min_x = min(p.x for p in generated)
-    max_x = max(p.x for p in generated)
-    min_y = min(p.y for p in generated)
-    max_y = max(p.y for p in generated)
-
-    return BoundingBox(Point(min_x, min_y), Point(max_x, max_y))
+    return BoundingBox(
+      Point(self._x0 + int(cols[0]), self._y0 + int(rows[0])),
+      Point(self._x0 + int(cols[-1]), self._y0 + int(rows[-1])),
+    )
 
   def has_generated_neighbor(self, p: Point) -> bool:
     """Check if a quadrant has any generated neighbors (4-connected)."""
@@ -310,6 +400,48 @@ class QuadrantGrid:
     ]
     return sum(1 for n in neighbors if self.is_generated(n))
 
+  def generated_neighbor_counts(self) -> np.ndarray:
+    """count_generated_neighbors for every quadrant, as a (height, width) array."""
+    generated = (self._cells == _GENERATED_CODE).astype(np.int8)
+    b = self.GRID_BORDER
+    return (
+      generated[b - 1 : -b - 1, b:-b]
+      + generated[b + 1 : generated.shape[0] - b + 1, b:-b]
+      + generated[b:-b, b - 1 : -b - 1]
+      + generated[b:-b, b + 1 : generated.shape[1] - b + 1]
+    )
+
+  def get_empty_near_generated(self) -> list[Point]:
+    """
+    Get empty quadrants with a generated quadrant among their 8 neighbors.
+
+    Returned in row-major (y, then x) order.
+    """
+    gen_bounds = self.get_generated_bounds()
+    if gen_bounds is None:
+      return []
+
+    # Such quadrants are at most one row/column outside the generated bounds,
+    # so only look at that window (plus one more cell for the neighbors)
+    b = self.GRID_BORDER
+    top = gen_bounds.top_left.y - self._y0 + b - 2
+    left = gen_bounds.top_left.x - self._x0 + b - 2
+    bottom = gen_bounds.bottom_right.y - self._y0 + b + 3
+    right = gen_bounds.bottom_right.x - self._x0 + b + 3
+    window = self._cells[top:bottom, left:right]
+
+    generated = window == _GENERATED_CODE
+    near = np.zeros((window.shape[0] - 2, window.shape[1] - 2), dtype=bool)
+    for dy in range(3):
+      for dx in range(3):
+        if dy != 1 or dx != 1:
+          near |= generated[dy : dy + near.shape[0], dx : dx + near.shape[1]]
+
+    rows, cols = np.nonzero(near & (window[1:-1, 1:-1] == _EMPTY_CODE))
+    x0 = self._x0 + left + 1 - b
+    y0 = self._y0 + top + 1 - b
+    return [Point(x0 + c, y0 + r) for r, c in zip(rows.tolist(), cols.tolist())]
+
   def visualize(
     self,
     highlight: list[Point] | None = None,
@@ -407,6 +539,7 @@ def run_generation_step(
     get_quadrant_render as shared_get_quadrant_render,
   )
   from isometric_hanford.generation.shared import (
+    has_quadrant_generation,
     image_to_png_bytes,
     png_bytes_to_image,
     save_quadrant_generation,
@@ -425,8 +558,7 @@ def run_generation_step(
 
   # Helper functions
   def has_generation_in_db(qx: int, qy: int) -> bool:
-    gen = shared_get_quadrant_generation(conn, qx, qy)
-    return gen is not None
+    return has_quadrant_generation(conn, qx, qy)
 
   def get_render_from_db_with_render(qx: int, qy: int) -> Image.Image | None:
     """Get render, rendering if it doesn't exist yet."""
@@ -620,7 +752,7 @@ def render_quadrant(
 
 def call_oxen_api(image_url: str, api_key: str) -> str:
   """Call the Oxen API to generate pixel art."""
-  import requests
+  from isometric_hanford.generation.http_session import get_session
 
   endpoint = "https://hub.oxen.ai/api/images/edit"
   model = "cannoneyed-gentle-gold-antlion"
@@ -642,7 +774,7 @@ def call_oxen_api(image_url: str, api_key: str) -> str:
     "num_inference_steps": 28,
   }
 
-  response = requests.post(endpoint, headers=headers, json=payload, timeout=300)
+  response = get_session().post(endpoint, headers=headers, json=payload, timeout=300)
   response.raise_for_status()
 
   result = response.json()
@@ -687,11 +819,13 @@ def download_image_to_pil(
   import requests
   from PIL import Image
 
+  from isometric_hanford.generation.http_session import get_session
+
   last_error = None
 
   for attempt in range(1, max_retries + 1):
     try:
-      response = requests.get(url, timeout=120)
+      response = get_session().get(url, timeout=120)
       response.raise_for_status()
       return Image.open(BytesIO(response.content))
     except requests.exceptions.HTTPError as e:
@@ -732,14 +866,18 @@ def find_interior_gaps(grid: QuadrantGrid) -> list[Point]:
   if gen_bounds is None:
     return []
 
-  gaps = []
-  for y in range(gen_bounds.top_left.y, gen_bounds.bottom_right.y + 1):
-    for x in range(gen_bounds.top_left.x, gen_bounds.bottom_right.x + 1):
-      p = Point(x, y)
-      if not grid.is_generated(p) and grid.bounds.contains(p):
-        gaps.append(p)
-
-  return gaps
+  # Generated quadrants are always within grid bounds, so is gen_bounds
+  row0 = gen_bounds.top_left.y - grid.bounds.top_left.y
+  col0 = gen_bounds.top_left.x - grid.bounds.top_left.x
+  window = (
+    slice(row0, row0 + gen_bounds.height),
+    slice(col0, col0 + gen_bounds.width),
+  )
+  rows, cols = np.nonzero(~grid.generated_mask()[window])
+  return [
+    Point(gen_bounds.top_left.x + c, gen_bounds.top_left.y + r)
+    for r, c in zip(rows.tolist(), cols.tolist())
+  ]
 
 
 def can_generate_2x2(
@@ -758,67 +896,84 @@ def can_generate_2x2(
   The gap requirement prevents seams at tile boundaries. 2x2 tiles with gaps are
   bridged back using 1x2/2x1 tiles which handle seams better.
   """
-  quadrants = [
-    top_left,
-    Point(top_left.x + 1, top_left.y),
-    Point(top_left.x, top_left.y + 1),
-    Point(top_left.x + 1, top_left.y + 1),
-  ]
+  valid = can_generate_2x2_many(
+    grid, np.array([top_left.x]), np.array([top_left.y]), require_gap=require_gap
+  )
+  return bool(valid[0])
+
+
+# Offsets from a 2x2 tile's top-left corner to the tile itself, to the direct
+# (4-connected) neighbors of its quadrants, and to the quadrants within 2 tiles
+# of it (straight or diagonal), excluding the tile.
+_2X2_TILE = [(0, 0), (1, 0), (0, 1), (1, 1)]
+_2X2_DIRECT_NEIGHBORS = [
+  (0, -1),
+  (1, -1),
+  (0, 2),
+  (1, 2),
+  (-1, 0),
+  (-1, 1),
+  (2, 0),
+  (2, 1),
+]
+_2X2_TWO_AWAY = sorted(
+  {
+    (qx + dx, qy + dy)
+    for qx, qy in _2X2_TILE
+    for dx, dy in [
+      (-2, 0),
+      (2, 0),
+      (0, -2),
+      (0, 2),
+      (-1, -1),
+      (1, -1),
+      (-1, 1),
+      (1, 1),
+    ]
+  }
+  - set(_2X2_TILE)
+)
 
-  # All must be empty
-  if any(grid.is_generated(q) for q in quadrants):
-    return False
 
-  # All must be within bounds
-  if not all(grid.bounds.contains(q) for q in quadrants):
-    return False
+def can_generate_2x2_many(
+  grid: QuadrantGrid, xs: np.ndarray, ys: np.ndarray, require_gap: bool = True
+) -> np.ndarray:
+  """
+  Vectorized can_generate_2x2 for arrays of top-left corners.
+
+  Args:
+      grid: The quadrant grid
+      xs: Top-left x coordinates
+      ys: Top-left y coordinates (same shape as xs)
+      require_gap: Same as for can_generate_2x2
+
+  Returns:
+      Boolean array, True where a 2x2 tile can be generated
+  """
 
-  quadrant_set = set(quadrants)
+  def any_generated(offsets: list[tuple[int, int]]) -> np.ndarray:
+    result = np.zeros(np.shape(xs), dtype=bool)
+    for dx, dy in offsets:
+      result |= grid.is_generated_at(xs + dx, ys + dy)
+    return result
+
+  # All must be empty and within bounds
+  valid = ~any_generated(_2X2_TILE)
+  for dx, dy in _2X2_TILE:
+    valid &= (
+      (grid.bounds.top_left.x <= xs + dx)
+      & (xs + dx <= grid.bounds.bottom_right.x)
+      & (grid.bounds.top_left.y <= ys + dy)
+      & (ys + dy <= grid.bounds.bottom_right.y)
+    )
 
+  has_direct_neighbor = any_generated(_2X2_DIRECT_NEIGHBORS)
   if require_gap:
-    # Check that NO quadrant has a direct generated neighbor (to avoid seams)
-    for q in quadrants:
-      direct_neighbors = [
-        Point(q.x - 1, q.y),
-        Point(q.x + 1, q.y),
-        Point(q.x, q.y - 1),
-        Point(q.x, q.y + 1),
-      ]
-      for n in direct_neighbors:
-        if n not in quadrant_set and grid.is_generated(n):
-          # Has direct neighbor - would create seam
-          return False
-
-    # Check that there IS generated content within 2 tiles (so we can bridge later)
-    for q in quadrants:
-      # Check neighbors at distance 2
-      two_away = [
-        Point(q.x - 2, q.y),
-        Point(q.x + 2, q.y),
-        Point(q.x, q.y - 2),
-        Point(q.x, q.y + 2),
-        Point(q.x - 1, q.y - 1),
-        Point(q.x + 1, q.y - 1),
-        Point(q.x - 1, q.y + 1),
-        Point(q.x + 1, q.y + 1),
-      ]
-      for n in two_away:
-        if n not in quadrant_set and grid.is_generated(n):
-          return True
-    return False
-  else:
-    # Original behavior: at least one must have a generated neighbor (outside the 2x2)
-    for q in quadrants:
-      neighbors = [
-        Point(q.x - 1, q.y),
-        Point(q.x + 1, q.y),
-        Point(q.x, q.y - 1),
-        Point(q.x, q.y + 1),
-      ]
-      for n in neighbors:
-        if n not in quadrant_set and grid.is_generated(n):
-          return True
-    return False
+    # NO direct generated neighbor (to avoid seams), but generated content
+    # within 2 tiles (so we can bridge later)
+    return valid & ~has_direct_neighbor & any_generated(_2X2_TWO_AWAY)
+  # Original behavior: at least one must have a generated neighbor
+  return valid & has_direct_neighbor
 
 
 def can_generate_1x2_horizontal(grid: QuadrantGrid, left: Point) -> bool:
@@ -831,34 +986,8 @@ def can_generate_1x2_horizontal(grid: QuadrantGrid, left: Point) -> bool:
   NOT on the SHORT sides (left end of left, right end of right).
   This prevents seams since short-side pixels aren't included in the template.
   """
-  right = Point(left.x + 1, left.y)
-
-  if grid.is_generated(left) or grid.is_generated(right):
-    return False
-  if not grid.bounds.contains(left) or not grid.bounds.contains(right):
-    return False
-
-  # SHORT sides (ends) - these CANNOT have generated neighbors
-  short_side_neighbors = [
-    Point(left.x - 1, left.y),  # Left of left quadrant
-    Point(right.x + 1, right.y),  # Right of right quadrant
-  ]
-  for n in short_side_neighbors:
-    if grid.is_generated(n):
-      return False  # Would create seam
-
-  # LONG sides (top/bottom) - at least one must have generated neighbor
-  long_side_neighbors = [
-    Point(left.x, left.y - 1),  # Above left
-    Point(left.x, left.y + 1),  # Below left
-    Point(right.x, right.y - 1),  # Above right
-    Point(right.x, right.y + 1),  # Below right
-  ]
-  for n in long_side_neighbors:
-    if grid.is_generated(n):
-      return True
-
-  return False
+  index = grid._flat_index(left)
+  return index is not None and _can_generate_1x2_at(grid._flat, index, grid._stride)
 
 
 def can_generate_2x1_vertical(grid: QuadrantGrid, top: Point) -> bool:
@@ -873,43 +1002,64 @@ def can_generate_2x1_vertical(grid: QuadrantGrid, top: Point) -> bool:
   NOT on the SHORT sides (above top, below bottom).
   This prevents seams since short-side pixels aren't included in the template.
   """
-  bottom = Point(top.x, top.y + 1)
+  index = grid._flat_index(top)
+  return index is not None and _can_generate_2x1_at(grid._flat, index, grid._stride)
 
-  if grid.is_generated(top) or grid.is_generated(bottom):
-    return False
-  if not grid.bounds.contains(top) or not grid.bounds.contains(bottom):
-    return False
 
-  # SHORT sides (ends) - these CANNOT have generated neighbors
-  short_side_neighbors = [
-    Point(top.x, top.y - 1),  # Above top quadrant
-    Point(bottom.x, bottom.y + 1),  # Below bottom quadrant
-  ]
-  for n in short_side_neighbors:
-    if grid.is_generated(n):
-      return False  # Would create seam
+def can_generate_single(grid: QuadrantGrid, p: Point) -> bool:
+  """Check if a single quadrant can be generated."""
+  index = grid._flat_index(p)
+  return index is not None and _can_generate_single_at(
+    grid._flat, index, grid._stride
+  )
 
-  # LONG sides (left/right) - at least one must have generated neighbor
-  long_side_neighbors = [
-    Point(top.x - 1, top.y),  # Left of top
-    Point(top.x + 1, top.y),  # Right of top
-    Point(bottom.x - 1, bottom.y),  # Left of bottom
-    Point(bottom.x + 1, bottom.y),  # Right of bottom
-  ]
-  for n in long_side_neighbors:
-    if grid.is_generated(n):
-      return True
 
-  return False
+# The checks behind can_generate_1x2_horizontal, can_generate_2x1_vertical and
+# can_generate_single, on QuadrantGrid._flat. `i` must be an in-bounds
+# quadrant; the grid's border keeps every neighbor looked at inside _flat.
 
 
-def can_generate_single(grid: QuadrantGrid, p: Point) -> bool:
-  """Check if a single quadrant can be generated."""
-  if grid.is_generated(p):
+def _can_generate_1x2_at(cells: memoryview, i: int, stride: int) -> bool:
+  # Both quadrants in bounds and not generated
+  if cells[i] not in _OPEN_CODES or cells[i + 1] not in _OPEN_CODES:
     return False
-  if not grid.bounds.contains(p):
+  # SHORT sides (ends) - these CANNOT have generated neighbors
+  if cells[i - 1] == _GENERATED_CODE or cells[i + 2] == _GENERATED_CODE:
+    return False  # Would create seam
+  # LONG sides (top/bottom) - at least one must have generated neighbor
+  return _GENERATED_CODE in (
+    cells[i - stride],
+    cells[i + stride],
+    cells[i + 1 - stride],
+    cells[i + 1 + stride],
+  )
+
+
+def _can_generate_2x1_at(cells: memoryview, i: int, stride: int) -> bool:
+  # Both quadrants in bounds and not generated
+  if cells[i] not in _OPEN_CODES or cells[i + stride] not in _OPEN_CODES:
     return False
-  return grid.has_generated_neighbor(p)
+  # SHORT sides (ends) - these CANNOT have generated neighbors
+  if cells[i - stride] == _GENERATED_CODE or cells[i + 2 * stride] == _GENERATED_CODE:
+    return False  # Would create seam
+  # LONG sides (left/right) - at least one must have generated neighbor
+  return _GENERATED_CODE in (
+    cells[i - 1],
+    cells[i + 1],
+    cells[i + stride - 1],
+    cells[i + stride + 1],
+  )
+
+
+def _can_generate_single_at(cells: memoryview, i: int, stride: int) -> bool:
+  if cells[i] not in _OPEN_CODES:
+    return False
+  return _GENERATED_CODE in (
+    cells[i - 1],
+    cells[i + 1],
+    cells[i - stride],
+    cells[i + stride],
+  )
 
 
 def find_best_2x2_tiles(
@@ -929,45 +1079,34 @@ def find_best_2x2_tiles(
   if gen_bounds is None:
     return []
 
-  valid_positions = []
-
   # When require_gap is True, we look for tiles 2 rows/cols away (with 1 row/col gap)
   # When require_gap is False, we look for tiles 1 row/col away (directly adjacent)
   offset = 2 if require_gap else 1
 
+  x_range = np.arange(gen_bounds.top_left.x, gen_bounds.bottom_right.x, 2)
+  y_range = np.arange(gen_bounds.top_left.y, gen_bounds.bottom_right.y, 2)
+
   if direction == "top":
     # Look for 2x2 tiles above the current bounds
     y = gen_bounds.top_left.y - offset - 1  # -1 because 2x2 tile has height 2
-    for x in range(gen_bounds.top_left.x, gen_bounds.bottom_right.x, 2):
-      tl = Point(x, y)
-      if can_generate_2x2(grid, tl, require_gap=require_gap):
-        valid_positions.append(tl)
-
+    xs, ys = x_range, np.full_like(x_range, y)
   elif direction == "bottom":
     # Look for 2x2 tiles below the current bounds
     y = gen_bounds.bottom_right.y + offset
-    for x in range(gen_bounds.top_left.x, gen_bounds.bottom_right.x, 2):
-      tl = Point(x, y)
-      if can_generate_2x2(grid, tl, require_gap=require_gap):
-        valid_positions.append(tl)
-
+    xs, ys = x_range, np.full_like(x_range, y)
   elif direction == "left":
     # Look for 2x2 tiles to the left of current bounds
     x = gen_bounds.top_left.x - offset - 1  # -1 because 2x2 tile has width 2
-    for y in range(gen_bounds.top_left.y, gen_bounds.bottom_right.y, 2):
-      tl = Point(x, y)
-      if can_generate_2x2(grid, tl, require_gap=require_gap):
-        valid_positions.append(tl)
-
+    xs, ys = np.full_like(y_range, x), y_range
   elif direction == "right":
     # Look for 2x2 tiles to the right of current bounds
     x = gen_bounds.bottom_right.x + offset
-    for y in range(gen_bounds.top_left.y, gen_bounds.bottom_right.y, 2):
-      tl = Point(x, y)
-      if can_generate_2x2(grid, tl, require_gap=require_gap):
-        valid_positions.append(tl)
+    xs, ys = np.full_like(y_range, x), y_range
+  else:
+    return []
 
-  return valid_positions
+  valid = can_generate_2x2_many(grid, xs, ys, require_gap=require_gap)
+  return [Point(x, y) for x, y in zip(xs[valid].tolist(), ys[valid].tolist())]
 
 
 def get_2x2_quadrants(top_left: Point) -> list[Point]:
@@ -1021,7 +1160,7 @@ def create_generation_plan(grid: QuadrantGrid) -> list[GenerationStep]:
   direction_idx = 0
   max_iterations = 1000  # Safety limit
 
-  while grid.get_all_empty() and max_iterations > 0:
+  while grid.count_empty() and max_iterations > 0:
     max_iterations -= 1
     made_progress = False
 
@@ -1044,78 +1183,119 @@ def create_generation_plan(grid: QuadrantGrid) -> list[GenerationStep]:
     # Step B: Fill remaining gaps (bridges and single quadrants)
     # IMPORTANT: 2x2 tiles can NEVER touch existing generated content.
     # Only use 1x2, 2x1, or single tiles for bridging.
-    remaining_empty = grid.get_all_empty()
-    if remaining_empty:
-      # Sort by how many generated neighbors they have (more = better)
-      remaining_empty.sort(key=lambda p: -grid.count_generated_neighbors(p))
-
-      for p in remaining_empty:
-        if grid.is_generated(p):
-          continue
-
-        # Try 1x2 horizontal
-        for dx in [0, -1]:
-          left = Point(p.x + dx, p.y)
-          if can_generate_1x2_horizontal(grid, left):
-            quadrants = get_1x2_quadrants(left)
-            steps.append(
-              GenerationStep(step_num, quadrants, f"Bridge 1x2 horizontal: {left}")
-            )
-            grid.mark_multiple_generated(quadrants)
-            step_num += 1
-            made_progress = True
-            break
-        else:
-          # Try 2x1 vertical
-          for dy in [0, -1]:
-            top = Point(p.x, p.y + dy)
-            if can_generate_2x1_vertical(grid, top):
-              quadrants = get_2x1_quadrants(top)
-              steps.append(
-                GenerationStep(
-                  step_num,
-                  quadrants,
-                  f"Bridge 2x1 vertical: {top}",
-                )
-              )
-              grid.mark_multiple_generated(quadrants)
-              step_num += 1
-              made_progress = True
-              break
-          else:
-            # Single quadrant as last resort
-            if can_generate_single(grid, p):
-              steps.append(GenerationStep(step_num, [p], f"Single quadrant: {p}"))
-              grid.mark_generated(p)
-              step_num += 1
-              made_progress = True
+    bridge_steps = bridge_remaining_empty(grid)
+    for quadrants, desc in bridge_steps:
+      steps.append(GenerationStep(step_num, quadrants, desc))
+      step_num += 1
+      made_progress = True
 
     if not made_progress:
       # Check if we have disconnected empty regions
-      empty = grid.get_all_empty()
-      if empty:
+      empty = grid.empty_mask()
+      if empty.any():
         # Find an empty quadrant adjacent to the generated region
-        for p in empty:
-          if grid.has_generated_neighbor(p):
-            # Generate it as a single
-            steps.append(
-              GenerationStep(step_num, [p], f"Single quadrant (fallback): {p}")
-            )
-            grid.mark_generated(p)
-            step_num += 1
-            made_progress = True
-            break
+        reachable = np.flatnonzero(empty & (grid.generated_neighbor_counts() > 0))
+        if len(reachable):
+          # Generate it as a single
+          row, col = divmod(int(reachable[0]), empty.shape[1])
+          p = Point(grid.bounds.top_left.x + col, grid.bounds.top_left.y + row)
+          steps.append(
+            GenerationStep(step_num, [p], f"Single quadrant (fallback): {p}")
+          )
+          grid.mark_generated(p)
+          step_num += 1
+          made_progress = True
 
         if not made_progress:
           # Truly stuck - there may be disconnected regions
           print(
-            f"Warning: {len(empty)} quadrants cannot be reached from generated region"
+            f"Warning: {int(empty.sum())} quadrants cannot be reached "
+            "from generated region"
           )
           break
 
   return steps
 
 
+def bridge_remaining_empty(grid: QuadrantGrid) -> list[tuple[list[Point], str]]:
+  """
+  Make one bridging pass over every empty quadrant, marking placements on grid.
+
+  Empty quadrants are visited in order of how many generated neighbors they
+  had when the pass started (more = better), then row-major. Each one is
+  covered by a 1x2 horizontal tile, a 2x1 vertical tile, or a single
+  quadrant, whichever is valid first.
+
+  Only quadrants with a generated quadrant among their 8 surrounding
+  neighbors can be covered, so instead of visiting every empty quadrant the
+  pass keeps a heap of those, keyed by visiting order. Placing a tile adds
+  the quadrants around it that have not been visited yet.
+
+  Returns list of (quadrants, description) tuples.
+  """
+  result: list[tuple[list[Point], str]] = []
+  # This visits every quadrant of a large map, so it works on flat indices
+  # into the grid's cells rather than on Points
+  cells, stride = grid._flat, grid._stride
+  neighbors_8 = [
+    offset + dx for offset in (-stride, 0, stride) for dx in (-1, 0, 1)
+  ]
+  neighbors_8.remove(0)
+  placed_this_pass: set[int] = set()
+
+  def visit_key(i: int) -> tuple[int, int]:
+    # Generated neighbor count as of the start of the pass, then row-major
+    count = 0
+    for n in (i - 1, i + 1, i - stride, i + stride):
+      if cells[n] == _GENERATED_CODE and n not in placed_this_pass:
+        count += 1
+    return (-count, i)
+
+  heap = [visit_key(grid._flat_index(p)) for p in grid.get_empty_near_generated()]
+  queued = {i for _, i in heap}
+  heapq.heapify(heap)
+
+  while heap:
+    key = heapq.heappop(heap)
+    i = key[1]
+    if cells[i] == _GENERATED_CODE:
+      continue
+
+    # Try 1x2 horizontal, then 2x1 vertical, then a single quadrant. The
+    # description names the tile's first quadrant.
+    if _can_generate_1x2_at(cells, i, stride):
+      tile, label = [i, i + 1], "Bridge 1x2 horizontal"
+    elif _can_generate_1x2_at(cells, i - 1, stride):
+      tile, label = [i - 1, i], "Bridge 1x2 horizontal"
+    elif _can_generate_2x1_at(cells, i, stride):
+      tile, label = [i, i + stride], "Bridge 2x1 vertical"
+    elif _can_generate_2x1_at(cells, i - stride, stride):
+      tile, label = [i - stride, i], "Bridge 2x1 vertical"
+    elif _can_generate_single_at(cells, i, stride):
+      tile, label = [i], "Single quadrant"
+    else:
+      continue
+
+    quadrants = [grid._point_at(j) for j in tile]
+    result.append((quadrants, f"{label}: {quadrants[0]}"))
+    for j in tile:
+      cells[j] = _GENERATED_CODE
+    placed_this_pass.update(tile)
+
+    # Queue the not-yet-visited empty quadrants the new tile is now near
+    for j in tile:
+      for offset in neighbors_8:
+        n = j + offset
+        if cells[n] != _EMPTY_CODE or n in queued:
+          continue
+        n_key = visit_key(n)
+        if n_key > key:
+          queued.add(n)
+          heapq.heappush(heap, n_key)
+
+  return result
+
+
 def fill_gaps_efficiently(
   grid: QuadrantGrid, gaps: list[Point]
 ) -> list[tuple[list[Point], str]]:
@@ -1129,55 +1309,215 @@ def fill_gaps_efficiently(
   - Interior gaps are often surrounded by generated content, so many
     1x2/2x1 configurations won't be valid due to short-side constraints.
 
+  Gaps must be within the grid bounds. Among gaps with the same number of
+  generated neighbors, the first in row-major order is filled first.
+
   Returns list of (quadrants, description) tuples.
   """
   result = []
-  gap_set = set(gaps)
+  # Works on flat indices into the grid's cells, like bridge_remaining_empty.
+  # Flat index order is row-major.
+  cells, stride = grid._flat, grid._stride
+  gap_set = {grid._flat_index(p) for p in gaps}
 
-  while gap_set:
-    found = False
-
-    # Sort gaps by how many generated neighbors they have (prioritize well-connected gaps)
-    sorted_gaps = sorted(gap_set, key=lambda p: -grid.count_generated_neighbors(p))
-
-    for p in sorted_gaps:
-      if p not in gap_set:
-        continue
-
-      # Try 1x2 horizontal (use proper validation with short-side constraint)
-      right = Point(p.x + 1, p.y)
-      if right in gap_set and can_generate_1x2_horizontal(grid, p):
-        result.append(([p, right], f"1x2 at {p}"))
-        grid.mark_multiple_generated([p, right])
-        gap_set -= {p, right}
-        found = True
-        break
+  def count_generated_neighbors(i: int) -> int:
+    return (
+      (cells[i - 1] == _GENERATED_CODE)
+      + (cells[i + 1] == _GENERATED_CODE)
+      + (cells[i - stride] == _GENERATED_CODE)
+      + (cells[i + stride] == _GENERATED_CODE)
+    )
 
-      # Try 2x1 vertical (use proper validation with short-side constraint)
-      bottom = Point(p.x, p.y + 1)
-      if bottom in gap_set and can_generate_2x1_vertical(grid, p):
-        result.append(([p, bottom], f"2x1 at {p}"))
-        grid.mark_multiple_generated([p, bottom])
-        gap_set -= {p, bottom}
-        found = True
-        break
+  # Gaps are tried by how many generated neighbors they have (prioritize
+  # well-connected gaps), then row-major. A gap with a generated neighbor can
+  # always be filled (as a single at worst), and neighbor counts only change
+  # around placed tiles, so rather than re-sorting every gap after each
+  # placement, keep a heap of (-count, index) entries and push a fresh entry
+  # when a count changes.
+  heap = [
+    (-count, i) for i in gap_set if (count := count_generated_neighbors(i)) > 0
+  ]
+  heapq.heapify(heap)
 
-      # Single quadrant as last resort
-      if grid.has_generated_neighbor(p):
-        result.append(([p], f"single at {p}"))
-        grid.mark_generated(p)
-        gap_set.discard(p)
-        found = True
+  while gap_set:
+    i = None
+    while heap:
+      neg_count, candidate = heapq.heappop(heap)
+      # Skip filled gaps and entries superseded by a higher count
+      if candidate in gap_set and -neg_count == count_generated_neighbors(candidate):
+        i = candidate
         break
 
-    if not found:
+    if i is None:
       # Stuck - remaining gaps are unreachable
       print(f"Warning: {len(gap_set)} interior gaps unreachable")
       break
 
+    # Try 1x2 horizontal (use proper validation with short-side constraint)
+    if i + 1 in gap_set and _can_generate_1x2_at(cells, i, stride):
+      tile, label = [i, i + 1], "1x2"
+    # Try 2x1 vertical (use proper validation with short-side constraint)
+    elif i + stride in gap_set and _can_generate_2x1_at(cells, i, stride):
+      tile, label = [i, i + stride], "2x1"
+    # Single quadrant as last resort
+    else:
+      tile, label = [i], "single"
+
+    quadrants = [grid._point_at(j) for j in tile]
+    result.append((quadrants, f"{label} at {quadrants[0]}"))
+    for j in tile:
+      cells[j] = _GENERATED_CODE
+    gap_set.difference_update(tile)
+
+    # Re-prioritize the gaps whose neighbor counts just went up
+    for j in tile:
+      for n in (j - 1, j + 1, j - stride, j + stride):
+        if n in gap_set:
+          heapq.heappush(heap, (-count_generated_neighbors(n), n))
+
   return result
 
 
+# =============================================================================
+# Parallel Plan Execution
+# =============================================================================
+
+# A step's template holds its own quadrants plus context from the quadrants
+# around them (the template is a 2x2 tile, so never further than this away)
+CONTEXT_RADIUS = 1
+
+DEFAULT_PLAN_WORKERS = 4
+DEFAULT_STEP_RETRIES = 1
+
+
+def build_step_dependencies(steps: list[GenerationStep]) -> dict[int, set[int]]:
+  """
+  Map each step number to the earlier steps it has to wait for.
+
+  A step depends on every earlier step that generates one of its quadrants
+  or a quadrant within CONTEXT_RADIUS of them, since those are what its
+  template (and seam validation) reads. Running steps in any order that
+  respects these dependencies gives each step the same context it would
+  have had running the plan in order.
+
+  Args:
+    steps: Plan steps, in plan order
+
+  Returns:
+    Dict of step_number -> set of step_numbers it depends on
+  """
+  order = {step.step_number: i for i, step in enumerate(steps)}
+  owners: dict[Point, int] = {}
+  for step in steps:
+    for q in step.quadrants:
+      owners.setdefault(q, step.step_number)
+
+  offsets = range(-CONTEXT_RADIUS, CONTEXT_RADIUS + 1)
+  dependencies: dict[int, set[int]] = {}
+  for step in steps:
+    index = order[step.step_number]
+    deps = set()
+    for q in step.quadrants:
+      for dy in offsets:
+        for dx in offsets:
+          owner = owners.get(Point(q.x + dx, q.y + dy))
+          if owner is not None and order[owner] < index:
+            deps.add(owner)
+    dependencies[step.step_number] = deps
+  return dependencies
+
+
+def _run_step_safely(
+  run_step: Callable[[GenerationStep], dict], step: GenerationStep
+) -> dict:
+  """Run a step, turning an exception into a failed result."""
+  try:
+    return run_step(step)
+  except Exception as e:
+    return {"success": False, "error": str(e)}
+
+
+def run_steps_concurrently(
+  steps: list[GenerationStep],
+  run_step: Callable[[GenerationStep], dict],
+  max_workers: int = DEFAULT_PLAN_WORKERS,
+  max_retries: int = DEFAULT_STEP_RETRIES,
+  on_result: Callable[[GenerationStep, dict], None] | None = None,
+) -> dict[str, list[int]]:
+  """
+  Run plan steps on a thread pool, each once its dependencies have finished.
+
+  Ready steps are started in plan order. A failed step is retried up to
+  max_retries times; if it still fails, the steps that depend on it
+  (directly or transitively) are skipped, and everything else carries on.
+
+  Args:
+    steps: Steps to run, in plan order
+    run_step: Runs one step and returns a dict with "success" and
+      "message"/"error" (exceptions count as failures)
+    max_workers: Maximum number of steps running at once
+    max_retries: Extra attempts for a failed step before giving up on it
+    on_result: Called on this thread with each step's final result
+
+  Returns:
+    Dict of "generated", "error" and "skipped" step numbers
+  """
+  dependencies = build_step_dependencies(steps)
+  dependents: dict[int, list[int]] = {n: [] for n in dependencies}
+  for n, deps in dependencies.items():
+    for dep in deps:
+      dependents[dep].append(n)
+
+  order = {step.step_number: i for i, step in enumerate(steps)}
+  by_number = {step.step_number: step for step in steps}
+  waiting = {n: len(deps) for n, deps in dependencies.items()}
+  ready = [(order[n], n) for n, count in waiting.items() if count == 0]
+  heapq.heapify(ready)
+  attempts: dict[int, int] = {}
+  outcome: dict[str, list[int]] = {"generated": [], "error": [], "skipped": []}
+
+  with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    running: dict[Future, int] = {}
+    while ready or running:
+      while ready and len(running) < max_workers:
+        _, n = heapq.heappop(ready)
+        attempts[n] = attempts.get(n, 0) + 1
+        print(f"\n▶️ Step {n}: {by_number[n].description}")
+        future = executor.submit(_run_step_safely, run_step, by_number[n])
+        running[future] = n
+
+      done, _ = wait(running, return_when=FIRST_COMPLETED)
+      for future in done:
+        n = running.pop(future)
+        result = future.result()
+        if result.get("success"):
+          outcome["generated"].append(n)
+          for dependent in dependents[n]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+              heapq.heappush(ready, (order[dependent], dependent))
+        elif attempts[n] <= max_retries:
+          print(f"🔁 Step {n} failed ({result.get('error')}), retrying...")
+          heapq.heappush(ready, (order[n], n))
+          continue
+        else:
+          outcome["error"].append(n)
+          skipped = set(outcome["skipped"])
+          stack = list(dependents[n])
+          while stack:
+            dependent = stack.pop()
+            if dependent not in skipped:
+              skipped.add(dependent)
+              outcome["skipped"].append(dependent)
+              stack.extend(dependents[dependent])
+
+        if on_result is not None:
+          on_result(by_number[n], result)
+
+  outcome["skipped"].sort(key=order.__getitem__)
+  return outcome
+
+
 # =============================================================================
 # Main Script
 # =============================================================================
@@ -1288,19 +1628,26 @@ def execute_plan(
   bucket: str,
   no_start_server: bool,
   max_steps: int | None = None,
+  max_workers: int = DEFAULT_PLAN_WORKERS,
+  max_retries: int = DEFAULT_STEP_RETRIES,
 ) -> int:
   """
   Execute a generation plan, updating status as we go.
 
-  Stops on first error.
+  Independent steps run concurrently (see run_steps_concurrently), each on
+  its own pooled DB connection. A step that still fails after its retries
+  is marked as an error and the steps that need it as context are left
+  pending, while unrelated steps keep running.
 
-  Returns exit code (0 for success, 1 for error).
+  Returns exit code (0 for success, 1 if any step failed).
   """
   # Import here to avoid circular imports
+  from isometric_hanford.generation.db_pool import SQLiteConnectionPool
   from isometric_hanford.generation.shared import (
     WEB_RENDER_DIR,
     get_generation_config,
     start_web_server,
+    thread_pooled_page,
   )
 
   # Get pending steps
@@ -1315,69 +1662,80 @@ def execute_plan(
     pending_steps = pending_steps[:max_steps]
 
   print("\n🚀 Executing generation plan...")
-  print(f"   {len(pending_steps)} steps to execute")
+  print(f"   {len(pending_steps)} steps to execute with up to {max_workers} workers")
 
   web_server = None
   generation_dir = Path(plan.generation_dir)
+  pool = SQLiteConnectionPool(generation_dir / "quadrants.db")
 
-  try:
-    if not no_start_server:
-      web_server = start_web_server(WEB_RENDER_DIR, port)
-
-    config = get_generation_config(conn)
-
-    for step in pending_steps:
-      print(f"\n{'=' * 60}")
-      print(f"Step {step.step_number}/{len(plan.steps)}: {step.description}")
-      print("=" * 60)
-
-      # Convert Points to tuples for the generation API
-      quadrant_tuples = [(q.x, q.y) for q in step.quadrants]
-
-      try:
-        result = run_generation_step(
-          conn,
+  def run_step(step: GenerationStep) -> dict:
+    # Convert Points to tuples for the generation API
+    quadrant_tuples = [(q.x, q.y) for q in step.quadrants]
+    step_conn = pool.connect()
+    try:
+      # The step's renders share one browser, closed when the step finishes
+      with thread_pooled_page():
+        return run_generation_step(
+          step_conn,
           config,
           quadrant_tuples,
           generation_dir,
           port,
           bucket,
         )
-        if result.get("success"):
-          print(f"✅ Step {step.step_number} complete: {result.get('message')}")
-          plan.update_step_status(step.step_number, StepStatus.GENERATED)
-          plan.save(plan_path)
-        else:
-          error_msg = result.get("error", "Unknown error")
-          print(f"❌ Step {step.step_number} failed: {error_msg}")
-          plan.update_step_status(step.step_number, StepStatus.ERROR, error_msg)
-          plan.save(plan_path)
-          print("\n⛔ Stopping execution due to error.")
-          return 1
-      except Exception as e:
-        error_msg = str(e)
-        print(f"❌ Step {step.step_number} failed: {error_msg}")
-        plan.update_step_status(step.step_number, StepStatus.ERROR, error_msg)
-        plan.save(plan_path)
-        print("\n⛔ Stopping execution due to error.")
-        return 1
+    finally:
+      step_conn.close()
+
+  def record_result(step: GenerationStep, result: dict) -> None:
+    if result.get("success"):
+      print(f"✅ Step {step.step_number} complete: {result.get('message')}")
+      plan.update_step_status(step.step_number, StepStatus.GENERATED)
+    else:
+      error_msg = result.get("error", "Unknown error")
+      print(f"❌ Step {step.step_number} failed: {error_msg}")
+      plan.update_step_status(step.step_number, StepStatus.ERROR, error_msg)
+    plan.save(plan_path)
+
+  try:
+    if not no_start_server:
+      web_server = start_web_server(WEB_RENDER_DIR, port)
+
+    config = get_generation_config(conn)
+
+    outcome = run_steps_concurrently(
+      pending_steps,
+      run_step,
+      max_workers=max_workers,
+      max_retries=max_retries,
+      on_result=record_result,
+    )
 
   finally:
+    pool.close()
     if web_server:
       print("\n🛑 Stopping web server...")
       web_server.terminate()
       web_server.wait()
 
+  if outcome["skipped"]:
+    print(
+      f"\n⏭️ Skipped {len(outcome['skipped'])} step(s) that depend on failed steps "
+      f"{outcome['error']}"
+    )
+
   # Print summary
   summary = plan.get_summary()
   print(f"\n{'=' * 60}")
-  print("✅ Plan execution complete!")
+  if outcome["error"]:
+    print("⛔ Plan execution finished with errors")
+  else:
+    print("✅ Plan execution complete!")
   print(
     f"   Generated: {summary['generated']}, Pending: {summary['pending']}, Errors: {summary['error']}"
   )
   print("=" * 60)
 
-  return 0
+  return 1 if outcome["error"] else 0
 
 
 def main():
@@ -1434,6 +1792,18 @@ def main():
     default=None,
     help="Maximum number of steps to execute",
   )
+  exec_group.add_argument(
+    "--workers",
+    type=int,
+    default=DEFAULT_PLAN_WORKERS,
+    help=f"Steps to run concurrently (default: {DEFAULT_PLAN_WORKERS})",
+  )
+  exec_group.add_argument(
+    "--max-retries",
+    type=int,
+    default=DEFAULT_STEP_RETRIES,
+    help=f"Retries for a failed step (default: {DEFAULT_STEP_RETRIES})",
+  )
   exec_group.add_argument(
     "--bucket",
     default="isometric-nyc-infills",
@@ -1478,6 +1848,8 @@ def main():
         args.bucket,
         args.no_start_server,
         args.max_steps,
+        args.workers,
+        args.max_retries,
       )
 
     # Mode 2: Create new plan
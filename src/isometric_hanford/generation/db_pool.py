@@ -0,0 +1,175 @@
+"""
+Thread-safe SQLite connection pool for the generation app.
+
+Flask request threads read tiles while model worker threads write
+generations. With SQLite's default rollback journal, readers and writers
+block each other and requests fail with `database is locked`. Pooled
+connections are opened with WAL journaling (readers never block on the
+writer), a busy timeout (writers wait instead of failing), and larger
+page-cache/mmap settings for tile reads.
+
+Connections are handed out with `pool.connect()` and returned by calling
+`conn.close()`, so code written against plain `sqlite3.connect()` works
+unchanged.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+# Milliseconds a connection waits for a lock before raising "database is locked"
+DEFAULT_BUSY_TIMEOUT_MS = 30_000
+
+# Idle connections kept open for reuse (more can be open while in use)
+DEFAULT_MAX_IDLE_CONNECTIONS = 8
+
+# Per-connection pragmas applied when a pooled connection is opened
+DEFAULT_PRAGMAS: dict[str, Any] = {
+  # Readers don't block on the writer (and vice versa)
+  "journal_mode": "WAL",
+  # Safe with WAL: the DB can't be corrupted, a crash only loses the last commits
+  "synchronous": "NORMAL",
+  # Memory-map up to 256 MB of the DB for tile reads
+  "mmap_size": 256 * 1024 * 1024,
+  # 64 MB page cache (negative values are KiB)
+  "cache_size": -64 * 1024,
+  "temp_store": "MEMORY",
+}
+
+
+class PooledConnection(sqlite3.Connection):
+  """
+  A sqlite3 connection whose close() returns it to its pool.
+
+  The connection may move between threads (check_same_thread=False), but
+  must only be used by one thread at a time.
+  """
+
+  _pool: "SQLiteConnectionPool | None" = None
+  _checked_out = False
+
+  def close(self) -> None:
+    if self._pool is None:
+      super().close()
+    elif self._checked_out:
+      self._checked_out = False
+      self._pool._release(self)
+    # Otherwise already returned - closing twice is a no-op
+
+  def close_underlying(self) -> None:
+    """Really close the connection instead of returning it to the pool."""
+    self._pool = None
+    self._checked_out = False
+    super().close()
+
+
+class SQLiteConnectionPool:
+  """
+  Pool of WAL-mode connections to a single SQLite database.
+
+  Idle connections are reused most-recently-used first. The number of open
+  connections isn't capped (SQLite allows any number of readers), but at
+  most `max_idle` are kept open once returned.
+
+  Args:
+    db_path: Path to the SQLite database
+    max_idle: Number of idle connections to keep open
+    busy_timeout_ms: How long a connection waits on a lock before failing
+    pragmas: Pragmas to run on each new connection (default DEFAULT_PRAGMAS)
+  """
+
+  def __init__(
+    self,
+    db_path: Path,
+    max_idle: int = DEFAULT_MAX_IDLE_CONNECTIONS,
+    busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+    pragmas: dict[str, Any] | None = None,
+  ):
+    self.db_path = Path(db_path)
+    self.max_idle = max_idle
+    self.busy_timeout_ms = busy_timeout_ms
+    self.pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+    self._lock = threading.Lock()
+    self._idle: list[PooledConnection] = []
+    self._closed = False
+
+    self.created = 0
+    self.reused = 0
+    self.in_use = 0
+
+  def _open(self) -> PooledConnection:
+    """Open and configure a new connection."""
+    conn = sqlite3.connect(
+      self.db_path,
+      timeout=self.busy_timeout_ms / 1000,
+      check_same_thread=False,
+      factory=PooledConnection,
+    )
+    conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+    for name, value in self.pragmas.items():
+      conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+  def connect(self) -> PooledConnection:
+    """Get a connection from the pool. Call conn.close() to return it."""
+    with self._lock:
+      if self._closed:
+        raise RuntimeError(f"Connection pool for {self.db_path} is closed")
+      conn = self._idle.pop() if self._idle else None
+      if conn is not None:
+        self.reused += 1
+      self.in_use += 1
+
+    if conn is None:
+      try:
+        conn = self._open()
+      except Exception:
+        with self._lock:
+          self.in_use -= 1
+        raise
+      with self._lock:
+        self.created += 1
+
+    conn._pool = self
+    conn._checked_out = True
+    return conn
+
+  def _release(self, conn: PooledConnection) -> None:
+    """Return a connection to the pool (called by PooledConnection.close)."""
+    try:
+      # Don't leak a half-finished transaction or row factory to the next user
+      if conn.in_transaction:
+        conn.rollback()
+      conn.row_factory = None
+    except sqlite3.Error:
+      conn.close_underlying()
+      with self._lock:
+        self.in_use -= 1
+      return
+
+    with self._lock:
+      self.in_use -= 1
+      if not self._closed and len(self._idle) < self.max_idle:
+        self._idle.append(conn)
+        return
+    conn.close_underlying()
+
+  def close(self) -> None:
+    """Close all idle connections. Connections in use are closed on release."""
+    with self._lock:
+      self._closed = True
+      idle, self._idle = self._idle, []
+    for conn in idle:
+      conn.close_underlying()
+
+  def get_stats(self) -> dict[str, Any]:
+    """Get connection counts for status reporting."""
+    with self._lock:
+      return {
+        "db_path": str(self.db_path),
+        "created": self.created,
+        "reused": self.reused,
+        "in_use": self.in_use,
+        "idle": len(self._idle),
+      }
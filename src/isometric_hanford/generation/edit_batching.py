@@ -0,0 +1,232 @@
+"""
+Micro-batching for the image edit inference server (inference/server.py).
+
+One diffusion call over N templates costs much less GPU time than N calls
+of one template each, but the app sends one template per request. The
+EditBatcher queues incoming edits and runs them through the pipeline
+together: while one batch is on the GPU, requests that arrive queue up and
+become the next batch, and an idle server waits up to max_wait_ms for
+company before running a lone request.
+
+Only edits that can share a pipeline call are batched together - the same
+image size, steps and CFG settings, and either all or none with a negative
+prompt (see EditJob.batch_key). Each edit keeps its own prompt and seed.
+
+Nothing here imports torch, diffusers or modal, so the batching can be run
+on CPU with a stub pipeline in place of QwenImageEditPipeline.
+"""
+
+import asyncio
+import random
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from PIL import Image
+
+# Most edits run in one pipeline call (bounded by GPU memory)
+DEFAULT_MAX_BATCH_SIZE = 4
+
+# How long a request waits for others to batch with when the GPU is idle
+DEFAULT_MAX_WAIT_MS = 50
+
+
+@dataclass
+class EditJob:
+  """One image edit request."""
+
+  image: Image.Image
+  prompt: str
+  negative_prompt: str | None = None
+  true_cfg_scale: float = 2.0
+  steps: int = 14
+  guidance_scale: float = 3.0
+  seed: int | None = None
+
+  def batch_key(self) -> tuple:
+    """Jobs with equal keys can run in the same pipeline call."""
+    return (
+      self.image.size,
+      self.steps,
+      self.true_cfg_scale,
+      self.guidance_scale,
+      self.negative_prompt is not None,
+    )
+
+
+def run_pipeline_batch(
+  pipe: Callable[..., Any],
+  jobs: list[EditJob],
+  make_generator: Callable[[int], Any] = lambda seed: seed,
+) -> list[Image.Image]:
+  """
+  Run compatible edit jobs through an image edit pipeline in one call.
+
+  A single job is passed exactly as before batching (scalar prompt and
+  image); several jobs are passed as lists of prompts, images and
+  generators, which QwenImageEditPipeline treats as a batch.
+
+  Args:
+    pipe: The pipeline (called like QwenImageEditPipeline; returns an object
+      with an `images` list)
+    jobs: Jobs sharing one batch_key()
+    make_generator: Builds a job's random generator from its seed (e.g. a
+      seeded torch.Generator); jobs without a seed get a random one
+
+  Returns:
+    The output images, in job order
+
+  Raises:
+    ValueError: If the jobs can't share a call, or the pipeline returns the
+      wrong number of images
+  """
+  if len({job.batch_key() for job in jobs}) != 1:
+    raise ValueError("Jobs in a pipeline batch must share one batch key")
+
+  first = jobs[0]
+  seeds = [
+    job.seed if job.seed is not None else random.randint(0, 2**32 - 1) for job in jobs
+  ]
+
+  def per_job(values: list) -> Any:
+    return values[0] if len(jobs) == 1 else values
+
+  output = pipe(
+    prompt=per_job([job.prompt for job in jobs]),
+    negative_prompt=(
+      per_job([job.negative_prompt for job in jobs])
+      if first.negative_prompt is not None
+      else None
+    ),
+    true_cfg_scale=first.true_cfg_scale,
+    image=per_job([job.image for job in jobs]),
+    num_inference_steps=first.steps,
+    guidance_scale=first.guidance_scale,
+    generator=per_job([make_generator(seed) for seed in seeds]),
+  )
+
+  images = list(output.images)
+  if len(images) != len(jobs):
+    raise ValueError(f"Pipeline returned {len(images)} image(s) for {len(jobs)} job(s)")
+  return images
+
+
+class EditBatcher:
+  """
+  Collects concurrent edit requests into pipeline batches.
+
+  Requests are submitted from the server's event loop; batches run one at a
+  time on a dedicated thread, so the loop keeps accepting requests while
+  the GPU is busy.
+  """
+
+  def __init__(
+    self,
+    run_batch: Callable[[list[EditJob]], list[Image.Image]],
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+  ):
+    """
+    Args:
+      run_batch: Runs a list of compatible jobs (e.g. run_pipeline_batch
+        bound to the pipeline) and returns their images in order
+      max_batch_size: Most jobs per run_batch call
+      max_wait_ms: How long an idle batcher waits for a batch to fill
+    """
+    self.run_batch = run_batch
+    self.max_batch_size = max(1, max_batch_size)
+    self.max_wait = max(0.0, max_wait_ms) / 1000
+    # How many batches of each size have run
+    self.batch_size_counts: Counter[int] = Counter()
+    self._pending: deque[tuple[EditJob, asyncio.Future]] = deque()
+    self._arrived = asyncio.Event()
+    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="edit-batch")
+    self._worker: asyncio.Task | None = None
+
+  async def submit(self, job: EditJob) -> Image.Image:
+    """Queue one edit and wait for its output image."""
+    [image] = await self.submit_many([job])
+    return image
+
+  async def submit_many(self, jobs: list[EditJob]) -> list[Image.Image]:
+    """Queue several edits at once and wait for all of their output images."""
+    loop = asyncio.get_running_loop()
+    if self._worker is None or self._worker.done():
+      self._worker = loop.create_task(self._run())
+
+    futures = []
+    for job in jobs:
+      future = loop.create_future()
+      self._pending.append((job, future))
+      futures.append(future)
+    self._arrived.set()
+    return list(await asyncio.gather(*futures))
+
+  async def close(self) -> None:
+    """Stop the worker (pending requests are cancelled)."""
+    if self._worker is not None:
+      self._worker.cancel()
+      try:
+        await self._worker
+      except asyncio.CancelledError:
+        pass
+    for _, future in self._pending:
+      future.cancel()
+    self._pending.clear()
+    self._executor.shutdown(wait=False)
+
+  def _compatible_count(self) -> int:
+    key = self._pending[0][0].batch_key()
+    return sum(1 for job, _ in self._pending if job.batch_key() == key)
+
+  def _take_batch(self) -> list[tuple[EditJob, asyncio.Future]]:
+    """Remove the oldest job and up to max_batch_size - 1 compatible ones."""
+    key = self._pending[0][0].batch_key()
+    batch, rest = [], deque()
+    for entry in self._pending:
+      if len(batch) < self.max_batch_size and entry[0].batch_key() == key:
+        batch.append(entry)
+      else:
+        rest.append(entry)
+    self._pending = rest
+    return batch
+
+  async def _run(self) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+      while not self._pending:
+        self._arrived.clear()
+        await self._arrived.wait()
+
+      # Give concurrent requests a moment to join the oldest one
+      deadline = loop.time() + self.max_wait
+      while self._compatible_count() < self.max_batch_size:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+          break
+        self._arrived.clear()
+        try:
+          await asyncio.wait_for(self._arrived.wait(), remaining)
+        except asyncio.TimeoutError:
+          break
+
+      batch = self._take_batch()
+      self.batch_size_counts[len(batch)] += 1
+      try:
+        images = await loop.run_in_executor(
+          self._executor, self.run_batch, [job for job, _ in batch]
+        )
+        if len(images) != len(batch):
+          raise ValueError(
+            f"run_batch returned {len(images)} image(s) for {len(batch)} job(s)"
+          )
+      except Exception as e:
+        for _, future in batch:
+          if not future.done():
+            future.set_exception(e)
+        continue
+
+      for (_, future), image in zip(batch, images):
+        if not future.done():
+          future.set_result(image)
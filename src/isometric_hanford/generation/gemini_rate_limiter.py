@@ -0,0 +1,444 @@
+"""
+Cross-process token-bucket rate limiting for Gemini API calls.
+
+The Gemini generators (nano banana, and the snow, dark mode, water mask and
+full map layer scripts) each call generate_content as fast as they can. Run
+side by side, they overshoot the project's quota and spend their time on
+429 errors and retries. Instead, every call draws from shared token
+buckets: one of requests, refilled at RPM per minute, and one of tokens,
+refilled at TPM per minute. Each bucket holds at most one minute's budget.
+
+Bucket state lives in a SQLite database, so every script and process on
+the machine draws from the same budget. Quotas are per model, so each model
+has its own buckets.
+
+When a call is rate limited anyway (another machine shares the key, or the
+budget is set too high), every caller of that model pauses: for the
+server's suggested retry delay, or a delay that doubles with each
+consecutive 429 and halves again as calls succeed.
+
+Budgets come from GEMINI_RPM and GEMINI_TPM; both default to 0, which
+turns the budget off but keeps the shared pause after a 429. The
+database defaults to `.gemini_rate_limit/buckets.db` in the repo root and
+can be overridden with the GEMINI_RATE_LIMIT_PATH environment variable.
+"""
+
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from PIL import Image
+
+T = TypeVar("T")
+
+DEFAULT_GEMINI_RATE_LIMIT_PATH = (
+  Path(__file__).parent.parent.parent.parent / ".gemini_rate_limit" / "buckets.db"
+)
+
+# Requests per minute (0 = no request budget; 429s still pause callers).
+# Image generation preview models allow ~10-20 per project.
+DEFAULT_RPM = 0
+
+# Tokens per minute (0 = no token budget)
+DEFAULT_TPM = 0
+
+# Pause after a 429, doubling per consecutive 429 up to the maximum
+INITIAL_BACKOFF_SECONDS = 2.0
+MAX_BACKOFF_SECONDS = 120.0
+
+# Attempts per call before a 429 is raised to the caller
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Slack for float error in refilled buckets, so a bucket a hair short of
+# a full request doesn't ask for a near-zero wait forever
+BUDGET_EPSILON = 1e-9
+
+# Token costs of images: small images cost one tile, larger ones are split
+# into 768x768 tiles, and a generated image costs a fixed amount
+IMAGE_TILE_TOKENS = 258
+SMALL_IMAGE_MAX_SIZE = 384
+IMAGE_TILE_SIZE = 768
+OUTPUT_IMAGE_TOKENS = 1290
+
+
+def estimate_tokens(
+  images: list[Image.Image], prompt: str = "", output_images: int = 1
+) -> int:
+  """
+  Estimate the tokens a generate_content call will use.
+
+  Args:
+    images: The input images
+    prompt: The prompt text (about 4 characters per token)
+    output_images: Images the response is expected to contain
+
+  Returns:
+    The estimated total (input and output) token count
+  """
+  total = len(prompt) // 4 + output_images * OUTPUT_IMAGE_TOKENS
+  for image in images:
+    width, height = image.size
+    if width <= SMALL_IMAGE_MAX_SIZE and height <= SMALL_IMAGE_MAX_SIZE:
+      total += IMAGE_TILE_TOKENS
+    else:
+      tiles = math.ceil(width / IMAGE_TILE_SIZE) * math.ceil(height / IMAGE_TILE_SIZE)
+      total += tiles * IMAGE_TILE_TOKENS
+  return total
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+  """Check if an exception is a Gemini 429 / RESOURCE_EXHAUSTED error."""
+  return getattr(error, "code", None) == 429 or (
+    getattr(error, "status", None) == "RESOURCE_EXHAUSTED"
+  )
+
+
+def retry_delay_from_error(error: BaseException) -> float | None:
+  """The retry delay a 429 error suggests (google.rpc.RetryInfo), if any."""
+  details = getattr(error, "details", None)
+  if not isinstance(details, dict):
+    return None
+  for detail in details.get("error", {}).get("details", []):
+    if isinstance(detail, dict) and "retryDelay" in detail:
+      match = re.fullmatch(r"([\d.]+)s", str(detail["retryDelay"]))
+      if match:
+        return float(match.group(1))
+  return None
+
+
+class GeminiRateLimiter:
+  """
+  SQLite-backed request and token buckets, one pair per model.
+
+  Each call opens its own connection and updates the buckets in an
+  immediate transaction, so one limiter may be used from any number of
+  threads, and any number of processes may share a database.
+  """
+
+  def __init__(
+    self,
+    path: Path = DEFAULT_GEMINI_RATE_LIMIT_PATH,
+    rpm: float = DEFAULT_RPM,
+    tpm: float = DEFAULT_TPM,
+    initial_backoff_seconds: float = INITIAL_BACKOFF_SECONDS,
+    max_backoff_seconds: float = MAX_BACKOFF_SECONDS,
+    clock: Callable[[], float] = time.time,
+    sleep: Callable[[float], None] = time.sleep,
+  ):
+    """
+    Args:
+      path: SQLite database holding the bucket state
+      rpm: Requests per minute (0 for no request budget)
+      tpm: Tokens per minute (0 for no token budget)
+      initial_backoff_seconds: Pause after a first 429
+      max_backoff_seconds: Longest pause after consecutive 429s
+      clock: Wall-clock time source (shared between processes)
+      sleep: Sleeps while waiting for budget
+    """
+    self.path = Path(path)
+    self.rpm = max(0.0, rpm)
+    self.tpm = max(0.0, tpm)
+    self.initial_backoff_seconds = initial_backoff_seconds
+    self.max_backoff_seconds = max_backoff_seconds
+    self._clock = clock
+    self._sleep = sleep
+    self._lock = threading.Lock()
+    self._initialized = False
+
+  def _connect(self) -> sqlite3.Connection:
+    with self._lock:
+      if not self._initialized:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+      # Autocommit mode: transactions are opened explicitly
+      conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+      if not self._initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+          """
+          CREATE TABLE IF NOT EXISTS buckets (
+            model TEXT PRIMARY KEY,
+            requests REAL NOT NULL,
+            tokens REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            backoff_seconds REAL NOT NULL,
+            paused_until REAL NOT NULL
+          )
+          """
+        )
+        self._initialized = True
+      return conn
+
+  def _update(self, model: str, change: Callable[[dict, float], Any]) -> Any:
+    """
+    Refill a model's buckets, apply `change(state, now)` to them, and save.
+
+    Runs in an immediate transaction, so no other process can read the
+    buckets between the read and the write.
+    """
+    with closing(self._connect()) as conn:
+      conn.execute("BEGIN IMMEDIATE")
+      try:
+        now = self._clock()
+        row = conn.execute(
+          """
+          SELECT requests, tokens, updated_at, backoff_seconds, paused_until
+          FROM buckets WHERE model = ?
+          """,
+          (model,),
+        ).fetchone()
+        if row is None:
+          state = {
+            "requests": self.rpm,
+            "tokens": self.tpm,
+            "backoff_seconds": 0.0,
+            "paused_until": 0.0,
+          }
+        else:
+          # Buckets don't refill while paused after a 429
+          elapsed = max(0.0, now - max(row[2], row[4]))
+          state = {
+            "requests": min(self.rpm, row[0] + elapsed * self.rpm / 60),
+            "tokens": min(self.tpm, row[1] + elapsed * self.tpm / 60),
+            "backoff_seconds": row[3],
+            "paused_until": row[4],
+          }
+
+        result = change(state, now)
+
+        conn.execute(
+          """
+          INSERT OR REPLACE INTO buckets
+            (model, requests, tokens, updated_at, backoff_seconds, paused_until)
+          VALUES (?, ?, ?, ?, ?, ?)
+          """,
+          (
+            model,
+            state["requests"],
+            state["tokens"],
+            now,
+            state["backoff_seconds"],
+            state["paused_until"],
+          ),
+        )
+        conn.execute("COMMIT")
+        return result
+      except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+  def try_acquire(self, model: str, tokens: int = 0) -> float:
+    """
+    Take one request and `tokens` tokens from a model's buckets if they
+    have enough budget.
+
+    Returns:
+      0 if the budget was taken, otherwise how long to wait before trying
+      again
+    """
+
+    def take(state: dict, now: float) -> float:
+      if state["paused_until"] > now:
+        return state["paused_until"] - now
+
+      wait = 0.0
+      if self.rpm and state["requests"] < 1 - BUDGET_EPSILON:
+        wait = (1 - state["requests"]) * 60 / self.rpm
+      if self.tpm:
+        # A call larger than the whole bucket waits for a full bucket
+        needed = min(tokens, self.tpm)
+        if state["tokens"] < needed - BUDGET_EPSILON:
+          wait = max(wait, (needed - state["tokens"]) * 60 / self.tpm)
+      if wait > 0:
+        return wait
+
+      if self.rpm:
+        state["requests"] -= 1
+      if self.tpm:
+        state["tokens"] -= tokens
+      return 0.0
+
+    return self._update(model, take)
+
+  def acquire(self, model: str, tokens: int = 0) -> float:
+    """
+    Wait until a model's buckets have budget for a call, and take it.
+
+    Args:
+      model: The Gemini model name
+      tokens: Estimated tokens for the call (see estimate_tokens)
+
+    Returns:
+      Seconds spent waiting
+    """
+    waited = 0.0
+    while (wait := self.try_acquire(model, tokens)) > 0:
+      self._sleep(wait)
+      waited += wait
+    return waited
+
+  def record_usage(self, model: str, extra_tokens: float) -> None:
+    """
+    Correct the token bucket once a call's actual usage is known.
+
+    Args:
+      model: The Gemini model name
+      extra_tokens: Tokens used beyond the estimate (negative to refund)
+    """
+    if not self.tpm or not extra_tokens:
+      return
+
+    def charge(state: dict, now: float) -> None:
+      state["tokens"] = min(self.tpm, state["tokens"] - extra_tokens)
+
+    self._update(model, charge)
+
+  def report_rate_limited(self, model: str, retry_after: float | None = None) -> float:
+    """
+    Pause every caller of a model after a 429.
+
+    Args:
+      model: The Gemini model name
+      retry_after: The server's suggested retry delay, if it gave one
+
+    Returns:
+      The pause in seconds
+    """
+
+    def back_off(state: dict, now: float) -> float:
+      backoff = min(
+        self.max_backoff_seconds,
+        max(self.initial_backoff_seconds, state["backoff_seconds"] * 2),
+      )
+      state["backoff_seconds"] = backoff
+      delay = max(backoff, retry_after or 0.0)
+      state["paused_until"] = max(state["paused_until"], now + delay)
+      # The quota is spent: when the pause ends (the bucket doesn't refill
+      # during it), exactly one caller goes straight away and the rest are
+      # paced at the request rate rather than bursting
+      state["requests"] = 1.0
+      return delay
+
+    return self._update(model, back_off)
+
+  def report_success(self, model: str) -> None:
+    """Shrink a model's backoff after a successful call."""
+
+    def recover(state: dict, now: float) -> None:
+      backoff = state["backoff_seconds"] / 2
+      state["backoff_seconds"] = (
+        backoff if backoff >= self.initial_backoff_seconds else 0.0
+      )
+
+    self._update(model, recover)
+
+  def get_state(self, model: str) -> dict[str, float]:
+    """Get a model's current (refilled) bucket state."""
+    return self._update(model, lambda state, now: dict(state))
+
+
+# Global limiter, created on first use
+_gemini_rate_limiter: GeminiRateLimiter | None = None
+_gemini_rate_limiter_configured = False
+_gemini_rate_limiter_lock = threading.Lock()
+
+
+def get_gemini_rate_limiter() -> GeminiRateLimiter | None:
+  """
+  Get the global rate limiter, or None if rate limiting is disabled.
+
+  Unless configure_gemini_rate_limiter() has been called, a limiter is
+  created on first use with GEMINI_RPM / GEMINI_TPM budgets, at
+  GEMINI_RATE_LIMIT_PATH (or the default path).
+  """
+  global _gemini_rate_limiter, _gemini_rate_limiter_configured
+
+  with _gemini_rate_limiter_lock:
+    if not _gemini_rate_limiter_configured:
+      path = os.getenv("GEMINI_RATE_LIMIT_PATH")
+      _gemini_rate_limiter = GeminiRateLimiter(
+        Path(path) if path else DEFAULT_GEMINI_RATE_LIMIT_PATH,
+        rpm=float(os.getenv("GEMINI_RPM", DEFAULT_RPM)),
+        tpm=float(os.getenv("GEMINI_TPM", DEFAULT_TPM)),
+      )
+      _gemini_rate_limiter_configured = True
+      limiter = _gemini_rate_limiter
+      if limiter.rpm or limiter.tpm:
+        print(
+          f"⏱️ Gemini rate limit: {limiter.rpm or 'unlimited'} requests/min, "
+          f"{limiter.tpm or 'unlimited'} tokens/min"
+        )
+    return _gemini_rate_limiter
+
+
+def configure_gemini_rate_limiter(
+  path: Path | None = DEFAULT_GEMINI_RATE_LIMIT_PATH, **kwargs: Any
+) -> GeminiRateLimiter | None:
+  """
+  Replace the global rate limiter. Takes the same arguments as
+  GeminiRateLimiter; pass path=None to disable rate limiting.
+  """
+  global _gemini_rate_limiter, _gemini_rate_limiter_configured
+
+  with _gemini_rate_limiter_lock:
+    _gemini_rate_limiter = GeminiRateLimiter(path, **kwargs) if path else None
+    _gemini_rate_limiter_configured = True
+    return _gemini_rate_limiter
+
+
+def call_with_rate_limit(
+  model: str,
+  call: Callable[[], T],
+  tokens: int = 0,
+  max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> T:
+  """
+  Make a Gemini call within the shared rate limit, retrying 429s.
+
+  Args:
+    model: The Gemini model name (each model has its own budget)
+    call: Makes the call, e.g. a lambda around client.models.generate_content
+    tokens: Estimated tokens for the call (see estimate_tokens); corrected
+      from the response's usage_metadata afterwards
+    max_attempts: Attempts before a 429 is raised
+
+  Returns:
+    The call's result
+
+  Raises:
+    Whatever the call raises; 429s only once max_attempts are used up
+  """
+  limiter = get_gemini_rate_limiter()
+  if limiter is None:
+    return call()
+
+  for attempt in range(1, max_attempts + 1):
+    waited = limiter.acquire(model, tokens)
+    if waited >= 1:
+      print(f"      ⏳ Waited {waited:.1f}s for the Gemini rate limit")
+
+    try:
+      result = call()
+    except Exception as e:
+      if not is_rate_limit_error(e) or attempt == max_attempts:
+        raise
+      delay = limiter.report_rate_limited(model, retry_delay_from_error(e))
+      print(
+        f"      ⚠️ Gemini rate limited (attempt {attempt}/{max_attempts}), "
+        f"pausing {delay:.0f}s"
+      )
+      continue
+
+    limiter.report_success(model)
+    usage = getattr(result, "usage_metadata", None)
+    used = getattr(usage, "total_token_count", None)
+    if isinstance(used, int):
+      limiter.record_usage(model, used - tokens)
+    return result
+
+  raise AssertionError("unreachable")
@@ -0,0 +1,274 @@
+"""
+Persistent, cross-process cache of Gemini Files API uploads.
+
+The Gemini generators upload their images with client.files.upload before
+every generate_content call, and keep uploading the same images: nano
+banana's labeled reference tile on every generation, and the same pixel art
+whenever the snow, dark mode, water mask and full map layer scripts (or
+reruns and retries) process the same quadrants. Uploaded files stay
+available for 48 hours, so each upload is recorded under the SHA-256 of the
+uploaded PNG bytes with its file name, URI and expiry, and later uploads of
+the same bytes reuse the recorded file.
+
+Records live in a SQLite database, so every script and process on the
+machine shares them (concurrent writers are serialized by SQLite). Records
+are scoped to the API key and base URL that made the upload, since files
+belong to the key's project, and are not served within the expiry margin of
+their expiry, so a file can't expire mid-generation.
+
+The database defaults to `.gemini_upload_cache/uploads.db` in the repo root
+and can be overridden with the GEMINI_UPLOAD_CACHE_PATH environment
+variable.
+"""
+
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+from google.genai import types
+from PIL import Image
+
+DEFAULT_GEMINI_UPLOAD_CACHE_PATH = (
+  Path(__file__).parent.parent.parent.parent / ".gemini_upload_cache" / "uploads.db"
+)
+
+# The Files API deletes uploads after 48 hours
+DEFAULT_FILE_TTL_SECONDS = 48 * 60 * 60
+
+# Files expiring sooner than this are uploaded again (a generation, with
+# retries, can take several minutes)
+DEFAULT_EXPIRY_MARGIN_SECONDS = 60 * 60
+
+
+def upload_namespace(api_key: str | None = None, base_url: str | None = None) -> str:
+  """
+  Scope for cached uploads: files are only visible to the project that
+  uploaded them. Defaults to GEMINI_API_KEY and GOOGLE_GEMINI_BASE_URL.
+  """
+  if api_key is None:
+    api_key = os.getenv("GEMINI_API_KEY", "")
+  if base_url is None:
+    base_url = os.getenv("GOOGLE_GEMINI_BASE_URL", "")
+  return hashlib.sha256(f"{base_url}\n{api_key}".encode()).hexdigest()[:16]
+
+
+def image_png_bytes(image: Image.Image | bytes) -> bytes:
+  """PNG bytes of an image (bytes are assumed to be PNG already)."""
+  if isinstance(image, bytes):
+    return image
+  buffer = io.BytesIO()
+  image.save(buffer, format="PNG")
+  return buffer.getvalue()
+
+
+class GeminiUploadCache:
+  """
+  SQLite-backed record of Files API uploads, keyed by content hash.
+
+  Each call opens its own connection, so one cache may be used from any
+  number of threads, and any number of processes may share a database.
+  """
+
+  def __init__(
+    self,
+    path: Path = DEFAULT_GEMINI_UPLOAD_CACHE_PATH,
+    expiry_margin_seconds: float = DEFAULT_EXPIRY_MARGIN_SECONDS,
+  ):
+    self.path = Path(path)
+    self.expiry_margin_seconds = expiry_margin_seconds
+    self._lock = threading.Lock()
+    self._initialized = False
+
+    self.hits = 0
+    self.misses = 0
+
+  def _connect(self) -> sqlite3.Connection:
+    with self._lock:
+      if not self._initialized:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+      conn = sqlite3.connect(self.path, timeout=30)
+      if not self._initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+          """
+          CREATE TABLE IF NOT EXISTS uploads (
+            namespace TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            name TEXT NOT NULL,
+            uri TEXT NOT NULL,
+            mime_type TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (namespace, content_hash)
+          )
+          """
+        )
+        conn.commit()
+        self._initialized = True
+      return conn
+
+  def get(self, content_hash: str, namespace: str | None = None) -> types.File | None:
+    """Get the recorded upload of some content, unless it's about to expire."""
+    namespace = namespace if namespace is not None else upload_namespace()
+    with closing(self._connect()) as conn:
+      row = conn.execute(
+        """
+        SELECT name, uri, mime_type FROM uploads
+        WHERE namespace = ? AND content_hash = ? AND expires_at > ?
+        """,
+        (namespace, content_hash, time.time() + self.expiry_margin_seconds),
+      ).fetchone()
+    if row is None:
+      return None
+    return types.File(name=row[0], uri=row[1], mime_type=row[2])
+
+  def put(
+    self, content_hash: str, file: types.File, namespace: str | None = None
+  ) -> None:
+    """Record an upload (replacing any earlier one), and drop expired records."""
+    namespace = namespace if namespace is not None else upload_namespace()
+    now = time.time()
+    if file.expiration_time is not None:
+      expires_at = file.expiration_time.timestamp()
+    else:
+      expires_at = now + DEFAULT_FILE_TTL_SECONDS
+
+    with closing(self._connect()) as conn, conn:
+      conn.execute("DELETE FROM uploads WHERE expires_at <= ?", (now,))
+      conn.execute(
+        """
+        INSERT OR REPLACE INTO uploads
+          (namespace, content_hash, name, uri, mime_type, expires_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        (
+          namespace,
+          content_hash,
+          file.name,
+          file.uri,
+          file.mime_type or "image/png",
+          expires_at,
+        ),
+      )
+
+  def upload(
+    self, client: Any, image: Image.Image | bytes, namespace: str | None = None
+  ) -> types.File:
+    """
+    Upload an image with client.files.upload, unless the same PNG bytes were
+    already uploaded (by any process) and haven't expired.
+
+    Args:
+      client: A genai.Client (or anything with a compatible `files.upload`)
+      image: The image, or its PNG bytes
+      namespace: Upload scope (defaults to upload_namespace())
+
+    Returns:
+      The uploaded (or previously uploaded) file, usable in `contents`
+    """
+    png_bytes = image_png_bytes(image)
+    content_hash = hashlib.sha256(png_bytes).hexdigest()
+
+    cached = self.get(content_hash, namespace)
+    with self._lock:
+      if cached is not None:
+        self.hits += 1
+      else:
+        self.misses += 1
+    if cached is not None:
+      print(f"      ♻️  Reusing uploaded file {cached.name}")
+      return cached
+
+    file = client.files.upload(
+      file=io.BytesIO(png_bytes), config=types.UploadFileConfig(mime_type="image/png")
+    )
+    self.put(content_hash, file, namespace)
+    return file
+
+  def clear(self) -> None:
+    """Forget every recorded upload."""
+    with closing(self._connect()) as conn, conn:
+      conn.execute("DELETE FROM uploads")
+
+  def get_stats(self) -> dict[str, Any]:
+    """Get cache statistics."""
+    with closing(self._connect()) as conn:
+      entries = conn.execute(
+        "SELECT COUNT(*) FROM uploads WHERE expires_at > ?", (time.time(),)
+      ).fetchone()[0]
+    with self._lock:
+      return {
+        "path": str(self.path),
+        "entries": entries,
+        "hits": self.hits,
+        "misses": self.misses,
+      }
+
+
+# Global cache, created on first use
+_gemini_upload_cache: GeminiUploadCache | None = None
+_gemini_upload_cache_configured = False
+_gemini_upload_cache_lock = threading.Lock()
+
+
+def get_gemini_upload_cache() -> GeminiUploadCache | None:
+  """
+  Get the global upload cache, or None if caching is disabled.
+
+  Unless configure_gemini_upload_cache() has been called, a cache is created
+  at GEMINI_UPLOAD_CACHE_PATH (or the default path) on first use.
+  """
+  global _gemini_upload_cache, _gemini_upload_cache_configured
+
+  with _gemini_upload_cache_lock:
+    if not _gemini_upload_cache_configured:
+      path = os.getenv("GEMINI_UPLOAD_CACHE_PATH")
+      _gemini_upload_cache = GeminiUploadCache(
+        Path(path) if path else DEFAULT_GEMINI_UPLOAD_CACHE_PATH
+      )
+      _gemini_upload_cache_configured = True
+    return _gemini_upload_cache
+
+
+def configure_gemini_upload_cache(
+  path: Path | None = DEFAULT_GEMINI_UPLOAD_CACHE_PATH,
+  expiry_margin_seconds: float = DEFAULT_EXPIRY_MARGIN_SECONDS,
+) -> GeminiUploadCache | None:
+  """Replace the global upload cache. Pass path=None to disable caching."""
+  global _gemini_upload_cache, _gemini_upload_cache_configured
+
+  with _gemini_upload_cache_lock:
+    _gemini_upload_cache = (
+      GeminiUploadCache(path, expiry_margin_seconds) if path else None
+    )
+    _gemini_upload_cache_configured = True
+    return _gemini_upload_cache
+
+
+def upload_image(
+  client: Any, image: Image.Image | bytes, namespace: str | None = None
+) -> types.File:
+  """
+  Upload an image for a generate_content call, through the global cache.
+
+  Args:
+    client: A genai.Client
+    image: The image, or its PNG bytes
+    namespace: Upload scope, for clients not using GEMINI_API_KEY (see
+      upload_namespace)
+
+  Returns:
+    The uploaded (or previously uploaded) file
+  """
+  cache = get_gemini_upload_cache()
+  if cache is not None:
+    return cache.upload(client, image, namespace)
+  return client.files.upload(
+    file=io.BytesIO(image_png_bytes(image)),
+    config=types.UploadFileConfig(mime_type="image/png"),
+  )
@@ -2,21 +2,31 @@
 Generate a full map layer using parallel model endpoints.
 
 This script executes the generation plan created by init_layer.py, using
-multiple model inference endpoints in round-robin fashion.
+multiple model inference endpoints in round-robin fashion. Each model keeps
+up to its `max_concurrency` requests in flight (and starts at most
+`requests_per_minute` of them). Each model calls Gemini with its own API
+key (`api_key_env`), Gemini model (`model`) and, unless `url` is
+"gemini-api", API base URL, so models with separate keys add quota. Models
+sharing a key and Gemini model also share one rate limit (see
+gemini_rate_limiter), so adding them doesn't overshoot the quota.
 
 The generation proceeds in strict step order:
 1. Complete ALL step 1 items (2x2 tiles) before starting step 2
 2. Complete ALL step 2 items (1x2/2x1 strips) before starting step 3
 3. Complete ALL step 3 items (1x1 corners)
 
+Progress is recorded in progress.db as each item finishes. Items left
+in_progress by an interrupted run are put back to pending on startup, so
+rerunning the script resumes where it left off.
+
 Usage:
   uv run python src/isometric_hanford/generation/generate_full_map_layer.py \
     --layer-dir layers/snow
 
-  # Resume from where it left off:
+  # Keep 8 requests in flight per model (unless set in layer_config.json):
   uv run python src/isometric_hanford/generation/generate_full_map_layer.py \
     --layer-dir layers/snow \
-    --resume
+    --max-concurrency 8
 
   # Retry failed items:
   uv run python src/isometric_hanford/generation/generate_full_map_layer.py \
@@ -30,14 +40,25 @@ import argparse
 import json
 import os
 import sqlite3
-import tempfile
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
 
 from dotenv import load_dotenv
 from PIL import Image
 
+from isometric_hanford.generation.db_pool import SQLiteConnectionPool
+from isometric_hanford.generation.gemini_rate_limiter import (
+  call_with_rate_limit,
+  estimate_tokens,
+)
+from isometric_hanford.generation.gemini_upload_cache import (
+  upload_image,
+  upload_namespace,
+)
 from isometric_hanford.generation.shared import (
   get_quadrant_generation,
   get_quadrant_render,
@@ -48,6 +69,16 @@ from isometric_hanford.generation.shared import (
 # Load environment variables
 load_dotenv()
 
+# Default --max-concurrency: in-flight requests for models that don't set
+# max_concurrency in layer_config.json
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Gemini model for endpoints that don't set their own
+DEFAULT_GEMINI_MODEL = "gemini-2.0-flash-exp-image-generation"
+
+# Endpoint url meaning "the default Gemini API base URL"
+GEMINI_API_URL = "gemini-api"
+
 
 @dataclass
 class ModelEndpoint:
@@ -57,11 +88,24 @@ class ModelEndpoint:
   url: str
   api_key_env: str
   prompt: str | None = None
+  max_concurrency: int = 1  # Requests in flight at once
+  requests_per_minute: float | None = None  # Request start rate limit
+  model: str = DEFAULT_GEMINI_MODEL  # Gemini model to call
 
   @property
   def api_key(self) -> str | None:
     return os.getenv(self.api_key_env)
 
+  @property
+  def base_url(self) -> str | None:
+    """Gemini API base URL, or None for the default (GOOGLE_GEMINI_BASE_URL)."""
+    return None if self.url == GEMINI_API_URL else self.url
+
+  @property
+  def min_request_interval(self) -> float:
+    """Seconds between request starts allowed by requests_per_minute."""
+    return 60 / self.requests_per_minute if self.requests_per_minute else 0.0
+
 
 @dataclass
 class GenerationItem:
@@ -209,6 +253,23 @@ def mark_item_error(conn: sqlite3.Connection, item_id: int, error_message: str)
   conn.commit()
 
 
+def reset_in_progress_items(conn: sqlite3.Connection) -> int:
+  """
+  Put items left in_progress by an interrupted run back to pending.
+
+  Returns count of reset items.
+  """
+  cursor = conn.cursor()
+  cursor.execute("""
+        UPDATE generation_plan
+        SET status = 'pending', model_name = NULL, started_at = NULL
+        WHERE status = 'in_progress'
+    """)
+  count = cursor.rowcount
+  conn.commit()
+  return count
+
+
 def reset_error_items(conn: sqlite3.Connection) -> int:
   """Reset all error items to pending. Returns count of reset items."""
   cursor = conn.cursor()
@@ -307,6 +368,7 @@ def split_block(
 def call_gemini_api(
   input_image: Image.Image,
   prompt: str,
+  model: ModelEndpoint | None = None,
 ) -> Image.Image:
   """
   Call the Gemini API to generate a transformed version of the image.
@@ -314,6 +376,8 @@ def call_gemini_api(
   Args:
       input_image: The input image to transform
       prompt: The generation prompt
+      model: The endpoint whose API key, base URL and Gemini model to use
+        (defaults to GEMINI_API_KEY and DEFAULT_GEMINI_MODEL)
 
   Returns:
       Generated PIL Image
@@ -321,39 +385,49 @@ def call_gemini_api(
   from google import genai
   from google.genai import types
 
-  api_key = os.getenv("GEMINI_API_KEY")
+  if model is None:
+    model = ModelEndpoint(
+      name="gemini", url=GEMINI_API_URL, api_key_env="GEMINI_API_KEY"
+    )
+
+  api_key = model.api_key
   if not api_key:
-    raise ValueError("GEMINI_API_KEY not found in environment")
+    raise ValueError(f"{model.api_key_env} not found in environment")
 
-  client = genai.Client(api_key=api_key)
+  http_options = types.HttpOptions(base_url=model.base_url) if model.base_url else None
+  client = genai.Client(api_key=api_key, http_options=http_options)
 
-  # Upload input image
-  with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-    input_path = tmp.name
-    input_image.save(input_path)
+  # Upload input image (reusing any earlier upload of the same image)
+  input_ref = upload_image(
+    client, input_image, upload_namespace(api_key, model.base_url)
+  )
 
-  try:
-    input_ref = client.files.upload(file=input_path)
+  # Quotas are per API key and model: endpoints with their own key get their
+  # own budget, while GEMINI_API_KEY callers share the other scripts' budget
+  rate_limit_key = model.model
+  if model.api_key_env != "GEMINI_API_KEY" or model.base_url:
+    rate_limit_key = f"{model.model} ({model.api_key_env} @ {model.base_url})"
 
-    response = client.models.generate_content(
-      model="gemini-2.0-flash-exp-image-generation",
+  response = call_with_rate_limit(
+    rate_limit_key,
+    lambda: client.models.generate_content(
+      model=model.model,
       contents=[input_ref, prompt],
       config=types.GenerateContentConfig(
         response_modalities=["TEXT", "IMAGE"],
       ),
-    )
-
-    # Extract the generated image
-    for part in response.parts:
-      if part.text is not None:
-        print(f"      Model: {part.text[:100]}...")
-      elif image := part.as_image():
-        return image._pil_image
+    ),
+    tokens=estimate_tokens([input_image], prompt),
+  )
 
-    raise ValueError("No image in Gemini response")
+  # Extract the generated image
+  for part in response.parts:
+    if part.text is not None:
+      print(f"      Model: {part.text[:100]}...")
+    elif image := part.as_image():
+      return image._pil_image
 
-  finally:
-    Path(input_path).unlink(missing_ok=True)
+  raise ValueError("No image in Gemini response")
 
 
 def process_item(
@@ -386,7 +460,7 @@ def process_item(
 
   # Call the model API
   try:
-    generated_image = call_gemini_api(input_image, prompt)
+    generated_image = call_gemini_api(input_image, prompt, model)
   except Exception as e:
     return False, f"API error: {e}"
 
@@ -409,12 +483,106 @@ def process_item(
     qx = item.top_left_x + dx
     qy = item.top_left_y + dy
     output_path = generations_dir / f"{qx}_{qy}.png"
-    quad_img.save(output_path)
+    # Write then rename, so an interrupted run never leaves a truncated PNG
+    tmp_path = output_path.with_suffix(".png.tmp")
+    quad_img.save(tmp_path, format="PNG")
+    os.replace(tmp_path, output_path)
     saved_count += 1
 
   return True, f"Generated {saved_count} quadrant(s)"
 
 
+def dispatch_items(
+  items: list[GenerationItem],
+  models: list[ModelEndpoint],
+  process: Callable[[GenerationItem, ModelEndpoint], tuple[bool, str]],
+  on_start: Callable[[GenerationItem, ModelEndpoint], None] | None = None,
+  on_result: Callable[[GenerationItem, ModelEndpoint, bool, str], None] | None = None,
+) -> int:
+  """
+  Process items concurrently across models.
+
+  Items are handed out in order, round-robin across the models that have
+  capacity: a model runs at most max_concurrency items at once and starts
+  at most one every min_request_interval seconds. process() runs on worker
+  threads; on_start and on_result are called on this thread, so they can
+  share one DB connection.
+
+  Args:
+    items: Items to process, in order
+    models: Model endpoints to spread the items across
+    process: Processes one item with a model, returning (success, message)
+      (exceptions count as failures)
+    on_start: Called just before an item is submitted
+    on_result: Called with each item's (success, message) as it finishes
+
+  Returns:
+    Number of items processed
+  """
+  queue = deque(items)
+  in_flight = {model.name: 0 for model in models}
+  next_start = {model.name: 0.0 for model in models}
+  running: dict[Future, tuple[GenerationItem, ModelEndpoint]] = {}
+  processed = 0
+  next_model = 0
+
+  def run(item: GenerationItem, model: ModelEndpoint) -> tuple[bool, str]:
+    try:
+      return process(item, model)
+    except Exception as e:
+      return False, f"Error: {e}"
+
+  max_workers = sum(max(1, model.max_concurrency) for model in models)
+  with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    while queue or running:
+      # Hand out items round-robin until no model can take another
+      now = time.monotonic()
+      started = True
+      while queue and started:
+        started = False
+        for offset in range(len(models)):
+          model = models[(next_model + offset) % len(models)]
+          if (
+            in_flight[model.name] >= max(1, model.max_concurrency)
+            or next_start[model.name] > now
+          ):
+            continue
+          item = queue.popleft()
+          in_flight[model.name] += 1
+          next_start[model.name] = now + model.min_request_interval
+          next_model = (next_model + offset + 1) % len(models)
+          if on_start is not None:
+            on_start(item, model)
+          running[executor.submit(run, item, model)] = (item, model)
+          started = True
+          break
+
+      # Wake up for the next finished item, or when a rate-limited model
+      # with a free slot may start again
+      timeout = None
+      if queue:
+        waits = [
+          next_start[model.name] - now
+          for model in models
+          if in_flight[model.name] < max(1, model.max_concurrency)
+        ]
+        if waits:
+          timeout = max(0.0, min(waits))
+      if not running:
+        time.sleep(timeout or 0)
+        continue
+
+      done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+      for future in done:
+        item, model = running.pop(future)
+        in_flight[model.name] -= 1
+        processed += 1
+        if on_result is not None:
+          on_result(item, model, *future.result())
+
+  return processed
+
+
 def print_progress(
   progress: dict[int, dict[str, int]], current_step: int | None = None
 ) -> None:
@@ -442,6 +610,7 @@ def generate_layer(
   dry_run: bool = False,
   retry_errors: bool = False,
   max_items: int | None = None,
+  max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
 ) -> int:
   """
   Execute the generation plan for a layer.
@@ -451,6 +620,7 @@ def generate_layer(
       dry_run: If True, don't actually call APIs
       retry_errors: If True, reset error items and retry them
       max_items: Maximum number of items to process (for testing)
+      max_concurrency: In-flight requests for models that don't set their own
 
   Returns:
       Exit code (0 for success, 1 for errors)
@@ -482,7 +652,8 @@ def generate_layer(
     return 1
 
   progress_conn = sqlite3.connect(progress_db_path)
-  source_conn = sqlite3.connect(source_db_path)
+  # Worker threads each read source quadrants on their own connection
+  source_pool = SQLiteConnectionPool(source_db_path)
 
   try:
     # Get generation params
@@ -498,13 +669,22 @@ def generate_layer(
       model_configs = [
         {
           "name": "gemini",
-          "url": "gemini-api",
+          "url": GEMINI_API_URL,
           "api_key_env": "GEMINI_API_KEY",
         }
       ]
 
-    models = [ModelEndpoint(**cfg) for cfg in model_configs]
-    print(f"   Models: {[m.name for m in models]}")
+    models = [
+      ModelEndpoint(**{"max_concurrency": max_concurrency, **cfg})
+      for cfg in model_configs
+    ]
+    print(f"   Models: {', '.join(f'{m.name} (x{m.max_concurrency})' for m in models)}")
+
+    # Resume items an interrupted run left in progress
+    if not dry_run:
+      resumed_count = reset_in_progress_items(progress_conn)
+      if resumed_count > 0:
+        print(f"\n🔄 Resuming {resumed_count} interrupted items")
 
     # Reset errors if requested
     if retry_errors:
@@ -518,7 +698,6 @@ def generate_layer(
 
     # Process each step in order
     items_processed = 0
-    model_index = 0
 
     for step in [1, 2, 3]:
       step_names = {1: "2x2 tiles", 2: "1x2/2x1 strips", 3: "1x1 corners"}
@@ -533,49 +712,60 @@ def generate_layer(
 
       print(f"   {len(pending)} items pending")
 
-      for item in pending:
-        if max_items is not None and items_processed >= max_items:
-          print(f"\n⚠️  Reached max items limit ({max_items})")
-          return 0
-
-        model = models[model_index % len(models)]
-        model_index += 1
+      limit_reached = False
+      if max_items is not None:
+        remaining = max_items - items_processed
+        limit_reached = len(pending) > remaining
+        pending = pending[:remaining]
 
+      def start_item(item: GenerationItem, model: ModelEndpoint) -> None:
         print(
-          f"\n   [{items_processed + 1}] {item.block_type} at ({item.top_left_x}, {item.top_left_y})"
+          f"\n   ▶️  {item.block_type} at ({item.top_left_x}, {item.top_left_y})"
+          f" → {model.name}"
         )
-        print(f"       Model: {model.name}")
-
         # Mark as in progress
         if not dry_run:
           mark_item_in_progress(progress_conn, item.id, model.name)
 
-        # Process the item
-        success, message = process_item(
-          item=item,
-          model=model,
-          source_conn=source_conn,
-          source_layer=layer_config["source_layer"],
-          layer_dir=layer_dir,
-          prompt=prompt,
-          dry_run=dry_run,
-        )
-
+      def process(item: GenerationItem, model: ModelEndpoint) -> tuple[bool, str]:
+        source_conn = source_pool.connect()
+        try:
+          return process_item(
+            item=item,
+            model=model,
+            source_conn=source_conn,
+            source_layer=layer_config["source_layer"],
+            layer_dir=layer_dir,
+            prompt=prompt,
+            dry_run=dry_run,
+          )
+        finally:
+          source_conn.close()
+
+      def record_result(
+        item: GenerationItem, model: ModelEndpoint, success: bool, message: str
+      ) -> None:
+        nonlocal items_processed
+        items_processed += 1
+        location = f"({item.top_left_x}, {item.top_left_y})"
         if success:
-          print(f"       ✅ {message}")
+          print(f"   [{items_processed}] ✅ {location} ({model.name}): {message}")
           if not dry_run:
             mark_item_complete(progress_conn, item.id)
         else:
-          print(f"       ❌ {message}")
+          print(f"   [{items_processed}] ❌ {location} ({model.name}): {message}")
           if not dry_run:
             mark_item_error(progress_conn, item.id, message)
 
-        items_processed += 1
-
         # Print progress every 10 items
         if items_processed % 10 == 0:
-          progress = get_step_progress(progress_conn)
-          print_progress(progress, step)
+          print_progress(get_step_progress(progress_conn), step)
+
+      dispatch_items(pending, models, process, start_item, record_result)
+
+      if limit_reached or (max_items is not None and items_processed >= max_items):
+        print(f"\n⚠️  Reached max items limit ({max_items})")
+        return 0
 
     # Final progress
     progress = get_step_progress(progress_conn)
@@ -592,7 +782,7 @@ def generate_layer(
 
   finally:
     progress_conn.close()
-    source_conn.close()
+    source_pool.close()
 
 
 def main():
@@ -623,6 +813,13 @@ def main():
     default=None,
     help="Maximum number of items to process (for testing)",
   )
+  parser.add_argument(
+    "--max-concurrency",
+    type=int,
+    default=DEFAULT_MAX_CONCURRENCY,
+    help="In-flight requests per model, unless set in layer_config.json "
+    f"(default: {DEFAULT_MAX_CONCURRENCY})",
+  )
 
   args = parser.parse_args()
 
@@ -637,6 +834,7 @@ def main():
       dry_run=args.dry_run,
       retry_errors=args.retry_errors,
       max_items=args.max_items,
+      max_concurrency=args.max_concurrency,
     )
   except KeyboardInterrupt:
     print("\n\n⚠️  Interrupted by user")
@@ -14,17 +14,20 @@ The main entry point is `run_generation_for_quadrants()` which handles:
 5. Saving the generated quadrants to the database
 """
 
+import base64
 import os
 import re
 import sqlite3
 import tempfile
-from pathlib import Path
+import threading
+from concurrent.futures import Future
 from typing import Callable
 
 import requests
 from dotenv import load_dotenv
 from PIL import Image
 
+from isometric_hanford.generation.http_session import get_session
 from isometric_hanford.generation.infill_template import (
   QUADRANT_SIZE,
   InfillRegion,
@@ -44,11 +47,12 @@ from isometric_hanford.generation.shared import (
   save_quadrant_render,
   save_quadrant_water_mask,
   split_tile_into_quadrants,
-  upload_to_gcs,
+  upload_png_to_gcs,
 )
 from isometric_hanford.generation.shared import (
   get_quadrant_generation as shared_get_quadrant_generation,
 )
+from isometric_hanford.generation.web_renderer import get_running_renderer
 
 # Load environment variables
 load_dotenv()
@@ -114,6 +118,137 @@ def parse_quadrant_list(s: str) -> list[tuple[int, int]]:
 # Local Inference API Functions
 # =============================================================================
 
+DEFAULT_LOCAL_PROMPT = (
+  "Fill in the outlined section with the missing pixels corresponding to "
+  "the <isometric nyc pixel art> style, removing the border and exactly "
+  "following the shape/style/structure of the surrounding image (if present)."
+)
+
+# Binary endpoint statuses meaning "not deployed here" rather than "failed"
+# (run_generation_for_quadrants falls back to the base64/multipart endpoint)
+BINARY_ENDPOINT_FALLBACK_STATUSES = (404, 405, 415)
+
+# How long a batched local call waits for concurrent calls to join its request
+DEFAULT_BATCH_WAIT_SECONDS = 0.25
+
+
+def encode_template_image(
+  image: "Image.Image", use_jpeg: bool = True, jpeg_quality: int = 90
+) -> tuple[bytes, str]:
+  """
+  Encode a template image for a local inference request.
+
+  Args:
+      image: PIL Image of the input template
+      use_jpeg: If True, compress as JPEG (flattened onto white), else PNG
+      jpeg_quality: JPEG quality 1-100
+
+  Returns:
+      (encoded bytes, MIME type)
+  """
+  from io import BytesIO
+
+  img_buffer = BytesIO()
+  if use_jpeg:
+    # Convert to RGB if needed (JPEG doesn't support alpha)
+    if image.mode in ("RGBA", "LA", "P"):
+      rgb_image = Image.new("RGB", image.size, (255, 255, 255))
+      if image.mode == "P":
+        image = image.convert("RGBA")
+      rgb_image.paste(image, mask=image.split()[-1] if image.mode == "RGBA" else None)
+      image = rgb_image
+    image.save(img_buffer, format="JPEG", quality=jpeg_quality, optimize=True)
+    return img_buffer.getvalue(), "image/jpeg"
+
+  image.save(img_buffer, format="PNG")
+  return img_buffer.getvalue(), "image/png"
+
+
+def call_local_api_png(
+  image: "Image.Image",
+  model_config: "ModelConfig | None" = None,  # noqa: F821
+  additional_prompt: str | None = None,
+  negative_prompt: str | None = None,
+  use_jpeg: bool = True,
+  jpeg_quality: int = 90,
+) -> "Image.Image":
+  """
+  Call the local inference API's binary endpoint (no base64 or multipart).
+
+  The request body is the raw template image (Content-Type image/jpeg or
+  image/png), with parameters in the query string:
+    - prompt: The generation prompt
+    - negative_prompt: Optional negative prompt
+    - steps: Number of inference steps
+
+  The response body is the raw generated PNG.
+
+  Args:
+      image: PIL Image of the input template
+      model_config: Optional model configuration (ModelConfig from model_config.py).
+        Its binary endpoint is used; if not provided, uses defaults.
+      additional_prompt: Optional custom prompt text to override the base prompt
+      negative_prompt: Optional negative prompt text for generation
+      use_jpeg: If True, compress image as JPEG (much smaller). Default True.
+      jpeg_quality: JPEG quality 1-100 (default 90, good balance of size/quality)
+
+  Returns:
+      PIL Image of the generated result
+
+  Raises:
+      requests.HTTPError: If the API call fails
+      ValueError: If the response format is unexpected
+  """
+  import time
+  from io import BytesIO
+
+  # Use provided config or defaults
+  if model_config is not None:
+    endpoint = model_config.resolved_binary_endpoint
+    num_inference_steps = model_config.num_inference_steps
+  else:
+    endpoint = None
+    num_inference_steps = 15
+  endpoint = endpoint or "http://localhost:8888/edit-png"
+
+  # Build prompt - custom prompt overrides default
+  if additional_prompt:
+    prompt = additional_prompt
+    print(f"   📝 Using custom prompt: {additional_prompt}")
+  else:
+    prompt = DEFAULT_LOCAL_PROMPT
+
+  image_bytes, mime_type = encode_template_image(image, use_jpeg, jpeg_quality)
+
+  params = {"prompt": prompt, "steps": num_inference_steps}
+  if negative_prompt:
+    params["negative_prompt"] = negative_prompt
+    print(f"   🚫 Using negative prompt: {negative_prompt}")
+
+  print(f"   🏠 Calling local API (binary) at {endpoint}...")
+  print(f"   📊 Steps: {num_inference_steps}")
+  print(f"   📦 Image: {len(image_bytes):,} bytes ({mime_type})")
+
+  start_time = time.time()
+  response = get_session().post(
+    endpoint,
+    params=params,
+    data=image_bytes,
+    headers={"Content-Type": mime_type, "Accept": "image/png"},
+    timeout=600,  # 10 minute timeout for local inference
+  )
+  response.raise_for_status()
+  elapsed_time = time.time() - start_time
+
+  content_type = response.headers.get("content-type", "")
+  if "image" not in content_type:
+    raise ValueError(f"Expected image response, got content-type: {content_type}")
+
+  print(f"   ✓ Received {len(response.content):,} bytes from local API")
+  print(f"   ⏱️  Generation took {elapsed_time:.1f}s")
+
+  return Image.open(BytesIO(response.content))
+
 
 def call_local_api_b64(
   image: "Image.Image",
@@ -165,39 +300,22 @@ def call_local_api_b64(
     prompt = additional_prompt
     print(f"   📝 Using custom prompt: {additional_prompt}")
   else:
-    prompt = (
-      "Fill in the outlined section with the missing pixels corresponding to "
-      "the <isometric nyc pixel art> style, removing the border and exactly "
-      "following the shape/style/structure of the surrounding image (if present)."
-    )
+    prompt = DEFAULT_LOCAL_PROMPT
 
   # Convert PIL image to base64 (use JPEG for compression if enabled)
-  img_buffer = BytesIO()
-  if use_jpeg:
-    # Convert to RGB if needed (JPEG doesn't support alpha)
-    if image.mode in ("RGBA", "LA", "P"):
-      rgb_image = Image.new("RGB", image.size, (255, 255, 255))
-      if image.mode == "P":
-        image = image.convert("RGBA")
-      rgb_image.paste(image, mask=image.split()[-1] if image.mode == "RGBA" else None)
-      image = rgb_image
-    image.save(img_buffer, format="JPEG", quality=jpeg_quality, optimize=True)
-    img_format = "JPEG"
-    tmp_ext = ".jpg"
-  else:
-    image.save(img_buffer, format="PNG")
-    img_format = "PNG"
-    tmp_ext = ".png"
+  image_bytes, mime_type = encode_template_image(image, use_jpeg, jpeg_quality)
+  img_format = "JPEG" if use_jpeg else "PNG"
+  tmp_ext = ".jpg" if use_jpeg else ".png"
 
   # Save temp image for debugging before encoding to base64
   tmp_file = tempfile.NamedTemporaryFile(
     delete=False, suffix=f"_local_api_input{tmp_ext}", prefix="isometric_"
   )
-  tmp_file.write(img_buffer.getvalue())
+  tmp_file.write(image_bytes)
   tmp_file.close()
   print(f"   💾 Saved temp image for debugging: {tmp_file.name}")
 
-  image_b64 = base64.b64encode(img_buffer.getvalue()).decode()
+  image_b64 = base64.b64encode(image_bytes).decode()
 
   # Prepare JSON payload
   payload = {
@@ -219,7 +337,7 @@ def call_local_api_b64(
   print(f"   📦 Image: {len(image_b64):,} bytes ({img_format}, base64)")
 
   start_time = time.time()
-  response = requests.post(
+  response = get_session().post(
     endpoint,
     json=payload,
     headers={"Content-Type": "application/json"},
@@ -302,36 +420,16 @@ def call_local_api(
     prompt = additional_prompt
     print(f"   📝 Using custom prompt: {additional_prompt}")
   else:
-    prompt = (
-      "Fill in the outlined section with the missing pixels corresponding to "
-      "the <isometric nyc pixel art> style, removing the border and exactly "
-      "following the shape/style/structure of the surrounding image (if present)."
-    )
+    prompt = DEFAULT_LOCAL_PROMPT
 
   # Convert PIL image to bytes (use JPEG for compression if enabled)
-  img_buffer = BytesIO()
-  if use_jpeg:
-    # Convert to RGB if needed (JPEG doesn't support alpha)
-    if image.mode in ("RGBA", "LA", "P"):
-      rgb_image = Image.new("RGB", image.size, (255, 255, 255))
-      if image.mode == "P":
-        image = image.convert("RGBA")
-      rgb_image.paste(image, mask=image.split()[-1] if image.mode == "RGBA" else None)
-      image = rgb_image
-    image.save(img_buffer, format="JPEG", quality=jpeg_quality, optimize=True)
-    filename = "input.jpg"
-    mime_type = "image/jpeg"
-    img_format = "JPEG"
-  else:
-    image.save(img_buffer, format="PNG")
-    filename = "input.png"
-    mime_type = "image/png"
-    img_format = "PNG"
-  img_buffer.seek(0)
+  image_bytes, mime_type = encode_template_image(image, use_jpeg, jpeg_quality)
+  filename = "input.jpg" if use_jpeg else "input.png"
+  img_format = "JPEG" if use_jpeg else "PNG"
 
   # Prepare multipart form data
   files = {
-    "file": (filename, img_buffer, mime_type),
+    "file": (filename, image_bytes, mime_type),
   }
   data = {
     "prompt": prompt,
@@ -345,10 +443,10 @@ def call_local_api(
 
   print(f"   🏠 Calling local API at {endpoint}...")
   print(f"   📊 Steps: {num_inference_steps}")
-  print(f"   📦 Image: {img_buffer.getbuffer().nbytes:,} bytes ({img_format})")
+  print(f"   📦 Image: {len(image_bytes):,} bytes ({img_format})")
 
   start_time = time.time()
-  response = requests.post(
+  response = get_session().post(
     endpoint,
     files=files,
     data=data,
@@ -370,11 +468,254 @@ def call_local_api(
   return Image.open(BytesIO(response.content))
 
 
+def call_local_api_batch(
+  images: list["Image.Image"],
+  model_config: "ModelConfig",  # noqa: F821
+  prompts: list[str | None] | None = None,
+  negative_prompts: list[str | None] | None = None,
+  use_jpeg: bool = True,
+  jpeg_quality: int = 90,
+) -> list["Image.Image"]:
+  """
+  Call the local inference API's batch endpoint with several templates.
+
+  The batch endpoint expects JSON with an `items` list, each item in the
+  base64 endpoint's format (image_b64, prompt, negative_prompt, steps), and
+  returns `images_b64` in the same order.
+
+  Args:
+      images: PIL Images of the input templates
+      model_config: Model configuration (ModelConfig from model_config.py).
+        Its batch endpoint is used.
+      prompts: Optional custom prompt per image (None uses the default prompt)
+      negative_prompts: Optional negative prompt per image
+      use_jpeg: If True, compress images as JPEG (much smaller). Default True.
+      jpeg_quality: JPEG quality 1-100 (default 90, good balance of size/quality)
+
+  Returns:
+      PIL Images of the generated results, in input order
+
+  Raises:
+      requests.HTTPError: If the API call fails
+      ValueError: If the response format is unexpected
+  """
+  import base64
+  import time
+  from io import BytesIO
+
+  endpoint = model_config.resolved_batch_endpoint or "http://localhost:8888/edit-batch"
+  prompts = prompts or [None] * len(images)
+  negative_prompts = negative_prompts or [None] * len(images)
+
+  items = []
+  total_bytes = 0
+  for image, prompt, negative_prompt in zip(images, prompts, negative_prompts):
+    image_bytes, _ = encode_template_image(image, use_jpeg, jpeg_quality)
+    total_bytes += len(image_bytes)
+    items.append(
+      {
+        "image_b64": base64.b64encode(image_bytes).decode(),
+        "prompt": prompt or DEFAULT_LOCAL_PROMPT,
+        "negative_prompt": negative_prompt or None,
+        "steps": model_config.num_inference_steps,
+      }
+    )
+
+  print(f"   🏠 Calling local API (batch of {len(items)}) at {endpoint}...")
+  print(f"   📊 Steps: {model_config.num_inference_steps}")
+  print(f"   📦 Images: {total_bytes:,} bytes")
+
+  start_time = time.time()
+  response = get_session().post(
+    endpoint,
+    json={"items": items},
+    timeout=600,  # 10 minute timeout for local inference
+  )
+  response.raise_for_status()
+  elapsed_time = time.time() - start_time
+
+  result = response.json()
+  results_b64 = result.get("images_b64")
+  if not isinstance(results_b64, list) or len(results_b64) != len(items):
+    raise ValueError(
+      f"Expected {len(items)} 'images_b64' in response, got keys: {list(result.keys())}"
+    )
+
+  print(f"   ✓ Received {len(results_b64)} images from local API")
+  print(f"   ⏱️  Batch generation took {elapsed_time:.1f}s")
+
+  return [Image.open(BytesIO(base64.b64decode(b64))) for b64 in results_b64]
+
+
+class LocalBatchClient:
+  """
+  Groups concurrent local inference calls into batch endpoint requests.
+
+  The queue worker runs up to a model's max_concurrency items at once, each
+  on its own thread. Each thread calls edit(); the first call of a group
+  waits up to max_wait_seconds for others to join, then one request carries
+  the whole group (a full group is sent right away) and every caller gets
+  its own image back.
+  """
+
+  def __init__(
+    self,
+    model_config: "ModelConfig",  # noqa: F821
+    max_batch_size: int,
+    max_wait_seconds: float = DEFAULT_BATCH_WAIT_SECONDS,
+  ):
+    self.model_config = model_config
+    self.max_batch_size = max(1, max_batch_size)
+    self.max_wait_seconds = max_wait_seconds
+    self._condition = threading.Condition()
+    self._pending: list[tuple[tuple, Future]] = []
+
+  def edit(
+    self,
+    image: "Image.Image",
+    additional_prompt: str | None = None,
+    negative_prompt: str | None = None,
+  ) -> "Image.Image":
+    """
+    Generate one image, batched with any concurrent calls.
+
+    Raises:
+        requests.HTTPError: If the batch request fails (every caller in the
+          batch gets the error)
+    """
+    import time
+
+    future: Future = Future()
+    with self._condition:
+      self._pending.append(((image, additional_prompt, negative_prompt), future))
+      if len(self._pending) >= self.max_batch_size:
+        # Full - send now, and release the caller waiting on this group
+        batch, self._pending = self._pending, []
+        self._condition.notify_all()
+      elif len(self._pending) == 1:
+        # First of a new group - wait for others to join
+        deadline = time.monotonic() + self.max_wait_seconds
+        while self._pending and self._pending[0][1] is future:
+          remaining = deadline - time.monotonic()
+          if remaining <= 0:
+            break
+          self._condition.wait(remaining)
+        if self._pending and self._pending[0][1] is future:
+          batch, self._pending = self._pending, []
+        else:
+          batch = []
+      else:
+        batch = []
+
+    if batch:
+      self._send(batch)
+    return future.result()
+
+  def _send(self, batch: list[tuple[tuple, Future]]) -> None:
+    images, prompts, negative_prompts = zip(*(request for request, _ in batch))
+    try:
+      results = call_local_api_batch(
+        list(images), self.model_config, list(prompts), list(negative_prompts)
+      )
+    except Exception as e:
+      for _, future in batch:
+        future.set_exception(e)
+      return
+    for (_, future), result in zip(batch, results):
+      future.set_result(result)
+
+
+# Batch clients by (model_id, batch endpoint), shared by the worker threads
+_local_batch_clients: dict[tuple[str, str], LocalBatchClient] = {}
+_local_batch_clients_lock = threading.Lock()
+
+
+def get_local_batch_client(
+  model_config: "ModelConfig",  # noqa: F821
+) -> LocalBatchClient:
+  """
+  Get the shared batch client for a model, sized to its max_concurrency.
+  """
+  key = (model_config.model_id, model_config.resolved_batch_endpoint)
+  with _local_batch_clients_lock:
+    client = _local_batch_clients.get(key)
+    if client is None or client.max_batch_size != max(1, model_config.max_concurrency):
+      client = LocalBatchClient(model_config, model_config.max_concurrency)
+      _local_batch_clients[key] = client
+    return client
+
+
+def _is_endpoint_fallback(error: requests.HTTPError) -> bool:
+  """Whether a failed endpoint should be skipped for the next transport."""
+  status = error.response.status_code if error.response is not None else None
+  return status in BINARY_ENDPOINT_FALLBACK_STATUSES
+
+
+def call_local_inference(
+  image: "Image.Image",
+  model_config: "ModelConfig",  # noqa: F821
+  additional_prompt: str | None = None,
+  negative_prompt: str | None = None,
+) -> "Image.Image":
+  """
+  Call a local/URL model over the best transport it supports.
+
+  Models with a batch endpoint and max_concurrency > 1 send concurrent calls
+  as one batch request (see LocalBatchClient). Otherwise the binary
+  endpoint is used when the model has one, then the base64 (use_base64) or
+  multipart endpoint. An endpoint answering with one of
+  BINARY_ENDPOINT_FALLBACK_STATUSES (e.g. not deployed yet) falls back to
+  the next transport.
+
+  Args:
+      image: PIL Image of the input template
+      model_config: Model configuration (ModelConfig from model_config.py)
+      additional_prompt: Optional custom prompt text to override the base prompt
+      negative_prompt: Optional negative prompt text for generation
+
+  Returns:
+      PIL Image of the generated result
+  """
+  if model_config.resolved_batch_endpoint and model_config.max_concurrency > 1:
+    print("🏠 Using local inference (batch mode)...")
+    try:
+      return get_local_batch_client(model_config).edit(
+        image, additional_prompt, negative_prompt
+      )
+    except requests.HTTPError as e:
+      if not _is_endpoint_fallback(e):
+        raise
+      status = e.response.status_code
+      print(f"   ⚠️ Batch endpoint unavailable ({status}), falling back...")
+
+  if model_config.resolved_binary_endpoint:
+    print("🏠 Using local inference (binary mode)...")
+    try:
+      return call_local_api_png(image, model_config, additional_prompt, negative_prompt)
+    except requests.HTTPError as e:
+      if not _is_endpoint_fallback(e):
+        raise
+      status = e.response.status_code
+      print(f"   ⚠️ Binary endpoint unavailable ({status}), falling back...")
+
+  if model_config.use_base64:
+    print("🏠 Using local inference (base64 mode)...")
+    return call_local_api_b64(image, model_config, additional_prompt, negative_prompt)
+
+  print("🏠 Using local inference (multipart mode)...")
+  return call_local_api(image, model_config, additional_prompt, negative_prompt)
+
+
 # =============================================================================
 # Oxen API Functions
 # =============================================================================
 
 
+def png_data_url(png_bytes: bytes) -> str:
+  """Encode PNG bytes as a base64 data URL."""
+  return f"data:image/png;base64,{base64.b64encode(png_bytes).decode()}"
+
+
 def call_oxen_api(
   image_url: str,
   model_config: "ModelConfig | None" = None,  # noqa: F821
@@ -385,14 +726,16 @@ def call_oxen_api(
   Call the Oxen API to generate pixel art.
 
   Args:
-      image_url: Public URL of the input template image
+      image_url: Public URL of the input template image, or a data URL (see
+        png_data_url) for models with inline_images
       model_config: Optional model configuration (ModelConfig from model_config.py).
         If not provided, uses defaults.
       additional_prompt: Optional custom prompt text to override the base prompt
       negative_prompt: Optional negative prompt text for generation
 
   Returns:
-      URL of the generated image
+      URL of the generated image (a data URL if the API returned base64 data;
+      download_image_to_pil accepts both)
 
   Raises:
       requests.HTTPError: If the API call fails
@@ -443,9 +786,13 @@ def call_oxen_api(
     payload["negative_prompt"] = negative_prompt
     print(f"   🚫 Using negative prompt: {negative_prompt}")
 
+  # Ask for the result inline rather than as a URL to download
+  if model_config is not None and model_config.inline_images:
+    payload["response_format"] = "b64_json"
+
   print(f"   🤖 Calling Oxen API with model {model_id}...")
   start_time = time.time()
-  response = requests.post(endpoint, headers=headers, json=payload, timeout=300)
+  response = get_session().post(endpoint, headers=headers, json=payload, timeout=300)
   response.raise_for_status()
   elapsed_time = time.time() - start_time
 
@@ -468,11 +815,10 @@ def call_oxen_api(
         return image_data["url"]
       elif "image_url" in image_data:
         return image_data["image_url"]
+      elif "b64_json" in image_data:
+        return png_data_url(base64.b64decode(image_data["b64_json"]))
       elif "data" in image_data:
-        # Some APIs return base64 data - we'd need to handle this differently
-        raise ValueError(
-          f"API returned base64 data instead of URL: {list(image_data.keys())}"
-        )
+        return png_data_url(base64.b64decode(image_data["data"]))
       else:
         raise ValueError(
           f"Image data missing 'url' key. Available keys: {list(image_data.keys())}"
@@ -507,10 +853,11 @@ def download_image_to_pil(
   Download an image from a URL and return as PIL Image.
 
   Includes retry logic for transient errors (e.g., 403 Forbidden when
-  the image is not yet available).
+  the image is not yet available). Data URLs (e.g. inline Oxen results)
+  are decoded without a request.
 
   Args:
-      url: URL of the image to download
+      url: URL of the image to download, or a base64 data URL
       max_retries: Maximum number of retry attempts (default: 3)
       retry_delay: Seconds to wait between retries (default: 10.0)
 
@@ -523,11 +870,14 @@ def download_image_to_pil(
   import time
   from io import BytesIO
 
+  if url.startswith("data:"):
+    return Image.open(BytesIO(base64.b64decode(url.partition(",")[2])))
+
   last_error = None
 
   for attempt in range(1, max_retries + 1):
     try:
-      response = requests.get(url, timeout=120)
+      response = get_session().get(url, timeout=120)
       response.raise_for_status()
       return Image.open(BytesIO(response.content))
     except requests.exceptions.HTTPError as e:
@@ -569,6 +919,9 @@ def render_quadrant(
   Render a quadrant and save to database.
 
   This renders the tile containing the quadrant and saves all 4 quadrants.
+  If the global WebRenderer has been started (e.g. by the generation app),
+  the render is dispatched to its worker pool; otherwise it uses this
+  thread's warm page via render_url_to_image.
 
   Args:
       conn: Database connection
@@ -585,6 +938,28 @@ def render_quadrant(
 
   print(f"   🎨 Rendering tile for quadrant ({x}, {y})...")
 
+  renderer = get_running_renderer()
+  if renderer is not None and renderer.port == port:
+    quadrant_bytes = renderer.render_quadrant(
+      quadrant_x=x,
+      quadrant_y=y,
+      lat=quadrant["lat"],
+      lng=quadrant["lng"],
+      width_px=config["width_px"],
+      height_px=config["height_px"],
+      camera_azimuth_degrees=config["camera_azimuth_degrees"],
+      camera_elevation_degrees=config["camera_elevation_degrees"],
+      view_height_meters=config.get("view_height_meters", 200),
+    )
+    result_bytes = None
+    for (dx, dy), png_bytes in quadrant_bytes.items():
+      qx, qy = x + dx, y + dy
+      save_quadrant_render(conn, config, qx, qy, png_bytes)
+      print(f"      ✓ Saved render for ({qx}, {qy})")
+      if qx == x and qy == y:
+        result_bytes = png_bytes
+    return result_bytes
+
   # Build URL and render using shared utilities
   url = build_tile_render_url(
     port=port,
@@ -745,131 +1120,115 @@ def run_generation_for_quadrants(
 
   # Check if we're using local or Oxen API
   is_local = model_config is not None and model_config.is_local
-  use_base64 = model_config is not None and model_config.use_base64
-
-  template_path = None
-  try:
-    if is_local:
-      # Local inference - no GCS upload needed
-      print(f"📋 Template size: {template_image.size[0]}x{template_image.size[1]}")
-
-      update_status("generating", "Calling local model (this may take a minute)...")
-      if use_base64:
-        print("🏠 Using local inference (base64 mode)...")
-        generated_image = call_local_api_b64(
-          template_image, model_config, prompt, negative_prompt
-        )
-      else:
-        print("🏠 Using local inference (multipart mode)...")
-        generated_image = call_local_api(
-          template_image, model_config, prompt, negative_prompt
-        )
-      print("   ✓ Local inference complete")
+
+  if is_local:
+    # Local inference - no GCS upload needed
+    print(f"📋 Template size: {template_image.size[0]}x{template_image.size[1]}")
+
+    update_status("generating", "Calling local model (this may take a minute)...")
+    generated_image = call_local_inference(
+      template_image, model_config, prompt, negative_prompt
+    )
+    print("   ✓ Local inference complete")
+  else:
+    print(f"   Template size: {template_image.size[0]}x{template_image.size[1]}")
+    template_png = image_to_png_bytes(template_image)
+    if model_config is not None and model_config.inline_images:
+      # Oxen API - template sent in the request, no GCS upload needed
+      image_url = png_data_url(template_png)
     else:
       # Oxen API - upload to GCS first
-      with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-        template_path = Path(tmp.name)
-        template_image.save(template_path)
-
       update_status("uploading", "Uploading template to cloud...")
       print("📤 Uploading template to GCS...")
-      print(f"   Template path: {template_path}")
-      print(f"   Template size: {template_image.size[0]}x{template_image.size[1]}")
-      image_url = upload_to_gcs(template_path, bucket_name)
+      image_url = upload_png_to_gcs(template_png, bucket_name)
       print(f"   Uploaded URL: {image_url}")
 
-      update_status("generating", "Calling AI model (this may take a minute)...")
-      print("🤖 Calling Oxen API...")
-      generated_url = call_oxen_api(image_url, model_config, prompt, negative_prompt)
+    update_status("generating", "Calling AI model (this may take a minute)...")
+    print("🤖 Calling Oxen API...")
+    generated_url = call_oxen_api(image_url, model_config, prompt, negative_prompt)
 
-      update_status("saving", "Downloading and saving results...")
-      print("📥 Downloading generated image...")
+    update_status("saving", "Downloading and saving results...")
+    print("📥 Downloading generated image...")
+    if not generated_url.startswith("data:"):
       print(f"   Generated URL: {generated_url}")
-      generated_image = download_image_to_pil(generated_url)
+    generated_image = download_image_to_pil(generated_url)
 
-    # For local inference, update status to saving now
-    if is_local:
-      update_status("saving", "Saving results...")
+  # For local inference, update status to saving now
+  if is_local:
+    update_status("saving", "Saving results...")
 
-    # Extract quadrants from generated image and save to database
-    print("💾 Saving generated quadrants to database...")
+  # Extract quadrants from generated image and save to database
+  print("💾 Saving generated quadrants to database...")
+
+  # Figure out what quadrants are in the infill region
+  all_infill_quadrants = (
+    placement.all_infill_quadrants
+    if placement.all_infill_quadrants
+    else region.overlapping_quadrants()
+  )
 
-    # Figure out what quadrants are in the infill region
-    all_infill_quadrants = (
-      placement.all_infill_quadrants
-      if placement.all_infill_quadrants
-      else region.overlapping_quadrants()
+  # For each infill quadrant, extract pixels from the generated image
+  saved_count = 0
+  for qx, qy in all_infill_quadrants:
+    # Calculate position in the generated image
+    quad_world_x = qx * QUADRANT_SIZE
+    quad_world_y = qy * QUADRANT_SIZE
+
+    template_x = quad_world_x - placement.world_offset_x
+    template_y = quad_world_y - placement.world_offset_y
+
+    # Crop this quadrant from the generated image
+    crop_box = (
+      template_x,
+      template_y,
+      template_x + QUADRANT_SIZE,
+      template_y + QUADRANT_SIZE,
     )
+    quad_img = generated_image.crop(crop_box)
+    png_bytes = image_to_png_bytes(quad_img)
 
-    # For each infill quadrant, extract pixels from the generated image
-    saved_count = 0
-    for qx, qy in all_infill_quadrants:
-      # Calculate position in the generated image
-      quad_world_x = qx * QUADRANT_SIZE
-      quad_world_y = qy * QUADRANT_SIZE
-
-      template_x = quad_world_x - placement.world_offset_x
-      template_y = quad_world_y - placement.world_offset_y
-
-      # Crop this quadrant from the generated image
-      crop_box = (
-        template_x,
-        template_y,
-        template_x + QUADRANT_SIZE,
-        template_y + QUADRANT_SIZE,
+    # Only save primary quadrants (not padding)
+    if (qx, qy) in primary_quadrants or (qx, qy) in [
+      (q[0], q[1]) for q in primary_quadrants
+    ]:
+      # Check if this model saves to water_mask or dark_mode instead of generation
+      is_water_mask_model = model_config and getattr(
+        model_config, "is_water_mask", False
       )
-      quad_img = generated_image.crop(crop_box)
-      png_bytes = image_to_png_bytes(quad_img)
-
-      # Only save primary quadrants (not padding)
-      if (qx, qy) in primary_quadrants or (qx, qy) in [
-        (q[0], q[1]) for q in primary_quadrants
-      ]:
-        # Check if this model saves to water_mask or dark_mode instead of generation
-        is_water_mask_model = model_config and getattr(
-          model_config, "is_water_mask", False
-        )
-        is_dark_mode_model = model_config and getattr(
-          model_config, "is_dark_mode", False
-        )
-        if is_water_mask_model:
-          if save_quadrant_water_mask(conn, config, qx, qy, png_bytes):
-            print(f"   ✓ Saved water mask for ({qx}, {qy})")
-            saved_count += 1
-          else:
-            print(f"   ⚠️ Failed to save water mask for ({qx}, {qy})")
-        elif is_dark_mode_model:
-          if save_quadrant_dark_mode(conn, config, qx, qy, png_bytes):
-            print(f"   ✓ Saved dark mode for ({qx}, {qy})")
-            saved_count += 1
-          else:
-            print(f"   ⚠️ Failed to save dark mode for ({qx}, {qy})")
+      is_dark_mode_model = model_config and getattr(model_config, "is_dark_mode", False)
+      if is_water_mask_model:
+        if save_quadrant_water_mask(conn, config, qx, qy, png_bytes):
+          print(f"   ✓ Saved water mask for ({qx}, {qy})")
+          saved_count += 1
         else:
-          if save_quadrant_generation(conn, config, qx, qy, png_bytes):
-            print(f"   ✓ Saved generation for ({qx}, {qy})")
-            saved_count += 1
-          else:
-            print(f"   ⚠️ Failed to save generation for ({qx}, {qy})")
+          print(f"   ⚠️ Failed to save water mask for ({qx}, {qy})")
+      elif is_dark_mode_model:
+        if save_quadrant_dark_mode(conn, config, qx, qy, png_bytes):
+          print(f"   ✓ Saved dark mode for ({qx}, {qy})")
+          saved_count += 1
+        else:
+          print(f"   ⚠️ Failed to save dark mode for ({qx}, {qy})")
       else:
-        print(f"   ⏭️ Skipped padding quadrant ({qx}, {qy})")
-
-    # Check if this was a water mask or dark mode generation
-    is_water_mask_model = model_config and getattr(model_config, "is_water_mask", False)
-    is_dark_mode_model = model_config and getattr(model_config, "is_dark_mode", False)
-    if is_water_mask_model:
-      output_type = "water mask"
-    elif is_dark_mode_model:
-      output_type = "dark mode"
+        if save_quadrant_generation(conn, config, qx, qy, png_bytes):
+          print(f"   ✓ Saved generation for ({qx}, {qy})")
+          saved_count += 1
+        else:
+          print(f"   ⚠️ Failed to save generation for ({qx}, {qy})")
     else:
-      output_type = "generation"
-    update_status("complete", f"Generated {saved_count} {output_type}(s)")
-    return {
-      "success": True,
-      "message": f"Generated {saved_count} {output_type}{'s' if saved_count != 1 else ''}",
-      "quadrants": list(primary_quadrants),
-    }
-
-  finally:
-    # Clean up temp file if it was created (only for Oxen API path)
-    if template_path is not None:
-      template_path.unlink(missing_ok=True)
+      print(f"   ⏭️ Skipped padding quadrant ({qx}, {qy})")
+
+  # Check if this was a water mask or dark mode generation
+  is_water_mask_model = model_config and getattr(model_config, "is_water_mask", False)
+  is_dark_mode_model = model_config and getattr(model_config, "is_dark_mode", False)
+  if is_water_mask_model:
+    output_type = "water mask"
+  elif is_dark_mode_model:
+    output_type = "dark mode"
+  else:
+    output_type = "generation"
+  update_status("complete", f"Generated {saved_count} {output_type}(s)")
+  return {
+    "success": True,
+    "message": f"Generated {saved_count} {output_type}{'s' if saved_count != 1 else ''}",
+    "quadrants": list(primary_quadrants),
+  }
@@ -44,6 +44,7 @@ from isometric_hanford.generation.shared import (
   get_generation_config,
   get_quadrant_generation,
   get_quadrant_render,
+  has_quadrant_generation,
   image_to_png_bytes,
   png_bytes_to_image,
   render_url_to_image,
@@ -92,13 +93,7 @@ def has_generation_in_db(conn: sqlite3.Connection) -> callable:
   """Create a function to check if a quadrant has generation in the database."""
 
   def check(qx: int, qy: int) -> bool:
-    cursor = conn.cursor()
-    cursor.execute(
-      "SELECT generation FROM quadrants WHERE quadrant_x = ? AND quadrant_y = ?",
-      (qx, qy),
-    )
-    row = cursor.fetchone()
-    return row is not None and row[0] is not None
+    return has_quadrant_generation(conn, qx, qy)
 
   return check
 
@@ -38,7 +38,6 @@ import argparse
 import os
 import re
 import sqlite3
-import tempfile
 from pathlib import Path
 from typing import Callable
 
@@ -47,6 +46,14 @@ from google import genai
 from google.genai import types
 from PIL import Image
 
+from isometric_hanford.generation.gemini_rate_limiter import (
+  call_with_rate_limit,
+  estimate_tokens,
+)
+from isometric_hanford.generation.gemini_upload_cache import (
+  get_gemini_upload_cache,
+  upload_image,
+)
 from isometric_hanford.generation.infill_template import (
   QUADRANT_SIZE,
   InfillRegion,
@@ -55,7 +62,7 @@ from isometric_hanford.generation.infill_template import (
 )
 from isometric_hanford.generation.shared import (
   DEFAULT_WEB_PORT,
-  WEB_DIR,
+  WEB_RENDER_DIR,
   QuadrantHelpers,
   build_tile_render_url,
   ensure_quadrant_exists,
@@ -74,29 +81,34 @@ from isometric_hanford.generation.shared import (
 # Load environment variables
 load_dotenv()
 
+# Gemini image generation model (also used by the snow, dark mode and water
+# mask scripts)
+GEMINI_MODEL = "gemini-3-pro-image-preview"
+
 # =============================================================================
 # Reference Image Upload Cache
 # =============================================================================
 
-# Cache for uploaded reference images to Gemini API
-# Maps (tl_x, tl_y) -> uploaded file reference
-# This avoids re-uploading the same reference images on every generation
-_REFERENCE_UPLOAD_CACHE: dict[tuple[int, int], any] = {}
+# Uploads go through the persistent upload cache (gemini_upload_cache.py), so
+# the same labeled reference is only uploaded once per 48 hours, across runs
+# and across the Gemini generation scripts.
 
 
 def clear_reference_cache():
-  """Clear the reference upload cache. Call this if references are regenerated."""
-  global _REFERENCE_UPLOAD_CACHE
-  _REFERENCE_UPLOAD_CACHE.clear()
+  """Clear the upload cache. Call this if references are regenerated."""
+  cache = get_gemini_upload_cache()
+  if cache is not None:
+    cache.clear()
   print("   🗑️ Cleared reference upload cache")
 
 
 def get_cache_stats() -> dict:
-  """Get statistics about the reference upload cache."""
-  return {
-    "cached_references": len(_REFERENCE_UPLOAD_CACHE),
-    "coordinates": list(_REFERENCE_UPLOAD_CACHE.keys()),
-  }
+  """Get statistics about the upload cache."""
+  cache = get_gemini_upload_cache()
+  if cache is None:
+    return {"cached_references": 0}
+  stats = cache.get_stats()
+  return {"cached_references": stats["entries"], **stats}
 
 
 # =============================================================================
@@ -559,7 +571,7 @@ def call_gemini_nano_banana(
   Args:
     template_image: The template image with render pixels and red border
     reference_images: List of reference images for style context
-    reference_coords: Optional list of (x, y) TL coordinates for caching uploaded references
+    reference_coords: Optional list of (x, y) TL coordinates of the reference images
     infill_region: Optional infill region for creating few-shot examples
     conn: Optional database connection for few-shot examples
     config: Optional generation config for few-shot examples
@@ -588,23 +600,12 @@ def call_gemini_nano_banana(
   # Build contents list with images
   contents: list = []
 
-  # Add template image
-  with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-    template_path = tmp.name
-    template_image.save(template_path)
-
   # Save template to debug dir
   if debug_dir:
     template_debug_path = debug_dir / "template.png"
     template_image.save(template_debug_path)
     print(f"      ✓ Saved template: {template_debug_path}")
 
-  try:
-    template_ref = client.files.upload(file=template_path)
-    contents.append(template_ref)
-  finally:
-    Path(template_path).unlink(missing_ok=True)
-
   # Simplified approach: Upload just ONE reference image (no few-shot)
   # Use the first reference image only
   print(f"\n   📷 Using simplified approach: template + 1 reference with LABELS")
@@ -649,20 +650,10 @@ def call_gemini_nano_banana(
     template_labeled.save(template_labeled_path)
     print(f"      ✓ Saved labeled template: {template_labeled_path}")
 
-  # Re-upload the labeled template
-  with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-    labeled_template_path = tmp.name
-    template_labeled.save(labeled_template_path)
-
-  try:
-    # Remove the original unlabeled template from contents
-    contents.pop()
-    # Upload the labeled version
-    print(f"      ⬆️ Uploading labeled template to Gemini API...")
-    template_labeled_ref = client.files.upload(file=labeled_template_path)
-    contents.append(template_labeled_ref)
-  finally:
-    Path(labeled_template_path).unlink(missing_ok=True)
+  # Upload the labeled template
+  print(f"      ⬆️ Uploading labeled template to Gemini API...")
+  contents.append(upload_image(client, template_labeled))
+  input_images = [template_labeled]
 
   if reference_images:
     ref_img = reference_images[0]
@@ -698,18 +689,11 @@ def call_gemini_nano_banana(
       ref_labeled.save(ref_labeled_path)
       print(f"      ✓ Saved labeled reference: {ref_labeled_path}")
 
-    # Upload the labeled reference
-    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-      ref_tmp_path = tmp.name
-      ref_labeled.save(ref_tmp_path)
-
-    try:
-      print(f"      ⬆️ Uploading labeled reference to Gemini API...")
-      ref_ref = client.files.upload(file=ref_tmp_path)
-      contents.append(ref_ref)
-      print(f"      ✅ Labeled reference uploaded")
-    finally:
-      Path(ref_tmp_path).unlink(missing_ok=True)
+    # Upload the labeled reference (the same reference is only uploaded once)
+    print(f"      ⬆️ Uploading labeled reference to Gemini API...")
+    contents.append(upload_image(client, ref_labeled))
+    input_images.append(ref_labeled)
+    print(f"      ✅ Labeled reference uploaded")
 
   # Build the prompt - custom prompt overrides default
   if prompt:
@@ -807,15 +791,19 @@ Think of this like: "Redraw the 3D render as pixel art in the style of Image B"
   print("=" * 60 + "\n")
 
   print("   🤖 Calling Gemini API...")
-  response = client.models.generate_content(
-    model="gemini-3-pro-image-preview",
-    contents=contents,
-    config=types.GenerateContentConfig(
-      response_modalities=["TEXT", "IMAGE"],
-      image_config=types.ImageConfig(
-        aspect_ratio="1:1",
+  response = call_with_rate_limit(
+    GEMINI_MODEL,
+    lambda: client.models.generate_content(
+      model=GEMINI_MODEL,
+      contents=contents,
+      config=types.GenerateContentConfig(
+        response_modalities=["TEXT", "IMAGE"],
+        image_config=types.ImageConfig(
+          aspect_ratio="1:1",
+        ),
       ),
     ),
+    tokens=estimate_tokens(input_images, generation_prompt),
   )
 
   # Extract the generated image
@@ -1440,7 +1428,7 @@ Examples:
 
   try:
     if not args.no_start_server:
-      web_server = start_web_server(WEB_DIR, args.port)
+      web_server = start_web_server(WEB_RENDER_DIR, args.port)
 
     success = generate_tile_nano_banana(
       generation_dir,
@@ -42,7 +42,6 @@ Output structure:
 import argparse
 import os
 import sqlite3
-import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -50,13 +49,19 @@ from google import genai
 from google.genai import types
 from PIL import Image
 
+from isometric_hanford.generation.gemini_rate_limiter import (
+  call_with_rate_limit,
+  estimate_tokens,
+)
+from isometric_hanford.generation.gemini_upload_cache import upload_image
 from isometric_hanford.generation.generate_tile_nano_banana import (
+  GEMINI_MODEL,
   parse_quadrant_list,
   render_quadrant,
 )
 from isometric_hanford.generation.shared import (
   DEFAULT_WEB_PORT,
-  WEB_DIR,
+  WEB_RENDER_DIR,
   get_generation_config,
   get_quadrant_generation,
   get_quadrant_render,
@@ -116,22 +121,14 @@ def call_gemini_water_mask(
   # Build contents list with images
   contents: list = []
 
-  # Upload input image
-  with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-    input_path = tmp.name
-    input_image.save(input_path)
-
   # Save input to debug dir
   if debug_dir:
     input_debug_path = debug_dir / "input.png"
     input_image.save(input_debug_path)
     print(f"      ✓ Saved input: {input_debug_path}")
 
-  try:
-    input_ref = client.files.upload(file=input_path)
-    contents.append(input_ref)
-  finally:
-    Path(input_path).unlink(missing_ok=True)
+  # Upload input image (reusing any earlier upload of the same image)
+  contents.append(upload_image(client, input_image))
 
   # Use custom prompt or default
   generation_prompt = prompt if prompt else WATER_MASK_PROMPT
@@ -157,15 +154,19 @@ def call_gemini_water_mask(
   print("=" * 60 + "\n")
 
   print("   🤖 Calling Gemini API...")
-  response = client.models.generate_content(
-    model="gemini-3-pro-image-preview",
-    contents=contents,
-    config=types.GenerateContentConfig(
-      response_modalities=["TEXT", "IMAGE"],
-      image_config=types.ImageConfig(
-        aspect_ratio="1:1",
+  response = call_with_rate_limit(
+    GEMINI_MODEL,
+    lambda: client.models.generate_content(
+      model=GEMINI_MODEL,
+      contents=contents,
+      config=types.GenerateContentConfig(
+        response_modalities=["TEXT", "IMAGE"],
+        image_config=types.ImageConfig(
+          aspect_ratio="1:1",
+        ),
       ),
     ),
+    tokens=estimate_tokens([input_image], generation_prompt),
   )
 
   # Extract the generated image
@@ -448,7 +449,7 @@ Examples:
   try:
     # Only start web server if using renders (not the default)
     if args.use_render and not args.no_start_server:
-      web_server = start_web_server(WEB_DIR, args.port)
+      web_server = start_web_server(WEB_RENDER_DIR, args.port)
 
     # Generate water mask for each tile
     success_count = 0
@@ -0,0 +1,139 @@
+"""
+Shared HTTP session for inference and image download calls.
+
+Bare `requests.post()` / `requests.get()` open a new connection (and TLS
+handshake) for every call. Generation talks to the same few hosts over and
+over - the Oxen API, the local inference server and GCS - so calls go
+through one shared `requests.Session` instead, whose connection pool keeps
+connections alive between calls.
+
+The session retries failed connects and 429/502/503/504 responses (honoring
+Retry-After), with exponential backoff. POSTs are not idempotent - a paid
+edit call must not run twice - so they are only resent when the server
+never processed them: failed connects, 429 and 503. A 502/504 only means a
+gateway gave up waiting, not that the upstream skipped the request. The
+final response is returned either way, so `raise_for_status()` behaves as
+it did with bare requests.
+
+The session may be used from any number of threads at once; the pool holds
+up to `pool_size` idle connections per host.
+"""
+
+import threading
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Idle keep-alive connections kept per host (more can be open at once)
+DEFAULT_POOL_SIZE = 16
+
+# Retries for connection errors and retryable statuses
+DEFAULT_RETRIES = 3
+
+# Retry delays are backoff_factor * 2 ** (retry - 1) seconds: 0.5s, 1s, 2s
+DEFAULT_BACKOFF_FACTOR = 0.5
+
+# Statuses worth retrying for idempotent requests
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+# Statuses that mean the request wasn't processed, so are safe to resend
+# even for POSTs
+UNPROCESSED_STATUS_CODES = frozenset({429, 503})
+
+
+class PostSafeRetry(Retry):
+  """Retry policy that only resends POSTs on UNPROCESSED_STATUS_CODES."""
+
+  def is_retry(
+    self, method: str, status_code: int, has_retry_after: bool = False
+  ) -> bool:
+    if method.upper() == "POST" and status_code not in UNPROCESSED_STATUS_CODES:
+      return False
+    return super().is_retry(method, status_code, has_retry_after)
+
+
+def create_session(
+  pool_size: int = DEFAULT_POOL_SIZE,
+  retries: int = DEFAULT_RETRIES,
+  backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+  status_forcelist: tuple[int, ...] = RETRY_STATUS_CODES,
+) -> requests.Session:
+  """
+  Create a session with a keep-alive connection pool and retry policy.
+
+  Args:
+    pool_size: Idle connections kept per host
+    retries: Retries for connection errors and status_forcelist responses
+      (0 disables retrying)
+    backoff_factor: Base delay for exponential backoff between retries
+    status_forcelist: Response statuses to retry (POSTs only on those also
+      in UNPROCESSED_STATUS_CODES)
+
+  Returns:
+    A configured requests.Session
+  """
+  retry = PostSafeRetry(
+    total=retries,
+    connect=retries,
+    # A read error means the server may have processed the request
+    read=0,
+    status=retries,
+    status_forcelist=status_forcelist,
+    allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+    backoff_factor=backoff_factor,
+    respect_retry_after_header=True,
+    raise_on_status=False,
+  )
+  adapter = HTTPAdapter(
+    pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+  )
+  session = requests.Session()
+  session.mount("http://", adapter)
+  session.mount("https://", adapter)
+  return session
+
+
+# Global session shared by the generation HTTP calls
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+  """
+  Get the global session, creating it with the default settings on first use.
+  """
+  global _session
+
+  with _session_lock:
+    if _session is None:
+      _session = create_session()
+    return _session
+
+
+def configure_session(**kwargs: Any) -> requests.Session:
+  """
+  Replace the global session. Takes the same arguments as create_session().
+
+  Connections held by the previous session are closed.
+  """
+  global _session
+
+  with _session_lock:
+    previous = _session
+    _session = create_session(**kwargs)
+  if previous is not None:
+    previous.close()
+  return _session
+
+
+def close_session() -> None:
+  """Close the global session's connections (a new one is made on next use)."""
+  global _session
+
+  with _session_lock:
+    previous = _session
+    _session = None
+  if previous is not None:
+    previous.close()
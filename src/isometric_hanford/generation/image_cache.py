@@ -0,0 +1,135 @@
+"""
+In-process LRU cache of decoded quadrant images.
+
+Template building decodes the same neighboring context quadrants over and
+over as consecutive queue items in a plan walk across a rectangle. This
+caches decoded PIL images keyed by (x, y, column, content hash), bounded by
+the decoded (uncompressed) size of the cached images.
+
+Because the content hash is part of the key, an entry can never be served
+for different image bytes. The save_quadrant_* functions additionally
+invalidate entries for the quadrant they overwrite, to free memory early.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from PIL import Image
+
+# 512 MB holds ~500 decoded 512x512 RGBA quadrants
+DEFAULT_IMAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+ImageCacheKey = tuple[int, int, str, str]
+
+
+def decoded_size(image: Image.Image) -> int:
+  """Approximate memory used by a decoded image, in bytes."""
+  return image.width * image.height * len(image.getbands())
+
+
+class DecodedImageCache:
+  """
+  Thread-safe, byte-size-bounded LRU cache of decoded PIL images.
+
+  Images are copied on the way in and out, so callers may modify the
+  images they get back.
+  """
+
+  def __init__(self, max_bytes: int = DEFAULT_IMAGE_CACHE_MAX_BYTES):
+    self.max_bytes = max_bytes
+    self._lock = threading.Lock()
+    self._entries: OrderedDict[ImageCacheKey, tuple[Image.Image, int]] = OrderedDict()
+    self._size_bytes = 0
+
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self.invalidations = 0
+
+  def get(self, key: ImageCacheKey) -> Image.Image | None:
+    """Get a copy of the cached image for a key, or None on a miss."""
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        self.misses += 1
+        return None
+      self._entries.move_to_end(key)
+      self.hits += 1
+      image = entry[0]
+    return image.copy()
+
+  def put(self, key: ImageCacheKey, image: Image.Image) -> None:
+    """Cache a copy of an image, evicting LRU entries to stay under max_bytes."""
+    size = decoded_size(image)
+    if size > self.max_bytes:
+      return
+    image = image.copy()
+
+    with self._lock:
+      old = self._entries.pop(key, None)
+      if old is not None:
+        self._size_bytes -= old[1]
+      self._entries[key] = (image, size)
+      self._size_bytes += size
+
+      while self._size_bytes > self.max_bytes:
+        _, (_, old_size) = self._entries.popitem(last=False)
+        self._size_bytes -= old_size
+        self.evictions += 1
+
+  def invalidate(self, x: int, y: int, column: str | None = None) -> int:
+    """
+    Drop cached images for quadrant (x, y), optionally only for one column.
+
+    Returns the number of entries removed.
+    """
+    with self._lock:
+      keys = [
+        key
+        for key in self._entries
+        if key[0] == x and key[1] == y and (column is None or key[2] == column)
+      ]
+      for key in keys:
+        _, size = self._entries.pop(key)
+        self._size_bytes -= size
+      self.invalidations += len(keys)
+      return len(keys)
+
+  def clear(self) -> None:
+    """Drop every cached image and reset the counters."""
+    with self._lock:
+      self._entries.clear()
+      self._size_bytes = 0
+      self.hits = 0
+      self.misses = 0
+      self.evictions = 0
+      self.invalidations = 0
+
+  def __len__(self) -> int:
+    with self._lock:
+      return len(self._entries)
+
+  def get_stats(self) -> dict[str, Any]:
+    """Get hit/miss counts and current cache size."""
+    with self._lock:
+      lookups = self.hits + self.misses
+      return {
+        "entries": len(self._entries),
+        "size_bytes": self._size_bytes,
+        "max_bytes": self.max_bytes,
+        "hits": self.hits,
+        "misses": self.misses,
+        "evictions": self.evictions,
+        "invalidations": self.invalidations,
+        "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+      }
+
+
+# Global cache shared by every QuadrantHelpers in the process
+_image_cache = DecodedImageCache()
+
+
+def get_decoded_image_cache() -> DecodedImageCache:
+  """Get the process-wide decoded image cache."""
+  return _image_cache
@@ -20,6 +20,7 @@ Algorithm:
 
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -250,35 +251,42 @@ def place_2x2_tiles(
 
   # First pass: Place 2x2 tiles avoiding both generated AND scheduled neighbors
   # This creates a pattern with gaps for bridging
-  while True:
-    valid_positions = find_all_valid_2x2_positions(
-      bounds, generated, scheduled, allow_adjacent_scheduled=False
-    )
-    if not valid_positions:
-      break
-
-    tl = valid_positions[0]
-    quadrants = get_2x2_quadrants(tl)
-    steps.append(GenerationStep(quadrants=quadrants, step_type="2x2"))
-    for q in quadrants:
-      scheduled.add(q)
+  _place_2x2_pass(bounds, generated, scheduled, steps, allow_adjacent_scheduled=False)
 
   # Second pass: Fill remaining 2x2-sized gaps by allowing adjacent to scheduled
   # This helps cover areas that can't be reached by bridges
-  while True:
-    valid_positions = find_all_valid_2x2_positions(
-      bounds, generated, scheduled, allow_adjacent_scheduled=True
-    )
-    if not valid_positions:
-      break
+  _place_2x2_pass(bounds, generated, scheduled, steps, allow_adjacent_scheduled=True)
+
+  return steps, scheduled
+
+
+def _place_2x2_pass(
+  bounds: RectBounds,
+  generated: set[Point],
+  scheduled: set[Point],
+  steps: list[GenerationStep],
+  allow_adjacent_scheduled: bool,
+) -> None:
+  """
+  Repeatedly place a 2x2 tile at the first valid position, in row-major order.
+
+  Scheduling a tile can only invalidate positions (never validate them), so
+  the candidates found by one scan are the only positions that can ever be
+  placed in this pass, and the first one still valid is always the next
+  placement. Each candidate is re-checked against the tiles placed so far
+  instead of rescanning the whole rectangle after every placement.
 
-    tl = valid_positions[0]
+  Appends the placed steps to `steps` and their quadrants to `scheduled`.
+  """
+  candidates = find_all_valid_2x2_positions(
+    bounds, generated, scheduled, allow_adjacent_scheduled
+  )
+  for tl in candidates:
+    if not can_place_2x2(tl, bounds, generated, scheduled, allow_adjacent_scheduled):
+      continue
     quadrants = get_2x2_quadrants(tl)
     steps.append(GenerationStep(quadrants=quadrants, step_type="2x2"))
-    for q in quadrants:
-      scheduled.add(q)
-
-  return steps, scheduled
+    scheduled.update(quadrants)
 
 
 # =============================================================================
@@ -327,10 +335,11 @@ def can_place_2x1_horizontal(
 
   # "Generated" for the purpose of long-side check includes both
   # pre-existing generated AND scheduled quadrants
-  combined = generated | scheduled
+  def covered(p: Point) -> bool:
+    return p in generated or p in scheduled
 
-  top_both_generated = top_left in combined and top_right in combined
-  bottom_both_generated = bottom_left in combined and bottom_right in combined
+  top_both_generated = covered(top_left) and covered(top_right)
+  bottom_both_generated = covered(bottom_left) and covered(bottom_right)
 
   # At least one side must be fully generated
   return top_both_generated or bottom_both_generated
@@ -375,10 +384,11 @@ def can_place_1x2_vertical(
   right_top = Point(top.x + 1, top.y)
   right_bottom = Point(top.x + 1, bottom.y)
 
-  combined = generated | scheduled
+  def covered(p: Point) -> bool:
+    return p in generated or p in scheduled
 
-  left_both_generated = left_top in combined and left_bottom in combined
-  right_both_generated = right_top in combined and right_bottom in combined
+  left_both_generated = covered(left_top) and covered(left_bottom)
+  right_both_generated = covered(right_top) and covered(right_bottom)
 
   # At least one side must be fully generated
   return left_both_generated or right_both_generated
@@ -430,27 +440,64 @@ def place_2x1_tiles(
   steps: list[GenerationStep] = []
   new_scheduled = set(scheduled)
 
-  # Keep placing tiles until no more can be placed
-  while True:
-    valid_positions = find_all_valid_2x1_positions(bounds, generated, new_scheduled)
-    if not valid_positions:
-      break
-
-    # Pick the first valid position
-    pos, tile_type = valid_positions[0]
+  # Valid positions keyed by (type order, y, x), so the heap's smallest
+  # entry matches the first entry of find_all_valid_2x1_positions(): all
+  # vertical 1x2 tiles in row-major order, then all horizontal 2x1 tiles.
+  # Entries may go stale; they are re-checked when popped.
+  candidates = [
+    (_2X1_TYPE_ORDER[tile_type], pos.y, pos.x)
+    for pos, tile_type in find_all_valid_2x1_positions(bounds, generated, new_scheduled)
+  ]
+  heapq.heapify(candidates)
 
-    if tile_type == "2x1":
-      quadrants = [pos, Point(pos.x + 1, pos.y)]
-    else:  # 1x2
-      quadrants = [pos, Point(pos.x, pos.y + 1)]
+  # Keep placing tiles until no more can be placed
+  while candidates:
+    key = heapq.heappop(candidates)
+    if not _can_place_2x1_key(key, bounds, generated, new_scheduled):
+      continue
+
+    # Place the first valid position
+    order, y, x = key
+    if order == _2X1_TYPE_ORDER["2x1"]:
+      tile_type = "2x1"
+      quadrants = [Point(x, y), Point(x + 1, y)]
+    else:
+      tile_type = "1x2"
+      quadrants = [Point(x, y), Point(x, y + 1)]
 
     steps.append(GenerationStep(quadrants=quadrants, step_type=tile_type))
     for q in quadrants:
       new_scheduled.add(q)
 
+    # A placement only changes the validity of positions whose tile or
+    # neighbors include the new quadrants, so only those are re-evaluated
+    for q in quadrants:
+      for ny in range(q.y - 2, q.y + 2):
+        for nx in range(q.x - 2, q.x + 2):
+          for order in _2X1_TYPE_ORDER.values():
+            key = (order, ny, nx)
+            if _can_place_2x1_key(key, bounds, generated, new_scheduled):
+              heapq.heappush(candidates, key)
+
   return steps, new_scheduled
 
 
+_2X1_TYPE_ORDER = {"1x2": 0, "2x1": 1}
+
+
+def _can_place_2x1_key(
+  key: tuple[int, int, int],
+  bounds: RectBounds,
+  generated: set[Point],
+  scheduled: set[Point],
+) -> bool:
+  """Check a (type order, y, x) candidate from place_2x1_tiles."""
+  order, y, x = key
+  if order == _2X1_TYPE_ORDER["2x1"]:
+    return can_place_2x1_horizontal(Point(x, y), bounds, generated, scheduled)
+  return can_place_1x2_vertical(Point(x, y), bounds, generated, scheduled)
+
+
 # =============================================================================
 # 1x1 Tile Placement
 # =============================================================================
@@ -546,7 +593,6 @@ def place_1x1_tiles(
   """
   steps: list[GenerationStep] = []
   combined = generated | scheduled
-  new_scheduled = set(scheduled)
 
   # Find all remaining unscheduled quadrants within bounds
   remaining = [p for p in bounds.all_points() if p not in combined]
@@ -555,29 +601,29 @@ def place_1x1_tiles(
   # This helps ensure we place tiles in an order that maintains context
   def priority(p: Point) -> int:
     blocks = get_2x2_block_positions(p)
-    max_generated = max(
-      count_generated_in_block(block, combined | new_scheduled) for block in blocks
-    )
+    max_generated = max(count_generated_in_block(block, combined) for block in blocks)
     return -max_generated  # Negative for descending sort
 
   remaining.sort(key=priority)
 
+  # Everything generated or scheduled so far, kept up to date as we place
+  placed = set(combined)
+
   # Keep iterating until no more valid placements
   # (as each placement may enable new valid placements)
   changed = True
   while changed:
     changed = False
-    for p in list(remaining):
-      if p in new_scheduled:
-        remaining.remove(p)
-        continue
-
+    still_remaining = []
+    for p in remaining:
       # Check if this 1x1 has valid context
-      if can_place_1x1(p, combined | new_scheduled):
+      if can_place_1x1(p, placed):
         steps.append(GenerationStep(quadrants=[p], step_type="1x1"))
-        new_scheduled.add(p)
-        remaining.remove(p)
+        placed.add(p)
         changed = True
+      else:
+        still_remaining.append(p)
+    remaining = still_remaining
 
   return steps
 
@@ -30,6 +30,22 @@ class ModelConfig:
   use_base64: bool = (
     True  # Use base64 encoding for URL inference (faster, default True)
   )
+  # Optional raw image/png endpoint for URL inference (e.g. the server's
+  # edit_png). Preferred over the base64/multipart endpoint when set.
+  binary_endpoint: str | None = None
+  binary_endpoint_env: str | None = (
+    None  # Environment variable name for the binary endpoint (overrides if set)
+  )
+  # Optional batch endpoint for URL inference (e.g. the server's edit_batch).
+  # Concurrent calls (max_concurrency > 1) are grouped into one request.
+  batch_endpoint: str | None = None
+  batch_endpoint_env: str | None = (
+    None  # Environment variable name for the batch endpoint (overrides if set)
+  )
+  # Oxen-style models: send templates inline as base64 data URLs and ask for
+  # base64 results, instead of uploading to GCS and downloading the result.
+  # The endpoint must accept data URLs for input_image.
+  inline_images: bool = False
   is_water_mask: bool = (
     False  # If True, save output to water_mask column instead of generation
   )
@@ -46,6 +62,8 @@ class ModelConfig:
   noise: float | None = None  # 0.0-1.0, amount of noise to add
   # Optional default prompt for this model (used if no user prompt is provided)
   prompt: str | None = None
+  # Max queue items this model processes at once (e.g. endpoint replicas)
+  max_concurrency: int = 1
 
   @property
   def api_key(self) -> str | None:
@@ -61,6 +79,24 @@ class ModelConfig:
         return env_endpoint
     return self.endpoint
 
+  @property
+  def resolved_binary_endpoint(self) -> str | None:
+    """Get the binary endpoint, checking binary_endpoint_env first if set."""
+    if self.binary_endpoint_env:
+      env_endpoint = os.getenv(self.binary_endpoint_env)
+      if env_endpoint:
+        return env_endpoint
+    return self.binary_endpoint
+
+  @property
+  def resolved_batch_endpoint(self) -> str | None:
+    """Get the batch endpoint, checking batch_endpoint_env first if set."""
+    if self.batch_endpoint_env:
+      env_endpoint = os.getenv(self.batch_endpoint_env)
+      if env_endpoint:
+        return env_endpoint
+    return self.batch_endpoint
+
   @property
   def is_local(self) -> bool:
     """Check if this model uses URL-based inference (local server or remote URL)."""
@@ -91,6 +127,18 @@ class ModelConfig:
       result["noise"] = self.noise
     if self.prompt is not None:
       result["prompt"] = self.prompt
+    # Include max_concurrency if more than one item can run at once
+    if self.max_concurrency != 1:
+      result["max_concurrency"] = self.max_concurrency
+    # Include binary_endpoint if set
+    if self.binary_endpoint is not None:
+      result["binary_endpoint"] = self.binary_endpoint
+    # Include batch_endpoint if set
+    if self.batch_endpoint is not None:
+      result["batch_endpoint"] = self.batch_endpoint
+    # Include inline_images if set
+    if self.inline_images:
+      result["inline_images"] = self.inline_images
     return result
 
 
@@ -114,6 +162,21 @@ class AppConfig:
       return self.get_model(self.default_model_id)
     return self.models[0] if self.models else None
 
+  def get_max_concurrency(self) -> dict[str | None, int]:
+    """
+    Get each model's in-flight item limit, keyed by model_id.
+
+    Queue items without a model_id run on the default model, so None maps
+    to the default model's limit.
+    """
+    limits: dict[str | None, int] = {
+      m.model_id: max(1, m.max_concurrency) for m in self.models
+    }
+    default_model = self.get_default_model()
+    if default_model is not None:
+      limits[None] = max(1, default_model.max_concurrency)
+    return limits
+
   def to_dict(self) -> dict[str, Any]:
     """Convert to dictionary for JSON serialization."""
     return {
@@ -157,12 +220,18 @@ def load_app_config(config_path: Path | None = None) -> AppConfig:
         num_inference_steps=model_data.get("num_inference_steps", 28),
         model_type=model_data.get("model_type", "oxen"),
         use_base64=model_data.get("use_base64", True),
+        binary_endpoint=model_data.get("binary_endpoint"),
+        binary_endpoint_env=model_data.get("binary_endpoint_env"),
+        batch_endpoint=model_data.get("batch_endpoint"),
+        batch_endpoint_env=model_data.get("batch_endpoint_env"),
+        inline_images=model_data.get("inline_images", False),
         is_water_mask=model_data.get("is_water_mask", False),
         is_dark_mode=model_data.get("is_dark_mode", False),
         desaturation=model_data.get("desaturation"),
         gamma_shift=model_data.get("gamma_shift"),
         noise=model_data.get("noise"),
         prompt=model_data.get("prompt"),
+        max_concurrency=model_data.get("max_concurrency", 1),
       )
     )
 
@@ -229,6 +298,18 @@ def save_app_config(config: AppConfig, config_path: Path | None = None) -> None:
       model_dict["noise"] = model.noise
     if model.prompt is not None:
       model_dict["prompt"] = model.prompt
+    if model.max_concurrency != 1:
+      model_dict["max_concurrency"] = model.max_concurrency
+    if model.binary_endpoint is not None:
+      model_dict["binary_endpoint"] = model.binary_endpoint
+    if model.binary_endpoint_env is not None:
+      model_dict["binary_endpoint_env"] = model.binary_endpoint_env
+    if model.batch_endpoint is not None:
+      model_dict["batch_endpoint"] = model.batch_endpoint
+    if model.batch_endpoint_env is not None:
+      model_dict["batch_endpoint_env"] = model.batch_endpoint_env
+    if model.inline_images:
+      model_dict["inline_images"] = model.inline_images
 
     data["models"].append(model_dict)
 
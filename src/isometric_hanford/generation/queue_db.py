@@ -3,15 +3,30 @@ Database-backed generation queue.
 
 Provides a robust, persistent queue for generation and render requests
 that survives server restarts and doesn't rely on client-side state.
+
+Items are claimed with a lease: the claiming worker's id and an expiry time
+are stored on the row, and the worker renews the lease (LeaseHeartbeat)
+while it processes the item. Several worker processes can therefore share
+one queue.db - a claim is a single atomic UPDATE, and items whose worker
+died are reclaimed once their lease expires.
 """
 
 import json
+import os
+import socket
 import sqlite3
+import threading
 import time
+import uuid
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 
+# How long a claim stays valid without a heartbeat. LeaseHeartbeat renews
+# every third of this, so a worker has to miss several renewals to lose it.
+DEFAULT_LEASE_SECONDS = 60.0
+
 
 class QueueItemType(str, Enum):
   GENERATE = "generate"
@@ -120,6 +135,11 @@ def init_queue_table(conn: sqlite3.Connection) -> None:
   cursor.execute("""
     CREATE INDEX IF NOT EXISTS idx_queue_status ON generation_queue(status)
   """)
+  # Per-model FIFO order, so dequeueing is an index seek per model
+  cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_queue_status_model_created
+    ON generation_queue(status, model_id, created_at)
+  """)
 
   # Migration: Add columns if they don't exist (for existing dbs)
   cursor.execute("PRAGMA table_info(generation_queue)")
@@ -130,6 +150,10 @@ def init_queue_table(conn: sqlite3.Connection) -> None:
     cursor.execute("ALTER TABLE generation_queue ADD COLUMN prompt TEXT")
   if "negative_prompt" not in columns:
     cursor.execute("ALTER TABLE generation_queue ADD COLUMN negative_prompt TEXT")
+  if "worker_id" not in columns:
+    cursor.execute("ALTER TABLE generation_queue ADD COLUMN worker_id TEXT")
+  if "lease_expires_at" not in columns:
+    cursor.execute("ALTER TABLE generation_queue ADD COLUMN lease_expires_at REAL")
 
   conn.commit()
 
@@ -203,6 +227,108 @@ def add_to_queue(
   )
 
 
+def add_many_to_queue(
+  conn: sqlite3.Connection,
+  item_type: QueueItemType,
+  quadrant_groups: list[list[tuple[int, int]]],
+  model_id: str | None = None,
+  prompt: str | None = None,
+  negative_prompt: str | None = None,
+) -> list[tuple[QueueItem, int]]:
+  """
+  Add several items (e.g. every step of a plan) to the queue at once.
+
+  All items are inserted with a single executemany() in one transaction,
+  so a plan is either queued completely or not at all. Items keep their
+  order: each gets a slightly later created_at than the one before.
+
+  Args:
+    conn: Database connection
+    item_type: Type of operation for every item
+    quadrant_groups: The quadrants of each item, in queue order
+    model_id: Optional model ID for every item
+    prompt: Optional additional prompt text for every item
+    negative_prompt: Optional negative prompt text for every item
+
+  Returns:
+    (item, position) for each created item, where position is the item's
+    1-based position within its model's pending queue
+  """
+  if not quadrant_groups:
+    return []
+
+  cursor = conn.cursor()
+  if not conn.in_transaction:
+    # Hold the write lock so the new ids are contiguous and the counts exact
+    cursor.execute("BEGIN IMMEDIATE")
+
+  try:
+    cursor.execute(
+      """
+      SELECT COUNT(*) FROM generation_queue WHERE status = ? AND model_id IS ?
+      """,
+      (QueueItemStatus.PENDING.value, model_id),
+    )
+    pending_ahead = cursor.fetchone()[0]
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM generation_queue")
+    max_id_before = cursor.fetchone()[0]
+
+    # 1µs apart keeps created_at strictly increasing within the batch
+    now = time.time()
+    created_at = [now + i * 1e-6 for i in range(len(quadrant_groups))]
+    cursor.executemany(
+      """
+      INSERT INTO generation_queue
+        (item_type, quadrants, model_id, status, created_at, prompt, negative_prompt)
+      VALUES (?, ?, ?, ?, ?, ?, ?)
+      """,
+      (
+        (
+          item_type.value,
+          json.dumps(quadrants),
+          model_id,
+          QueueItemStatus.PENDING.value,
+          created,
+          prompt,
+          negative_prompt,
+        )
+        for quadrants, created in zip(quadrant_groups, created_at)
+      ),
+    )
+    cursor.execute(
+      "SELECT id FROM generation_queue WHERE id > ? ORDER BY id",
+      (max_id_before,),
+    )
+    item_ids = [row[0] for row in cursor.fetchall()]
+    conn.commit()
+  except Exception:
+    conn.rollback()
+    raise
+
+  return [
+    (
+      QueueItem(
+        id=item_id,
+        item_type=item_type,
+        quadrants=quadrants,
+        model_id=model_id,
+        status=QueueItemStatus.PENDING,
+        created_at=created,
+        started_at=None,
+        completed_at=None,
+        error_message=None,
+        result_message=None,
+        prompt=prompt,
+        negative_prompt=negative_prompt,
+      ),
+      pending_ahead + i + 1,
+    )
+    for i, (item_id, quadrants, created) in enumerate(
+      zip(item_ids, quadrant_groups, created_at)
+    )
+  ]
+
+
 def get_next_pending_item(conn: sqlite3.Connection) -> QueueItem | None:
   """
   Get the next pending item from the queue.
@@ -226,13 +352,68 @@ def get_next_pending_item(conn: sqlite3.Connection) -> QueueItem | None:
   return QueueItem.from_row(row) if row else None
 
 
+# Lists the head (oldest pending item) of every available model's queue,
+# oldest first, without reading every pending row: a recursive CTE skips
+# through the distinct pending model_ids on idx_queue_status_model_created,
+# then takes the head of each model not marked busy (one index seek each).
+# Parameters: :pending, :busy (JSON array of non-NULL busy model_ids) and
+# :null_busy (1 if the default/NULL model is busy).
+_AVAILABLE_HEADS_SQL = """
+  WITH RECURSIVE pending_models(model_id) AS (
+    SELECT (SELECT MIN(model_id) FROM generation_queue WHERE status = :pending)
+    UNION ALL
+    SELECT (
+      SELECT MIN(model_id) FROM generation_queue
+      WHERE status = :pending AND model_id > pending_models.model_id
+    )
+    FROM pending_models
+    WHERE pending_models.model_id IS NOT NULL
+  ),
+  heads(id) AS (
+    SELECT (
+      SELECT id FROM generation_queue
+      WHERE status = :pending AND model_id = pending_models.model_id
+      ORDER BY created_at, id
+      LIMIT 1
+    )
+    FROM pending_models
+    WHERE pending_models.model_id IS NOT NULL
+      AND pending_models.model_id NOT IN (SELECT value FROM json_each(:busy))
+    UNION ALL
+    SELECT (
+      SELECT id FROM generation_queue
+      WHERE status = :pending AND model_id IS NULL
+      ORDER BY created_at, id
+      LIMIT 1
+    )
+    WHERE NOT :null_busy
+  )
+  SELECT queue.id, queue.quadrants, queue.context_quadrants
+  FROM heads
+  JOIN generation_queue AS queue ON queue.id = heads.id
+  ORDER BY queue.created_at, queue.id
+"""
+
+
+def _available_model_params(busy_models: set[str | None]) -> dict[str, Any]:
+  """Query parameters for _AVAILABLE_HEADS_SQL."""
+  return {
+    "pending": QueueItemStatus.PENDING.value,
+    "busy": json.dumps(sorted(m for m in busy_models if m is not None)),
+    "null_busy": None in busy_models,
+  }
+
+
 def get_next_pending_item_for_available_model(
   conn: sqlite3.Connection, busy_models: set[str | None]
 ) -> QueueItem | None:
   """
   Get the next pending item for a model that isn't currently busy.
 
-  This enables parallel processing of different models' queues.
+  This enables parallel processing of different models' queues. The
+  model filter runs in SQL, so the cost doesn't grow with queue length.
+  Use claim_next_pending_item_for_available_model() to also mark the item
+  as processing.
 
   Args:
     conn: Database connection
@@ -242,27 +423,329 @@ def get_next_pending_item_for_available_model(
   Returns None if no available items.
   """
   cursor = conn.cursor()
-
-  # Get all pending items ordered by creation time
   cursor.execute(
-    """
+    f"""
     SELECT id, item_type, quadrants, model_id, status,
            created_at, started_at, completed_at, error_message, result_message,
            context_quadrants, prompt, negative_prompt
     FROM generation_queue
-    WHERE status = ?
-    ORDER BY created_at ASC
+    WHERE id = (SELECT id FROM ({_AVAILABLE_HEADS_SQL}) LIMIT 1)
     """,
-    (QueueItemStatus.PENDING.value,),
+    _available_model_params(busy_models),
   )
+  row = cursor.fetchone()
+  return QueueItem.from_row(row) if row else None
+
+
+def make_worker_id() -> str:
+  """Build a worker id that is unique across processes on this machine."""
+  return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
 
-  for row in cursor.fetchall():
-    item = QueueItem.from_row(row)
-    # Check if this model is available (not busy)
-    if item.model_id not in busy_models:
-      return item
+def _reclaim_expired_leases(cursor: sqlite3.Cursor, now: float) -> int:
+  """Return processing items with an expired (or no) lease to pending."""
+  cursor.execute(
+    """
+    UPDATE generation_queue
+    SET status = ?, started_at = NULL, worker_id = NULL, lease_expires_at = NULL
+    WHERE status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)
+    """,
+    (QueueItemStatus.PENDING.value, QueueItemStatus.PROCESSING.value, now),
+  )
+  return cursor.rowcount
 
-  return None
+
+def reclaim_expired_leases(conn: sqlite3.Connection) -> int:
+  """
+  Return processing items whose lease has expired to the pending queue.
+
+  Items claimed before leases existed (no lease_expires_at) count as
+  expired. claim_next_pending_item_for_available_model() already does this
+  before every claim; call it directly e.g. on server startup.
+
+  Returns the number of items reclaimed.
+  """
+  cursor = conn.cursor()
+  reclaimed = _reclaim_expired_leases(cursor, time.time())
+  conn.commit()
+  return reclaimed
+
+
+def _parse_quadrants(value: str | None) -> set[tuple[int, int]]:
+  """Parse a JSON list of [x, y] pairs into a set of tuples."""
+  return {(q[0], q[1]) for q in json.loads(value)} if value else set()
+
+
+def _item_footprint(
+  quadrants: set[tuple[int, int]], context_quadrants: set[tuple[int, int]]
+) -> set[tuple[int, int]]:
+  """
+  Quadrants an item may read while it runs: its own quadrants, their
+  neighbors (candidates for lazily calculated context) and any explicit
+  context quadrants.
+  """
+  footprint = set(context_quadrants)
+  for x, y in quadrants:
+    for dx in (-1, 0, 1):
+      for dy in (-1, 0, 1):
+        footprint.add((x + dx, y + dy))
+  return footprint
+
+
+def claim_next_pending_item_for_available_model(
+  conn: sqlite3.Connection,
+  busy_models: set[str | None] | None = None,
+  worker_id: str | None = None,
+  lease_seconds: float = DEFAULT_LEASE_SECONDS,
+  max_concurrency: Mapping[str | None, int] | None = None,
+) -> QueueItem | None:
+  """
+  Atomically claim the next pending item for a model that isn't busy.
+
+  In one write transaction, expired leases are reclaimed and the in-flight
+  items (processing with a live lease, in any worker process) are counted
+  per model. A model is available while it has fewer in-flight items than
+  its max_concurrency. The oldest pending item of each available model is
+  considered, oldest first, and the first one that doesn't overlap an
+  in-flight item is marked as processing with UPDATE ... RETURNING.
+
+  Two items overlap if either one generates a quadrant the other generates
+  or may read as context (neighbors and explicit context quadrants).
+  Models only ever start their oldest pending item, so an item that is
+  blocked by an overlap is never overtaken by later items of its model.
+
+  Two workers - even in different processes - can never claim the same
+  item, run overlapping items at once, or exceed a model's limit.
+
+  Args:
+    conn: Database connection
+    busy_models: Set of model_ids that shouldn't be claimed for, regardless
+                 of their limit (None represents the default/no model)
+    worker_id: Id of the claiming worker (see make_worker_id)
+    lease_seconds: How long the claim is valid without a renew_lease()
+    max_concurrency: In-flight item limit per model_id (None for the default
+                     model). Models not listed are limited to one item.
+
+  Returns the claimed item (status processing), or None if no available items.
+  """
+  limits = max_concurrency or {}
+  now = time.time()
+  cursor = conn.cursor()
+  if not conn.in_transaction:
+    # Take the write lock up front so the reclaim and claim see one snapshot
+    cursor.execute("BEGIN IMMEDIATE")
+
+  try:
+    _reclaim_expired_leases(cursor, now)
+
+    # Everything still processing holds a live lease
+    cursor.execute(
+      """
+      SELECT model_id, quadrants, context_quadrants
+      FROM generation_queue
+      WHERE status = ?
+      """,
+      (QueueItemStatus.PROCESSING.value,),
+    )
+    in_flight_counts: dict[str | None, int] = {}
+    in_flight_quadrants: set[tuple[int, int]] = set()
+    in_flight_footprint: set[tuple[int, int]] = set()
+    for model_id, quadrants_json, context_json in cursor.fetchall():
+      in_flight_counts[model_id] = in_flight_counts.get(model_id, 0) + 1
+      quadrants = _parse_quadrants(quadrants_json)
+      in_flight_quadrants |= quadrants
+      in_flight_footprint |= _item_footprint(quadrants, _parse_quadrants(context_json))
+
+    busy = set(busy_models or ()) | {
+      model_id
+      for model_id, count in in_flight_counts.items()
+      if count >= max(1, limits.get(model_id, 1))
+    }
+
+    cursor.execute(
+      _AVAILABLE_HEADS_SQL,
+      _available_model_params(busy),
+    )
+    item_id = None
+    for head_id, quadrants_json, context_json in cursor.fetchall():
+      quadrants = _parse_quadrants(quadrants_json)
+      footprint = _item_footprint(quadrants, _parse_quadrants(context_json))
+      if footprint.isdisjoint(in_flight_quadrants) and quadrants.isdisjoint(
+        in_flight_footprint
+      ):
+        item_id = head_id
+        break
+
+    row = None
+    if item_id is not None:
+      cursor.execute(
+        """
+        UPDATE generation_queue
+        SET status = ?, started_at = ?, worker_id = ?, lease_expires_at = ?
+        WHERE id = ? AND status = ?
+        RETURNING id, item_type, quadrants, model_id, status,
+                  created_at, started_at, completed_at, error_message, result_message,
+                  context_quadrants, prompt, negative_prompt
+        """,
+        (
+          QueueItemStatus.PROCESSING.value,
+          now,
+          worker_id,
+          now + lease_seconds,
+          item_id,
+          QueueItemStatus.PENDING.value,
+        ),
+      )
+      row = cursor.fetchone()
+    conn.commit()
+  except Exception:
+    conn.rollback()
+    raise
+
+  return QueueItem.from_row(row) if row else None
+
+
+def get_in_flight_counts(conn: sqlite3.Connection) -> dict[str | None, int]:
+  """
+  Count items with a live lease (being processed by any worker) per model.
+
+  Returns a dict mapping model_id (None for the default model) -> count.
+  """
+  cursor = conn.cursor()
+  cursor.execute(
+    """
+    SELECT model_id, COUNT(*)
+    FROM generation_queue
+    WHERE status = ? AND lease_expires_at >= ?
+    GROUP BY model_id
+    """,
+    (QueueItemStatus.PROCESSING.value, time.time()),
+  )
+  return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def renew_lease(
+  conn: sqlite3.Connection,
+  item_id: int,
+  worker_id: str | None,
+  lease_seconds: float = DEFAULT_LEASE_SECONDS,
+) -> bool:
+  """
+  Extend the lease on an item claimed by worker_id (the heartbeat).
+
+  Returns False if the worker no longer holds the item - it was cancelled,
+  finished, or reclaimed by another worker after the lease expired.
+  """
+  cursor = conn.cursor()
+  cursor.execute(
+    """
+    UPDATE generation_queue
+    SET lease_expires_at = ?
+    WHERE id = ? AND worker_id IS ? AND status = ?
+    """,
+    (
+      time.time() + lease_seconds,
+      item_id,
+      worker_id,
+      QueueItemStatus.PROCESSING.value,
+    ),
+  )
+  conn.commit()
+  return cursor.rowcount > 0
+
+
+class LeaseHeartbeat:
+  """
+  Keeps the lease on a claimed item alive from a background thread.
+
+  Renews every `interval` seconds (default a third of the lease) while the
+  with-block runs. If a renewal finds the lease was lost, `lost` is set and
+  the heartbeat stops.
+
+  Args:
+    connect: Returns a database connection; each renewal closes its own
+    item_id: The claimed item
+    worker_id: The worker that claimed it
+    lease_seconds: Lease length set on each renewal
+    interval: Seconds between renewals
+  """
+
+  def __init__(
+    self,
+    connect: Callable[[], sqlite3.Connection],
+    item_id: int,
+    worker_id: str | None,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    interval: float | None = None,
+  ):
+    self.connect = connect
+    self.item_id = item_id
+    self.worker_id = worker_id
+    self.lease_seconds = lease_seconds
+    self.interval = lease_seconds / 3 if interval is None else interval
+    self.lost = False
+    self._stop = threading.Event()
+    self._thread: threading.Thread | None = None
+
+  def _run(self) -> None:
+    while not self._stop.wait(self.interval):
+      try:
+        conn = self.connect()
+        try:
+          renewed = renew_lease(conn, self.item_id, self.worker_id, self.lease_seconds)
+        finally:
+          conn.close()
+      except sqlite3.Error as e:
+        # Try again next interval - the lease outlives a few missed renewals
+        print(f"⚠️  Lease renewal failed for item {self.item_id}: {e}")
+        continue
+
+      if not renewed:
+        self.lost = True
+        return
+
+  def __enter__(self) -> "LeaseHeartbeat":
+    self._thread = threading.Thread(
+      target=self._run, name=f"lease-heartbeat-{self.item_id}", daemon=True
+    )
+    self._thread.start()
+    return self
+
+  def __exit__(self, *exc_info) -> None:
+    self._stop.set()
+    if self._thread is not None:
+      self._thread.join()
+
+
+def release_claimed_item(
+  conn: sqlite3.Connection, item_id: int, worker_id: str | None = None
+) -> bool:
+  """
+  Put a claimed (processing) item back in the pending queue.
+
+  Used when a dispatched item won't be processed after all. Items that were
+  cancelled or finished in the meantime are left alone, as are items
+  claimed by a different worker if worker_id is given.
+
+  Returns True if the item was returned to the queue.
+  """
+  cursor = conn.cursor()
+  cursor.execute(
+    """
+    UPDATE generation_queue
+    SET status = ?, started_at = NULL, worker_id = NULL, lease_expires_at = NULL
+    WHERE id = ? AND status = ? AND (? IS NULL OR worker_id = ?)
+    """,
+    (
+      QueueItemStatus.PENDING.value,
+      item_id,
+      QueueItemStatus.PROCESSING.value,
+      worker_id,
+      worker_id,
+    ),
+  )
+  conn.commit()
+  return cursor.rowcount > 0
 
 
 def get_processing_item(conn: sqlite3.Connection) -> QueueItem | None:
@@ -288,48 +771,74 @@ def get_processing_item(conn: sqlite3.Connection) -> QueueItem | None:
   return QueueItem.from_row(row) if row else None
 
 
-def mark_item_processing(conn: sqlite3.Connection, item_id: int) -> None:
-  """Mark a queue item as processing."""
-  cursor = conn.cursor()
-  cursor.execute(
-    """
-    UPDATE generation_queue
-    SET status = ?, started_at = ?
-    WHERE id = ?
-    """,
-    (QueueItemStatus.PROCESSING.value, time.time(), item_id),
-  )
-  conn.commit()
+def mark_item_complete(
+  conn: sqlite3.Connection,
+  item_id: int,
+  result_message: str | None = None,
+  worker_id: str | None = None,
+) -> bool:
+  """
+  Mark a queue item as complete.
 
+  If worker_id is given, the item is only updated while that worker still
+  holds its lease (it may have been cancelled or reclaimed meanwhile).
 
-def mark_item_complete(
-  conn: sqlite3.Connection, item_id: int, result_message: str | None = None
-) -> None:
-  """Mark a queue item as complete."""
+  Returns True if the item was updated.
+  """
   cursor = conn.cursor()
   cursor.execute(
     """
     UPDATE generation_queue
     SET status = ?, completed_at = ?, result_message = ?
-    WHERE id = ?
+    WHERE id = ? AND (? IS NULL OR (worker_id = ? AND status = ?))
     """,
-    (QueueItemStatus.COMPLETE.value, time.time(), result_message, item_id),
+    (
+      QueueItemStatus.COMPLETE.value,
+      time.time(),
+      result_message,
+      item_id,
+      worker_id,
+      worker_id,
+      QueueItemStatus.PROCESSING.value,
+    ),
   )
   conn.commit()
+  return cursor.rowcount > 0
 
 
-def mark_item_error(conn: sqlite3.Connection, item_id: int, error_message: str) -> None:
-  """Mark a queue item as errored."""
+def mark_item_error(
+  conn: sqlite3.Connection,
+  item_id: int,
+  error_message: str,
+  worker_id: str | None = None,
+) -> bool:
+  """
+  Mark a queue item as errored.
+
+  If worker_id is given, the item is only updated while that worker still
+  holds its lease.
+
+  Returns True if the item was updated.
+  """
   cursor = conn.cursor()
   cursor.execute(
     """
     UPDATE generation_queue
     SET status = ?, completed_at = ?, error_message = ?
-    WHERE id = ?
+    WHERE id = ? AND (? IS NULL OR (worker_id = ? AND status = ?))
     """,
-    (QueueItemStatus.ERROR.value, time.time(), error_message, item_id),
+    (
+      QueueItemStatus.ERROR.value,
+      time.time(),
+      error_message,
+      item_id,
+      worker_id,
+      worker_id,
+      QueueItemStatus.PROCESSING.value,
+    ),
   )
   conn.commit()
+  return cursor.rowcount > 0
 
 
 def get_pending_queue(conn: sqlite3.Connection) -> list[QueueItem]:
@@ -349,6 +858,16 @@ def get_pending_queue(conn: sqlite3.Connection) -> list[QueueItem]:
   return [QueueItem.from_row(row) for row in cursor.fetchall()]
 
 
+def count_pending_items(conn: sqlite3.Connection) -> int:
+  """Count pending items without loading them."""
+  cursor = conn.cursor()
+  cursor.execute(
+    "SELECT COUNT(*) FROM generation_queue WHERE status = ?",
+    (QueueItemStatus.PENDING.value,),
+  )
+  return cursor.fetchone()[0]
+
+
 def get_queue_position(conn: sqlite3.Connection, item_id: int) -> int:
   """
   Get the position of an item in the queue.
@@ -430,13 +949,14 @@ def get_queue_status_by_model(conn: sqlite3.Connection) -> dict[str, Any]:
   Returns a dictionary with:
     - by_model: dict mapping model_id -> {
         is_processing: bool,
-        current_item: dict | None,
+        current_item: dict | None (most recently started item),
+        in_flight_count: int (items currently processing),
         pending_count: int,
         pending_items: list of dicts,
         position: int (1-based, 0 if processing)
       }
     - total_pending: int
-    - processing_models: list of model_ids currently processing
+    - processing_models: list of distinct model_ids currently processing
     - all_processing_quadrants: list of all quadrants currently being processed
   """
   processing_items = get_all_processing_items(conn)
@@ -451,6 +971,7 @@ def get_queue_status_by_model(conn: sqlite3.Connection) -> dict[str, Any]:
       by_model[model_id] = {
         "is_processing": False,
         "current_item": None,
+        "in_flight_count": 0,
         "pending_count": 0,
         "pending_items": [],
       }
@@ -463,7 +984,8 @@ def get_queue_status_by_model(conn: sqlite3.Connection) -> dict[str, Any]:
 
   for processing in processing_items:
     model_id = processing.model_id or "default"
-    processing_models.append(model_id)
+    if model_id not in processing_models:
+      processing_models.append(model_id)
 
     # Collect all processing quadrants
     if processing.quadrants:
@@ -473,12 +995,14 @@ def get_queue_status_by_model(conn: sqlite3.Connection) -> dict[str, Any]:
       by_model[model_id] = {
         "is_processing": True,
         "current_item": processing.to_dict(),
+        "in_flight_count": 1,
         "pending_count": 0,
         "pending_items": [],
       }
     else:
       by_model[model_id]["is_processing"] = True
       by_model[model_id]["current_item"] = processing.to_dict()
+      by_model[model_id]["in_flight_count"] += 1
 
   return {
     "by_model": by_model,
@@ -548,8 +1072,10 @@ def reset_all_processing_items(conn: sqlite3.Connection) -> int:
   """
   Reset ALL items in 'processing' state back to 'pending'.
 
-  This should be called on server startup to ensure any items that were
-  interrupted mid-processing (e.g., due to server shutdown) are retried.
+  This retries items that were interrupted mid-processing (e.g., due to
+  server shutdown). Only safe when no other worker process shares the
+  queue - otherwise use reclaim_expired_leases(), which leaves live
+  claims alone.
 
   Returns the number of items reset.
   """
@@ -576,8 +1102,8 @@ def cleanup_stale_processing(
   This handles cases where the server crashed during processing.
   Items older than max_age_seconds are reset to 'pending'.
 
-  Note: For server startup, use reset_all_processing_items() instead,
-  which resets all processing items regardless of age.
+  Note: Claiming reclaims items whose lease has expired, which recovers
+  crashed workers without a fixed timeout. See reclaim_expired_leases().
 
   Returns the number of items reset.
   """
@@ -0,0 +1,288 @@
+"""
+Content-addressed on-disk cache for Playwright tile renders.
+
+Renders are deterministic for a given camera (lat, lng, width, height,
+azimuth, elevation, view_height), so the full screenshot PNG is stored under
+a hash of those parameters. Deleting a render from a generation DB, or
+seeding a fresh DB for the same area, can then be served from disk without
+launching a browser.
+
+The cache is bounded by total size and evicts least-recently-used entries
+(file mtime is bumped on every hit, so recency survives restarts).
+
+The cache is opt-in: scripts use it when the RENDER_CACHE_DIR environment
+variable is set, and the generation app when started with --render-cache.
+By default it lives in the user cache directory
+(`~/.cache/isometric_hanford/renders`, or under XDG_CACHE_HOME).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_RENDER_CACHE_DIR = (
+  Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache")
+  / "isometric_hanford"
+  / "renders"
+)
+DEFAULT_RENDER_CACHE_MAX_BYTES = 1024**3  # 1 GB
+
+# Bump to invalidate every cached render (e.g. after changing the web renderer)
+RENDER_CACHE_VERSION = 1
+
+# Query params that fully describe a tile render URL (see build_tile_render_url)
+_TILE_URL_PARAMS = ("lat", "lon", "azimuth", "elevation", "view_height")
+
+
+def render_cache_key(
+  lat: float,
+  lng: float,
+  width_px: int,
+  height_px: int,
+  azimuth: float,
+  elevation: float,
+  view_height: float,
+) -> str:
+  """
+  Build the cache key for a render with the given camera parameters.
+
+  Floats are rounded so that values which went through a URL round-trip
+  (str -> float) map to the same key as the originals.
+  """
+  params = {
+    "v": RENDER_CACHE_VERSION,
+    "lat": round(float(lat), 9),
+    "lng": round(float(lng), 9),
+    "width": int(width_px),
+    "height": int(height_px),
+    "azimuth": round(float(azimuth), 6),
+    "elevation": round(float(elevation), 6),
+    "view_height": round(float(view_height), 6),
+  }
+  payload = json.dumps(params, sort_keys=True)
+  return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def render_cache_key_for_url(url: str, width: int, height: int) -> str | None:
+  """
+  Build the cache key for a tile render URL, or None if the URL is not a
+  tile render (only export URLs built by build_tile_render_url are cached).
+  """
+  query = parse_qs(urlparse(url).query)
+  if query.get("export") != ["true"]:
+    return None
+  if any(len(query.get(name, [])) != 1 for name in _TILE_URL_PARAMS):
+    return None
+
+  try:
+    return render_cache_key(
+      lat=float(query["lat"][0]),
+      lng=float(query["lon"][0]),
+      width_px=width,
+      height_px=height,
+      azimuth=float(query["azimuth"][0]),
+      elevation=float(query["elevation"][0]),
+      view_height=float(query["view_height"][0]),
+    )
+  except ValueError:
+    return None
+
+
+class RenderCache:
+  """
+  Size-bounded LRU cache of render PNGs on disk.
+
+  Entries live at `<cache_dir>/<key[:2]>/<key>.png`. The index of entries is
+  loaded lazily from the directory on first use. All methods are
+  thread-safe; several processes may share a directory (writes are atomic),
+  but each process only evicts entries it knows about.
+  """
+
+  def __init__(
+    self,
+    cache_dir: Path = DEFAULT_RENDER_CACHE_DIR,
+    max_bytes: int = DEFAULT_RENDER_CACHE_MAX_BYTES,
+  ):
+    self.cache_dir = Path(cache_dir)
+    self.max_bytes = max_bytes
+    self._lock = threading.Lock()
+    # key -> size in bytes, least recently used first
+    self._entries: OrderedDict[str, int] = OrderedDict()
+    self._size_bytes = 0
+    self._loaded = False
+
+    self.hits = 0
+    self.misses = 0
+    self.writes = 0
+    self.evictions = 0
+
+  def _path(self, key: str) -> Path:
+    return self.cache_dir / key[:2] / f"{key}.png"
+
+  def _load_index(self) -> None:
+    """Scan the cache directory, oldest entries first. Caller holds the lock."""
+    if self._loaded:
+      return
+    self._loaded = True
+    if not self.cache_dir.exists():
+      return
+
+    found = []
+    for path in self.cache_dir.glob("*/*.png"):
+      try:
+        stat = path.stat()
+      except OSError:
+        continue
+      found.append((stat.st_mtime, path.stem, stat.st_size))
+
+    for _, key, size in sorted(found):
+      self._entries[key] = size
+      self._size_bytes += size
+
+  def _forget(self, key: str) -> None:
+    size = self._entries.pop(key, None)
+    if size is not None:
+      self._size_bytes -= size
+
+  def get(self, key: str) -> bytes | None:
+    """Get the cached PNG bytes for a key, or None on a miss."""
+    with self._lock:
+      self._load_index()
+      path = self._path(key)
+      try:
+        data = path.read_bytes()
+      except OSError:
+        # Evicted by another process (or never written)
+        self._forget(key)
+        self.misses += 1
+        return None
+
+      try:
+        os.utime(path)
+      except OSError:
+        pass
+
+      if key in self._entries:
+        self._entries.move_to_end(key)
+      else:
+        # Written by another process sharing the directory
+        self._entries[key] = len(data)
+        self._size_bytes += len(data)
+      self.hits += 1
+      return data
+
+  def put(self, key: str, data: bytes) -> None:
+    """Store PNG bytes for a key, evicting LRU entries to stay under max_bytes."""
+    if len(data) > self.max_bytes:
+      return
+
+    with self._lock:
+      self._load_index()
+      path = self._path(key)
+      path.parent.mkdir(parents=True, exist_ok=True)
+
+      # Write to a temp file and rename so readers never see a partial PNG
+      tmp_path = path.with_name(f".{key}.{uuid.uuid4().hex}.tmp")
+      tmp_path.write_bytes(data)
+      os.replace(tmp_path, path)
+
+      self._forget(key)
+      self._entries[key] = len(data)
+      self._size_bytes += len(data)
+      self.writes += 1
+
+      while self._size_bytes > self.max_bytes and self._entries:
+        old_key, old_size = self._entries.popitem(last=False)
+        self._size_bytes -= old_size
+        self.evictions += 1
+        try:
+          self._path(old_key).unlink()
+        except OSError:
+          pass
+
+  def clear(self) -> int:
+    """Delete every cached render. Returns the number of entries removed."""
+    with self._lock:
+      self._load_index()
+      removed = 0
+      for key in list(self._entries):
+        try:
+          self._path(key).unlink()
+          removed += 1
+        except OSError:
+          pass
+      self._entries.clear()
+      self._size_bytes = 0
+      return removed
+
+  def __len__(self) -> int:
+    with self._lock:
+      self._load_index()
+      return len(self._entries)
+
+  def get_stats(self) -> dict[str, Any]:
+    """Get hit/miss counts and current cache size."""
+    with self._lock:
+      self._load_index()
+      lookups = self.hits + self.misses
+      return {
+        "cache_dir": str(self.cache_dir),
+        "entries": len(self._entries),
+        "size_bytes": self._size_bytes,
+        "max_bytes": self.max_bytes,
+        "hits": self.hits,
+        "misses": self.misses,
+        "writes": self.writes,
+        "evictions": self.evictions,
+        "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+      }
+
+
+# Global cache shared by render_url_to_bytes and WebRenderer
+_render_cache: RenderCache | None = None
+_render_cache_configured = False
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> RenderCache | None:
+  """
+  Get the global render cache, or None if caching is disabled.
+
+  Unless configure_render_cache() has been called, a cache is created in
+  RENDER_CACHE_DIR on first use if that is set; otherwise caching is off.
+  """
+  global _render_cache, _render_cache_configured
+
+  with _render_cache_lock:
+    if not _render_cache_configured:
+      cache_dir = os.getenv("RENDER_CACHE_DIR")
+      _render_cache = RenderCache(Path(cache_dir)) if cache_dir else None
+      _render_cache_configured = True
+    return _render_cache
+
+
+def configure_render_cache(
+  cache_dir: Path | None = DEFAULT_RENDER_CACHE_DIR,
+  max_bytes: int = DEFAULT_RENDER_CACHE_MAX_BYTES,
+) -> RenderCache | None:
+  """
+  Replace the global render cache. Pass cache_dir=None to disable caching.
+  """
+  global _render_cache, _render_cache_configured
+
+  with _render_cache_lock:
+    _render_cache = RenderCache(cache_dir, max_bytes) if cache_dir else None
+    _render_cache_configured = True
+    return _render_cache
+
+
+def get_render_cache_stats() -> dict[str, Any] | None:
+  """Get stats for the global render cache, or None if disabled."""
+  cache = get_render_cache()
+  return cache.get_stats() if cache is not None else None
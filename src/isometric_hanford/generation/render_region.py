@@ -0,0 +1,290 @@
+"""
+Batch-render a rectangle of quadrants using super-tile renders.
+
+A regular render produces one 2x2 tile (4 quadrants) per page load, and
+adjacent renders re-render overlapping geometry. This script instead covers
+the rectangle with blocks of up to batch×batch quadrants, renders each block
+as a single larger viewport (same meters-per-pixel as a regular tile), and
+slices the screenshot into quadrants that are saved to the database.
+
+With the default 8x8 batch, a 500x500 quadrant map takes ~3,900 page loads
+instead of ~62,500 non-overlapping 2x2 tile renders.
+
+Usage:
+  uv run python src/isometric_hanford/generation/render_region.py <generation_dir> \\
+    --tl "0,0" --br "49,49" [--batch 8] [--no-overwrite]
+"""
+
+import argparse
+import math
+import sqlite3
+import time
+from pathlib import Path
+
+from isometric_hanford.generation.make_rectangle_plan import Point
+from isometric_hanford.generation.shared import (
+  DEFAULT_WEB_PORT,
+  WEB_RENDER_DIR,
+  build_tile_render_url,
+  calculate_region_render_params,
+  get_generation_config,
+  image_to_png_bytes,
+  render_url_to_image,
+  save_quadrant_render,
+  split_image_into_quadrant_grid,
+  start_web_server,
+)
+
+# Default super-tile size in quadrants per side. With 512px quadrants an 8x8
+# block is a 4096x4096 viewport, which Chromium/WebGL handles comfortably.
+DEFAULT_BATCH_SIZE = 8
+
+
+def plan_region_batches(
+  tl: Point, br: Point, batch_width: int, batch_height: int
+) -> list[tuple[int, int, int, int]]:
+  """
+  Split the inclusive rectangle tl..br into super-tile blocks.
+
+  Blocks are laid out row by row from the top-left. Blocks on the right and
+  bottom edges are clipped to the rectangle.
+
+  Returns:
+    List of (x, y, nx, ny) blocks, where (x, y) is the block's top-left
+    quadrant and nx×ny its size in quadrants.
+  """
+  batches = []
+  for y in range(tl.y, br.y + 1, batch_height):
+    ny = min(batch_height, br.y - y + 1)
+    for x in range(tl.x, br.x + 1, batch_width):
+      nx = min(batch_width, br.x - x + 1)
+      batches.append((x, y, nx, ny))
+  return batches
+
+
+def count_tile_renders(tl: Point, br: Point) -> int:
+  """Number of non-overlapping 2x2 tile renders needed to cover tl..br."""
+  width = br.x - tl.x + 1
+  height = br.y - tl.y + 1
+  return math.ceil(width / 2) * math.ceil(height / 2)
+
+
+def get_rendered_quadrants(
+  conn: sqlite3.Connection, tl: Point, br: Point
+) -> set[tuple[int, int]]:
+  """Get all quadrants within tl..br that already have a render."""
+  cursor = conn.cursor()
+  cursor.execute(
+    """
+    SELECT quadrant_x, quadrant_y FROM quadrants
+    WHERE quadrant_x BETWEEN ? AND ? AND quadrant_y BETWEEN ? AND ?
+      AND render IS NOT NULL
+    """,
+    (tl.x, br.x, tl.y, br.y),
+  )
+  return {(row[0], row[1]) for row in cursor.fetchall()}
+
+
+def render_region_batch(
+  conn: sqlite3.Connection,
+  config: dict,
+  x: int,
+  y: int,
+  nx: int,
+  ny: int,
+  port: int = DEFAULT_WEB_PORT,
+) -> int:
+  """
+  Render the nx×ny block with (x, y) at the top-left in one page load and
+  save every quadrant render to the database.
+
+  Returns:
+    Number of quadrants saved
+  """
+  params = calculate_region_render_params(config, x, y, nx, ny)
+  url = build_tile_render_url(
+    port=port,
+    lat=params["lat"],
+    lng=params["lng"],
+    width_px=params["width_px"],
+    height_px=params["height_px"],
+    azimuth=config["camera_azimuth_degrees"],
+    elevation=config["camera_elevation_degrees"],
+    view_height=params["view_height_meters"],
+  )
+
+  image = render_url_to_image(url, params["width_px"], params["height_px"])
+  quadrant_images = split_image_into_quadrant_grid(image, nx, ny)
+
+  saved = 0
+  for (dx, dy), quad_img in quadrant_images.items():
+    png_bytes = image_to_png_bytes(quad_img)
+    if save_quadrant_render(conn, config, x + dx, y + dy, png_bytes):
+      saved += 1
+  return saved
+
+
+def render_region(
+  generation_dir: Path,
+  tl: Point,
+  br: Point,
+  batch_size: int = DEFAULT_BATCH_SIZE,
+  port: int = DEFAULT_WEB_PORT,
+  overwrite: bool = True,
+  dry_run: bool = False,
+) -> dict:
+  """
+  Render every quadrant in tl..br using super-tile batches.
+
+  Returns:
+    Dict with page_loads, quadrants_saved, skipped_batches, and elapsed_s
+  """
+  db_path = generation_dir / "quadrants.db"
+  if not db_path.exists():
+    raise FileNotFoundError(f"Database not found: {db_path}")
+
+  conn = sqlite3.connect(db_path)
+  try:
+    config = get_generation_config(conn)
+    batches = plan_region_batches(tl, br, batch_size, batch_size)
+    rendered = set() if overwrite else get_rendered_quadrants(conn, tl, br)
+
+    print(f"📐 Rendering region {tl} to {br} in {len(batches)} super-tile(s)")
+    print(f"   (2x2 tile mode would need {count_tile_renders(tl, br)} renders)")
+
+    stats = {
+      "page_loads": 0,
+      "quadrants_saved": 0,
+      "skipped_batches": 0,
+      "elapsed_s": 0.0,
+    }
+    start = time.time()
+
+    for i, (x, y, nx, ny) in enumerate(batches):
+      block = {(x + dx, y + dy) for dx in range(nx) for dy in range(ny)}
+      if block <= rendered:
+        stats["skipped_batches"] += 1
+        continue
+
+      print(f"   🎨 [{i + 1}/{len(batches)}] Block ({x},{y}) {nx}x{ny}")
+      if dry_run:
+        continue
+
+      saved = render_region_batch(conn, config, x, y, nx, ny, port)
+      stats["quadrants_saved"] += saved
+      stats["page_loads"] += 1
+
+    stats["elapsed_s"] = round(time.time() - start, 2)
+    return stats
+  finally:
+    conn.close()
+
+
+def main():
+  parser = argparse.ArgumentParser(
+    description="Batch-render a rectangle of quadrants using super-tile renders."
+  )
+  parser.add_argument(
+    "generation_dir",
+    type=Path,
+    help="Path to the generation directory containing quadrants.db",
+  )
+  parser.add_argument(
+    "--tl",
+    type=str,
+    required=True,
+    help="Top-left quadrant (x,y). For negative coords use --tl='-1,-2'",
+  )
+  parser.add_argument(
+    "--br",
+    type=str,
+    required=True,
+    help="Bottom-right quadrant (x,y). For negative coords use --br='-1,-2'",
+  )
+  parser.add_argument(
+    "--batch",
+    type=int,
+    default=DEFAULT_BATCH_SIZE,
+    help=f"Super-tile size in quadrants per side (default: {DEFAULT_BATCH_SIZE})",
+  )
+  parser.add_argument(
+    "--port",
+    type=int,
+    default=DEFAULT_WEB_PORT,
+    help=f"Web server port (default: {DEFAULT_WEB_PORT})",
+  )
+  parser.add_argument(
+    "--no-start-server",
+    action="store_true",
+    help="Don't start web server (assume it's already running)",
+  )
+  parser.add_argument(
+    "--no-overwrite",
+    action="store_true",
+    help="Skip blocks whose quadrants all already have renders",
+  )
+  parser.add_argument(
+    "--dry-run",
+    action="store_true",
+    help="Show the batch plan without rendering",
+  )
+
+  args = parser.parse_args()
+
+  try:
+    tl = Point.from_string(args.tl)
+    br = Point.from_string(args.br)
+  except ValueError as e:
+    print(f"❌ Error parsing coordinates: {e}")
+    return 1
+
+  if tl.x > br.x or tl.y > br.y:
+    print("❌ Error: top-left must be above and to the left of bottom-right")
+    return 1
+
+  if args.batch < 2:
+    print("❌ Error: --batch must be at least 2")
+    return 1
+
+  generation_dir = args.generation_dir.resolve()
+  if not generation_dir.exists():
+    print(f"❌ Error: Directory not found: {generation_dir}")
+    return 1
+
+  web_server = None
+
+  try:
+    if not args.no_start_server and not args.dry_run:
+      web_server = start_web_server(WEB_RENDER_DIR, args.port)
+
+    stats = render_region(
+      generation_dir,
+      tl,
+      br,
+      batch_size=args.batch,
+      port=args.port,
+      overwrite=not args.no_overwrite,
+      dry_run=args.dry_run,
+    )
+    print(
+      f"✅ Saved {stats['quadrants_saved']} quadrant(s) in "
+      f"{stats['page_loads']} page load(s), {stats['elapsed_s']}s "
+      f"({stats['skipped_batches']} block(s) skipped)"
+    )
+    return 0
+
+  except FileNotFoundError as e:
+    print(f"❌ Error: {e}")
+    return 1
+  except KeyboardInterrupt:
+    print("\n⚠️  Interrupted by user")
+    return 1
+  finally:
+    if web_server:
+      print("🛑 Stopping web server...")
+      web_server.terminate()
+      web_server.wait()
+
+
+if __name__ == "__main__":
+  exit(main())
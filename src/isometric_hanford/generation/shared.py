@@ -4,15 +4,21 @@ Shared utilities for e2e generation scripts.
 Contains common database operations, web server management, and image utilities.
 """
 
+import atexit
+import hashlib
 import io
 import json
 import math
 import sqlite3
 import subprocess
+import threading
 import time
 import urllib.error
 import urllib.request
 import uuid
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from io import BytesIO
 from pathlib import Path
 from urllib.parse import urlencode
@@ -21,6 +27,12 @@ from google.cloud import storage
 from PIL import Image
 from playwright.sync_api import sync_playwright
 
+from isometric_hanford.generation.image_cache import get_decoded_image_cache
+from isometric_hanford.generation.render_cache import (
+  get_render_cache,
+  render_cache_key_for_url,
+)
+
 # Web render server configuration
 WEB_RENDER_DIR = Path(__file__).parent.parent.parent / "web_render"
 DEFAULT_WEB_PORT = 5173
@@ -125,6 +137,221 @@ def start_web_server(web_dir: Path, port: int) -> subprocess.Popen:
 # =============================================================================
 
 
+# Recycle a page (context + page) after this many renders to bound memory growth
+# in long-running Chromium sessions.
+DEFAULT_MAX_RENDERS_PER_PAGE = 50
+
+
+@dataclass
+class RenderTimings:
+  """Wall-clock timings for a single page render, in seconds."""
+
+  launch_s: float = 0.0
+  navigation_s: float = 0.0
+  tiles_wait_s: float = 0.0
+  screenshot_s: float = 0.0
+  # True if the page never reported TILES_LOADED (the render may be partial)
+  tiles_timed_out: bool = False
+
+  @property
+  def total_s(self) -> float:
+    return self.launch_s + self.navigation_s + self.tiles_wait_s + self.screenshot_s
+
+  def summary(self) -> str:
+    """Format the timings as a single log line."""
+    parts = []
+    if self.launch_s > 0:
+      parts.append(f"launch {self.launch_s:.2f}s")
+    parts.append(f"nav {self.navigation_s:.2f}s")
+    parts.append(f"tiles {self.tiles_wait_s:.2f}s")
+    parts.append(f"screenshot {self.screenshot_s:.2f}s")
+    return f"{self.total_s:.2f}s ({', '.join(parts)})"
+
+
+class PooledPage:
+  """
+  A warm Chromium page that is reused across renders.
+
+  Launching Chromium dominates the cost of a single render, so this keeps the
+  Playwright driver, browser, context and page alive between calls. The page
+  is recycled (new context + page on the same browser) after `max_renders`
+  renders, and the whole browser is relaunched after any render error.
+
+  Playwright's sync API is bound to the thread that started it, so a
+  PooledPage must only be used from the thread that created it.
+  """
+
+  def __init__(self, max_renders: int = DEFAULT_MAX_RENDERS_PER_PAGE):
+    self.max_renders = max_renders
+    self.render_count = 0
+    self.launch_count = 0
+    self._playwright = None
+    self._browser = None
+    self._context = None
+    self._page = None
+    self._viewport: tuple[int, int] | None = None
+
+  @property
+  def is_open(self) -> bool:
+    return self._browser is not None and self._browser.is_connected()
+
+  def _ensure_page(self, width: int, height: int) -> float:
+    """Make sure a page with the given viewport exists. Returns launch time."""
+    start = time.perf_counter()
+    launched = False
+
+    if not self.is_open:
+      self.close()
+      self._playwright = sync_playwright().start()
+      self._browser = self._playwright.chromium.launch(
+        headless=True,
+        args=CHROMIUM_ARGS,
+      )
+      self.launch_count += 1
+      launched = True
+
+    if self._page is None or self._page.is_closed():
+      self._close_page()
+      self._context = self._browser.new_context(
+        viewport={"width": width, "height": height},
+        device_scale_factor=1,
+      )
+      self._page = self._context.new_page()
+      self._viewport = (width, height)
+      launched = True
+    elif self._viewport != (width, height):
+      self._page.set_viewport_size({"width": width, "height": height})
+      self._viewport = (width, height)
+
+    return time.perf_counter() - start if launched else 0.0
+
+  def render(
+    self,
+    url: str,
+    width: int,
+    height: int,
+    wait_for_tiles: bool = True,
+    timeout_ms: int = 60000,
+  ) -> tuple[bytes, RenderTimings]:
+    """
+    Render a URL to PNG bytes, reusing the warm page.
+
+    Returns:
+      Tuple of (PNG bytes, RenderTimings)
+    """
+    timings = RenderTimings()
+    try:
+      timings.launch_s = self._ensure_page(width, height)
+      page = self._page
+
+      start = time.perf_counter()
+      page.goto(url, wait_until="networkidle")
+      timings.navigation_s = time.perf_counter() - start
+
+      if wait_for_tiles:
+        start = time.perf_counter()
+        try:
+          page.wait_for_function("window.TILES_LOADED === true", timeout=timeout_ms)
+        except Exception:
+          print("      ⚠️  Timeout waiting for tiles, continuing anyway...")
+          timings.tiles_timed_out = True
+        timings.tiles_wait_s = time.perf_counter() - start
+
+      start = time.perf_counter()
+      screenshot_bytes = page.screenshot(type="png")
+      timings.screenshot_s = time.perf_counter() - start
+    except Exception:
+      # The browser may have crashed - start from scratch next time
+      self.close()
+      raise
+
+    self.render_count += 1
+    if self.render_count % self.max_renders == 0:
+      self._close_page()
+
+    return screenshot_bytes, timings
+
+  def _close_page(self) -> None:
+    """Close the current context and page, keeping the browser alive."""
+    for obj in (self._page, self._context):
+      if obj is not None:
+        try:
+          obj.close()
+        except Exception:
+          pass
+    self._page = None
+    self._context = None
+    self._viewport = None
+
+  def close(self) -> None:
+    """Close the page, browser and Playwright driver."""
+    self._close_page()
+    if self._browser is not None:
+      try:
+        self._browser.close()
+      except Exception:
+        pass
+      self._browser = None
+    if self._playwright is not None:
+      try:
+        self._playwright.stop()
+      except Exception:
+        pass
+      self._playwright = None
+
+
+# One warm page per thread for render_url_to_bytes
+_thread_pages = threading.local()
+
+
+def get_thread_pooled_page() -> PooledPage | None:
+  """
+  Get the warm PooledPage owned by the current thread.
+
+  The main thread's page is created on first use and closed at exit.
+  Playwright can only be stopped from its own thread, so other threads only
+  have a page inside a thread_pooled_page() block; outside one, this
+  returns None.
+  """
+  pooled = getattr(_thread_pages, "page", None)
+  if pooled is None and threading.current_thread() is threading.main_thread():
+    pooled = PooledPage()
+    _thread_pages.page = pooled
+    atexit.register(pooled.close)
+  return pooled
+
+
+def close_thread_pooled_page() -> None:
+  """Close the current thread's warm PooledPage, if any."""
+  pooled = getattr(_thread_pages, "page", None)
+  if pooled is not None:
+    pooled.close()
+    _thread_pages.page = None
+
+
+@contextmanager
+def thread_pooled_page() -> Iterator[PooledPage]:
+  """
+  Keep a warm PooledPage for the current thread's renders within the block.
+
+  Worker threads (plan steps, request handlers) wrap their renders in this
+  so they share one browser, which is closed when the block exits. On the
+  main thread the page stays open until exit.
+  """
+  # The main thread's page outlives the block; nested blocks share the page
+  pooled = get_thread_pooled_page()
+  if pooled is not None:
+    yield pooled
+    return
+
+  pooled = PooledPage()
+  _thread_pages.page = pooled
+  try:
+    yield pooled
+  finally:
+    close_thread_pooled_page()
+
+
 def render_url_to_bytes(
   url: str,
   width: int,
@@ -136,7 +363,11 @@ def render_url_to_bytes(
   Render a URL to PNG bytes using Playwright.
 
   This is a shared utility for rendering web pages to images with consistent
-  Chromium configuration across all scripts.
+  Chromium configuration across all scripts. The browser is kept warm in a
+  per-thread PooledPage (on the main thread, or in a worker thread inside
+  thread_pooled_page()), so only the first render pays the Chromium launch
+  cost. Tile render URLs (see build_tile_render_url) are
+  served from the on-disk render cache when possible.
 
   Args:
       url: The URL to render
@@ -148,32 +379,36 @@ def render_url_to_bytes(
   Returns:
       PNG image bytes
   """
-  with sync_playwright() as p:
-    browser = p.chromium.launch(
-      headless=True,
-      args=CHROMIUM_ARGS,
-    )
-
-    context = browser.new_context(
-      viewport={"width": width, "height": height},
-      device_scale_factor=1,
+  cache = get_render_cache()
+  cache_key = None
+  if cache is not None and wait_for_tiles:
+    cache_key = render_cache_key_for_url(url, width, height)
+    if cache_key is not None:
+      cached = cache.get(cache_key)
+      if cached is not None:
+        print("      💾 Render served from cache")
+        return cached
+
+  pooled = get_thread_pooled_page()
+  if pooled is not None:
+    screenshot_bytes, timings = pooled.render(
+      url, width, height, wait_for_tiles, timeout_ms
     )
-    page = context.new_page()
-
-    page.goto(url, wait_until="networkidle")
-
-    if wait_for_tiles:
-      try:
-        page.wait_for_function("window.TILES_LOADED === true", timeout=timeout_ms)
-      except Exception:
-        print("      ⚠️  Timeout waiting for tiles, continuing anyway...")
-
-    screenshot_bytes = page.screenshot(type="png")
-
-    page.close()
-    context.close()
-    browser.close()
+  else:
+    # A worker thread outside thread_pooled_page(): nothing would close a
+    # warm browser, so use one for this render only
+    one_shot = PooledPage()
+    try:
+      screenshot_bytes, timings = one_shot.render(
+        url, width, height, wait_for_tiles, timeout_ms
+      )
+    finally:
+      one_shot.close()
+  print(f"      ⏱️  Render took {timings.summary()}")
 
+  # Don't cache renders that may be missing tiles
+  if cache_key is not None and not timings.tiles_timed_out:
+    cache.put(cache_key, screenshot_bytes)
   return screenshot_bytes
 
 
@@ -329,6 +564,217 @@ def get_quadrant_dark_mode(conn: sqlite3.Connection, x: int, y: int) -> bytes |
   return row[0] if row else None
 
 
+# Image columns that can be checked for presence without loading the blob
+QUADRANT_DATA_COLUMNS = ("render", "generation", "water_mask", "dark_mode")
+
+# Max coordinates per presence query (2 bound params each, SQLite's default
+# limit is 999 params)
+_PRESENCE_CHUNK_SIZE = 400
+
+
+def has_quadrant_data_batch(
+  conn: sqlite3.Connection,
+  coords: Iterable[tuple[int, int]],
+  column: str = "generation",
+) -> set[tuple[int, int]]:
+  """
+  Find which of the given quadrants have data in an image column.
+
+  Uses `IS NOT NULL`, which SQLite answers from the record header, so the PNG
+  blobs are never read. Prefer this over get_quadrant_* when only presence
+  matters.
+
+  Args:
+    conn: Database connection
+    coords: Quadrant (x, y) coordinates to check
+    column: One of QUADRANT_DATA_COLUMNS
+
+  Returns:
+    Set of the coordinates whose column is not NULL
+  """
+  if column not in QUADRANT_DATA_COLUMNS:
+    raise ValueError(f"Unknown quadrant data column: {column}")
+
+  coords = list(dict.fromkeys(coords))
+  if not coords:
+    return set()
+
+  cursor = conn.cursor()
+  # Optional columns (water_mask, dark_mode) are added by migrations
+  if column not in ("render", "generation"):
+    cursor.execute("PRAGMA table_info(quadrants)")
+    if column not in {row[1] for row in cursor.fetchall()}:
+      return set()
+
+  present = set()
+  for i in range(0, len(coords), _PRESENCE_CHUNK_SIZE):
+    chunk = coords[i : i + _PRESENCE_CHUNK_SIZE]
+    placeholders = ", ".join("(?, ?)" for _ in chunk)
+    params = [value for coord in chunk for value in coord]
+    # Join against the coordinate list so each lookup uses the primary key
+    # (a row-value IN (...) would scan the whole table)
+    cursor.execute(
+      f"""
+      WITH coords(x, y) AS (VALUES {placeholders})
+      SELECT q.quadrant_x, q.quadrant_y FROM coords
+      JOIN quadrants q ON q.quadrant_x = coords.x AND q.quadrant_y = coords.y
+      WHERE q.{column} IS NOT NULL
+      """,
+      params,
+    )
+    present.update((row[0], row[1]) for row in cursor.fetchall())
+  return present
+
+
+def has_generation_batch(
+  conn: sqlite3.Connection, coords: Iterable[tuple[int, int]]
+) -> set[tuple[int, int]]:
+  """Find which of the given quadrants have a generation."""
+  return has_quadrant_data_batch(conn, coords, "generation")
+
+
+def has_render_batch(
+  conn: sqlite3.Connection, coords: Iterable[tuple[int, int]]
+) -> set[tuple[int, int]]:
+  """Find which of the given quadrants have a render."""
+  return has_quadrant_data_batch(conn, coords, "render")
+
+
+def has_quadrant_generation(conn: sqlite3.Connection, x: int, y: int) -> bool:
+  """Check if the quadrant at (x, y) has a generation, without loading it."""
+  return bool(has_quadrant_data_batch(conn, [(x, y)], "generation"))
+
+
+def has_quadrant_render(conn: sqlite3.Connection, x: int, y: int) -> bool:
+  """Check if the quadrant at (x, y) has a render, without loading it."""
+  return bool(has_quadrant_data_batch(conn, [(x, y)], "render"))
+
+
+def get_quadrant_content_hash(
+  conn: sqlite3.Connection,
+  x: int,
+  y: int,
+  column: str = "generation",
+  backfill: bool = True,
+) -> tuple[int, str | None] | None:
+  """
+  Get (rowid, content hash) for a quadrant's image column.
+
+  Returns the hash stored by save_quadrant_*. If it's missing (the image was
+  written by something else), it is computed by streaming the blob and
+  stored for next time, under a write lock so a concurrent save can't be
+  given a stale hash. With backfill=False a missing hash is returned as None
+  instead, so callers holding a read transaction don't have to upgrade it to
+  a write.
+
+  Raises sqlite3.OperationalError if the hash columns haven't been added yet
+  (see ensure_content_hash_columns_exist).
+
+  Returns:
+    Tuple of (rowid, hash), or None if there is no image
+  """
+  if column not in QUADRANT_DATA_COLUMNS:
+    raise ValueError(f"Unknown quadrant data column: {column}")
+
+  query = f"""
+    SELECT rowid, {column}_hash FROM quadrants
+    WHERE quadrant_x = ? AND quadrant_y = ? AND {column} IS NOT NULL
+  """
+  cursor = conn.cursor()
+  row = cursor.execute(query, (x, y)).fetchone()
+  if row is None or row[1] is not None or not backfill:
+    return row
+
+  own_transaction = not conn.in_transaction
+  if own_transaction:
+    conn.execute("BEGIN IMMEDIATE")
+  try:
+    # Re-read under the write lock in case another writer got here first
+    row = cursor.execute(query, (x, y)).fetchone()
+    if row is None or row[1] is not None:
+      return row
+
+    rowid = row[0]
+    hasher = hashlib.sha256()
+    with conn.blobopen("quadrants", column, rowid, readonly=True) as blob:
+      while chunk := blob.read(64 * 1024):
+        hasher.update(chunk)
+    stored_hash = hasher.hexdigest()
+    cursor.execute(
+      f"UPDATE quadrants SET {column}_hash = ? WHERE rowid = ?",
+      (stored_hash, rowid),
+    )
+    return rowid, stored_hash
+  finally:
+    if own_transaction:
+      conn.commit()
+
+
+def load_quadrant_image(
+  conn: sqlite3.Connection, x: int, y: int, column: str = "generation"
+) -> Image.Image | None:
+  """
+  Load and decode a quadrant's image, using the decoded image cache.
+
+  Images are cached by (x, y, column, content hash), so a hit only costs a
+  metadata query. Falls back to decoding without the cache if the hash
+  columns haven't been added to this database.
+
+  Returns:
+    A PIL Image the caller may modify, or None if there is no image
+  """
+  try:
+    info = get_quadrant_content_hash(conn, x, y, column)
+  except sqlite3.OperationalError:
+    # Hash columns not migrated yet
+    data = _get_quadrant_blob(conn, x, y, column)
+    return png_bytes_to_image(data) if data else None
+
+  if info is None:
+    return None
+
+  cache = get_decoded_image_cache()
+  key = (x, y, column, info[1])
+  image = cache.get(key)
+  if image is not None:
+    return image
+
+  cursor = conn.cursor()
+  cursor.execute(
+    f"""
+    SELECT {column}, {column}_hash FROM quadrants
+    WHERE quadrant_x = ? AND quadrant_y = ?
+    """,
+    (x, y),
+  )
+  row = cursor.fetchone()
+  if row is None or not row[0]:
+    return None
+
+  image = png_bytes_to_image(row[0])
+  image.load()
+  # Key by the hash read together with the bytes (the image may have been
+  # replaced since the first query)
+  if row[1] is not None:
+    cache.put((x, y, column, row[1]), image)
+  return image
+
+
+def _get_quadrant_blob(
+  conn: sqlite3.Connection, x: int, y: int, column: str
+) -> bytes | None:
+  """Get the raw bytes of a quadrant's image column."""
+  if column not in QUADRANT_DATA_COLUMNS:
+    raise ValueError(f"Unknown quadrant data column: {column}")
+  cursor = conn.cursor()
+  cursor.execute(
+    f"SELECT {column} FROM quadrants WHERE quadrant_x = ? AND quadrant_y = ?",
+    (x, y),
+  )
+  row = cursor.fetchone()
+  return row[0] if row else None
+
+
 def check_all_quadrants_rendered(conn: sqlite3.Connection, x: int, y: int) -> bool:
   """
   Check if all 4 quadrants for the tile starting at (x, y) have been rendered.
@@ -336,13 +782,7 @@ def check_all_quadrants_rendered(conn: sqlite3.Connection, x: int, y: int) -> bo
   The tile covers quadrants: (x, y), (x+1, y), (x, y+1), (x+1, y+1)
   """
   positions = [(x, y), (x + 1, y), (x, y + 1), (x + 1, y + 1)]
-
-  for qx, qy in positions:
-    q = get_quadrant(conn, qx, qy)
-    if q is None or not q["has_render"]:
-      return False
-
-  return True
+  return len(has_render_batch(conn, positions)) == len(positions)
 
 
 def check_all_quadrants_generated(conn: sqlite3.Connection, x: int, y: int) -> bool:
@@ -352,40 +792,114 @@ def check_all_quadrants_generated(conn: sqlite3.Connection, x: int, y: int) -> b
   The tile covers quadrants: (x, y), (x+1, y), (x, y+1), (x+1, y+1)
   """
   positions = [(x, y), (x + 1, y), (x, y + 1), (x + 1, y + 1)]
+  return len(has_generation_batch(conn, positions)) == len(positions)
 
-  for qx, qy in positions:
-    q = get_quadrant(conn, qx, qy)
-    if q is None or not q["has_generation"]:
-      return False
 
-  return True
+def content_hash(data: bytes) -> str:
+  """Hash image bytes for ETags and content-addressed caching."""
+  return hashlib.sha256(data).hexdigest()
 
 
-def save_quadrant_render(
-  conn: sqlite3.Connection, config: dict, x: int, y: int, png_bytes: bytes
-) -> bool:
+def ensure_content_hash_columns_exist(conn: sqlite3.Connection) -> None:
   """
-  Save render bytes for a quadrant at position (x, y).
+  Ensure every image column has a `<column>_hash` column (migration).
 
-  Creates the quadrant if it doesn't exist.
-  Returns True if successful.
+  The hash is written alongside the image by the save_quadrant_* functions.
+  Triggers clear a hash whenever its image is changed without updating the
+  hash (deletes, imports, or scripts writing the column directly), so a
+  stored hash is never stale; readers recompute missing hashes lazily.
   """
+  cursor = conn.cursor()
+  cursor.execute("PRAGMA table_info(quadrants)")
+  columns = {row[1] for row in cursor.fetchall()}
+  cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+  triggers = {row[0] for row in cursor.fetchall()}
+
+  changed = False
+  for column in QUADRANT_DATA_COLUMNS:
+    if column not in columns:
+      continue
+    if f"{column}_hash" not in columns:
+      cursor.execute(f"ALTER TABLE quadrants ADD COLUMN {column}_hash TEXT")
+      print(f"📝 Added '{column}_hash' column to quadrants table")
+      changed = True
+    if f"clear_{column}_hash" not in triggers:
+      cursor.execute(
+        f"""
+        CREATE TRIGGER clear_{column}_hash
+        AFTER UPDATE OF {column} ON quadrants
+        WHEN NEW.{column}_hash IS OLD.{column}_hash
+          AND NEW.{column} IS NOT OLD.{column}
+        BEGIN
+          UPDATE quadrants SET {column}_hash = NULL
+          WHERE quadrant_x = NEW.quadrant_x AND quadrant_y = NEW.quadrant_y;
+        END
+        """
+      )
+      changed = True
+
+  if changed:
+    conn.commit()
+
+
+# Database files whose content hash migration has run in this process
+_content_hash_migrated: set[str] = set()
+_content_hash_migrated_lock = threading.Lock()
+
+
+def _ensure_content_hash_columns_once(conn: sqlite3.Connection) -> None:
+  """Run ensure_content_hash_columns_exist once per database file."""
+  # The "main" database's file ("" for in-memory databases, never cached)
+  path = conn.execute("PRAGMA database_list").fetchone()[2]
+  with _content_hash_migrated_lock:
+    if path in _content_hash_migrated:
+      return
+  ensure_content_hash_columns_exist(conn)
+  if path:
+    with _content_hash_migrated_lock:
+      _content_hash_migrated.add(path)
+
+
+def _save_quadrant_image(
+  conn: sqlite3.Connection,
+  config: dict,
+  x: int,
+  y: int,
+  column: str,
+  png_bytes: bytes,
+  extra_assignments: str = "",
+) -> bool:
+  """Save image bytes and their content hash to an image column."""
   # Ensure the quadrant exists first
   ensure_quadrant_exists(conn, config, x, y)
+  _ensure_content_hash_columns_once(conn)
 
   cursor = conn.cursor()
   cursor.execute(
-    """
+    f"""
     UPDATE quadrants
-    SET render = ?
+    SET {column} = ?, {column}_hash = ?{extra_assignments}
     WHERE quadrant_x = ? AND quadrant_y = ?
     """,
-    (png_bytes, x, y),
+    (png_bytes, content_hash(png_bytes), x, y),
   )
   conn.commit()
+  get_decoded_image_cache().invalidate(x, y, column)
   return cursor.rowcount > 0
 
 
+def save_quadrant_render(
+  conn: sqlite3.Connection, config: dict, x: int, y: int, png_bytes: bytes
+) -> bool:
+  """
+  Save render bytes for a quadrant at position (x, y).
+
+  Creates the quadrant if it doesn't exist.
+  Returns True if successful.
+  """
+  return _save_quadrant_image(conn, config, x, y, "render", png_bytes)
+
+
 def save_quadrant_generation(
   conn: sqlite3.Connection, config: dict, x: int, y: int, png_bytes: bytes
 ) -> bool:
@@ -395,20 +909,7 @@ def save_quadrant_generation(
   Creates the quadrant if it doesn't exist.
   Returns True if successful.
   """
-  # Ensure the quadrant exists first
-  ensure_quadrant_exists(conn, config, x, y)
-
-  cursor = conn.cursor()
-  cursor.execute(
-    """
-    UPDATE quadrants
-    SET generation = ?
-    WHERE quadrant_x = ? AND quadrant_y = ?
-    """,
-    (png_bytes, x, y),
-  )
-  conn.commit()
-  return cursor.rowcount > 0
+  return _save_quadrant_image(conn, config, x, y, "generation", png_bytes)
 
 
 def save_quadrant_water_mask(
@@ -421,20 +922,15 @@ def save_quadrant_water_mask(
   Sets water_type to WATER_EDGE since this is a manually generated mask.
   Returns True if successful.
   """
-  # Ensure the quadrant exists first
-  ensure_quadrant_exists(conn, config, x, y)
-
-  cursor = conn.cursor()
-  cursor.execute(
-    """
-    UPDATE quadrants
-    SET water_mask = ?, water_type = 'WATER_EDGE'
-    WHERE quadrant_x = ? AND quadrant_y = ?
-    """,
-    (png_bytes, x, y),
+  return _save_quadrant_image(
+    conn,
+    config,
+    x,
+    y,
+    "water_mask",
+    png_bytes,
+    extra_assignments=", water_type = 'WATER_EDGE'",
   )
-  conn.commit()
-  return cursor.rowcount > 0
 
 
 def save_quadrant_dark_mode(
@@ -446,20 +942,7 @@ def save_quadrant_dark_mode(
   Creates the quadrant if it doesn't exist.
   Returns True if successful.
   """
-  # Ensure the quadrant exists first
-  ensure_quadrant_exists(conn, config, x, y)
-
-  cursor = conn.cursor()
-  cursor.execute(
-    """
-    UPDATE quadrants
-    SET dark_mode = ?
-    WHERE quadrant_x = ? AND quadrant_y = ?
-    """,
-    (png_bytes, x, y),
-  )
-  conn.commit()
-  return cursor.rowcount > 0
+  return _save_quadrant_image(conn, config, x, y, "dark_mode", png_bytes)
 
 
 def ensure_quadrant_exists(
@@ -611,6 +1094,47 @@ def calculate_quadrant_lat_lng(
   )
 
 
+def calculate_region_render_params(
+  config: dict, x: int, y: int, nx: int, ny: int
+) -> dict:
+  """
+  Calculate the render parameters for a super-tile covering an nx×ny block of
+  quadrants with (x, y) in the top-left.
+
+  A regular tile render is the nx=ny=2 case. Larger regions use a larger
+  viewport centered on the middle of the block, with view_height scaled so
+  that meters-per-pixel (and therefore every quadrant's pixels) matches a
+  regular tile render.
+
+  Returns:
+    Dict with lat, lng, width_px, height_px, and view_height_meters
+  """
+  width_px = config["width_px"]
+  height_px = config["height_px"]
+  tile_step = config.get("tile_step", 0.5)
+  view_height_meters = config.get("view_height_meters", 200)
+
+  quadrant_w = int(width_px * tile_step)
+  quadrant_h = int(height_px * tile_step)
+  region_w = quadrant_w * nx
+  region_h = quadrant_h * ny
+
+  # The anchor of quadrant (qx, qy) is its bottom-right corner, so the center
+  # of the block is the anchor of the (fractional) quadrant one step up-left
+  # of the block's midpoint.
+  center_x = x + nx / 2 - 1
+  center_y = y + ny / 2 - 1
+  lat, lng = calculate_quadrant_lat_lng(config, center_x, center_y)
+
+  return {
+    "lat": lat,
+    "lng": lng,
+    "width_px": region_w,
+    "height_px": region_h,
+    "view_height_meters": view_height_meters * region_h / height_px,
+  }
+
+
 def latlng_to_quadrant_coords(
   config: dict, lat: float, lng: float
 ) -> tuple[float, float]:
@@ -718,6 +1242,28 @@ def split_tile_into_quadrants(
   return quadrants
 
 
+def split_image_into_quadrant_grid(
+  image: Image.Image, nx: int, ny: int
+) -> dict[tuple[int, int], Image.Image]:
+  """
+  Split a super-tile image into an nx×ny grid of quadrant images.
+
+  Returns a dict mapping (dx, dy) offset to the quadrant image, with (0, 0)
+  at the top-left. split_tile_into_quadrants is the nx=ny=2 case.
+  """
+  width, height = image.size
+  quad_w = width // nx
+  quad_h = height // ny
+
+  return {
+    (dx, dy): image.crop(
+      (dx * quad_w, dy * quad_h, (dx + 1) * quad_w, (dy + 1) * quad_h)
+    )
+    for dy in range(ny)
+    for dx in range(nx)
+  }
+
+
 def stitch_quadrants_to_tile(
   quadrants: dict[tuple[int, int], Image.Image],
 ) -> Image.Image:
@@ -782,8 +1328,39 @@ def get_neighboring_generated_quadrants(
 
 def has_any_neighbor_generations(conn: sqlite3.Connection, x: int, y: int) -> bool:
   """Check if there are any generated neighbor quadrants for a tile at (x, y)."""
-  neighbors = get_neighboring_generated_quadrants(conn, x, y)
-  return any(v is not None for v in neighbors.values())
+  neighbors = [(x - 1, y), (x - 1, y + 1), (x, y - 1), (x + 1, y - 1), (x - 1, y - 1)]
+  return bool(has_generation_batch(conn, neighbors))
+
+
+# Global GCS client shared by uploads (creating one resolves credentials and
+# opens a new connection pool)
+_storage_client: storage.Client | None = None
+_storage_client_lock = threading.Lock()
+
+# Public URLs of content-addressed uploads made by this process, keyed by
+# (bucket, SHA-256 of the bytes)
+_uploaded_urls: dict[tuple[str, str], str] = {}
+_uploaded_urls_lock = threading.Lock()
+
+
+def get_storage_client() -> storage.Client:
+  """Get the global GCS client, creating it on first use."""
+  global _storage_client
+
+  with _storage_client_lock:
+    if _storage_client is None:
+      _storage_client = storage.Client()
+    return _storage_client
+
+
+def reset_storage_client() -> None:
+  """Drop the global GCS client and the record of content-addressed uploads."""
+  global _storage_client
+
+  with _storage_client_lock:
+    _storage_client = None
+  with _uploaded_urls_lock:
+    _uploaded_urls.clear()
 
 
 def upload_to_gcs(
@@ -800,8 +1377,7 @@ def upload_to_gcs(
   Returns:
     Public URL of the uploaded file
   """
-  client = storage.Client()
-  bucket = client.bucket(bucket_name)
+  bucket = get_storage_client().bucket(bucket_name)
 
   if blob_name is None:
     unique_id = uuid.uuid4().hex[:8]
@@ -810,12 +1386,47 @@ def upload_to_gcs(
   blob = bucket.blob(blob_name)
 
   print(f"   📤 Uploading {local_path.name} to gs://{bucket_name}/{blob_name}...")
-  blob.upload_from_filename(str(local_path))
-  blob.make_public()
+  # Upload and make public in one request
+  blob.upload_from_filename(str(local_path), predefined_acl="publicRead")
 
   return blob.public_url
 
 
+def upload_png_to_gcs(png_bytes: bytes, bucket_name: str) -> str:
+  """
+  Upload PNG bytes to GCS under a content-addressed name and return its URL.
+
+  The blob is named after the SHA-256 of the bytes, so identical images
+  (e.g. the template of a retried generation) share one object, and each
+  is only uploaded once per process.
+
+  Args:
+    png_bytes: The PNG image data
+    bucket_name: Name of the GCS bucket
+
+  Returns:
+    Public URL of the uploaded image
+  """
+  digest = hashlib.sha256(png_bytes).hexdigest()
+  with _uploaded_urls_lock:
+    url = _uploaded_urls.get((bucket_name, digest))
+  if url is not None:
+    print(f"   ♻️  Template already uploaded: {url}")
+    return url
+
+  blob_name = f"infills/{digest}.png"
+  blob = get_storage_client().bucket(bucket_name).blob(blob_name)
+
+  print(f"   📤 Uploading template to gs://{bucket_name}/{blob_name}...")
+  blob.upload_from_string(
+    png_bytes, content_type="image/png", predefined_acl="publicRead"
+  )
+
+  with _uploaded_urls_lock:
+    _uploaded_urls[(bucket_name, digest)] = blob.public_url
+  return blob.public_url
+
+
 # =============================================================================
 # Quadrant Helpers for Template Building
 # =============================================================================
@@ -880,30 +1491,35 @@ class QuadrantHelpers:
     For dark mode models: checks dark_mode column
     For regular models: checks generation column, with render fallback for context
     """
-    if self.is_dark_mode:
-      # Dark mode: only check dark_mode column
-      dark_mode = get_quadrant_dark_mode(self.conn, qx, qy)
-      return dark_mode is not None
+    return (qx, qy) in self.has_generation_batch([(qx, qy)])
 
-    # Regular: check generation column
-    gen = get_quadrant_generation(self.conn, qx, qy)
-    if gen is not None:
-      return True
-
-    # For context quadrants, treat as "generated" if they have a render
-    if (qx, qy) in self.context_set:
-      render = get_quadrant_render(self.conn, qx, qy)
-      return render is not None
+  def has_generation_batch(
+    self, coords: Iterable[tuple[int, int]]
+  ) -> set[tuple[int, int]]:
+    """
+    Find which of the given quadrants have the appropriate generation data,
+    using the same rules as has_generation. Only presence is queried; no image
+    data is loaded.
+    """
+    coords = list(coords)
+    if self.is_dark_mode:
+      return has_quadrant_data_batch(self.conn, coords, "dark_mode")
 
-    return False
+    present = has_generation_batch(self.conn, coords)
+    context_missing = [
+      coord for coord in coords if coord in self.context_set and coord not in present
+    ]
+    if context_missing:
+      present |= has_render_batch(self.conn, context_missing)
+    return present
 
   def get_render_with_fallback(self, qx: int, qy: int) -> Image.Image | None:
     """
     Get render for a quadrant, rendering on-demand if needed.
     """
-    render_bytes = get_quadrant_render(self.conn, qx, qy)
-    if render_bytes:
-      return png_bytes_to_image(render_bytes)
+    render = load_quadrant_image(self.conn, qx, qy, "render")
+    if render is not None:
+      return render
 
     # Need to render on demand
     if self.render_quadrant_fn is None:
@@ -920,16 +1536,16 @@ class QuadrantHelpers:
     """
     Get generation for a quadrant, with render fallback for context quadrants.
     """
-    gen_bytes = get_quadrant_generation(self.conn, qx, qy)
-    if gen_bytes:
-      return png_bytes_to_image(gen_bytes)
+    gen = load_quadrant_image(self.conn, qx, qy, "generation")
+    if gen is not None:
+      return gen
 
     # For context quadrants, fall back to render
     if (qx, qy) in self.context_set:
-      render_bytes = get_quadrant_render(self.conn, qx, qy)
-      if render_bytes:
+      render = load_quadrant_image(self.conn, qx, qy, "render")
+      if render is not None:
         print(f"   📋 Using render as context for ({qx}, {qy})")
-        return png_bytes_to_image(render_bytes)
+        return render
 
     return None
 
@@ -942,10 +1558,7 @@ class QuadrantHelpers:
     """
     if self.is_dark_mode:
       # Dark mode transforms pixel art - use generation as input
-      gen_bytes = get_quadrant_generation(self.conn, qx, qy)
-      if gen_bytes:
-        return png_bytes_to_image(gen_bytes)
-      return None
+      return load_quadrant_image(self.conn, qx, qy, "generation")
     else:
       # Regular generation uses 3D render as input
       return self.get_render_with_fallback(qx, qy)
@@ -0,0 +1,594 @@
+"""
+Stub inference server for offline end-to-end benchmarking.
+
+Serves the request contracts the generation code calls, so that the app,
+its queue worker and generate_omni can be run without Oxen, Modal, GCS or
+Gemini:
+
+  local   - POST /edit-b64, /edit-png, /edit-batch (inference/server.py;
+            call_local_api_b64 / call_local_api_png / call_local_api_batch)
+  oxen    - POST /api/images/edit (call_oxen_api); input_image is a public
+            URL from upload or a data URL, and the result is served as a
+            public URL like Oxen's (or inline with "response_format":
+            "b64_json")
+  gemini  - POST /v1beta/models/<model>:generateContent, plus the Files API
+            resumable upload (google-genai's client.files.upload)
+  upload  - GCS JSON API uploads and ACL updates (upload_to_gcs), via the
+            google-cloud-storage client's STORAGE_EMULATOR_HOST support
+  download - GET /<bucket>/<object> (public URLs, download_image_to_pil)
+
+GET /stub/stats returns each contract's request and error counts, for
+callers running the server in another process.
+
+Every "edit" returns the input image with its colors inverted, at the input
+size. Each contract has its own StubBehavior: a latency (plus uniform
+jitter) added to every request, and an error rate at which requests fail
+with error_status instead. Randomness comes from a seeded RNG, so runs with
+the same seed and request order behave the same.
+
+Objects live in memory for the server's lifetime.
+
+Usage:
+  uv run python src/isometric_hanford/generation/stub_inference_server.py \\
+    [--port 8890] [--latency-ms 2000] [--jitter-ms 500] [--error-rate 0.05]
+
+Then point the generation code at it (the server prints these):
+  MODAL_INFERENCE_URL=http://127.0.0.1:8890/edit-b64
+  STORAGE_EMULATOR_HOST=http://127.0.0.1:8890
+  GOOGLE_GEMINI_BASE_URL=http://127.0.0.1:8890
+and give Oxen models "endpoint": "http://127.0.0.1:8890/api/images/edit".
+"""
+
+import argparse
+import base64
+import email.parser
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import quote, unquote, urlparse
+
+from PIL import Image, ImageOps
+
+# Contracts with their own latency/error behaviour
+CONTRACTS = ("local", "oxen", "gemini", "upload", "download")
+
+# Bucket the Oxen stub serves its results from
+OUTPUT_BUCKET = "stub-outputs"
+
+
+@dataclass
+class StubBehavior:
+  """Latency and failure injection for one contract."""
+
+  latency_ms: float = 0.0
+  # Uniform jitter: each request waits latency_ms +/- jitter_ms
+  jitter_ms: float = 0.0
+  # Fraction of requests (0-1) that fail with error_status
+  error_rate: float = 0.0
+  error_status: int = 500
+
+
+@dataclass
+class ContractStats:
+  """Requests served (and failed on purpose) for one contract."""
+
+  requests: int = 0
+  errors: int = 0
+
+
+def client_env_for(url: str) -> dict[str, str]:
+  """Environment variables that point the generation clients at a stub URL."""
+  return {
+    "MODAL_INFERENCE_URL": f"{url}/edit-b64",
+    "MODAL_INFERENCE_PNG_URL": f"{url}/edit-png",
+    "MODAL_INFERENCE_BATCH_URL": f"{url}/edit-batch",
+    "STORAGE_EMULATOR_HOST": url,
+    "GOOGLE_GEMINI_BASE_URL": url,
+  }
+
+
+def stub_edit(image: Image.Image) -> Image.Image:
+  """The stub "model": the input image with its colors inverted."""
+  return ImageOps.invert(image.convert("RGB"))
+
+
+def png_bytes(image: Image.Image) -> bytes:
+  buffer = BytesIO()
+  image.save(buffer, format="PNG")
+  return buffer.getvalue()
+
+
+class StubInferenceServer:
+  """
+  A threaded local HTTP server implementing the stub contracts.
+
+  Usable as a context manager:
+
+    with StubInferenceServer(behaviors={"oxen": StubBehavior(2000)}) as stub:
+      os.environ.update(stub.client_env())
+      ...
+  """
+
+  def __init__(
+    self,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    behaviors: dict[str, StubBehavior] | None = None,
+    seed: int = 0,
+  ):
+    """
+    Args:
+      host: Interface to bind
+      port: Port to bind (0 picks a free port)
+      behaviors: StubBehavior per contract (see CONTRACTS); missing
+        contracts respond immediately and never fail
+      seed: Seed for the latency jitter and error injection
+    """
+    unknown = set(behaviors or {}) - set(CONTRACTS)
+    if unknown:
+      raise ValueError(f"Unknown contract(s): {sorted(unknown)}")
+
+    self.behaviors = {name: StubBehavior() for name in CONTRACTS}
+    self.behaviors.update(behaviors or {})
+    self.stats = {name: ContractStats() for name in CONTRACTS}
+    # (bucket, object name) -> (bytes, content type)
+    self.objects: dict[tuple[str, str], tuple[bytes, str]] = {}
+    # Gemini files: name -> (bytes, mime type); uploads in progress by id
+    self.files: dict[str, tuple[bytes, str]] = {}
+    self.pending_uploads: dict[str, dict] = {}
+    self.lock = threading.Lock()
+    self._rng = random.Random(seed)
+
+    self._httpd = ThreadingHTTPServer((host, port), _StubHandler)
+    self._httpd.daemon_threads = True
+    self._httpd.stub = self
+    self._thread: threading.Thread | None = None
+
+  @property
+  def url(self) -> str:
+    host, port = self._httpd.server_address[:2]
+    return f"http://{host}:{port}"
+
+  def client_env(self) -> dict[str, str]:
+    """Environment variables that point the generation clients at this server."""
+    return client_env_for(self.url)
+
+  def start(self) -> "StubInferenceServer":
+    """Serve requests on a background thread."""
+    self._thread = threading.Thread(
+      target=self._httpd.serve_forever, name="stub-inference-server", daemon=True
+    )
+    self._thread.start()
+    return self
+
+  def stop(self) -> None:
+    """Stop serving and close the socket."""
+    if self._thread is not None:
+      self._httpd.shutdown()
+      self._thread.join()
+      self._thread = None
+    self._httpd.server_close()
+
+  def __enter__(self) -> "StubInferenceServer":
+    return self.start()
+
+  def __exit__(self, *exc_info) -> None:
+    self.stop()
+
+  def put_object(self, bucket: str, name: str, data: bytes, content_type: str) -> str:
+    """Store an object and return its public URL."""
+    with self.lock:
+      self.objects[(bucket, name)] = (data, content_type)
+    return f"{self.url}/{bucket}/{quote(name, safe='/~')}"
+
+  def get_object(self, bucket: str, name: str) -> tuple[bytes, str] | None:
+    with self.lock:
+      return self.objects.get((bucket, name))
+
+  def admit(self, contract: str) -> int | None:
+    """
+    Apply a contract's latency and error injection to one request.
+
+    Sleeps for the request's latency, then returns the status to fail the
+    request with, or None to serve it.
+    """
+    behavior = self.behaviors[contract]
+    with self.lock:
+      jitter = self._rng.uniform(-behavior.jitter_ms, behavior.jitter_ms)
+      fail = self._rng.random() < behavior.error_rate
+      stats = self.stats[contract]
+      stats.requests += 1
+      stats.errors += fail
+    time.sleep(max(0.0, behavior.latency_ms + jitter) / 1000)
+    return behavior.error_status if fail else None
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+  """Routes requests to the stub contracts."""
+
+  protocol_version = "HTTP/1.1"
+  server: ThreadingHTTPServer
+
+  def setup(self) -> None:
+    super().setup()
+    # Otherwise Nagle's algorithm delays keep-alive responses
+    self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+  def log_message(self, format, *args) -> None:
+    pass
+
+  @property
+  def stub(self) -> StubInferenceServer:
+    return self.server.stub
+
+  def read_body(self) -> bytes:
+    return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+  def send(
+    self,
+    status: int,
+    body: bytes,
+    content_type: str = "application/json",
+    headers: dict[str, str] | None = None,
+  ) -> None:
+    self.send_response(status)
+    self.send_header("Content-Type", content_type)
+    self.send_header("Content-Length", str(len(body)))
+    for name, value in (headers or {}).items():
+      self.send_header(name, value)
+    self.end_headers()
+    self.wfile.write(body)
+
+  def send_json(self, data: dict, headers: dict[str, str] | None = None) -> None:
+    self.send(200, json.dumps(data).encode(), headers=headers)
+
+  def send_error_status(self, status: int) -> None:
+    message = {"error": {"code": status, "message": "Injected stub failure"}}
+    self.send(status, json.dumps(message).encode())
+
+  def do_GET(self) -> None:
+    url = urlparse(self.path)
+    if url.path == "/stub/stats":
+      with self.stub.lock:
+        stats = {name: asdict(s) for name, s in self.stub.stats.items()}
+      self.send_json(stats)
+      return
+    if url.path.startswith("/storage/v1/b/"):
+      self.handle_gcs_metadata(url.path)
+      return
+
+    bucket, _, name = url.path.lstrip("/").partition("/")
+    obj = self.stub.get_object(bucket, unquote(name))
+    if obj is None:
+      self.send(404, b"Not found", "text/plain")
+      return
+    status = self.stub.admit("download")
+    if status is not None:
+      self.send_error_status(status)
+      return
+    self.send(200, obj[0], obj[1])
+
+  def do_PATCH(self) -> None:
+    url = urlparse(self.path)
+    body = self.read_body()
+    if url.path.startswith("/storage/v1/b/"):
+      self.handle_gcs_metadata(url.path, json.loads(body or b"{}"))
+      return
+    self.send(404, b"Not found", "text/plain")
+
+  def do_POST(self) -> None:
+    url = urlparse(self.path)
+    path = url.path
+    body = self.read_body()
+
+    if path in ("/edit-b64", "/edit-png", "/edit-batch"):
+      self.handle_local(path, body)
+    elif path == "/api/images/edit":
+      self.handle_oxen(body)
+    elif path.startswith("/upload/storage/v1/b/"):
+      self.handle_gcs_upload(path, body)
+    elif path == "/upload/v1beta/files":
+      self.handle_file_upload_start(body)
+    elif path.startswith("/stub-file-uploads/"):
+      self.handle_file_upload_chunk(path.rsplit("/", 1)[-1], body)
+    elif path.startswith("/v1beta/models/") and path.endswith(":generateContent"):
+      self.handle_generate_content(body)
+    else:
+      self.send(404, b"Not found", "text/plain")
+
+  # ---------------------------------------------------------------------------
+  # local (inference/server.py)
+  # ---------------------------------------------------------------------------
+
+  def handle_local(self, path: str, body: bytes) -> None:
+    status = self.stub.admit("local")
+    if status is not None:
+      self.send_error_status(status)
+      return
+
+    if path == "/edit-png":
+      result = stub_edit(Image.open(BytesIO(body)))
+      self.send(200, png_bytes(result), "image/png")
+      return
+
+    request = json.loads(body)
+    items = request["items"] if path == "/edit-batch" else [request]
+    images_b64 = [
+      base64.b64encode(
+        png_bytes(stub_edit(Image.open(BytesIO(base64.b64decode(item["image_b64"])))))
+      ).decode()
+      for item in items
+    ]
+    if path == "/edit-batch":
+      self.send_json({"images_b64": images_b64})
+    else:
+      self.send_json({"image_b64": images_b64[0]})
+
+  # ---------------------------------------------------------------------------
+  # oxen (call_oxen_api)
+  # ---------------------------------------------------------------------------
+
+  def handle_oxen(self, body: bytes) -> None:
+    if not self.headers.get("Authorization", "").startswith("Bearer "):
+      self.send(401, json.dumps({"error": "Missing API key"}).encode())
+      return
+    status = self.stub.admit("oxen")
+    if status is not None:
+      self.send_error_status(status)
+      return
+
+    request = json.loads(body)
+    input_image = self.fetch_image(request["input_image"])
+    if input_image is None:
+      self.send(400, json.dumps({"error": "input_image not found"}).encode())
+      return
+
+    output = png_bytes(stub_edit(input_image))
+    if request.get("response_format") == "b64_json":
+      self.send_json({"images": [{"b64_json": base64.b64encode(output).decode()}]})
+      return
+    url = self.stub.put_object(
+      OUTPUT_BUCKET, f"{uuid.uuid4().hex}.png", output, "image/png"
+    )
+    self.send_json({"images": [{"url": url}]})
+
+  def fetch_image(self, image_url: str) -> Image.Image | None:
+    """Resolve an input image URL against this server's objects."""
+    if image_url.startswith("data:"):
+      return Image.open(BytesIO(base64.b64decode(image_url.partition(",")[2])))
+    parsed = urlparse(image_url)
+    bucket, _, name = parsed.path.lstrip("/").partition("/")
+    obj = self.stub.get_object(bucket, unquote(name))
+    return Image.open(BytesIO(obj[0])) if obj is not None else None
+
+  # ---------------------------------------------------------------------------
+  # upload (GCS JSON API, multipart uploads)
+  # ---------------------------------------------------------------------------
+
+  def object_resource(self, bucket: str, name: str, extra: dict | None = None) -> dict:
+    data, content_type = self.stub.get_object(bucket, name)
+    return {
+      "kind": "storage#object",
+      "id": f"{bucket}/{name}/1",
+      "bucket": bucket,
+      "name": name,
+      "generation": "1",
+      "contentType": content_type,
+      "size": str(len(data)),
+      **(extra or {}),
+    }
+
+  def handle_gcs_metadata(self, path: str, patch: dict | None = None) -> None:
+    """GET/PATCH an object's metadata or ACL (blob.make_public uses both)."""
+    # /storage/v1/b/<bucket>/o/<quoted name>[/acl]
+    parts = path.split("/")
+    if len(parts) < 7 or parts[5] != "o":
+      self.send(404, b"{}")
+      return
+    bucket, name = parts[4], unquote(parts[6])
+    if self.stub.get_object(bucket, name) is None:
+      self.send(404, b"{}")
+      return
+    status = self.stub.admit("upload")
+    if status is not None:
+      self.send_error_status(status)
+      return
+
+    if parts[7:] == ["acl"]:
+      self.send_json({"kind": "storage#objectAccessControls", "items": []})
+    else:
+      self.send_json(self.object_resource(bucket, name, patch))
+
+  def handle_gcs_upload(self, path: str, body: bytes) -> None:
+    bucket = path.split("/")[5]
+    # multipart/related: a JSON metadata part, then the object's bytes
+    message = email.parser.BytesParser().parsebytes(
+      f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+    )
+    metadata_part, data_part = message.get_payload()
+    metadata = json.loads(metadata_part.get_payload(decode=True))
+    status = self.stub.admit("upload")
+    if status is not None:
+      self.send_error_status(status)
+      return
+
+    self.stub.put_object(
+      bucket,
+      metadata["name"],
+      data_part.get_payload(decode=True),
+      data_part.get_content_type(),
+    )
+    self.send_json(self.object_resource(bucket, metadata["name"]))
+
+  # ---------------------------------------------------------------------------
+  # gemini (Files API uploads, generateContent)
+  # ---------------------------------------------------------------------------
+
+  def handle_file_upload_start(self, body: bytes) -> None:
+    status = self.stub.admit("upload")
+    if status is not None:
+      self.send_error_status(status)
+      return
+    file_info = json.loads(body or b"{}").get("file", {})
+    upload_id = uuid.uuid4().hex
+    with self.stub.lock:
+      self.stub.pending_uploads[upload_id] = {
+        "data": bytearray(),
+        "mime_type": file_info.get("mimeType")
+        or self.headers.get("X-Goog-Upload-Header-Content-Type", "image/png"),
+      }
+    self.send_json(
+      {},
+      headers={
+        "X-Goog-Upload-URL": f"{self.stub.url}/stub-file-uploads/{upload_id}",
+        "X-Goog-Upload-Status": "active",
+      },
+    )
+
+  def handle_file_upload_chunk(self, upload_id: str, body: bytes) -> None:
+    with self.stub.lock:
+      upload = self.stub.pending_uploads.get(upload_id)
+      if upload is not None:
+        upload["data"] += body
+    if upload is None:
+      self.send(404, b"{}")
+      return
+    if "finalize" not in self.headers.get("X-Goog-Upload-Command", ""):
+      self.send_json({}, headers={"X-Goog-Upload-Status": "active"})
+      return
+
+    name = f"files/{upload_id}"
+    with self.stub.lock:
+      del self.stub.pending_uploads[upload_id]
+      self.stub.files[name] = (bytes(upload["data"]), upload["mime_type"])
+    self.send_json(
+      {
+        "file": {
+          "name": name,
+          "mimeType": upload["mime_type"],
+          "sizeBytes": str(len(upload["data"])),
+          "uri": f"{self.stub.url}/v1beta/{name}",
+          "state": "ACTIVE",
+        }
+      },
+      headers={"X-Goog-Upload-Status": "final"},
+    )
+
+  def handle_generate_content(self, body: bytes) -> None:
+    status = self.stub.admit("gemini")
+    if status is not None:
+      self.send_error_status(status)
+      return
+
+    # Edit the first image in the request (uploaded file or inline data).
+    # Field names may be camelCase or snake_case; the API accepts both.
+    request = json.loads(body)
+    image = None
+    for content in request.get("contents", []):
+      for part in content.get("parts", []):
+        file_data = part.get("fileData") or part.get("file_data")
+        inline_data = part.get("inlineData") or part.get("inline_data")
+        if image is None and file_data:
+          uri = file_data.get("fileUri") or file_data.get("file_uri", "")
+          with self.stub.lock:
+            file = self.stub.files.get(uri.split("/v1beta/")[-1])
+          if file is not None:
+            image = Image.open(BytesIO(file[0]))
+        elif image is None and inline_data:
+          image = Image.open(BytesIO(base64.b64decode(inline_data["data"])))
+    if image is None:
+      self.send(400, json.dumps({"error": "No image in request"}).encode())
+      return
+
+    self.send_json(
+      {
+        "candidates": [
+          {
+            "content": {
+              "role": "model",
+              "parts": [
+                {"text": "Stub edit"},
+                {
+                  "inlineData": {
+                    "mimeType": "image/png",
+                    "data": base64.b64encode(png_bytes(stub_edit(image))).decode(),
+                  }
+                },
+              ],
+            },
+            "finishReason": "STOP",
+          }
+        ]
+      }
+    )
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(
+    description="Serve stub Oxen/Modal/GCS/Gemini contracts for offline runs."
+  )
+  parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
+  parser.add_argument("--port", type=int, default=8890, help="Port to bind to")
+  parser.add_argument(
+    "--latency-ms", type=float, default=0.0, help="Inference latency per request"
+  )
+  parser.add_argument(
+    "--jitter-ms", type=float, default=0.0, help="Uniform +/- inference jitter"
+  )
+  parser.add_argument(
+    "--error-rate", type=float, default=0.0, help="Fraction of inference calls to fail"
+  )
+  parser.add_argument(
+    "--error-status", type=int, default=500, help="Status of injected failures"
+  )
+  parser.add_argument(
+    "--transfer-latency-ms",
+    type=float,
+    default=0.0,
+    help="Latency per upload/download request",
+  )
+  parser.add_argument("--seed", type=int, default=0, help="Jitter/error RNG seed")
+  args = parser.parse_args()
+
+  inference = StubBehavior(
+    args.latency_ms, args.jitter_ms, args.error_rate, args.error_status
+  )
+  transfer = StubBehavior(args.transfer_latency_ms)
+  server = StubInferenceServer(
+    args.host,
+    args.port,
+    behaviors={
+      "local": inference,
+      "oxen": inference,
+      "gemini": inference,
+      "upload": transfer,
+      "download": transfer,
+    },
+    seed=args.seed,
+  )
+
+  print(f"🧪 Stub inference server on {server.url}")
+  for name, value in server.client_env().items():
+    print(f"   {name}={value}")
+  print(f"   Oxen endpoint: {server.url}/api/images/edit")
+  print("   Press Ctrl+C to stop")
+
+  server.start()
+  try:
+    while True:
+      time.sleep(1)
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.stop()
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
@@ -41,6 +41,7 @@ from isometric_hanford.generation.shared import (
   WEB_DIR,
   get_generation_config,
   start_web_server,
+  thread_pooled_page,
 )
 
 # Load environment variables
@@ -229,14 +230,15 @@ def run_generation(
   def status_callback(status: str, message: str) -> None:
     update_generation_state(status, message)
 
-  # Use the shared library function
-  return run_generation_for_quadrants(
-    conn=conn,
-    config=config,
-    selected_quadrants=selected_quadrants,
-    port=WEB_SERVER_PORT,
-    status_callback=status_callback,
-  )
+  # Use the shared library function, sharing one browser across its renders
+  with thread_pooled_page():
+    return run_generation_for_quadrants(
+      conn=conn,
+      config=config,
+      selected_quadrants=selected_quadrants,
+      port=WEB_SERVER_PORT,
+      status_callback=status_callback,
+    )
 
 
 def process_queue_item(item: dict) -> dict:
@@ -286,22 +288,24 @@ def process_queue_item(item: dict) -> dict:
       rendered_count = 0
       total = len(selected_quadrants)
 
-      for i, (qx, qy) in enumerate(selected_quadrants):
-        update_generation_state(
-          "rendering", f"Rendering quadrant ({qx}, {qy})... ({i + 1}/{total})"
-        )
-        print(f"   🎨 Rendering quadrant ({qx}, {qy})...")
-
-        try:
-          render_bytes = render_quadrant(conn, config, qx, qy, WEB_SERVER_PORT)
-          if render_bytes:
-            rendered_count += 1
-            print(f"      ✓ Rendered quadrant ({qx}, {qy})")
-          else:
-            print(f"      ⚠️ No render output for ({qx}, {qy})")
-        except Exception as e:
-          print(f"      ❌ Failed to render ({qx}, {qy}): {e}")
-          traceback.print_exc()
+      # One browser for the whole request, closed when it finishes
+      with thread_pooled_page():
+        for i, (qx, qy) in enumerate(selected_quadrants):
+          update_generation_state(
+            "rendering", f"Rendering quadrant ({qx}, {qy})... ({i + 1}/{total})"
+          )
+          print(f"   🎨 Rendering quadrant ({qx}, {qy})...")
+
+          try:
+            render_bytes = render_quadrant(conn, config, qx, qy, WEB_SERVER_PORT)
+            if render_bytes:
+              rendered_count += 1
+              print(f"      ✓ Rendered quadrant ({qx}, {qy})")
+            else:
+              print(f"      ⚠️ No render output for ({qx}, {qy})")
+          except Exception as e:
+            print(f"      ❌ Failed to render ({qx}, {qy}): {e}")
+            traceback.print_exc()
 
       update_generation_state("complete", f"Rendered {rendered_count} quadrant(s)")
       print(f"✅ Render complete: {rendered_count}/{total} quadrants")
@@ -526,22 +530,24 @@ def api_render():
       rendered_count = 0
       total = len(selected_quadrants)
 
-      for i, (qx, qy) in enumerate(selected_quadrants):
-        update_generation_state(
-          "rendering", f"Rendering quadrant ({qx}, {qy})... ({i + 1}/{total})"
-        )
-        print(f"   🎨 Rendering quadrant ({qx}, {qy})...")
-
-        try:
-          render_bytes = render_quadrant(conn, config, qx, qy, WEB_SERVER_PORT)
-          if render_bytes:
-            rendered_count += 1
-            print(f"      ✓ Rendered quadrant ({qx}, {qy})")
-          else:
-            print(f"      ⚠️ No render output for ({qx}, {qy})")
-        except Exception as e:
-          print(f"      ❌ Failed to render ({qx}, {qy}): {e}")
-          traceback.print_exc()
+      # One browser for the whole request, closed when it finishes
+      with thread_pooled_page():
+        for i, (qx, qy) in enumerate(selected_quadrants):
+          update_generation_state(
+            "rendering", f"Rendering quadrant ({qx}, {qy})... ({i + 1}/{total})"
+          )
+          print(f"   🎨 Rendering quadrant ({qx}, {qy})...")
+
+          try:
+            render_bytes = render_quadrant(conn, config, qx, qy, WEB_SERVER_PORT)
+            if render_bytes:
+              rendered_count += 1
+              print(f"      ✓ Rendered quadrant ({qx}, {qy})")
+            else:
+              print(f"      ⚠️ No render output for ({qx}, {qy})")
+          except Exception as e:
+            print(f"      ❌ Failed to render ({qx}, {qy}): {e}")
+            traceback.print_exc()
 
       update_generation_state("complete", f"Rendered {rendered_count} quadrant(s)")
       print(f"✅ Render complete: {rendered_count}/{total} quadrants")
@@ -3,27 +3,40 @@ Persisted web renderer for tile generation.
 
 This module manages a single web server process that stays running
 for the lifetime of the application, with an internal queue for
-handling render requests.
+handling render requests. A configurable number of render workers
+drain the queue concurrently against the same web server, each reusing
+its own warm Chromium page (see PooledPage) instead of launching a new
+browser for every request. Renders already in the on-disk render cache
+(see render_cache) are served without touching the queue.
 """
 
 import queue
 import subprocess
 import threading
 import time
-from dataclasses import dataclass
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Callable
-from urllib.parse import urlencode
 
 from PIL import Image
-from playwright.sync_api import sync_playwright
 
+from isometric_hanford.generation.render_cache import (
+  get_render_cache,
+  render_cache_key,
+)
 from isometric_hanford.generation.shared import (
-  CHROMIUM_ARGS,
+  DEFAULT_MAX_RENDERS_PER_PAGE,
   DEFAULT_WEB_PORT,
   WEB_RENDER_DIR,
+  PooledPage,
+  RenderTimings,
+  build_tile_render_url,
+  calculate_region_render_params,
   image_to_png_bytes,
+  split_image_into_quadrant_grid,
   split_tile_into_quadrants,
   wait_for_server,
 )
@@ -43,6 +56,59 @@ class RenderRequest:
   camera_elevation_degrees: float
   view_height_meters: float
   callback: Callable[[dict[tuple[int, int], bytes] | None, str | None], None]
+  # Number of quadrant columns/rows in the render (2x2 for a regular tile,
+  # larger for super-tile batch renders)
+  grid_width: int = 2
+  grid_height: int = 2
+
+
+# Default number of concurrent render workers (one Chromium page each)
+DEFAULT_RENDER_WORKERS = 1
+
+# A worker with this many consecutive failures is reported as unhealthy and
+# backs off before taking more work
+UNHEALTHY_AFTER_ERRORS = 3
+UNHEALTHY_BACKOFF_SECONDS = 5.0
+
+
+@dataclass
+class RenderWorkerHealth:
+  """Health and throughput tracking for a single render worker."""
+
+  worker_id: int
+  render_count: int = 0
+  error_count: int = 0
+  consecutive_errors: int = 0
+  browser_launches: int = 0
+  busy: bool = False
+  last_render_at: float | None = None
+  last_error: str | None = None
+  last_error_at: float | None = None
+  alive: bool = True
+  timings: RenderTimings = field(default_factory=RenderTimings)
+
+  @property
+  def healthy(self) -> bool:
+    return self.alive and self.consecutive_errors < UNHEALTHY_AFTER_ERRORS
+
+  def to_dict(self) -> dict[str, Any]:
+    """Convert to dictionary for JSON serialization."""
+    return {
+      "worker_id": self.worker_id,
+      "healthy": self.healthy,
+      "alive": self.alive,
+      "busy": self.busy,
+      "render_count": self.render_count,
+      "error_count": self.error_count,
+      "consecutive_errors": self.consecutive_errors,
+      "browser_launches": self.browser_launches,
+      "last_render_at": self.last_render_at,
+      "last_error": self.last_error,
+      "last_error_at": self.last_error_at,
+      "avg_total_s": (
+        round(self.timings.total_s / self.render_count, 3) if self.render_count else 0.0
+      ),
+    }
 
 
 class WebRenderer:
@@ -52,20 +118,42 @@ class WebRenderer:
   This class:
   - Starts a web server (bun/vite) when initialized
   - Maintains an internal queue of render requests
-  - Processes renders one at a time using Playwright
+  - Processes renders on `num_workers` worker threads, each using a warm
+    Playwright page that is recycled after `max_renders_per_page` renders
+    or after a crash
   - Provides thread-safe access to queue operations
+  - Tracks per-render timings (navigation, tile loading, screenshot) and
+    per-worker health
   """
 
   def __init__(
-    self, web_render_dir: Path = WEB_RENDER_DIR, port: int = DEFAULT_WEB_PORT
+    self,
+    web_render_dir: Path = WEB_RENDER_DIR,
+    port: int = DEFAULT_WEB_PORT,
+    max_renders_per_page: int = DEFAULT_MAX_RENDERS_PER_PAGE,
+    num_workers: int = DEFAULT_RENDER_WORKERS,
   ):
     self.web_render_dir = web_render_dir
     self.port = port
+    self.max_renders_per_page = max_renders_per_page
+    self.num_workers = max(1, num_workers)
     self.web_process: subprocess.Popen | None = None
     self.render_queue: queue.Queue[RenderRequest | None] = queue.Queue()
-    self.worker_thread: threading.Thread | None = None
+    self.worker_threads: list[threading.Thread] = []
+    self.worker_health: list[RenderWorkerHealth] = []
     self.running = False
     self._lock = threading.Lock()
+    # Serializes web server restarts across workers
+    self._server_lock = threading.Lock()
+
+    # Render timing stats (updated by the worker thread)
+    self._stats_lock = threading.Lock()
+    self.render_count = 0
+    self.error_count = 0
+    self.cache_hits = 0
+    self.browser_launches = 0
+    self.total_timings = RenderTimings()
+    self.last_timings: RenderTimings | None = None
 
   def start(self) -> None:
     """Start the web server and render worker thread."""
@@ -78,12 +166,26 @@ class WebRenderer:
       # Start the web server
       self._start_web_server()
 
-      # Start the worker thread
+      # Start the worker threads
       self.running = True
-      self.worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
-      self.worker_thread.start()
+      self.worker_health = [
+        RenderWorkerHealth(worker_id=i) for i in range(self.num_workers)
+      ]
+      self.worker_threads = []
+      for health in self.worker_health:
+        thread = threading.Thread(
+          target=self._worker_loop,
+          args=(health,),
+          name=f"render-worker-{health.worker_id}",
+          daemon=True,
+        )
+        thread.start()
+        self.worker_threads.append(thread)
 
-      print(f"✅ Web renderer ready on http://localhost:{self.port}")
+      print(
+        f"✅ Web renderer ready on http://localhost:{self.port} "
+        f"({self.num_workers} worker(s))"
+      )
 
   def stop(self) -> None:
     """Stop the web server and worker thread."""
@@ -94,12 +196,15 @@ class WebRenderer:
       print("🛑 Stopping web renderer...")
       self.running = False
 
-      # Signal worker to stop
-      self.render_queue.put(None)
+      # Signal each worker to stop
+      for _ in self.worker_threads:
+        self.render_queue.put(None)
 
-      # Wait for worker to finish
-      if self.worker_thread and self.worker_thread.is_alive():
-        self.worker_thread.join(timeout=5.0)
+      # Wait for workers to finish
+      for thread in self.worker_threads:
+        if thread.is_alive():
+          thread.join(timeout=5.0)
+      self.worker_threads = []
 
       # Stop the web server
       if self.web_process:
@@ -158,20 +263,36 @@ class WebRenderer:
 
   def _ensure_web_server_running(self) -> bool:
     """Ensure the web server is still running, restart if needed."""
-    if self.web_process is None or self.web_process.poll() is not None:
-      print("   ⚠️  Web server died, restarting...")
-      try:
-        self._start_web_server()
-        return True
-      except Exception as e:
-        print(f"   ❌ Failed to restart web server: {e}")
-        return False
-    return True
+    with self._server_lock:
+      if self.web_process is None or self.web_process.poll() is not None:
+        print("   ⚠️  Web server died, restarting...")
+        try:
+          self._start_web_server()
+          return True
+        except Exception as e:
+          print(f"   ❌ Failed to restart web server: {e}")
+          return False
+      return True
 
-  def _worker_loop(self) -> None:
+  def _worker_loop(self, health: RenderWorkerHealth) -> None:
     """Main worker loop that processes render requests."""
-    print("🔄 Render worker started")
-
+    print(f"🔄 Render worker {health.worker_id} started")
+
+    # The pooled page is owned by this thread (Playwright's sync API is
+    # thread-bound), so it is created and closed here.
+    pooled_page = PooledPage(max_renders=self.max_renders_per_page)
+    try:
+      self._process_requests(pooled_page, health)
+    finally:
+      pooled_page.close()
+      health.alive = False
+
+    print(f"🛑 Render worker {health.worker_id} stopped")
+
+  def _process_requests(
+    self, pooled_page: PooledPage, health: RenderWorkerHealth
+  ) -> None:
+    """Drain the render queue until stopped."""
     while self.running:
       try:
         # Wait for a request with timeout to allow checking running flag
@@ -190,74 +311,148 @@ class WebRenderer:
           continue
 
         # Process the render request
+        health.busy = True
         try:
-          result = self._render_tile(request)
+          result = self._render_tile(pooled_page, request, health)
+          health.consecutive_errors = 0
           request.callback(result, None)
         except Exception as e:
-          print(f"   ❌ Render error: {e}")
+          print(f"   ❌ Render error (worker {health.worker_id}): {e}")
+          with self._stats_lock:
+            self.error_count += 1
+            health.error_count += 1
+            health.consecutive_errors += 1
+            health.last_error = str(e)
+            health.last_error_at = time.time()
           request.callback(None, str(e))
+        finally:
+          health.busy = False
+
+        # Back off an unhealthy worker so healthy workers pick up the queue
+        if not health.healthy and self.running:
+          print(
+            f"   ⚠️  Render worker {health.worker_id} unhealthy "
+            f"({health.consecutive_errors} consecutive errors), backing off..."
+          )
+          time.sleep(UNHEALTHY_BACKOFF_SECONDS)
 
       except Exception as e:
         print(f"   ❌ Worker loop error: {e}")
 
-    print("🛑 Render worker stopped")
-
-  def _render_tile(self, request: RenderRequest) -> dict[tuple[int, int], bytes]:
+  def _render_tile(
+    self,
+    pooled_page: PooledPage,
+    request: RenderRequest,
+    health: RenderWorkerHealth,
+  ) -> dict[tuple[int, int], bytes]:
     """
-    Render a tile and return all 4 quadrants as PNG bytes.
+    Render a tile and return its quadrants as PNG bytes.
 
-    Returns a dict mapping (dx, dy) offset to PNG bytes.
+    Returns a dict mapping (dx, dy) offset to PNG bytes (4 quadrants for a
+    regular tile, grid_width×grid_height for a super-tile).
     """
-    # Build URL for rendering
-    params = {
-      "export": "true",
-      "lat": request.lat,
-      "lon": request.lng,
-      "width": request.width_px,
-      "height": request.height_px,
-      "azimuth": request.camera_azimuth_degrees,
-      "elevation": request.camera_elevation_degrees,
-      "view_height": request.view_height_meters,
-    }
-    query_string = urlencode(params)
-    url = f"http://localhost:{self.port}/?{query_string}"
+    url = build_tile_render_url(
+      port=self.port,
+      lat=request.lat,
+      lng=request.lng,
+      width_px=request.width_px,
+      height_px=request.height_px,
+      azimuth=request.camera_azimuth_degrees,
+      elevation=request.camera_elevation_degrees,
+      view_height=request.view_height_meters,
+    )
 
     print(f"   🎨 Rendering tile at ({request.lat:.6f}, {request.lng:.6f})...")
 
-    # Render using Playwright
-    with sync_playwright() as p:
-      browser = p.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+    launches_before = pooled_page.launch_count
+    screenshot_bytes, timings = pooled_page.render(
+      url, request.width_px, request.height_px
+    )
+    self._record_timings(health, timings, pooled_page.launch_count - launches_before)
+    print(f"      ⏱️  Render took {timings.summary()}")
 
-      context = browser.new_context(
-        viewport={"width": request.width_px, "height": request.height_px},
-        device_scale_factor=1,
-      )
-      page = context.new_page()
+    # Don't cache renders that may be missing tiles
+    cache = get_render_cache()
+    if cache is not None and not timings.tiles_timed_out:
+      cache.put(_request_cache_key(request), screenshot_bytes)
 
-      page.goto(url, wait_until="networkidle")
+    return _split_render(screenshot_bytes, request.grid_width, request.grid_height)
 
-      try:
-        page.wait_for_function("window.TILES_LOADED === true", timeout=60000)
-      except Exception:
-        print("      ⚠️  Timeout waiting for tiles, continuing anyway...")
+  def submit_render(
+    self,
+    quadrant_x: int,
+    quadrant_y: int,
+    lat: float,
+    lng: float,
+    width_px: int,
+    height_px: int,
+    camera_azimuth_degrees: float,
+    camera_elevation_degrees: float,
+    view_height_meters: float,
+    grid_width: int = 2,
+    grid_height: int = 2,
+  ) -> "Future[dict[tuple[int, int], bytes]]":
+    """
+    Queue a render without waiting for it.
 
-      # Get screenshot as bytes
-      screenshot_bytes = page.screenshot(type="png")
+    Submitting several renders before waiting on them lets all render
+    workers run concurrently. grid_width/grid_height > 2 request a
+    super-tile; width_px/height_px/view_height_meters must then describe the
+    whole super-tile (see shared.calculate_region_render_params).
 
-      page.close()
-      context.close()
-      browser.close()
+    Returns:
+      Future resolving to a dict mapping (dx, dy) offset to PNG bytes for all
+      quadrants in the render. The future raises RuntimeError if the render
+      fails.
+    """
+    future: Future[dict[tuple[int, int], bytes]] = Future()
+
+    # Serve identical renders from the cache without queueing
+    cache = get_render_cache()
+    if cache is not None:
+      cached = cache.get(
+        render_cache_key(
+          lat=lat,
+          lng=lng,
+          width_px=width_px,
+          height_px=height_px,
+          azimuth=camera_azimuth_degrees,
+          elevation=camera_elevation_degrees,
+          view_height=view_height_meters,
+        )
+      )
+      if cached is not None:
+        print(f"   💾 Render at ({lat:.6f}, {lng:.6f}) served from cache")
+        with self._stats_lock:
+          self.cache_hits += 1
+        future.set_result(_split_render(cached, grid_width, grid_height))
+        return future
 
-    # Open as PIL image and split into quadrants
-    full_tile = Image.open(BytesIO(screenshot_bytes))
-    quadrant_images = split_tile_into_quadrants(full_tile)
+    def callback(
+      result: dict[tuple[int, int], bytes] | None, error: str | None
+    ) -> None:
+      if error is not None or result is None:
+        future.set_exception(RuntimeError(error or "Render produced no output"))
+      else:
+        future.set_result(result)
 
-    # Convert to bytes
-    result = {}
-    for offset, quad_img in quadrant_images.items():
-      result[offset] = image_to_png_bytes(quad_img)
+    request = RenderRequest(
+      quadrant_x=quadrant_x,
+      quadrant_y=quadrant_y,
+      lat=lat,
+      lng=lng,
+      width_px=width_px,
+      height_px=height_px,
+      camera_azimuth_degrees=camera_azimuth_degrees,
+      camera_elevation_degrees=camera_elevation_degrees,
+      view_height_meters=view_height_meters,
+      callback=callback,
+      grid_width=grid_width,
+      grid_height=grid_height,
+    )
 
-    return result
+    self.render_queue.put(request)
+    return future
 
   def render_quadrant(
     self,
@@ -291,17 +486,7 @@ class WebRenderer:
     Raises:
       RuntimeError: If render fails or times out
     """
-    result_event = threading.Event()
-    result_data: dict[str, Any] = {"result": None, "error": None}
-
-    def callback(
-      result: dict[tuple[int, int], bytes] | None, error: str | None
-    ) -> None:
-      result_data["result"] = result
-      result_data["error"] = error
-      result_event.set()
-
-    request = RenderRequest(
+    future = self.submit_render(
       quadrant_x=quadrant_x,
       quadrant_y=quadrant_y,
       lat=lat,
@@ -311,18 +496,93 @@ class WebRenderer:
       camera_azimuth_degrees=camera_azimuth_degrees,
       camera_elevation_degrees=camera_elevation_degrees,
       view_height_meters=view_height_meters,
-      callback=callback,
     )
 
-    self.render_queue.put(request)
-
-    if not result_event.wait(timeout=timeout):
+    try:
+      return future.result(timeout=timeout)
+    except FutureTimeoutError:
       raise RuntimeError(f"Render timed out after {timeout}s")
 
-    if result_data["error"]:
-      raise RuntimeError(result_data["error"])
+  def submit_region_render(
+    self,
+    config: dict,
+    x: int,
+    y: int,
+    nx: int,
+    ny: int,
+  ) -> "Future[dict[tuple[int, int], bytes]]":
+    """
+    Queue a super-tile render of the nx×ny quadrant block with (x, y) in the
+    top-left, as a single page load.
 
-    return result_data["result"]
+    Returns:
+      Future resolving to a dict mapping (dx, dy) offset to PNG bytes
+    """
+    params = calculate_region_render_params(config, x, y, nx, ny)
+    return self.submit_render(
+      quadrant_x=x,
+      quadrant_y=y,
+      lat=params["lat"],
+      lng=params["lng"],
+      width_px=params["width_px"],
+      height_px=params["height_px"],
+      camera_azimuth_degrees=config["camera_azimuth_degrees"],
+      camera_elevation_degrees=config["camera_elevation_degrees"],
+      view_height_meters=params["view_height_meters"],
+      grid_width=nx,
+      grid_height=ny,
+    )
+
+  def _record_timings(
+    self, health: RenderWorkerHealth, timings: RenderTimings, launches: int
+  ) -> None:
+    """Accumulate timings for a completed render."""
+    with self._stats_lock:
+      self.render_count += 1
+      self.browser_launches += launches
+      for totals in (self.total_timings, health.timings):
+        totals.launch_s += timings.launch_s
+        totals.navigation_s += timings.navigation_s
+        totals.tiles_wait_s += timings.tiles_wait_s
+        totals.screenshot_s += timings.screenshot_s
+      self.last_timings = timings
+      health.render_count += 1
+      health.browser_launches += launches
+      health.last_render_at = time.time()
+
+  def get_stats(self) -> dict[str, Any]:
+    """
+    Get render statistics.
+
+    Returns a dict with render/error counts, browser launches, the
+    average time spent in each render phase, and per-worker health.
+    """
+    with self._stats_lock:
+      count = self.render_count
+      totals = self.total_timings
+
+      def avg(value: float) -> float:
+        return round(value / count, 3) if count else 0.0
+
+      return {
+        "render_count": count,
+        "error_count": self.error_count,
+        "cache_hits": self.cache_hits,
+        "browser_launches": self.browser_launches,
+        "avg_launch_s": avg(totals.launch_s),
+        "avg_navigation_s": avg(totals.navigation_s),
+        "avg_tiles_wait_s": avg(totals.tiles_wait_s),
+        "avg_screenshot_s": avg(totals.screenshot_s),
+        "avg_total_s": avg(totals.total_s),
+        "last_total_s": (
+          round(self.last_timings.total_s, 3) if self.last_timings else None
+        ),
+        "queue_size": self.queue_size,
+        "num_workers": self.num_workers,
+        "healthy_workers": sum(1 for h in self.worker_health if h.healthy),
+        "busy_workers": sum(1 for h in self.worker_health if h.busy),
+        "workers": [h.to_dict() for h in self.worker_health],
+      }
 
   @property
   def queue_size(self) -> int:
@@ -335,37 +595,84 @@ class WebRenderer:
     return self.running
 
 
+def _request_cache_key(request: RenderRequest) -> str:
+  """Get the render cache key for a request's camera parameters."""
+  return render_cache_key(
+    lat=request.lat,
+    lng=request.lng,
+    width_px=request.width_px,
+    height_px=request.height_px,
+    azimuth=request.camera_azimuth_degrees,
+    elevation=request.camera_elevation_degrees,
+    view_height=request.view_height_meters,
+  )
+
+
+def _split_render(
+  screenshot_bytes: bytes, grid_width: int, grid_height: int
+) -> dict[tuple[int, int], bytes]:
+  """Split a full render screenshot into quadrant PNG bytes."""
+  full_tile = Image.open(BytesIO(screenshot_bytes))
+  if grid_width == 2 and grid_height == 2:
+    quadrant_images = split_tile_into_quadrants(full_tile)
+  else:
+    quadrant_images = split_image_into_quadrant_grid(full_tile, grid_width, grid_height)
+
+  return {
+    offset: image_to_png_bytes(quad_img) for offset, quad_img in quadrant_images.items()
+  }
+
+
 # Global singleton instance
 _renderer: WebRenderer | None = None
 _renderer_lock = threading.Lock()
 
 
 def get_web_renderer(
-  web_render_dir: Path = WEB_RENDER_DIR, port: int = DEFAULT_WEB_PORT
+  web_render_dir: Path = WEB_RENDER_DIR,
+  port: int = DEFAULT_WEB_PORT,
+  num_workers: int = DEFAULT_RENDER_WORKERS,
 ) -> WebRenderer:
   """
   Get the global web renderer instance, creating it if necessary.
 
   This provides a singleton instance of the WebRenderer that can be
-  shared across the application.
+  shared across the application. num_workers only applies when the
+  instance is first created.
   """
   global _renderer
 
   with _renderer_lock:
     if _renderer is None:
-      _renderer = WebRenderer(web_render_dir, port)
+      _renderer = WebRenderer(web_render_dir, port, num_workers=num_workers)
     return _renderer
 
 
+def get_running_renderer() -> WebRenderer | None:
+  """Get the global web renderer if it has been started, else None."""
+  with _renderer_lock:
+    if _renderer is not None and _renderer.is_running:
+      return _renderer
+    return None
+
+
 def start_global_renderer(
-  web_render_dir: Path = WEB_RENDER_DIR, port: int = DEFAULT_WEB_PORT
+  web_render_dir: Path = WEB_RENDER_DIR,
+  port: int = DEFAULT_WEB_PORT,
+  num_workers: int = DEFAULT_RENDER_WORKERS,
 ) -> WebRenderer:
   """Start the global web renderer."""
-  renderer = get_web_renderer(web_render_dir, port)
+  renderer = get_web_renderer(web_render_dir, port, num_workers)
   renderer.start()
   return renderer
 
 
+def get_global_renderer_stats() -> dict[str, Any] | None:
+  """Get render statistics from the global renderer, or None if not created."""
+  with _renderer_lock:
+    return _renderer.get_stats() if _renderer is not None else None
+
+
 def stop_global_renderer() -> None:
   """Stop the global web renderer."""
   global _renderer
@@ -0,0 +1,17 @@
+"""
+Shared fixtures for the generation tests
+"""
+
+from pathlib import Path
+
+import pytest
+
+from isometric_hanford.generation.seed_tiles import init_database
+
+
+@pytest.fixture
+def quadrants_db(tmp_path: Path) -> Path:
+  """An empty tmp_path/quadrants.db with the real (unmigrated) schema."""
+  db_path = tmp_path / "quadrants.db"
+  init_database(db_path).close()
+  return db_path
@@ -0,0 +1,330 @@
+"""
+Tests for automatic_generation.py planning
+
+These tests verify the numpy-backed QuadrantGrid and that generation plans
+cover every empty quadrant exactly once with valid tiles, including:
+- Grid state lookups inside and outside the bounds
+- Vectorized 2x2 checks agreeing with the per-tile check
+- Interior gap filling
+- Spiral expansion from a seed region
+- Dependency-aware concurrent execution of plan steps
+- Closing each step's browser when the step finishes
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from isometric_hanford.generation import automatic_generation, shared
+from isometric_hanford.generation.automatic_generation import (
+  BoundingBox,
+  GenerationPlan,
+  GenerationStep,
+  Point,
+  QuadrantGrid,
+  QuadrantState,
+  build_step_dependencies,
+  can_generate_1x2_horizontal,
+  can_generate_2x1_vertical,
+  can_generate_2x2,
+  can_generate_2x2_many,
+  can_generate_single,
+  create_generation_plan,
+  execute_plan,
+  find_interior_gaps,
+  run_steps_concurrently,
+)
+
+
+def make_grid(
+  width: int, height: int, generated: set[tuple[int, int]], origin=(0, 0)
+) -> QuadrantGrid:
+  x0, y0 = origin
+  grid = QuadrantGrid(
+    BoundingBox(Point(x0, y0), Point(x0 + width - 1, y0 + height - 1))
+  )
+  for x, y in generated:
+    grid.mark_generated(Point(x, y))
+  return grid
+
+
+def assert_valid_plan(grid: QuadrantGrid, steps) -> None:
+  """Every empty quadrant is covered once, each step by a valid tile."""
+  empty = set(grid.get_all_empty())
+  covered: set[Point] = set()
+  for step in steps:
+    quadrants = step.quadrants
+    assert not covered & set(quadrants), f"step {step.step_number} overlaps"
+    if len(quadrants) == 2 and quadrants[0].y == quadrants[1].y:
+      assert can_generate_1x2_horizontal(grid, quadrants[0]), step.description
+    elif len(quadrants) == 2:
+      assert can_generate_2x1_vertical(grid, quadrants[0]), step.description
+    elif len(quadrants) == 1:
+      assert can_generate_single(grid, quadrants[0]), step.description
+    else:
+      # Offset 2x2 tiles in one direction are all checked against the grid
+      # before any of them is placed, so only check their shape here
+      assert len(quadrants) == 4, step.description
+      tl = quadrants[0]
+      assert set(quadrants) == {
+        Point(tl.x + dx, tl.y + dy) for dx in (0, 1) for dy in (0, 1)
+      }
+    grid.mark_multiple_generated(quadrants)
+    covered.update(quadrants)
+  assert covered == empty
+
+
+# =============================================================================
+# QuadrantGrid Tests
+# =============================================================================
+
+
+class TestQuadrantGrid:
+  def test_states_inside_and_outside_bounds(self) -> None:
+    grid = make_grid(4, 3, {(1, 1)}, origin=(-2, -1))
+    assert grid.is_generated(Point(1, 1))
+    assert grid.get_state(Point(1, 1)) == QuadrantState.GENERATED
+    assert grid.get_state(Point(-2, -1)) == QuadrantState.EMPTY
+
+    # Outside the bounds: always empty, and setting is a no-op
+    grid.mark_generated(Point(2, 1))
+    assert not grid.is_generated(Point(2, 1))
+    assert grid.get_state(Point(100, 100)) == QuadrantState.EMPTY
+
+  def test_row_major_listing_and_bounds(self) -> None:
+    grid = make_grid(5, 5, {(3, 1), (1, 3), (2, 2)})
+    assert grid.get_all_generated() == [Point(3, 1), Point(2, 2), Point(1, 3)]
+    assert grid.count_empty() == 22
+    assert grid.get_generated_bounds() == BoundingBox(Point(1, 1), Point(3, 3))
+    assert make_grid(3, 3, set()).get_generated_bounds() is None
+
+  def test_is_generated_at_matches_is_generated(self) -> None:
+    grid = make_grid(6, 4, {(0, 0), (5, 3), (2, 1)})
+    xs, ys = np.meshgrid(np.arange(-2, 8), np.arange(-2, 6))
+    expected = [
+      [grid.is_generated(Point(x, y)) for x in range(-2, 8)] for y in range(-2, 6)
+    ]
+    assert grid.is_generated_at(xs, ys).tolist() == expected
+
+  def test_neighbor_counts(self) -> None:
+    grid = make_grid(3, 3, {(1, 0), (0, 1), (2, 1)})
+    counts = grid.generated_neighbor_counts()
+    for y in range(3):
+      for x in range(3):
+        assert counts[y, x] == grid.count_generated_neighbors(Point(x, y))
+
+
+# =============================================================================
+# Tile Check Tests
+# =============================================================================
+
+
+class TestCanGenerate2x2Many:
+  def test_matches_scalar_check(self) -> None:
+    generated = {(x, y) for x in range(3, 6) for y in range(2, 5)} | {(9, 9)}
+    grid = make_grid(12, 12, generated)
+    xs, ys = np.meshgrid(np.arange(-1, 13), np.arange(-1, 13))
+    for require_gap in (True, False):
+      many = can_generate_2x2_many(grid, xs, ys, require_gap=require_gap)
+      for x, y, valid in zip(xs.ravel(), ys.ravel(), many.ravel()):
+        tl = Point(int(x), int(y))
+        assert can_generate_2x2(grid, tl, require_gap=require_gap) == valid, tl
+
+  def test_gap_required_from_generated_content(self) -> None:
+    grid = make_grid(8, 8, {(3, 3)})
+    # Directly adjacent: would create a seam
+    assert not can_generate_2x2(grid, Point(1, 3))
+    assert can_generate_2x2(grid, Point(1, 3), require_gap=False)
+    # One quadrant of gap, straight or diagonal: can be bridged later
+    assert can_generate_2x2(grid, Point(0, 3))
+    assert can_generate_2x2(grid, Point(4, 1))
+    # Too far from generated content to bridge
+    assert not can_generate_2x2(grid, Point(0, 0))
+
+
+# =============================================================================
+# Planning Tests
+# =============================================================================
+
+
+class TestFindInteriorGaps:
+  def test_gaps_inside_generated_bounds(self) -> None:
+    generated = {(x, y) for x in range(1, 5) for y in range(1, 4)} - {(2, 2), (3, 1)}
+    grid = make_grid(8, 6, generated)
+    assert find_interior_gaps(grid) == [Point(3, 1), Point(2, 2)]
+
+  def test_no_generated(self) -> None:
+    assert find_interior_gaps(make_grid(4, 4, set())) == []
+
+
+class TestCreateGenerationPlan:
+  def test_expands_from_seed(self) -> None:
+    seed = {(x, y) for x in range(9, 12) for y in range(9, 12)}
+    grid = make_grid(24, 20, seed)
+    steps = create_generation_plan(make_grid(24, 20, seed))
+
+    assert [s.step_number for s in steps] == list(range(1, len(steps) + 1))
+    assert any(len(s.quadrants) == 4 for s in steps)
+    assert_valid_plan(grid, steps)
+
+  def test_fills_interior_gaps_first(self) -> None:
+    generated = {(x, y) for x in range(0, 10, 3) for y in range(0, 10, 2)}
+    grid = make_grid(12, 12, generated)
+    steps = create_generation_plan(make_grid(12, 12, generated))
+
+    interior = [s for s in steps if s.description.startswith("Interior fill")]
+    assert interior == steps[: len(interior)]
+    assert {q for s in interior for q in s.quadrants} == set(
+      find_interior_gaps(make_grid(12, 12, generated))
+    )
+    assert_valid_plan(grid, steps)
+
+  def test_large_grid(self) -> None:
+    seed = {(x, y) for x in range(60, 64) for y in range(40, 44)}
+    grid = make_grid(150, 120, seed)
+    steps = create_generation_plan(make_grid(150, 120, seed))
+    assert_valid_plan(grid, steps)
+
+
+# =============================================================================
+# Parallel Execution Tests
+# =============================================================================
+
+
+def make_steps(*quadrant_lists: list[tuple[int, int]]) -> list[GenerationStep]:
+  return [
+    GenerationStep(i, [Point(x, y) for x, y in quadrants], f"step {i}")
+    for i, quadrants in enumerate(quadrant_lists, start=1)
+  ]
+
+
+class TestBuildStepDependencies:
+  def test_context_neighbors(self) -> None:
+    steps = make_steps(
+      [(0, 0), (1, 0), (0, 1), (1, 1)],
+      [(5, 5), (6, 5), (5, 6), (6, 6)],
+      [(2, 2)],  # Diagonal to step 1
+      [(4, 0), (4, 1)],  # Two quadrants of gap from step 1
+      [(2, 0), (3, 0)],  # Bridges steps 1 and 4
+    )
+    assert build_step_dependencies(steps) == {
+      1: set(),
+      2: set(),
+      3: {1},
+      4: set(),
+      5: {1, 4},
+    }
+
+  def test_matches_sequential_context(self) -> None:
+    """Every earlier step in a step's context window is a dependency."""
+    seed = {(x, y) for x in range(9, 12) for y in range(9, 12)}
+    steps = create_generation_plan(make_grid(24, 20, seed))
+    dependencies = build_step_dependencies(steps)
+    for j, step in enumerate(steps):
+      for earlier in steps[:j]:
+        near = any(
+          abs(a.x - b.x) <= 1 and abs(a.y - b.y) <= 1
+          for a in step.quadrants
+          for b in earlier.quadrants
+        )
+        assert (earlier.step_number in dependencies[step.step_number]) == near
+
+
+class TestRunStepsConcurrently:
+  def test_runs_independent_steps_in_parallel(self) -> None:
+    steps = make_steps(*[[(x * 3, 0)] for x in range(4)])
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def run_step(step: GenerationStep) -> dict:
+      nonlocal running, peak
+      with lock:
+        running += 1
+        peak = max(peak, running)
+      time.sleep(0.05)
+      with lock:
+        running -= 1
+      return {"success": True}
+
+    outcome = run_steps_concurrently(steps, run_step, max_workers=4)
+    assert sorted(outcome["generated"]) == [1, 2, 3, 4]
+    assert peak > 1
+
+  def test_waits_for_dependencies(self) -> None:
+    seed = {(x, y) for x in range(4, 7) for y in range(4, 7)}
+    steps = create_generation_plan(make_grid(12, 12, seed))
+    dependencies = build_step_dependencies(steps)
+    finished: list[int] = []
+    lock = threading.Lock()
+
+    def run_step(step: GenerationStep) -> dict:
+      with lock:
+        assert dependencies[step.step_number] <= set(finished)
+      time.sleep(0.001)
+      with lock:
+        finished.append(step.step_number)
+      return {"success": True}
+
+    outcome = run_steps_concurrently(steps, run_step, max_workers=8)
+    assert sorted(outcome["generated"]) == [s.step_number for s in steps]
+    assert outcome["error"] == outcome["skipped"] == []
+
+  def test_retries_then_skips_dependents_only(self) -> None:
+    steps = make_steps([(0, 0)], [(1, 0)], [(2, 0)], [(10, 10)], [(11, 10)])
+    attempts: dict[int, int] = {}
+    results: list[tuple[int, bool]] = []
+
+    def run_step(step: GenerationStep) -> dict:
+      attempts[step.step_number] = attempts.get(step.step_number, 0) + 1
+      if step.step_number == 1:
+        raise RuntimeError("boom")
+      if step.step_number == 4 and attempts[4] == 1:
+        return {"success": False, "error": "flaky"}
+      return {"success": True}
+
+    outcome = run_steps_concurrently(
+      steps,
+      run_step,
+      max_workers=2,
+      max_retries=1,
+      on_result=lambda step, result: results.append(
+        (step.step_number, result["success"])
+      ),
+    )
+    assert outcome == {"generated": [4, 5], "error": [1], "skipped": [2, 3]}
+    assert attempts == {1: 2, 4: 2, 5: 1}
+    assert sorted(results) == [(1, False), (4, True), (5, True)]
+
+
+class TestExecutePlan:
+  def test_each_step_closes_its_browser(self, tmp_path, monkeypatch) -> None:
+    pages = []
+    closed = set()
+    lock = threading.Lock()
+
+    def run_generation_step(conn, config, quadrants, *args) -> dict:
+      page = shared.get_thread_pooled_page()
+      assert page is not None
+      with lock:
+        pages.append(page)
+      return {"success": True, "message": "ok"}
+
+    monkeypatch.setattr(
+      automatic_generation, "run_generation_step", run_generation_step
+    )
+    monkeypatch.setattr(shared, "get_generation_config", lambda conn: {})
+    monkeypatch.setattr(shared.PooledPage, "close", lambda page: closed.add(page))
+
+    steps = make_steps(*[[(x * 3, 0)] for x in range(4)])
+    plan = GenerationPlan(
+      "now", BoundingBox(Point(0, 0), Point(9, 0)), steps, str(tmp_path)
+    )
+    exit_code = execute_plan(
+      None, plan, tmp_path / "plan.json", 5173, "bucket", no_start_server=True
+    )
+
+    assert exit_code == 0
+    assert len(pages) == 4
+    assert set(pages) == closed
@@ -0,0 +1,108 @@
+"""
+Tests for db_pool.py
+
+These tests verify connection reuse, pragmas, transaction cleanup, and that
+readers aren't blocked by an in-flight write.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from isometric_hanford.generation.db_pool import SQLiteConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path: Path) -> SQLiteConnectionPool:
+  db_path = tmp_path / "quadrants.db"
+  conn = sqlite3.connect(db_path)
+  conn.execute("CREATE TABLE quadrants (quadrant_x INTEGER, quadrant_y INTEGER)")
+  conn.execute("INSERT INTO quadrants VALUES (0, 0)")
+  conn.commit()
+  conn.close()
+
+  pool = SQLiteConnectionPool(db_path, max_idle=2)
+  yield pool
+  pool.close()
+
+
+class TestSQLiteConnectionPool:
+  def test_reuses_connections(self, pool: SQLiteConnectionPool) -> None:
+    conn = pool.connect()
+    conn.close()
+    assert pool.connect() is conn
+
+    stats = pool.get_stats()
+    assert stats["created"] == 1
+    assert stats["reused"] == 1
+    assert stats["in_use"] == 1
+
+  def test_pragmas_applied(self, pool: SQLiteConnectionPool) -> None:
+    conn = pool.connect()
+    try:
+      assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+      assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+      assert conn.execute("PRAGMA cache_size").fetchone()[0] == -64 * 1024
+    finally:
+      conn.close()
+
+  def test_uncommitted_transaction_rolled_back(
+    self, pool: SQLiteConnectionPool
+  ) -> None:
+    conn = pool.connect()
+    conn.execute("INSERT INTO quadrants VALUES (1, 1)")
+    conn.close()
+
+    conn = pool.connect()
+    try:
+      assert conn.execute("SELECT COUNT(*) FROM quadrants").fetchone()[0] == 1
+    finally:
+      conn.close()
+
+  def test_double_close_is_safe(self, pool: SQLiteConnectionPool) -> None:
+    conn = pool.connect()
+    conn.close()
+    conn.close()
+
+    conn = pool.connect()
+    try:
+      assert conn.execute("SELECT 1").fetchone()[0] == 1
+    finally:
+      conn.close()
+    assert pool.get_stats()["idle"] == 1
+
+  def test_max_idle(self, pool: SQLiteConnectionPool) -> None:
+    conns = [pool.connect() for _ in range(4)]
+    for conn in conns:
+      conn.close()
+    assert pool.get_stats()["idle"] == 2
+
+  def test_closed_pool_rejects_connect(self, pool: SQLiteConnectionPool) -> None:
+    pool.close()
+    with pytest.raises(RuntimeError):
+      pool.connect()
+
+  def test_read_not_blocked_by_open_write(self, pool: SQLiteConnectionPool) -> None:
+    writer = pool.connect()
+    writer.execute("INSERT INTO quadrants VALUES (2, 2)")
+    assert writer.in_transaction
+
+    result = []
+
+    def read() -> None:
+      conn = pool.connect()
+      try:
+        result.append(conn.execute("SELECT COUNT(*) FROM quadrants").fetchone()[0])
+      finally:
+        conn.close()
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    thread.join(timeout=5)
+
+    # WAL readers see the last committed state without waiting on the writer
+    assert result == [1]
+    writer.commit()
+    writer.close()
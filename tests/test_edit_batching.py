@@ -0,0 +1,224 @@
+"""
+Tests for edit_batching.py
+
+These tests verify the inference server's micro-batching on CPU, with a
+stub pipeline in place of QwenImageEditPipeline, including:
+- Passing single jobs as before and several jobs as lists
+- Batching concurrent requests, up to max_batch_size
+- Keeping incompatible jobs (size, steps, negative prompt) apart
+- Queuing requests that arrive while a batch is running
+- Failing every request in a failed batch, and recovering afterwards
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image, ImageOps
+
+from isometric_hanford.generation.edit_batching import (
+  EditBatcher,
+  EditJob,
+  run_pipeline_batch,
+)
+
+
+class StubPipeline:
+  """Stands in for QwenImageEditPipeline: inverts each image, records calls."""
+
+  def __init__(self, delay: float = 0.0):
+    self.delay = delay
+    self.calls: list[dict] = []
+    self.lock = threading.Lock()
+
+  def __call__(self, prompt, image, **kwargs):
+    with self.lock:
+      self.calls.append({"prompt": prompt, "image": image, **kwargs})
+    time.sleep(self.delay)
+    images = image if isinstance(image, list) else [image]
+    return SimpleNamespace(images=[ImageOps.invert(img) for img in images])
+
+
+def make_job(color: str = "red", size: int = 8, **kwargs) -> EditJob:
+  return EditJob(image=Image.new("RGB", (size, size), color), prompt=color, **kwargs)
+
+
+def color_of(image: Image.Image) -> tuple[int, int, int]:
+  return image.getpixel((0, 0))
+
+
+# =============================================================================
+# run_pipeline_batch Tests
+# =============================================================================
+
+
+class TestRunPipelineBatch:
+  def test_single_job_is_passed_as_scalars(self) -> None:
+    pipe = StubPipeline()
+    job = make_job(negative_prompt="blurry", seed=7, steps=3)
+
+    [result] = run_pipeline_batch(pipe, [job])
+
+    assert color_of(result) == (0, 255, 255)
+    [call] = pipe.calls
+    assert call["prompt"] == "red"
+    assert call["image"] is job.image
+    assert call["negative_prompt"] == "blurry"
+    assert call["generator"] == 7
+    assert call["num_inference_steps"] == 3
+
+  def test_several_jobs_are_passed_as_lists(self) -> None:
+    pipe = StubPipeline()
+    jobs = [make_job("red", seed=1), make_job("blue", seed=2)]
+
+    results = run_pipeline_batch(
+      pipe, jobs, make_generator=lambda seed: f"generator-{seed}"
+    )
+
+    assert [color_of(img) for img in results] == [(0, 255, 255), (255, 255, 0)]
+    [call] = pipe.calls
+    assert call["prompt"] == ["red", "blue"]
+    assert call["negative_prompt"] is None
+    assert call["generator"] == ["generator-1", "generator-2"]
+
+  def test_random_seed_when_unset(self) -> None:
+    pipe = StubPipeline()
+    run_pipeline_batch(pipe, [make_job()])
+    assert isinstance(pipe.calls[0]["generator"], int)
+
+  def test_rejects_incompatible_jobs(self) -> None:
+    with pytest.raises(ValueError, match="batch key"):
+      run_pipeline_batch(StubPipeline(), [make_job(steps=3), make_job(steps=4)])
+
+  def test_rejects_wrong_image_count(self) -> None:
+    def pipe(**_):
+      return SimpleNamespace(images=[])
+
+    with pytest.raises(ValueError, match="0 image"):
+      run_pipeline_batch(pipe, [make_job()])
+
+
+# =============================================================================
+# EditBatcher Tests
+# =============================================================================
+
+
+def run_batcher(pipe: StubPipeline, jobs_per_request: list[list[EditJob]], **kwargs):
+  """Submit every request concurrently. Returns (results, batcher)."""
+
+  async def main():
+    batcher = EditBatcher(lambda jobs: run_pipeline_batch(pipe, jobs), **kwargs)
+    try:
+      results = await asyncio.gather(
+        *(batcher.submit_many(jobs) for jobs in jobs_per_request),
+        return_exceptions=True,
+      )
+    finally:
+      await batcher.close()
+    return results, batcher
+
+  return asyncio.run(main())
+
+
+class TestEditBatcher:
+  def test_batches_concurrent_requests(self) -> None:
+    pipe = StubPipeline()
+    colors = ["red", "blue", "white", "black"]
+
+    results, batcher = run_batcher(
+      pipe, [[make_job(color)] for color in colors], max_batch_size=4
+    )
+
+    assert [color_of(img) for [img] in results] == [
+      (0, 255, 255),
+      (255, 255, 0),
+      (0, 0, 0),
+      (255, 255, 255),
+    ]
+    assert batcher.batch_size_counts == {4: 1}
+    assert pipe.calls[0]["prompt"] == colors
+
+  def test_respects_max_batch_size(self) -> None:
+    pipe = StubPipeline()
+    _, batcher = run_batcher(pipe, [[make_job()] for _ in range(5)], max_batch_size=2)
+    assert batcher.batch_size_counts == {2: 2, 1: 1}
+
+  def test_keeps_incompatible_jobs_apart(self) -> None:
+    pipe = StubPipeline()
+    requests = [
+      [make_job()],
+      [make_job(size=16)],
+      [make_job(steps=3)],
+      [make_job(negative_prompt="blurry")],
+      [make_job()],
+    ]
+
+    results, batcher = run_batcher(pipe, requests, max_batch_size=4)
+
+    assert [img.size for [img] in results] == [(8, 8), (16, 16), (8, 8), (8, 8), (8, 8)]
+    assert batcher.batch_size_counts == {2: 1, 1: 3}
+
+  def test_batch_request_returns_images_in_order(self) -> None:
+    pipe = StubPipeline()
+    jobs = [make_job("red"), make_job("blue", size=16), make_job("white")]
+
+    [results], _ = run_batcher(pipe, [jobs], max_batch_size=4)
+
+    assert [color_of(img) for img in results] == [
+      (0, 255, 255),
+      (255, 255, 0),
+      (0, 0, 0),
+    ]
+    assert [img.size for img in results] == [(8, 8), (16, 16), (8, 8)]
+
+  def test_lone_request_runs_after_max_wait(self) -> None:
+    pipe = StubPipeline()
+    start = time.perf_counter()
+    [[result]], batcher = run_batcher(pipe, [[make_job()]], max_wait_ms=50)
+    assert time.perf_counter() - start < 1.0
+    assert result.size == (8, 8)
+    assert batcher.batch_size_counts == {1: 1}
+
+  def test_requests_queue_while_gpu_is_busy(self) -> None:
+    pipe = StubPipeline(delay=0.1)
+
+    async def main():
+      batcher = EditBatcher(
+        lambda jobs: run_pipeline_batch(pipe, jobs), max_batch_size=4, max_wait_ms=0
+      )
+      first = asyncio.ensure_future(batcher.submit(make_job()))
+      await asyncio.sleep(0.03)
+      # Arrive while the first batch is running; run together afterwards
+      rest = [batcher.submit(make_job()) for _ in range(3)]
+      await asyncio.gather(first, *rest)
+      await batcher.close()
+      return batcher
+
+    batcher = asyncio.run(main())
+    assert batcher.batch_size_counts == {1: 1, 3: 1}
+
+  def test_failed_batch_fails_its_requests_only(self) -> None:
+    pipe = StubPipeline()
+    attempts = []
+
+    def run_batch(jobs):
+      attempts.append(len(jobs))
+      if len(attempts) == 1:
+        raise RuntimeError("CUDA out of memory")
+      return run_pipeline_batch(pipe, jobs)
+
+    async def main():
+      batcher = EditBatcher(run_batch, max_batch_size=2)
+      failed = await asyncio.gather(
+        batcher.submit(make_job()), batcher.submit(make_job()), return_exceptions=True
+      )
+      recovered = await batcher.submit(make_job())
+      await batcher.close()
+      return failed, recovered
+
+    failed, recovered = asyncio.run(main())
+    assert [str(e) for e in failed] == ["CUDA out of memory"] * 2
+    assert recovered.size == (8, 8)
+    assert attempts == [2, 1]
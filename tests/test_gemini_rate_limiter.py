@@ -0,0 +1,316 @@
+"""
+Tests for gemini_rate_limiter.py
+
+These tests verify the shared Gemini token buckets with a fake clock,
+including:
+- Request (RPM) and token (TPM) budgets, refilled continuously
+- Separate budgets per model, shared across instances and processes
+- Pausing every caller after a 429, honoring the server's retry delay
+- Retrying 429s through call_with_rate_limit, against the stub server
+- Estimating image token costs
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+from google.genai import errors
+from PIL import Image
+
+from isometric_hanford.generation import http_session
+from isometric_hanford.generation.gemini_rate_limiter import (
+  GeminiRateLimiter,
+  call_with_rate_limit,
+  configure_gemini_rate_limiter,
+  estimate_tokens,
+  is_rate_limit_error,
+  retry_delay_from_error,
+)
+from isometric_hanford.generation.gemini_upload_cache import (
+  configure_gemini_upload_cache,
+)
+from isometric_hanford.generation.generate_full_map_layer import call_gemini_api
+from isometric_hanford.generation.stub_inference_server import (
+  StubBehavior,
+  StubInferenceServer,
+)
+
+MODEL = "gemini-test"
+
+
+class FakeClock:
+  """A clock that only moves when something sleeps on it."""
+
+  def __init__(self, now: float = 1000.0):
+    self.now = now
+    self.sleeps: list[float] = []
+
+  def __call__(self) -> float:
+    return self.now
+
+  def sleep(self, seconds: float) -> None:
+    self.sleeps.append(seconds)
+    self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+  return FakeClock()
+
+
+def limiter_for(path: Path, clock: FakeClock, **kwargs) -> GeminiRateLimiter:
+  return GeminiRateLimiter(path, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def rate_limit_error(retry_delay: str | None = None) -> errors.ClientError:
+  details = [{"retryDelay": retry_delay}] if retry_delay else []
+  response = {
+    "error": {"code": 429, "status": "RESOURCE_EXHAUSTED", "details": details}
+  }
+  return errors.ClientError(429, response)
+
+
+def take_requests(path: str, count: int) -> int:
+  """Take requests from a shared database without waiting (in a worker)."""
+  limiter = GeminiRateLimiter(Path(path), rpm=10)
+  return sum(limiter.try_acquire(MODEL) == 0 for _ in range(count))
+
+
+class Response:
+  def __init__(self, total_token_count: int):
+    self.usage_metadata = type("Usage", (), {"total_token_count": total_token_count})
+
+
+# =============================================================================
+# GeminiRateLimiter Tests
+# =============================================================================
+
+
+class TestGeminiRateLimiter:
+  def test_request_budget(self, tmp_path, clock) -> None:
+    limiter = limiter_for(tmp_path / "buckets.db", clock, rpm=60)
+
+    # A full bucket serves a minute's requests at once, then one per second
+    for _ in range(60):
+      assert limiter.acquire(MODEL) == 0
+    assert limiter.acquire(MODEL) == pytest.approx(1.0)
+    assert limiter.try_acquire(MODEL) == pytest.approx(1.0)
+
+    clock.now += 30
+    assert limiter.get_state(MODEL)["requests"] == pytest.approx(30)
+
+  def test_token_budget(self, tmp_path, clock) -> None:
+    limiter = limiter_for(tmp_path / "buckets.db", clock, rpm=0, tpm=6000)
+
+    assert limiter.acquire(MODEL, tokens=5000) == 0
+    # 1000 tokens left; 3000 more refill in 30 seconds
+    assert limiter.acquire(MODEL, tokens=4000) == pytest.approx(30)
+
+  def test_oversized_call_waits_for_a_full_bucket(self, tmp_path, clock) -> None:
+    limiter = limiter_for(tmp_path / "buckets.db", clock, rpm=0, tpm=1000)
+    assert limiter.acquire(MODEL, tokens=5000) == 0
+    # The bucket is 4000 in debt, so the next call waits for it to refill
+    assert limiter.acquire(MODEL, tokens=1000) == pytest.approx(5 * 60)
+
+  def test_records_actual_usage(self, tmp_path, clock) -> None:
+    limiter = limiter_for(tmp_path / "buckets.db", clock, rpm=0, tpm=6000)
+    limiter.acquire(MODEL, tokens=1000)
+
+    limiter.record_usage(MODEL, 2000)
+    assert limiter.get_state(MODEL)["tokens"] == pytest.approx(3000)
+    limiter.record_usage(MODEL, -10000)
+    assert limiter.get_state(MODEL)["tokens"] == pytest.approx(6000)
+
+  def test_unlimited_budgets_never_wait(self, tmp_path, clock) -> None:
+    limiter = limiter_for(tmp_path / "buckets.db", clock, rpm=0, tpm=0)
+    for _ in range(100):
+      assert limiter.acquire(MODEL, tokens=10**6) == 0
+
+  def test_budgets_default_to_unlimited(self, tmp_path, clock) -> None:
+    limiter = limiter_for(tmp_path / "buckets.db", clock)
+    for _ in range(100):
+      assert limiter.try_acquire(MODEL) == 0
+
+  def test_models_have_separate_budgets(self, tmp_path, clock) -> None:
+    limiter = limiter_for(tmp_path / "buckets.db", clock, rpm=1)
+    assert limiter.acquire("model-a") == 0
+    assert limiter.acquire("model-b") == 0
+    assert limiter.try_acquire("model-a") > 0
+
+  def test_budget_is_shared_between_instances(self, tmp_path, clock) -> None:
+    first = limiter_for(tmp_path / "buckets.db", clock, rpm=2)
+    second = limiter_for(tmp_path / "buckets.db", clock, rpm=2)
+    assert first.acquire(MODEL) == 0
+    assert second.acquire(MODEL) == 0
+    assert first.try_acquire(MODEL) > 0
+
+  def test_budget_is_shared_between_processes(self, tmp_path) -> None:
+    path = str(tmp_path / "buckets.db")
+    with ProcessPoolExecutor(max_workers=4) as executor:
+      taken = list(executor.map(take_requests, [path] * 4, [5] * 4))
+
+    # 20 attempts against a bucket of 10: only 10 succeed (allowing for a
+    # little refill while the workers run)
+    assert 10 <= sum(taken) <= 11
+
+
+# =============================================================================
+# Backoff Tests
+# =============================================================================
+
+
+class TestBackoff:
+  def test_rate_limit_pauses_every_caller(self, tmp_path, clock) -> None:
+    limiter = limiter_for(tmp_path / "buckets.db", clock, rpm=600)
+    other = limiter_for(tmp_path / "buckets.db", clock, rpm=600)
+
+    assert limiter.report_rate_limited(MODEL) == 2.0
+    assert other.try_acquire(MODEL) == pytest.approx(2.0)
+
+    # Once the pause ends, one caller goes and the rest are paced
+    clock.now += 2
+    assert other.try_acquire(MODEL) == 0
+    assert other.try_acquire(MODEL) == pytest.approx(0.1)
+
+  def test_backoff_doubles_and_decays(self, tmp_path, clock) -> None:
+    limiter = limiter_for(tmp_path / "buckets.db", clock, max_backoff_seconds=10)
+
+    delays = [limiter.report_rate_limited(MODEL) for _ in range(5)]
+    assert delays == [2.0, 4.0, 8.0, 10.0, 10.0]
+
+    limiter.report_success(MODEL)
+    assert limiter.get_state(MODEL)["backoff_seconds"] == 5.0
+    limiter.report_success(MODEL)
+    limiter.report_success(MODEL)
+    assert limiter.get_state(MODEL)["backoff_seconds"] == 0.0
+    assert limiter.report_rate_limited(MODEL) == 2.0
+
+  def test_honors_server_retry_delay(self, tmp_path, clock) -> None:
+    limiter = limiter_for(tmp_path / "buckets.db", clock)
+    assert limiter.report_rate_limited(MODEL, retry_after=30.0) == 30.0
+    assert limiter.try_acquire(MODEL) == pytest.approx(30.0)
+
+  def test_parses_rate_limit_errors(self) -> None:
+    assert is_rate_limit_error(rate_limit_error())
+    assert not is_rate_limit_error(errors.ServerError(503, {"error": {}}))
+    assert not is_rate_limit_error(ValueError("No image in Gemini response"))
+
+    assert retry_delay_from_error(rate_limit_error("17s")) == 17.0
+    assert retry_delay_from_error(rate_limit_error("0.5s")) == 0.5
+    assert retry_delay_from_error(rate_limit_error()) is None
+
+
+# =============================================================================
+# call_with_rate_limit Tests
+# =============================================================================
+
+
+class TestCallWithRateLimit:
+  @pytest.fixture
+  def limiter(self, tmp_path, clock):
+    limiter = configure_gemini_rate_limiter(
+      tmp_path / "buckets.db", rpm=60, tpm=6000, clock=clock, sleep=clock.sleep
+    )
+    yield limiter
+    configure_gemini_rate_limiter(None)
+
+  def test_retries_rate_limited_calls(self, limiter, clock) -> None:
+    outcomes = [rate_limit_error(), rate_limit_error("10s"), "done"]
+
+    def call() -> str:
+      outcome = outcomes.pop(0)
+      if isinstance(outcome, Exception):
+        raise outcome
+      return outcome
+
+    assert call_with_rate_limit(MODEL, call) == "done"
+    assert clock.sleeps == [pytest.approx(2.0), pytest.approx(10.0)]
+
+  def test_gives_up_after_max_attempts(self, limiter, clock) -> None:
+    calls = []
+
+    def call() -> None:
+      calls.append(clock.now)
+      raise rate_limit_error()
+
+    with pytest.raises(errors.ClientError):
+      call_with_rate_limit(MODEL, call, max_attempts=3)
+    assert len(calls) == 3
+
+  def test_other_errors_are_not_retried(self, limiter) -> None:
+    calls = []
+
+    def call() -> None:
+      calls.append(1)
+      raise ValueError("No image in Gemini response")
+
+    with pytest.raises(ValueError):
+      call_with_rate_limit(MODEL, call)
+    assert len(calls) == 1
+
+  def test_corrects_token_estimate_from_usage(self, limiter) -> None:
+    call_with_rate_limit(MODEL, lambda: Response(3000), tokens=1000)
+    assert limiter.get_state(MODEL)["tokens"] == pytest.approx(3000)
+
+  def test_calls_directly_when_disabled(self) -> None:
+    configure_gemini_rate_limiter(None)
+    assert call_with_rate_limit(MODEL, lambda: "done") == "done"
+
+
+class TestStubRateLimiting:
+  @pytest.fixture
+  def stub(self, request, monkeypatch, tmp_path, clock):
+    http_session.configure_session(backoff_factor=0)
+    configure_gemini_upload_cache(tmp_path / "uploads.db")
+    configure_gemini_rate_limiter(
+      tmp_path / "buckets.db", rpm=600, clock=clock, sleep=clock.sleep
+    )
+    behaviors = {"gemini": StubBehavior(error_rate=request.param, error_status=429)}
+    with StubInferenceServer(behaviors=behaviors, seed=3) as server:
+      for name, value in server.client_env().items():
+        monkeypatch.setenv(name, value)
+      monkeypatch.setenv("GEMINI_API_KEY", "stub")
+      try:
+        yield server
+      finally:
+        http_session.close_session()
+        configure_gemini_upload_cache(None)
+        configure_gemini_rate_limiter(None)
+
+  @pytest.mark.parametrize("stub", [1.0], indirect=True)
+  def test_persistent_429_is_raised(self, stub, clock) -> None:
+    with pytest.raises(errors.ClientError) as excinfo:
+      call_gemini_api(Image.new("RGB", (32, 16), "white"), "make it snow")
+
+    assert excinfo.value.code == 429
+    assert stub.stats["gemini"].requests == 5
+    assert clock.sleeps == [2.0, 4.0, 8.0, 16.0]
+
+  @pytest.mark.parametrize("stub", [0.5], indirect=True)
+  def test_intermittent_429s_are_retried(self, stub) -> None:
+    for _ in range(4):
+      result = call_gemini_api(Image.new("RGB", (32, 16), "white"), "make it snow")
+      assert result.size == (32, 16)
+
+    stats = stub.stats["gemini"]
+    assert stats.errors > 0
+    assert stats.requests == 4 + stats.errors
+
+
+# =============================================================================
+# estimate_tokens Tests
+# =============================================================================
+
+
+class TestEstimateTokens:
+  def test_small_images_cost_one_tile(self) -> None:
+    images = [Image.new("RGB", (384, 384)), Image.new("RGB", (64, 32))]
+    assert estimate_tokens(images, output_images=0) == 2 * 258
+
+  def test_large_images_cost_a_tile_per_768px(self) -> None:
+    assert estimate_tokens([Image.new("RGB", (1024, 1024))], output_images=0) == (
+      4 * 258
+    )
+
+  def test_includes_prompt_and_output(self) -> None:
+    assert estimate_tokens([], "x" * 400) == 100 + 1290
@@ -0,0 +1,191 @@
+"""
+Tests for gemini_upload_cache.py
+
+These tests verify the persistent Files API upload cache with a fake files
+client, including:
+- Uploading identical images once, and different images separately
+- Sharing records across cache instances and processes
+- Re-uploading files that are expired or about to expire
+- Scoping records to the API key and base URL
+- Uploading directly when caching is disabled
+"""
+
+import io
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from google.genai import types
+from PIL import Image
+
+from isometric_hanford.generation.gemini_upload_cache import (
+  GeminiUploadCache,
+  configure_gemini_upload_cache,
+  upload_image,
+)
+
+
+class FakeFiles:
+  """Stands in for genai.Client().files: records each uploaded file."""
+
+  def __init__(self, ttl: timedelta | None = timedelta(hours=48)):
+    self.ttl = ttl
+    self.uploads: list[tuple[bytes, str]] = []
+
+  def upload(self, file, config=None) -> types.File:
+    data = file.read() if isinstance(file, io.IOBase) else Path(file).read_bytes()
+    self.uploads.append((data, config.mime_type))
+    name = f"files/{len(self.uploads)}"
+    return types.File(
+      name=name,
+      uri=f"https://example.com/v1beta/{name}",
+      mime_type=config.mime_type,
+      expiration_time=(
+        datetime.now(timezone.utc) + self.ttl if self.ttl is not None else None
+      ),
+    )
+
+
+class FakeClient:
+  def __init__(self, **kwargs):
+    self.files = FakeFiles(**kwargs)
+
+
+@pytest.fixture(autouse=True)
+def gemini_env(monkeypatch):
+  monkeypatch.setenv("GEMINI_API_KEY", "key-a")
+  monkeypatch.delenv("GOOGLE_GEMINI_BASE_URL", raising=False)
+
+
+@pytest.fixture
+def cache(tmp_path) -> GeminiUploadCache:
+  return GeminiUploadCache(tmp_path / "uploads.db")
+
+
+def image(color: str) -> Image.Image:
+  return Image.new("RGB", (8, 8), color)
+
+
+def record_uploads(path: str, colors: list[str]) -> int:
+  """Upload images through a fresh cache (in a worker process)."""
+  client = FakeClient()
+  cache = GeminiUploadCache(Path(path))
+  for color in colors:
+    cache.upload(client, image(color), namespace="shared")
+  return len(client.files.uploads)
+
+
+# =============================================================================
+# GeminiUploadCache Tests
+# =============================================================================
+
+
+class TestGeminiUploadCache:
+  def test_uploads_identical_images_once(self, cache) -> None:
+    client = FakeClient()
+
+    first = cache.upload(client, image("red"))
+    second = cache.upload(client, image("red"))
+    other = cache.upload(client, image("blue"))
+
+    assert len(client.files.uploads) == 2
+    assert (first.name, first.uri) == (second.name, second.uri)
+    assert second.mime_type == "image/png"
+    assert other.name != first.name
+    assert cache.hits == 1 and cache.misses == 2
+
+  def test_uploads_png_bytes(self, cache) -> None:
+    client = FakeClient()
+    cache.upload(client, image("red"))
+    [(data, mime_type)] = client.files.uploads
+    assert mime_type == "image/png"
+    assert Image.open(io.BytesIO(data)).getpixel((0, 0)) == (255, 0, 0)
+
+  def test_records_persist_across_instances(self, cache) -> None:
+    uploaded = cache.upload(FakeClient(), image("red"))
+
+    client = FakeClient()
+    reused = GeminiUploadCache(cache.path).upload(client, image("red"))
+
+    assert client.files.uploads == []
+    assert reused.uri == uploaded.uri
+
+  def test_shared_across_processes(self, tmp_path) -> None:
+    path = str(tmp_path / "uploads.db")
+    colors = ["red", "green", "blue", "white"]
+    with ProcessPoolExecutor(max_workers=4) as executor:
+      list(executor.map(record_uploads, [path] * 4, [colors] * 4))
+
+    # Every record is readable afterwards, so no process re-uploads
+    assert record_uploads(path, colors) == 0
+    assert GeminiUploadCache(Path(path)).get_stats()["entries"] == 4
+
+  def test_reuploads_files_about_to_expire(self, tmp_path) -> None:
+    cache = GeminiUploadCache(tmp_path / "uploads.db", expiry_margin_seconds=3600)
+    client = FakeClient(ttl=timedelta(minutes=30))
+
+    cache.upload(client, image("red"))
+    cache.upload(client, image("red"))
+
+    assert len(client.files.uploads) == 2
+
+  def test_missing_expiry_uses_default_ttl(self, cache) -> None:
+    client = FakeClient(ttl=None)
+    cache.upload(client, image("red"))
+    cache.upload(client, image("red"))
+    assert len(client.files.uploads) == 1
+
+  def test_drops_expired_records(self, cache) -> None:
+    expired = types.File(
+      name="files/old",
+      uri="https://example.com/old",
+      mime_type="image/png",
+      expiration_time=datetime.now(timezone.utc) - timedelta(seconds=1),
+    )
+    cache.put("old", expired)
+    cache.upload(FakeClient(), image("red"))
+    assert cache.get_stats()["entries"] == 1
+
+  def test_scoped_to_api_key_and_base_url(self, cache, monkeypatch) -> None:
+    client = FakeClient()
+    cache.upload(client, image("red"))
+
+    monkeypatch.setenv("GEMINI_API_KEY", "key-b")
+    cache.upload(client, image("red"))
+
+    monkeypatch.setenv("GOOGLE_GEMINI_BASE_URL", "http://127.0.0.1:8890")
+    cache.upload(client, image("red"))
+
+    assert len(client.files.uploads) == 3
+
+  def test_clear(self, cache) -> None:
+    client = FakeClient()
+    cache.upload(client, image("red"))
+    cache.clear()
+    cache.upload(client, image("red"))
+    assert len(client.files.uploads) == 2
+
+
+# =============================================================================
+# upload_image Tests
+# =============================================================================
+
+
+class TestUploadImage:
+  def test_uses_global_cache(self, tmp_path) -> None:
+    configure_gemini_upload_cache(tmp_path / "uploads.db")
+    try:
+      client = FakeClient()
+      upload_image(client, image("red"))
+      upload_image(client, image("red"))
+    finally:
+      configure_gemini_upload_cache(None)
+    assert len(client.files.uploads) == 1
+
+  def test_uploads_directly_when_disabled(self) -> None:
+    configure_gemini_upload_cache(None)
+    client = FakeClient()
+    upload_image(client, image("red"))
+    upload_image(client, image("red"))
+    assert len(client.files.uploads) == 2
@@ -0,0 +1,309 @@
+"""
+Tests for generate_full_map_layer.py dispatching
+
+These tests verify that layer items are spread across models concurrently
+and that progress.db tracks them, including:
+- Round-robin assignment with per-model in-flight limits
+- Per-model request rate limits
+- Failures (and exceptions) recorded without stopping other items
+- Resuming items an interrupted run left in progress
+- Calling Gemini with each model's own API key and base URL
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from isometric_hanford.generation import generate_full_map_layer as layer_module
+from isometric_hanford.generation.gemini_rate_limiter import (
+  configure_gemini_rate_limiter,
+)
+from isometric_hanford.generation.gemini_upload_cache import (
+  configure_gemini_upload_cache,
+)
+from isometric_hanford.generation.generate_full_map_layer import (
+  GenerationItem,
+  ModelEndpoint,
+  call_gemini_api,
+  dispatch_items,
+  generate_layer,
+)
+from isometric_hanford.generation.stub_inference_server import StubInferenceServer
+
+
+def make_items(count: int, step: int = 1) -> list[GenerationItem]:
+  return [
+    GenerationItem(i, step, "2x2", i * 2, 0, 2, 2, "pending")
+    for i in range(1, count + 1)
+  ]
+
+
+def make_model(name: str, **kwargs) -> ModelEndpoint:
+  return ModelEndpoint(name=name, url="test", api_key_env="TEST_KEY", **kwargs)
+
+
+class InFlightTracker:
+  """Fake process() that sleeps and records per-model concurrency."""
+
+  def __init__(self, delay: float = 0.02):
+    self.delay = delay
+    self.lock = threading.Lock()
+    self.in_flight: dict[str, int] = {}
+    self.peak: dict[str, int] = {}
+    self.total_peak = 0
+    self.calls: list[tuple[int, str]] = []
+
+  def __call__(self, item: GenerationItem, model: ModelEndpoint) -> tuple[bool, str]:
+    with self.lock:
+      self.calls.append((item.id, model.name))
+      self.in_flight[model.name] = self.in_flight.get(model.name, 0) + 1
+      self.peak[model.name] = max(
+        self.peak.get(model.name, 0), self.in_flight[model.name]
+      )
+      self.total_peak = max(self.total_peak, sum(self.in_flight.values()))
+    time.sleep(self.delay)
+    with self.lock:
+      self.in_flight[model.name] -= 1
+    return True, "ok"
+
+
+# =============================================================================
+# dispatch_items Tests
+# =============================================================================
+
+
+class TestDispatchItems:
+  def test_round_robin_within_concurrency_limits(self) -> None:
+    models = [make_model("a", max_concurrency=2), make_model("b", max_concurrency=3)]
+    tracker = InFlightTracker()
+    results = []
+
+    processed = dispatch_items(
+      make_items(20),
+      models,
+      tracker,
+      on_result=lambda item, model, ok, msg: results.append((item.id, ok)),
+    )
+
+    assert processed == 20
+    assert sorted(results) == [(i, True) for i in range(1, 21)]
+    # The first items alternate between models
+    assert [name for _, name in tracker.calls[:4]] == ["a", "b", "a", "b"]
+    assert tracker.peak == {"a": 2, "b": 3}
+    assert tracker.total_peak == 5
+
+  def test_throughput_scales_with_models(self) -> None:
+    def elapsed(model_count: int) -> float:
+      models = [make_model(f"m{i}", max_concurrency=2) for i in range(model_count)]
+      start = time.perf_counter()
+      dispatch_items(make_items(24), models, InFlightTracker(delay=0.03))
+      return time.perf_counter() - start
+
+    assert elapsed(4) < elapsed(1) / 2
+
+  def test_rate_limit_spaces_request_starts(self) -> None:
+    model = make_model("slow", max_concurrency=4, requests_per_minute=1200)
+    starts = []
+
+    def process(item, model):
+      starts.append(time.monotonic())
+      return True, "ok"
+
+    dispatch_items(make_items(4), [model], process)
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.045  # 1200/min = one start every 50ms
+
+  def test_failures_do_not_stop_other_items(self) -> None:
+    def process(item, model):
+      if item.id == 2:
+        raise RuntimeError("boom")
+      if item.id == 3:
+        return False, "API error: nope"
+      return True, "ok"
+
+    results = {}
+    dispatch_items(
+      make_items(4),
+      [make_model("a", max_concurrency=2)],
+      process,
+      on_result=lambda item, model, ok, msg: results.update({item.id: (ok, msg)}),
+    )
+    assert results == {
+      1: (True, "ok"),
+      2: (False, "Error: boom"),
+      3: (False, "API error: nope"),
+      4: (True, "ok"),
+    }
+
+
+# =============================================================================
+# generate_layer Tests
+# =============================================================================
+
+
+@pytest.fixture
+def layer_dir(tmp_path: Path) -> Path:
+  """A layer with a 3-step plan in progress.db and an (empty) source DB."""
+  source_dir = tmp_path / "source"
+  source_dir.mkdir()
+  sqlite3.connect(source_dir / "quadrants.db").close()
+
+  layer = tmp_path / "layer"
+  layer.mkdir()
+  (layer / "layer_config.json").write_text(
+    json.dumps(
+      {
+        "name": "test",
+        "generation_dir": str(source_dir),
+        "source_layer": "generations",
+        "model_endpoints": [
+          {"name": "a", "url": "x", "api_key_env": "A", "max_concurrency": 2},
+          {"name": "b", "url": "x", "api_key_env": "B"},
+        ],
+      }
+    )
+  )
+
+  conn = sqlite3.connect(layer / "progress.db")
+  conn.execute("""
+    CREATE TABLE generation_plan (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      step INTEGER NOT NULL,
+      block_type TEXT NOT NULL,
+      top_left_x INTEGER NOT NULL,
+      top_left_y INTEGER NOT NULL,
+      width INTEGER NOT NULL,
+      height INTEGER NOT NULL,
+      status TEXT NOT NULL DEFAULT 'pending',
+      model_name TEXT,
+      started_at REAL,
+      completed_at REAL,
+      error_message TEXT
+    )
+  """)
+  rows = [(1, "2x2", x, 0, 2, 2) for x in range(0, 20, 2)]
+  rows += [(2, "1x2", x, 2, 1, 2) for x in range(5)]
+  rows += [(3, "1x1", x, 4, 1, 1) for x in range(5)]
+  conn.executemany(
+    "INSERT INTO generation_plan (step, block_type, top_left_x, top_left_y, "
+    "width, height) VALUES (?, ?, ?, ?, ?, ?)",
+    rows,
+  )
+  conn.commit()
+  conn.close()
+  return layer
+
+
+def get_statuses(layer: Path) -> dict[int, tuple[int, str, str | None]]:
+  conn = sqlite3.connect(layer / "progress.db")
+  try:
+    rows = conn.execute(
+      "SELECT id, step, status, model_name FROM generation_plan"
+    ).fetchall()
+    return {row[0]: (row[1], row[2], row[3]) for row in rows}
+  finally:
+    conn.close()
+
+
+class TestGenerateLayer:
+  def test_processes_steps_in_order_across_models(
+    self, layer_dir: Path, monkeypatch
+  ) -> None:
+    calls: list[int] = []
+    lock = threading.Lock()
+
+    def fake_process_item(item, model, source_conn, **kwargs):
+      source_conn.execute("SELECT 1")
+      with lock:
+        calls.append(item.step)
+      time.sleep(0.005)
+      if item.top_left_x == 4 and item.step == 2:
+        return False, "API error: nope"
+      return True, "ok"
+
+    monkeypatch.setattr(layer_module, "process_item", fake_process_item)
+
+    assert generate_layer(layer_dir, max_concurrency=3) == 1
+    assert calls == sorted(calls)
+
+    statuses = get_statuses(layer_dir)
+    assert sum(status == "complete" for _, status, _ in statuses.values()) == 19
+    assert [s for _, s, _ in statuses.values()].count("error") == 1
+    assert {model for _, _, model in statuses.values()} == {"a", "b"}
+
+  def test_resumes_interrupted_items(self, layer_dir: Path, monkeypatch) -> None:
+    conn = sqlite3.connect(layer_dir / "progress.db")
+    conn.execute(
+      "UPDATE generation_plan SET status = 'complete' WHERE id <= 5 OR step > 1"
+    )
+    conn.execute(
+      "UPDATE generation_plan SET status = 'in_progress', model_name = 'a' "
+      "WHERE id IN (6, 7)"
+    )
+    conn.commit()
+    conn.close()
+
+    processed: list[int] = []
+    monkeypatch.setattr(
+      layer_module,
+      "process_item",
+      lambda item, **kwargs: (processed.append(item.id), (True, "ok"))[1],
+    )
+
+    assert generate_layer(layer_dir) == 0
+    assert sorted(processed) == [6, 7, 8, 9, 10]
+    assert {status for _, status, _ in get_statuses(layer_dir).values()} == {"complete"}
+
+  def test_max_items(self, layer_dir: Path, monkeypatch) -> None:
+    monkeypatch.setattr(
+      layer_module, "process_item", lambda item, **kwargs: (True, "ok")
+    )
+
+    assert generate_layer(layer_dir, max_items=4) == 0
+    statuses = [status for _, status, _ in get_statuses(layer_dir).values()]
+    assert statuses.count("complete") == 4
+    assert statuses.count("pending") == 16
+
+
+# =============================================================================
+# Model Endpoint Tests
+# =============================================================================
+
+
+class TestModelEndpoints:
+  @pytest.fixture
+  def stubs(self, monkeypatch, tmp_path):
+    configure_gemini_upload_cache(tmp_path / "uploads.db")
+    configure_gemini_rate_limiter(tmp_path / "buckets.db")
+    monkeypatch.delenv("GOOGLE_GEMINI_BASE_URL", raising=False)
+    monkeypatch.setenv("KEY_A", "key-a")
+    monkeypatch.setenv("KEY_B", "key-b")
+    with StubInferenceServer() as a, StubInferenceServer() as b:
+      try:
+        yield a, b
+      finally:
+        configure_gemini_upload_cache(None)
+        configure_gemini_rate_limiter(None)
+
+  def test_each_model_uses_its_own_endpoint(self, stubs) -> None:
+    models = [
+      ModelEndpoint(name=name, url=stub.url, api_key_env=f"KEY_{name}")
+      for stub, name in zip(stubs, ["A", "B"])
+    ]
+    image = Image.new("RGB", (32, 16), "white")
+    for model in models:
+      assert call_gemini_api(image, "make it snow", model).size == (32, 16)
+
+    for stub in stubs:
+      assert stub.stats["gemini"].requests == 1
+      assert len(stub.files) == 1
+
+  def test_missing_api_key_names_the_variable(self, stubs) -> None:
+    model = ModelEndpoint(name="other", url=stubs[0].url, api_key_env="KEY_C")
+    with pytest.raises(ValueError, match="KEY_C"):
+      call_gemini_api(Image.new("RGB", (32, 16)), "make it snow", model)
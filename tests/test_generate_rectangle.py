@@ -0,0 +1,83 @@
+"""
+Tests for the /api/generate-rectangle endpoint
+
+These tests verify that every step of a rectangle plan is queued in one
+batch, in plan order, with ids and per-model positions in the response.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from isometric_hanford.generation import app as app_module
+from isometric_hanford.generation.queue_db import init_queue_table
+
+
+@pytest.fixture
+def client(quadrants_db: Path, monkeypatch):
+  """App test client on an empty generation DB, with the worker idle."""
+  conn = sqlite3.connect(quadrants_db)
+  init_queue_table(conn)
+  conn.commit()
+  conn.close()
+
+  monkeypatch.setattr(app_module, "GENERATION_DIR", quadrants_db.parent)
+  # Keep queued items in place instead of generating them
+  monkeypatch.setattr(app_module, "NO_GENERATE_MODE", True)
+  try:
+    yield app_module.app.test_client()
+  finally:
+    app_module.stop_queue_worker()
+    if app_module.queue_worker_thread is not None:
+      app_module.queue_worker_thread.join(timeout=5)
+    app_module.close_db_pool()
+
+
+def get_queue_rows(db_path: Path) -> list[tuple]:
+  conn = sqlite3.connect(db_path)
+  try:
+    return conn.execute(
+      "SELECT id, quadrants, model_id FROM generation_queue ORDER BY created_at, id"
+    ).fetchall()
+  finally:
+    conn.close()
+
+
+class TestGenerateRectangle:
+  """Tests for queueing a rectangle plan."""
+
+  def test_queues_every_step_in_order(self, client, tmp_path: Path) -> None:
+    response = client.post(
+      "/api/generate-rectangle",
+      json={"tl": [0, 0], "br": [9, 9], "model_id": "a"},
+    )
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data["success"] is True
+    rows = get_queue_rows(tmp_path / "quadrants.db")
+    assert data["queued_count"] == len(rows) > 0
+    assert data["item_ids"] == [row[0] for row in rows]
+    assert data["positions"] == list(range(1, len(rows) + 1))
+    assert {row[2] for row in rows} == {"a"}
+
+    queued_quadrants = {tuple(q) for row in rows for q in json.loads(row[1])}
+    assert queued_quadrants == {(x, y) for x in range(10) for y in range(10)}
+
+  def test_positions_are_per_model(self, client) -> None:
+    first = client.post(
+      "/api/generate-rectangle", json={"tl": [0, 0], "br": [3, 3], "model_id": "a"}
+    ).get_json()
+    second = client.post(
+      "/api/generate-rectangle",
+      json={"tl": [20, 0], "br": [23, 3], "model_id": "a"},
+    ).get_json()
+    other = client.post(
+      "/api/generate-rectangle",
+      json={"tl": [40, 0], "br": [43, 3], "model_id": "b"},
+    ).get_json()
+
+    assert second["positions"][0] == first["queued_count"] + 1
+    assert other["positions"][0] == 1
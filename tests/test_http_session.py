@@ -0,0 +1,241 @@
+"""
+Tests for http_session.py
+
+These tests verify that generation HTTP calls share pooled keep-alive
+connections, against a local stand-in HTTP server, including:
+- Connection reuse (vs. a new connection per bare requests call)
+- Reuse across threads, bounded by the pool size
+- Retrying 503s (with backoff) and connection errors, not other errors
+- Not resending POSTs on gateway errors
+- The generate_omni local API and download functions using the session
+"""
+
+import base64
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import pytest
+import requests
+from PIL import Image
+
+from isometric_hanford.generation import http_session
+from isometric_hanford.generation.generate_omni import (
+  call_local_api,
+  call_local_api_b64,
+  download_image_to_pil,
+)
+from isometric_hanford.generation.model_config import ModelConfig
+
+
+def png_bytes(color: str = "red") -> bytes:
+  buffer = BytesIO()
+  Image.new("RGB", (8, 8), color).save(buffer, format="PNG")
+  return buffer.getvalue()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+  """Keep-alive handler that counts connections and scripts failures."""
+
+  protocol_version = "HTTP/1.1"
+
+  def setup(self) -> None:
+    super().setup()
+    # Like real servers; otherwise Nagle's algorithm delays keep-alive replies
+    self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    with self.server.lock:
+      self.server.connections += 1
+
+  def log_message(self, format, *args) -> None:
+    pass
+
+  def send(self, status: int, body: bytes, content_type: str) -> None:
+    self.send_response(status)
+    self.send_header("Content-Type", content_type)
+    self.send_header("Content-Length", str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def scripted_failure(self) -> bool:
+    with self.server.lock:
+      self.server.requests += 1
+      status = self.server.fail_statuses.pop(0) if self.server.fail_statuses else None
+    if status is not None:
+      self.send(status, b"unavailable", "text/plain")
+    return status is not None
+
+  def do_GET(self) -> None:
+    if not self.scripted_failure():
+      self.send(200, png_bytes(), "image/png")
+
+  def do_POST(self) -> None:
+    body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+    if self.scripted_failure():
+      return
+    if self.path == "/edit-b64":
+      payload = json.loads(body)
+      assert payload["steps"] == 4
+      response = {"image_b64": base64.b64encode(png_bytes("blue")).decode()}
+      self.send(200, json.dumps(response).encode(), "application/json")
+    else:
+      self.send(200, png_bytes("green"), "image/png")
+
+
+@pytest.fixture
+def server():
+  """A stand-in HTTP server on a free local port."""
+  httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+  httpd.daemon_threads = True
+  httpd.lock = threading.Lock()
+  httpd.connections = 0
+  httpd.requests = 0
+  httpd.fail_statuses = []
+  thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+  thread.start()
+  httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+  try:
+    yield httpd
+  finally:
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+  """Give each test its own global session, with instant retry backoff."""
+  http_session.configure_session(backoff_factor=0)
+  yield
+  http_session.close_session()
+
+
+def local_model(endpoint: str) -> ModelConfig:
+  return ModelConfig(
+    name="local",
+    model_id="local",
+    api_key_env="",
+    endpoint=endpoint,
+    num_inference_steps=4,
+    model_type="local",
+  )
+
+
+# =============================================================================
+# Connection Reuse Tests
+# =============================================================================
+
+
+class TestConnectionReuse:
+  def test_session_reuses_one_connection(self, server) -> None:
+    session = http_session.get_session()
+    for _ in range(20):
+      session.get(f"{server.url}/image.png", timeout=5).raise_for_status()
+    assert server.requests == 20
+    assert server.connections == 1
+
+  def test_bare_requests_connect_every_time(self, server) -> None:
+    for _ in range(5):
+      requests.get(f"{server.url}/image.png", timeout=5).raise_for_status()
+    assert server.connections == 5
+
+  def test_threads_share_the_pool(self, server) -> None:
+    http_session.configure_session(pool_size=4)
+    session = http_session.get_session()
+
+    def fetch(_) -> int:
+      return session.get(f"{server.url}/image.png", timeout=5).status_code
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+      assert set(executor.map(fetch, range(100))) == {200}
+    assert server.requests == 100
+    assert server.connections <= 4
+
+  def test_configure_replaces_session(self) -> None:
+    first = http_session.get_session()
+    assert http_session.get_session() is first
+    second = http_session.configure_session(pool_size=2)
+    assert second is not first
+    assert http_session.get_session() is second
+
+
+# =============================================================================
+# Retry Tests
+# =============================================================================
+
+
+class TestRetries:
+  def test_retries_unavailable_post(self, server) -> None:
+    server.fail_statuses = [503, 429]
+    response = http_session.get_session().post(
+      f"{server.url}/edit", data=b"x", timeout=5
+    )
+    assert response.status_code == 200
+    assert server.requests == 3
+
+  def test_gives_up_after_retries(self, server) -> None:
+    http_session.configure_session(retries=1, backoff_factor=0)
+    server.fail_statuses = [503, 503, 503]
+    response = http_session.get_session().get(f"{server.url}/image.png", timeout=5)
+    assert response.status_code == 503
+    with pytest.raises(requests.HTTPError):
+      response.raise_for_status()
+    assert server.requests == 2
+
+  def test_does_not_retry_server_errors(self, server) -> None:
+    server.fail_statuses = [500]
+    response = http_session.get_session().post(
+      f"{server.url}/edit", data=b"x", timeout=5
+    )
+    assert response.status_code == 500
+    assert server.requests == 1
+
+  def test_does_not_resend_post_on_gateway_errors(self, server) -> None:
+    for status in (502, 504):
+      server.requests = 0
+      server.fail_statuses = [status]
+      response = http_session.get_session().post(
+        f"{server.url}/edit", data=b"x", timeout=5
+      )
+      assert response.status_code == status
+      assert server.requests == 1
+
+  def test_retries_get_on_gateway_errors(self, server) -> None:
+    server.fail_statuses = [502, 504]
+    response = http_session.get_session().get(f"{server.url}/image.png", timeout=5)
+    assert response.status_code == 200
+    assert server.requests == 3
+
+  def test_retries_refused_connections(self) -> None:
+    http_session.configure_session(retries=2, backoff_factor=0)
+    with socket.socket() as sock:
+      sock.bind(("127.0.0.1", 0))
+      port = sock.getsockname()[1]
+    with pytest.raises(requests.ConnectionError, match="Max retries"):
+      http_session.get_session().get(f"http://127.0.0.1:{port}/", timeout=5)
+
+
+# =============================================================================
+# generate_omni Tests
+# =============================================================================
+
+
+class TestGenerateOmniCalls:
+  def test_local_api_calls_reuse_connection(self, server) -> None:
+    template = Image.new("RGBA", (8, 8), "white")
+
+    b64_result = call_local_api_b64(template, local_model(f"{server.url}/edit-b64"))
+    multipart_result = call_local_api(template, local_model(f"{server.url}/edit"))
+    downloaded = download_image_to_pil(f"{server.url}/image.png")
+
+    assert b64_result.convert("RGB").getpixel((0, 0)) == (0, 0, 255)
+    assert multipart_result.convert("RGB").getpixel((0, 0)) == (0, 128, 0)
+    assert downloaded.convert("RGB").getpixel((0, 0)) == (255, 0, 0)
+    assert server.connections == 1
+
+  def test_download_retries_through_session(self, server) -> None:
+    server.fail_statuses = [503]
+    image = download_image_to_pil(f"{server.url}/image.png", retry_delay=0)
+    assert image.size == (8, 8)
+    assert server.requests == 2
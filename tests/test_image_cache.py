@@ -0,0 +1,148 @@
+"""
+Tests for image_cache.py and load_quadrant_image
+
+These tests verify byte-bounded LRU eviction, invalidation by the save
+functions, and that QuadrantHelpers reuse decoded images.
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from isometric_hanford.generation.image_cache import (
+  DecodedImageCache,
+  decoded_size,
+  get_decoded_image_cache,
+)
+from isometric_hanford.generation.shared import (
+  QuadrantHelpers,
+  ensure_content_hash_columns_exist,
+  image_to_png_bytes,
+  load_quadrant_image,
+  save_quadrant_generation,
+)
+
+
+def make_image(color: tuple[int, int, int], size: int = 16) -> Image.Image:
+  return Image.new("RGB", (size, size), color)
+
+
+@pytest.fixture
+def conn(quadrants_db: Path) -> sqlite3.Connection:
+  """Quadrants DB with generations at (0, 0) and (1, 0)."""
+  conn = sqlite3.connect(quadrants_db)
+  conn.executemany(
+    "INSERT INTO quadrants (quadrant_x, quadrant_y, lat, lng, tile_row, tile_col, "
+    "quadrant_index) VALUES (?, 0, 0, 0, 0, 0, 0)",
+    [(0,), (1,)],
+  )
+  ensure_content_hash_columns_exist(conn)
+  save_quadrant_generation(conn, {}, 0, 0, image_to_png_bytes(make_image((255, 0, 0))))
+  save_quadrant_generation(conn, {}, 1, 0, image_to_png_bytes(make_image((0, 255, 0))))
+
+  cache = get_decoded_image_cache()
+  cache.clear()
+  yield conn
+  cache.clear()
+  conn.close()
+
+
+# =============================================================================
+# DecodedImageCache Tests
+# =============================================================================
+
+
+class TestDecodedImageCache:
+  def test_evicts_by_decoded_size(self) -> None:
+    image = make_image((1, 2, 3))
+    cache = DecodedImageCache(max_bytes=decoded_size(image) * 2)
+
+    cache.put((0, 0, "generation", "a"), image)
+    cache.put((1, 0, "generation", "b"), image)
+    assert cache.get((0, 0, "generation", "a")) is not None
+    cache.put((2, 0, "generation", "c"), image)
+
+    # (1, 0) was least recently used
+    assert cache.get((1, 0, "generation", "b")) is None
+    assert cache.get((0, 0, "generation", "a")) is not None
+    assert cache.get_stats()["evictions"] == 1
+
+  def test_returns_copies(self) -> None:
+    cache = DecodedImageCache()
+    cache.put((0, 0, "render", "a"), make_image((1, 2, 3)))
+
+    image = cache.get((0, 0, "render", "a"))
+    image.putpixel((0, 0), (9, 9, 9))
+    assert cache.get((0, 0, "render", "a")).getpixel((0, 0)) == (1, 2, 3)
+
+  def test_invalidate_by_column(self) -> None:
+    cache = DecodedImageCache()
+    cache.put((0, 0, "render", "a"), make_image((1, 2, 3)))
+    cache.put((0, 0, "generation", "b"), make_image((1, 2, 3)))
+
+    assert cache.invalidate(0, 0, "render") == 1
+    assert len(cache) == 1
+    assert cache.invalidate(0, 0) == 1
+    assert len(cache) == 0
+
+
+# =============================================================================
+# load_quadrant_image Tests
+# =============================================================================
+
+
+class TestLoadQuadrantImage:
+  def test_second_load_is_a_hit(self, conn: sqlite3.Connection) -> None:
+    cache = get_decoded_image_cache()
+    first = load_quadrant_image(conn, 0, 0)
+    second = load_quadrant_image(conn, 0, 0)
+
+    assert first.getpixel((0, 0)) == (255, 0, 0)
+    assert second.getpixel((0, 0)) == (255, 0, 0)
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+  def test_missing_image(self, conn: sqlite3.Connection) -> None:
+    assert load_quadrant_image(conn, 0, 0, "render") is None
+    assert load_quadrant_image(conn, 5, 5) is None
+
+  def test_save_invalidates(self, conn: sqlite3.Connection) -> None:
+    load_quadrant_image(conn, 0, 0)
+    save_quadrant_generation(conn, {}, 0, 0, image_to_png_bytes(make_image((0, 0, 9))))
+
+    assert get_decoded_image_cache().get_stats()["invalidations"] == 1
+    assert load_quadrant_image(conn, 0, 0).getpixel((0, 0)) == (0, 0, 9)
+
+  def test_direct_write_not_served_stale(self, conn: sqlite3.Connection) -> None:
+    load_quadrant_image(conn, 0, 0)
+    conn.execute(
+      "UPDATE quadrants SET generation = ? WHERE quadrant_x = 0 AND quadrant_y = 0",
+      (image_to_png_bytes(make_image((7, 7, 7))),),
+    )
+    conn.commit()
+
+    assert load_quadrant_image(conn, 0, 0).getpixel((0, 0)) == (7, 7, 7)
+
+  def test_unmigrated_database(self, quadrants_db: Path) -> None:
+    conn = sqlite3.connect(quadrants_db)
+    conn.execute(
+      "INSERT INTO quadrants (quadrant_x, quadrant_y, lat, lng, tile_row, tile_col, "
+      "quadrant_index, generation) VALUES (0, 0, 0, 0, 0, 0, 0, ?)",
+      (image_to_png_bytes(make_image((3, 3, 3))),),
+    )
+    assert load_quadrant_image(conn, 0, 0).getpixel((0, 0)) == (3, 3, 3)
+    conn.close()
+
+
+class TestQuadrantHelpersCache:
+  def test_get_generation_reuses_decoded_images(self, conn: sqlite3.Connection) -> None:
+    helpers = QuadrantHelpers(conn, config={})
+    for _ in range(3):
+      assert helpers.get_generation(1, 0).getpixel((0, 0)) == (0, 255, 0)
+
+    stats = get_decoded_image_cache().get_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
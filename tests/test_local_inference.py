@@ -0,0 +1,255 @@
+"""
+Tests for the local inference transports in generate_omni.py
+
+These tests verify the raw image/png and batch transports against a local
+stand-in for inference/server.py's edit_png / edit_b64 / edit_batch
+endpoints, including:
+- Raw image bodies with parameters in the query string
+- Preferring the binary endpoint when one is configured
+- Falling back to base64 when the binary endpoint isn't deployed
+- Grouping concurrent calls into batch requests
+"""
+
+import base64
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+from PIL import Image, ImageOps
+
+from isometric_hanford.generation import http_session
+from isometric_hanford.generation.generate_omni import (
+  LocalBatchClient,
+  call_local_api_batch,
+  call_local_api_png,
+  call_local_inference,
+)
+from isometric_hanford.generation.model_config import ModelConfig
+
+
+def png_bytes(color: str) -> bytes:
+  buffer = BytesIO()
+  Image.new("RGB", (8, 8), color).save(buffer, format="PNG")
+  return buffer.getvalue()
+
+
+class EditHandler(BaseHTTPRequestHandler):
+  """Stand-in edit_png / edit_b64 endpoints that record each request."""
+
+  protocol_version = "HTTP/1.1"
+
+  def log_message(self, format, *args) -> None:
+    pass
+
+  def do_POST(self) -> None:
+    url = urlparse(self.path)
+    body = self.rfile.read(int(self.headers["Content-Length"]))
+    self.server.calls.append(
+      (url.path, parse_qs(url.query), self.headers["Content-Type"], body)
+    )
+
+    status = self.server.statuses.get(url.path, 200)
+    if status != 200:
+      content, content_type = b"nope", "text/plain"
+    elif url.path == "/edit-png":
+      content, content_type = png_bytes("blue"), "image/png"
+    elif url.path == "/edit-batch":
+      # Each item's template, inverted
+      images_b64 = []
+      for item in json.loads(body)["items"]:
+        image = Image.open(BytesIO(base64.b64decode(item["image_b64"])))
+        output = BytesIO()
+        ImageOps.invert(image.convert("RGB")).save(output, format="PNG")
+        images_b64.append(base64.b64encode(output.getvalue()).decode())
+      response = {"images_b64": images_b64}
+      content, content_type = json.dumps(response).encode(), "application/json"
+    else:
+      response = {"image_b64": base64.b64encode(png_bytes("green")).decode()}
+      content, content_type = json.dumps(response).encode(), "application/json"
+
+    self.send_response(status)
+    self.send_header("Content-Type", content_type)
+    self.send_header("Content-Length", str(len(content)))
+    self.end_headers()
+    self.wfile.write(content)
+
+
+@pytest.fixture
+def server():
+  httpd = ThreadingHTTPServer(("127.0.0.1", 0), EditHandler)
+  httpd.daemon_threads = True
+  httpd.calls = []
+  httpd.statuses = {}
+  threading.Thread(target=httpd.serve_forever, daemon=True).start()
+  httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+  http_session.configure_session(backoff_factor=0)
+  try:
+    yield httpd
+  finally:
+    http_session.close_session()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_model(
+  server, binary: bool = True, batch: bool = False, max_concurrency: int = 1
+) -> ModelConfig:
+  return ModelConfig(
+    name="local",
+    model_id="local",
+    api_key_env="",
+    endpoint=f"{server.url}/edit-b64",
+    binary_endpoint=f"{server.url}/edit-png" if binary else None,
+    batch_endpoint=f"{server.url}/edit-batch" if batch else None,
+    num_inference_steps=7,
+    model_type="url",
+    max_concurrency=max_concurrency,
+  )
+
+
+def color_of(image: Image.Image) -> tuple[int, int, int]:
+  return image.convert("RGB").getpixel((0, 0))
+
+
+def near_color_of(image: Image.Image) -> tuple[int, int, int]:
+  """color_of, rounded to absorb JPEG error in the template."""
+  return tuple(round(channel / 5) * 5 for channel in color_of(image))
+
+
+class TestCallLocalApiPng:
+  def test_sends_raw_image_with_query_params(self, server) -> None:
+    template = Image.new("RGBA", (8, 8), "red")
+    result = call_local_api_png(
+      template, make_model(server), "make it pixel art ✨", "blurry", use_jpeg=False
+    )
+
+    assert color_of(result) == (0, 0, 255)
+    [(path, query, content_type, body)] = server.calls
+    assert path == "/edit-png"
+    assert query == {
+      "prompt": ["make it pixel art ✨"],
+      "negative_prompt": ["blurry"],
+      "steps": ["7"],
+    }
+    assert content_type == "image/png"
+    assert color_of(Image.open(BytesIO(body))) == (255, 0, 0)
+
+  def test_jpeg_body(self, server) -> None:
+    call_local_api_png(Image.new("RGBA", (8, 8), "red"), make_model(server))
+    [(_, query, content_type, body)] = server.calls
+    assert content_type == "image/jpeg"
+    assert Image.open(BytesIO(body)).format == "JPEG"
+    assert "negative_prompt" not in query
+
+
+class TestCallLocalInference:
+  def test_prefers_binary_endpoint(self, server) -> None:
+    result = call_local_inference(Image.new("RGB", (8, 8)), make_model(server))
+    assert color_of(result) == (0, 0, 255)
+    assert [call[0] for call in server.calls] == ["/edit-png"]
+
+  def test_base64_without_binary_endpoint(self, server) -> None:
+    model = make_model(server, binary=False)
+    result = call_local_inference(Image.new("RGB", (8, 8)), model)
+    assert color_of(result) == (0, 128, 0)
+    assert [call[0] for call in server.calls] == ["/edit-b64"]
+
+  def test_falls_back_when_binary_not_deployed(self, server) -> None:
+    server.statuses["/edit-png"] = 404
+    result = call_local_inference(Image.new("RGB", (8, 8)), make_model(server))
+    assert color_of(result) == (0, 128, 0)
+    assert [call[0] for call in server.calls] == ["/edit-png", "/edit-b64"]
+
+  def test_binary_errors_are_not_masked(self, server) -> None:
+    server.statuses["/edit-png"] = 500
+    with pytest.raises(requests.HTTPError):
+      call_local_inference(Image.new("RGB", (8, 8)), make_model(server))
+    assert [call[0] for call in server.calls] == ["/edit-png"]
+
+
+class TestBatchCalls:
+  def test_batch_request_items_and_order(self, server) -> None:
+    results = call_local_api_batch(
+      [Image.new("RGB", (8, 8), "red"), Image.new("RGB", (8, 8), "blue")],
+      make_model(server, batch=True),
+      prompts=["custom", None],
+      negative_prompts=[None, "blurry"],
+      use_jpeg=False,
+    )
+
+    assert [color_of(img) for img in results] == [(0, 255, 255), (255, 255, 0)]
+    [(path, _, content_type, body)] = server.calls
+    assert path == "/edit-batch"
+    assert content_type == "application/json"
+    items = json.loads(body)["items"]
+    assert [item["prompt"] for item in items][0] == "custom"
+    assert "isometric nyc pixel art" in items[1]["prompt"]
+    assert [item["negative_prompt"] for item in items] == [None, "blurry"]
+    assert {item["steps"] for item in items} == {7}
+
+  def test_client_groups_concurrent_calls(self, server) -> None:
+    client = LocalBatchClient(
+      make_model(server, batch=True), max_batch_size=3, max_wait_seconds=5
+    )
+    colors = ["red", "blue", "white"]
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+      results = list(
+        executor.map(lambda color: client.edit(Image.new("RGB", (8, 8), color)), colors)
+      )
+
+    # A full group is sent without waiting out max_wait_seconds
+    assert [near_color_of(img) for img in results] == [
+      (0, 255, 255),
+      (255, 255, 0),
+      (0, 0, 0),
+    ]
+    [(path, _, _, body)] = server.calls
+    assert path == "/edit-batch"
+    assert len(json.loads(body)["items"]) == 3
+
+  def test_client_sends_partial_group_after_wait(self, server) -> None:
+    client = LocalBatchClient(
+      make_model(server, batch=True), max_batch_size=4, max_wait_seconds=0.05
+    )
+    result = client.edit(Image.new("RGB", (8, 8), "red"))
+    assert near_color_of(result) == (0, 255, 255)
+    assert len(json.loads(server.calls[0][3])["items"]) == 1
+
+  def test_client_errors_reach_every_caller(self, server) -> None:
+    server.statuses["/edit-batch"] = 500
+    client = LocalBatchClient(
+      make_model(server, batch=True), max_batch_size=2, max_wait_seconds=5
+    )
+
+    def edit(_) -> str:
+      try:
+        client.edit(Image.new("RGB", (8, 8)))
+      except requests.HTTPError as e:
+        return str(e.response.status_code)
+      return "ok"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+      assert list(executor.map(edit, range(2))) == ["500", "500"]
+    assert len(server.calls) == 1
+
+  def test_inference_uses_batch_with_concurrency(self, server) -> None:
+    model = make_model(server, batch=True, max_concurrency=2)
+    call_local_inference(Image.new("RGB", (8, 8)), model)
+    assert [call[0] for call in server.calls] == ["/edit-batch"]
+
+  def test_inference_skips_batch_without_concurrency(self, server) -> None:
+    call_local_inference(Image.new("RGB", (8, 8)), make_model(server, batch=True))
+    assert [call[0] for call in server.calls] == ["/edit-png"]
+
+  def test_inference_falls_back_when_batch_not_deployed(self, server) -> None:
+    server.statuses["/edit-batch"] = 404
+    model = make_model(server, batch=True, max_concurrency=2)
+    result = call_local_inference(Image.new("RGB", (8, 8)), model)
+    assert color_of(result) == (0, 0, 255)
+    assert [call[0] for call in server.calls] == ["/edit-batch", "/edit-png"]
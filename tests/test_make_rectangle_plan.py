@@ -820,6 +820,17 @@ class TestComplexScenarios:
     is_valid, errors = validate_plan(plan)
     assert is_valid, f"Plan invalid: {errors}"
 
+  def test_large_rectangle_with_scattered_generated(self) -> None:
+    """A large rectangle around scattered pre-generated quadrants."""
+    bounds = RectBounds(Point(0, 0), Point(39, 39))
+    generated = {Point(x, y) for x in range(-1, 41, 7) for y in range(-1, 41, 5)}
+    plan = create_rectangle_plan(bounds, generated)
+
+    is_valid, errors = validate_plan(plan)
+    assert is_valid, f"Plan invalid: {errors}"
+    is_valid, errors = validate_plan_context(plan)
+    assert is_valid, f"Plan context invalid: {errors}"
+
 
 # =============================================================================
 # Serialization Tests
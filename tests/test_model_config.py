@@ -0,0 +1,144 @@
+"""
+Tests for model configuration loading
+
+These tests verify that per-model options such as max_concurrency
+round-trip through app_config.json and map to queue limits.
+"""
+
+import json
+from pathlib import Path
+
+from isometric_hanford.generation.model_config import (
+  AppConfig,
+  ModelConfig,
+  load_app_config,
+  save_app_config,
+)
+
+
+def make_config(tmp_path: Path, models: list[dict], default: str | None) -> Path:
+  config_path = tmp_path / "app_config.json"
+  config_path.write_text(json.dumps({"models": models, "default_model_id": default}))
+  return config_path
+
+
+class TestMaxConcurrency:
+  """Tests for ModelConfig.max_concurrency."""
+
+  def test_defaults_to_one(self, tmp_path: Path) -> None:
+    config = load_app_config(
+      make_config(tmp_path, [{"name": "A", "model_id": "a"}], "a")
+    )
+    assert config.models[0].max_concurrency == 1
+    assert "max_concurrency" not in config.models[0].to_dict()
+
+  def test_loads_and_saves(self, tmp_path: Path) -> None:
+    config_path = make_config(
+      tmp_path, [{"name": "A", "model_id": "a", "max_concurrency": 4}], "a"
+    )
+    config = load_app_config(config_path)
+    assert config.models[0].max_concurrency == 4
+    assert config.models[0].to_dict()["max_concurrency"] == 4
+
+    save_app_config(config, config_path)
+    assert load_app_config(config_path).models[0].max_concurrency == 4
+
+  def test_get_max_concurrency_maps_default_model_to_none(self) -> None:
+    config = AppConfig(
+      models=[
+        ModelConfig(name="A", model_id="a", api_key_env="", max_concurrency=3),
+        ModelConfig(name="B", model_id="b", api_key_env="", max_concurrency=0),
+      ],
+      default_model_id="a",
+    )
+    assert config.get_max_concurrency() == {"a": 3, "b": 1, None: 3}
+
+
+class TestBinaryEndpoint:
+  """Tests for ModelConfig.binary_endpoint."""
+
+  def test_defaults_to_none(self, tmp_path: Path) -> None:
+    config = load_app_config(
+      make_config(tmp_path, [{"name": "A", "model_id": "a"}], "a")
+    )
+    assert config.models[0].resolved_binary_endpoint is None
+    assert "binary_endpoint" not in config.models[0].to_dict()
+
+  def test_env_overrides_and_saves(self, tmp_path: Path, monkeypatch) -> None:
+    config_path = make_config(
+      tmp_path,
+      [
+        {
+          "name": "A",
+          "model_id": "a",
+          "binary_endpoint": "http://localhost:8888/edit-png",
+          "binary_endpoint_env": "TEST_PNG_URL",
+        }
+      ],
+      "a",
+    )
+    monkeypatch.delenv("TEST_PNG_URL", raising=False)
+    model = load_app_config(config_path).models[0]
+    assert model.resolved_binary_endpoint == "http://localhost:8888/edit-png"
+
+    monkeypatch.setenv("TEST_PNG_URL", "https://example.com/edit-png")
+    assert model.resolved_binary_endpoint == "https://example.com/edit-png"
+
+    save_app_config(load_app_config(config_path), config_path)
+    saved = load_app_config(config_path).models[0]
+    assert saved.binary_endpoint == "http://localhost:8888/edit-png"
+    assert saved.binary_endpoint_env == "TEST_PNG_URL"
+
+
+class TestBatchEndpoint:
+  """Tests for ModelConfig.batch_endpoint."""
+
+  def test_env_overrides_and_saves(self, tmp_path: Path, monkeypatch) -> None:
+    config_path = make_config(
+      tmp_path,
+      [
+        {
+          "name": "A",
+          "model_id": "a",
+          "batch_endpoint": "http://localhost:8888/edit-batch",
+          "batch_endpoint_env": "TEST_BATCH_URL",
+        }
+      ],
+      "a",
+    )
+    monkeypatch.delenv("TEST_BATCH_URL", raising=False)
+    model = load_app_config(config_path).models[0]
+    assert model.resolved_batch_endpoint == "http://localhost:8888/edit-batch"
+    assert model.to_dict()["batch_endpoint"] == "http://localhost:8888/edit-batch"
+
+    monkeypatch.setenv("TEST_BATCH_URL", "https://example.com/edit-batch")
+    assert model.resolved_batch_endpoint == "https://example.com/edit-batch"
+
+    save_app_config(load_app_config(config_path), config_path)
+    saved = load_app_config(config_path).models[0]
+    assert saved.batch_endpoint == "http://localhost:8888/edit-batch"
+    assert saved.batch_endpoint_env == "TEST_BATCH_URL"
+
+
+class TestInlineImages:
+  """Tests for ModelConfig.inline_images."""
+
+  def test_defaults_off_and_saves(self, tmp_path: Path) -> None:
+    config_path = make_config(
+      tmp_path,
+      [
+        {"name": "A", "model_id": "a"},
+        {"name": "B", "model_id": "b", "inline_images": True},
+      ],
+      "a",
+    )
+    plain, inline = load_app_config(config_path).models
+    assert not plain.inline_images
+    assert "inline_images" not in plain.to_dict()
+    assert inline.to_dict()["inline_images"] is True
+
+    save_app_config(load_app_config(config_path), config_path)
+    assert [m.inline_images for m in load_app_config(config_path).models] == [
+      False,
+      True,
+    ]
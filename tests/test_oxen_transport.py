@@ -0,0 +1,120 @@
+"""
+Tests for the Oxen transports in generate_omni.py and shared.py
+
+These tests verify the GCS and inline paths against the stub inference
+server's Oxen and GCS emulator contracts, including:
+- Reusing one GCS client across uploads
+- Uploading identical templates once, under a content-addressed name
+- Sending templates and receiving results inline, without GCS
+- Decoding data URLs without a request
+"""
+
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from isometric_hanford.generation import http_session
+from isometric_hanford.generation.generate_omni import (
+  call_oxen_api,
+  download_image_to_pil,
+  png_data_url,
+)
+from isometric_hanford.generation.model_config import ModelConfig
+from isometric_hanford.generation.shared import (
+  get_storage_client,
+  reset_storage_client,
+  upload_png_to_gcs,
+)
+from isometric_hanford.generation.stub_inference_server import StubInferenceServer
+
+
+@pytest.fixture
+def stub(monkeypatch):
+  http_session.configure_session(backoff_factor=0)
+  with StubInferenceServer() as server:
+    monkeypatch.setenv("STORAGE_EMULATOR_HOST", server.url)
+    monkeypatch.setenv("STUB_OXEN_API_KEY", "stub")
+    reset_storage_client()
+    try:
+      yield server
+    finally:
+      reset_storage_client()
+      http_session.close_session()
+
+
+def png_bytes(color: str) -> bytes:
+  buffer = BytesIO()
+  Image.new("RGB", (8, 8), color).save(buffer, format="PNG")
+  return buffer.getvalue()
+
+
+def oxen_model(server, inline_images: bool = False) -> ModelConfig:
+  return ModelConfig(
+    name="oxen",
+    model_id="oxen",
+    api_key_env="STUB_OXEN_API_KEY",
+    endpoint=f"{server.url}/api/images/edit",
+    inline_images=inline_images,
+  )
+
+
+def color_of(image: Image.Image) -> tuple[int, int, int]:
+  return image.convert("RGB").getpixel((0, 0))
+
+
+# =============================================================================
+# GCS Upload Tests
+# =============================================================================
+
+
+class TestUploadPngToGcs:
+  def test_reuses_the_storage_client(self, stub) -> None:
+    assert get_storage_client() is get_storage_client()
+
+  def test_identical_templates_upload_once(self, stub) -> None:
+    first = upload_png_to_gcs(png_bytes("red"), "bucket")
+    second = upload_png_to_gcs(png_bytes("red"), "bucket")
+    other = upload_png_to_gcs(png_bytes("blue"), "bucket")
+
+    assert first == second != other
+    assert stub.stats["upload"].requests == 2
+    assert sorted(name for _, name in stub.objects) == sorted(
+      url.removeprefix(f"{stub.url}/bucket/") for url in (first, other)
+    )
+
+  def test_upload_is_public_and_content_addressed(self, stub) -> None:
+    url = upload_png_to_gcs(png_bytes("red"), "bucket")
+    assert url.startswith(f"{stub.url}/bucket/infills/")
+    assert color_of(download_image_to_pil(url)) == (255, 0, 0)
+
+  def test_buckets_are_tracked_separately(self, stub) -> None:
+    upload_png_to_gcs(png_bytes("red"), "bucket-a")
+    upload_png_to_gcs(png_bytes("red"), "bucket-b")
+    assert stub.stats["upload"].requests == 2
+
+
+# =============================================================================
+# Inline Transport Tests
+# =============================================================================
+
+
+class TestInlineImages:
+  def test_round_trip_skips_gcs(self, stub) -> None:
+    url = call_oxen_api(png_data_url(png_bytes("red")), oxen_model(stub, True))
+
+    assert url.startswith("data:image/png;base64,")
+    assert color_of(download_image_to_pil(url)) == (0, 255, 255)
+    assert stub.stats["oxen"].requests == 1
+    assert stub.stats["upload"].requests == 0
+    assert stub.stats["download"].requests == 0
+
+  def test_url_results_without_inline_images(self, stub) -> None:
+    url = call_oxen_api(png_data_url(png_bytes("red")), oxen_model(stub))
+    assert url.startswith(f"{stub.url}/")
+    assert color_of(download_image_to_pil(url)) == (0, 255, 255)
+    assert stub.stats["download"].requests == 1
+
+  def test_download_decodes_data_urls(self) -> None:
+    image = download_image_to_pil(png_data_url(png_bytes("blue")), max_retries=1)
+    assert color_of(image) == (0, 0, 255)
@@ -0,0 +1,238 @@
+"""
+Tests for PooledPage and the per-thread pages behind render_url_to_bytes
+
+These tests replace Playwright with an in-memory fake, and verify:
+- A PooledPage reuses its browser, recycles its page after max_renders
+  renders, and relaunches the browser after a render error
+- The main thread keeps one warm browser across renders
+- Worker threads only keep a browser inside thread_pooled_page(), and
+  close it when the block exits
+- Worker threads outside a block render with a one-shot browser
+"""
+
+import threading
+
+import pytest
+
+from isometric_hanford.generation import render_cache as render_cache_module
+from isometric_hanford.generation import shared
+from isometric_hanford.generation.shared import (
+  PooledPage,
+  close_thread_pooled_page,
+  get_thread_pooled_page,
+  render_url_to_bytes,
+  thread_pooled_page,
+)
+
+URL = "http://localhost:5173/?lat=1&lon=2"
+
+
+class FakePage:
+  def __init__(self, browser: "FakeBrowser"):
+    self.browser = browser
+    self.closed = False
+
+  def is_closed(self) -> bool:
+    return self.closed
+
+  def goto(self, url: str, wait_until: str) -> None:
+    if self.browser.fail_next:
+      self.browser.fail_next = False
+      raise RuntimeError("Target crashed")
+
+  def wait_for_function(self, expression: str, timeout: int) -> None:
+    pass
+
+  def set_viewport_size(self, size: dict) -> None:
+    pass
+
+  def screenshot(self, type: str) -> bytes:
+    self.browser.renders += 1
+    return b"png"
+
+  def close(self) -> None:
+    self.closed = True
+
+
+class FakeContext:
+  def __init__(self, browser: "FakeBrowser"):
+    self.browser = browser
+
+  def new_page(self) -> FakePage:
+    self.browser.pages += 1
+    return FakePage(self.browser)
+
+  def close(self) -> None:
+    pass
+
+
+class FakeBrowser:
+  def __init__(self):
+    self.connected = True
+    self.fail_next = False
+    self.pages = 0
+    self.renders = 0
+
+  def is_connected(self) -> bool:
+    return self.connected
+
+  def new_context(self, viewport: dict, device_scale_factor: int) -> FakeContext:
+    return FakeContext(self)
+
+  def close(self) -> None:
+    self.connected = False
+
+
+class FakePlaywright:
+  """Stands in for sync_playwright(), recording every browser it launches."""
+
+  def __init__(self):
+    self.browsers: list[FakeBrowser] = []
+    self.chromium = self
+
+  def __call__(self) -> "FakePlaywright":
+    return self
+
+  def start(self) -> "FakePlaywright":
+    return self
+
+  def stop(self) -> None:
+    pass
+
+  def launch(self, headless: bool, args: list[str]) -> FakeBrowser:
+    browser = FakeBrowser()
+    self.browsers.append(browser)
+    return browser
+
+  @property
+  def open_browsers(self) -> int:
+    return sum(browser.connected for browser in self.browsers)
+
+
+@pytest.fixture
+def playwright(monkeypatch) -> FakePlaywright:
+  fake = FakePlaywright()
+  monkeypatch.setattr(shared, "sync_playwright", fake)
+  # Render without the on-disk cache
+  monkeypatch.setattr(render_cache_module, "_render_cache", None)
+  monkeypatch.setattr(render_cache_module, "_render_cache_configured", True)
+  yield fake
+  close_thread_pooled_page()
+
+
+def run_in_thread(target) -> None:
+  errors = []
+
+  def run() -> None:
+    try:
+      target()
+    except BaseException as e:
+      errors.append(e)
+
+  thread = threading.Thread(target=run)
+  thread.start()
+  thread.join()
+  if errors:
+    raise errors[0]
+
+
+# =============================================================================
+# PooledPage Tests
+# =============================================================================
+
+
+class TestPooledPage:
+  def test_reuses_browser_and_page(self, playwright) -> None:
+    page = PooledPage()
+    timings = [page.render(URL, 512, 512)[1] for _ in range(3)]
+    page.close()
+
+    assert page.launch_count == 1
+    assert playwright.browsers[0].pages == 1
+    assert timings[0].launch_s > 0
+    assert all(t.launch_s == 0 for t in timings[1:])
+
+  def test_recycles_page_after_max_renders(self, playwright) -> None:
+    page = PooledPage(max_renders=2)
+    for _ in range(5):
+      page.render(URL, 512, 512)
+    page.close()
+
+    # One browser, with a fresh context and page every 2 renders
+    assert page.launch_count == 1
+    assert playwright.browsers[0].pages == 3
+    assert page.render_count == 5
+
+  def test_relaunches_browser_after_error(self, playwright) -> None:
+    page = PooledPage()
+    page.render(URL, 512, 512)
+    playwright.browsers[0].fail_next = True
+    with pytest.raises(RuntimeError, match="Target crashed"):
+      page.render(URL, 512, 512)
+    assert not playwright.browsers[0].connected
+
+    page.render(URL, 512, 512)
+    page.close()
+    assert page.launch_count == 2
+    assert len(playwright.browsers) == 2
+
+  def test_close_stops_browser(self, playwright) -> None:
+    page = PooledPage()
+    page.render(URL, 512, 512)
+    page.close()
+    assert not page.is_open
+    assert playwright.open_browsers == 0
+
+
+# =============================================================================
+# Per-thread page Tests
+# =============================================================================
+
+
+class TestThreadPages:
+  def test_main_thread_reuses_one_browser(self, playwright) -> None:
+    for _ in range(3):
+      assert render_url_to_bytes(URL, 512, 512, wait_for_tiles=False) == b"png"
+    assert len(playwright.browsers) == 1
+    assert playwright.open_browsers == 1
+
+  def test_worker_block_shares_and_closes_browser(self, playwright) -> None:
+    def work() -> None:
+      with thread_pooled_page():
+        for _ in range(3):
+          render_url_to_bytes(URL, 512, 512, wait_for_tiles=False)
+        assert playwright.open_browsers == 1
+      assert get_thread_pooled_page() is None
+
+    run_in_thread(work)
+    assert len(playwright.browsers) == 1
+    assert playwright.open_browsers == 0
+
+  def test_worker_outside_block_uses_one_shot_browser(self, playwright) -> None:
+    def work() -> None:
+      assert get_thread_pooled_page() is None
+      render_url_to_bytes(URL, 512, 512, wait_for_tiles=False)
+      render_url_to_bytes(URL, 512, 512, wait_for_tiles=False)
+
+    run_in_thread(work)
+    assert len(playwright.browsers) == 2
+    assert playwright.open_browsers == 0
+
+  def test_worker_block_closes_browser_on_error(self, playwright) -> None:
+    def work() -> None:
+      with thread_pooled_page():
+        render_url_to_bytes(URL, 512, 512, wait_for_tiles=False)
+        raise ValueError("step failed")
+
+    with pytest.raises(ValueError):
+      run_in_thread(work)
+    assert playwright.open_browsers == 0
+
+  def test_nested_blocks_share_the_page(self, playwright) -> None:
+    def work() -> None:
+      with thread_pooled_page() as outer:
+        with thread_pooled_page() as inner:
+          assert inner is outer
+        assert get_thread_pooled_page() is outer
+
+    run_in_thread(work)
@@ -0,0 +1,92 @@
+"""
+Tests for the viewport info API in app.py
+
+These tests verify get_quadrant_info_range against a small quadrants
+database, and that it matches per-quadrant get_quadrant_info.
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from isometric_hanford.generation import app as app_module
+
+
+@pytest.fixture
+def generation_dir(quadrants_db: Path, monkeypatch) -> Path:
+  """A generation dir whose 3x3 quadrants DB has been migrated."""
+  conn = sqlite3.connect(quadrants_db)
+  conn.executemany(
+    "INSERT INTO quadrants (quadrant_x, quadrant_y, lat, lng, tile_row, tile_col, "
+    "quadrant_index, render, generation) VALUES (?, ?, 0, 0, 0, 0, 0, ?, ?)",
+    [(x, y, b"render", b"gen" if x == 0 else None) for x in range(3) for y in range(3)],
+  )
+  app_module.run_schema_migrations(conn)
+  conn.execute(
+    "UPDATE quadrants SET flagged = 1 WHERE quadrant_x = 1 AND quadrant_y = 1"
+  )
+  conn.execute("UPDATE quadrants SET is_water = -1 WHERE quadrant_x = 2")
+  conn.execute(
+    "UPDATE quadrants SET water_type = 'ALL_WATER', starred = 1 "
+    "WHERE quadrant_x = 0 AND quadrant_y = 2"
+  )
+  conn.commit()
+  conn.close()
+
+  monkeypatch.setattr(app_module, "GENERATION_DIR", quadrants_db.parent)
+  return quadrants_db.parent
+
+
+class TestGetQuadrantInfoRange:
+  def test_covers_whole_block(self, generation_dir: Path) -> None:
+    infos = app_module.get_quadrant_info_range(-1, -1, 5, 4)
+    assert set(infos) == {(x, y) for x in range(-1, 4) for y in range(-1, 3)}
+
+  def test_flags_and_presence(self, generation_dir: Path) -> None:
+    infos = app_module.get_quadrant_info_range(0, 0, 3, 3)
+
+    assert infos[(0, 0)]["has_data"]
+    assert not infos[(1, 0)]["has_data"]
+    assert infos[(1, 1)]["flagged"]
+    assert infos[(2, 0)]["is_explicit_not_water"]
+    assert infos[(2, 0)]["water_status"] == -1
+    assert infos[(0, 2)]["starred"]
+    assert infos[(0, 2)]["water_type"] == "ALL_WATER"
+
+  def test_tile_type_selects_column(self, generation_dir: Path) -> None:
+    infos = app_module.get_quadrant_info_range(0, 0, 3, 3, tile_type="render")
+    assert all(infos[(x, y)]["has_data"] for x in range(3) for y in range(3))
+
+    infos = app_module.get_quadrant_info_range(0, 0, 3, 3, tile_type="dark_mode")
+    assert not any(info["has_data"] for info in infos.values())
+
+  def test_missing_quadrants_get_defaults(self, generation_dir: Path) -> None:
+    infos = app_module.get_quadrant_info_range(10, 10, 1, 1)
+    assert infos[(10, 10)] == app_module._empty_quadrant_info()
+
+  def test_matches_single_quadrant_info(self, generation_dir: Path) -> None:
+    infos = app_module.get_quadrant_info_range(-1, -1, 5, 5)
+    for (x, y), info in infos.items():
+      assert app_module.get_quadrant_info(x, y) == info
+
+
+class TestRunSchemaMigrations:
+  def test_idempotent(self, generation_dir: Path) -> None:
+    conn = sqlite3.connect(generation_dir / "quadrants.db")
+    try:
+      app_module.run_schema_migrations(conn)
+      columns = {row[1] for row in conn.execute("PRAGMA table_info(quadrants)")}
+    finally:
+      conn.close()
+
+    for column in (
+      "flagged",
+      "is_water",
+      "starred",
+      "is_reference",
+      "water_mask",
+      "water_type",
+      "dark_mode",
+    ):
+      assert column in columns
@@ -0,0 +1,123 @@
+"""
+Tests for the quadrant presence API in shared.py
+
+These tests verify that presence checks report the same answers as loading
+the image blobs, using a quadrants database with the real schema.
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from isometric_hanford.generation.shared import (
+  QuadrantHelpers,
+  check_all_quadrants_generated,
+  check_all_quadrants_rendered,
+  has_any_neighbor_generations,
+  has_generation_batch,
+  has_quadrant_data_batch,
+  has_quadrant_generation,
+  has_render_batch,
+)
+
+
+@pytest.fixture
+def conn(quadrants_db: Path) -> sqlite3.Connection:
+  """
+  Quadrants DB with a 4x4 grid:
+  - renders everywhere
+  - generations where x < 2
+  """
+  conn = sqlite3.connect(quadrants_db)
+  conn.executemany(
+    "INSERT INTO quadrants (quadrant_x, quadrant_y, lat, lng, tile_row, tile_col, "
+    "quadrant_index, render, generation) VALUES (?, ?, 0, 0, 0, 0, 0, ?, ?)",
+    [
+      (x, y, b"render", b"generation" if x < 2 else None)
+      for x in range(4)
+      for y in range(4)
+    ],
+  )
+  yield conn
+  conn.close()
+
+
+# =============================================================================
+# Presence Query Tests
+# =============================================================================
+
+
+class TestHasQuadrantDataBatch:
+  def test_generation_batch(self, conn: sqlite3.Connection) -> None:
+    coords = [(0, 0), (1, 3), (2, 0), (3, 3), (9, 9)]
+    assert has_generation_batch(conn, coords) == {(0, 0), (1, 3)}
+
+  def test_render_batch(self, conn: sqlite3.Connection) -> None:
+    coords = [(0, 0), (3, 3), (-1, 0)]
+    assert has_render_batch(conn, coords) == {(0, 0), (3, 3)}
+
+  def test_empty_and_duplicate_coords(self, conn: sqlite3.Connection) -> None:
+    assert has_generation_batch(conn, []) == set()
+    assert has_generation_batch(conn, [(0, 0), (0, 0)]) == {(0, 0)}
+
+  def test_large_batch_is_chunked(self, conn: sqlite3.Connection) -> None:
+    coords = [(x, y) for x in range(-20, 30) for y in range(-20, 30)]
+    expected = {(x, y) for x in range(2) for y in range(4)}
+    assert has_generation_batch(conn, coords) == expected
+
+  def test_missing_optional_column(self, conn: sqlite3.Connection) -> None:
+    assert has_quadrant_data_batch(conn, [(0, 0)], "dark_mode") == set()
+
+  def test_unknown_column_rejected(self, conn: sqlite3.Connection) -> None:
+    with pytest.raises(ValueError):
+      has_quadrant_data_batch(conn, [(0, 0)], "notes")
+
+  def test_single_quadrant(self, conn: sqlite3.Connection) -> None:
+    assert has_quadrant_generation(conn, 1, 1)
+    assert not has_quadrant_generation(conn, 2, 1)
+
+
+class TestTileChecks:
+  def test_check_all_quadrants(self, conn: sqlite3.Connection) -> None:
+    assert check_all_quadrants_rendered(conn, 2, 2)
+    assert not check_all_quadrants_rendered(conn, 3, 3)
+    assert check_all_quadrants_generated(conn, 0, 0)
+    assert not check_all_quadrants_generated(conn, 1, 0)
+
+  def test_has_any_neighbor_generations(self, conn: sqlite3.Connection) -> None:
+    assert has_any_neighbor_generations(conn, 2, 0)
+    assert not has_any_neighbor_generations(conn, 3, 1)
+
+
+# =============================================================================
+# QuadrantHelpers Tests
+# =============================================================================
+
+
+class TestQuadrantHelpersPresence:
+  def test_has_generation(self, conn: sqlite3.Connection) -> None:
+    helpers = QuadrantHelpers(conn, config={})
+    assert helpers.has_generation(0, 0)
+    assert not helpers.has_generation(2, 0)
+
+  def test_context_falls_back_to_render(self, conn: sqlite3.Connection) -> None:
+    helpers = QuadrantHelpers(conn, config={}, context_quadrants={(2, 0)})
+    assert helpers.has_generation(2, 0)
+    assert not helpers.has_generation(3, 0)
+    assert helpers.has_generation_batch([(0, 0), (2, 0), (3, 0)]) == {
+      (0, 0),
+      (2, 0),
+    }
+
+  def test_never_loads_blobs(self, conn: sqlite3.Connection) -> None:
+    statements = []
+    conn.set_trace_callback(statements.append)
+
+    helpers = QuadrantHelpers(conn, config={}, context_quadrants={(2, 0)})
+    helpers.has_generation_batch([(x, y) for x in range(4) for y in range(4)])
+
+    assert statements
+    for sql in statements:
+      assert "SELECT render" not in sql
+      assert "SELECT generation" not in sql
@@ -0,0 +1,556 @@
+"""
+Tests for the model-aware dequeue and lease-based claiming in queue_db
+
+These tests verify that the next available item is selected in SQL with
+the same semantics as the original Python filter (oldest pending item whose
+model isn't busy, NULL meaning the default model), that claiming marks the
+item as processing exactly once - also across processes - and that leases
+are renewed by heartbeats and reclaimed once they expire.
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from isometric_hanford.generation import queue_db
+from isometric_hanford.generation.queue_db import (
+  LeaseHeartbeat,
+  QueueItemStatus,
+  QueueItemType,
+  add_many_to_queue,
+  add_to_queue,
+  cancel_queue_item_by_id,
+  claim_next_pending_item_for_available_model,
+  get_in_flight_counts,
+  get_next_pending_item_for_available_model,
+  get_queue_position_for_model,
+  init_queue_table,
+  mark_item_complete,
+  mark_item_error,
+  reclaim_expired_leases,
+  release_claimed_item,
+  renew_lease,
+)
+
+
+@pytest.fixture
+def conn():
+  conn = sqlite3.connect(":memory:")
+  init_queue_table(conn)
+  yield conn
+  conn.close()
+
+
+def enqueue(conn: sqlite3.Connection, model_id: str | None, x: int = 0) -> int:
+  item = add_to_queue(conn, QueueItemType.GENERATE, [(x, 0)], model_id)
+  return item.id
+
+
+def get_status(conn: sqlite3.Connection, item_id: int) -> str:
+  return conn.execute(
+    "SELECT status FROM generation_queue WHERE id = ?", (item_id,)
+  ).fetchone()[0]
+
+
+# =============================================================================
+# Bulk enqueue
+# =============================================================================
+
+
+class TestAddManyToQueue:
+  """Tests for add_many_to_queue."""
+
+  def test_empty(self, conn) -> None:
+    assert add_many_to_queue(conn, QueueItemType.GENERATE, []) == []
+
+  def test_inserts_items_in_order(self, conn) -> None:
+    groups = [[(x, 0), (x + 1, 0)] for x in range(0, 20, 2)]
+
+    queued = add_many_to_queue(conn, QueueItemType.GENERATE, groups, "a")
+
+    rows = conn.execute(
+      "SELECT id, quadrants, model_id, status FROM generation_queue ORDER BY id"
+    ).fetchall()
+    assert [item.id for item, _ in queued] == [row[0] for row in rows]
+    assert [json.loads(row[1]) for row in rows] == [
+      [list(q) for q in group] for group in groups
+    ]
+    assert {row[2] for row in rows} == {"a"}
+    assert {row[3] for row in rows} == {QueueItemStatus.PENDING.value}
+
+    created = [item.created_at for item, _ in queued]
+    assert created == sorted(set(created))
+
+  def test_positions_follow_existing_items(self, conn) -> None:
+    enqueue(conn, "a")
+    enqueue(conn, "a")
+    enqueue(conn, "b")
+
+    queued = add_many_to_queue(
+      conn, QueueItemType.GENERATE, [[(x, 5)] for x in range(3)], "a"
+    )
+
+    assert [position for _, position in queued] == [3, 4, 5]
+    for item, position in queued:
+      assert get_queue_position_for_model(conn, item.id, "a") == position
+
+  def test_claimed_in_queue_order(self, conn) -> None:
+    queued = add_many_to_queue(
+      conn, QueueItemType.GENERATE, [[(x * 10, 0)] for x in range(5)], None
+    )
+
+    claimed = []
+    while (item := claim_next_pending_item_for_available_model(conn)) is not None:
+      claimed.append(item.id)
+      mark_item_complete(conn, item.id)
+    assert claimed == [item.id for item, _ in queued]
+
+  def test_failure_queues_nothing(self, conn) -> None:
+    groups = [[(0, 0)], [(1, 0)], object()]
+
+    with pytest.raises(TypeError):
+      add_many_to_queue(conn, QueueItemType.GENERATE, groups)
+
+    assert conn.execute("SELECT COUNT(*) FROM generation_queue").fetchone()[0] == 0
+
+
+# =============================================================================
+# Selection
+# =============================================================================
+
+
+class TestNextPendingItem:
+  """Tests for get_next_pending_item_for_available_model."""
+
+  def test_empty_queue(self, conn) -> None:
+    assert get_next_pending_item_for_available_model(conn, set()) is None
+
+  def test_oldest_item_across_models(self, conn) -> None:
+    first = enqueue(conn, "b")
+    enqueue(conn, "a")
+    enqueue(conn, None)
+
+    item = get_next_pending_item_for_available_model(conn, set())
+    assert item is not None
+    assert item.id == first
+    assert item.quadrants == [[0, 0]]
+
+  def test_skips_busy_models(self, conn) -> None:
+    enqueue(conn, "a")
+    enqueue(conn, "a")
+    b_item = enqueue(conn, "b")
+
+    item = get_next_pending_item_for_available_model(conn, {"a"})
+    assert item is not None
+    assert item.id == b_item
+
+  def test_null_model_is_default(self, conn) -> None:
+    default_item = enqueue(conn, None)
+    a_item = enqueue(conn, "a")
+
+    item = get_next_pending_item_for_available_model(conn, {"a"})
+    assert item is not None and item.id == default_item
+
+    item = get_next_pending_item_for_available_model(conn, {None})
+    assert item is not None and item.id == a_item
+
+  def test_all_models_busy(self, conn) -> None:
+    enqueue(conn, "a")
+    enqueue(conn, None)
+    assert get_next_pending_item_for_available_model(conn, {"a", None}) is None
+
+  def test_ignores_non_pending_items(self, conn) -> None:
+    done = enqueue(conn, "a")
+    mark_item_complete(conn, done)
+    cancelled = enqueue(conn, "a")
+    cancel_queue_item_by_id(conn, cancelled)
+    pending = enqueue(conn, "a")
+
+    item = get_next_pending_item_for_available_model(conn, set())
+    assert item is not None and item.id == pending
+
+  def test_does_not_claim(self, conn) -> None:
+    item_id = enqueue(conn, "a")
+    get_next_pending_item_for_available_model(conn, set())
+    assert get_status(conn, item_id) == QueueItemStatus.PENDING.value
+
+  def test_uses_model_index(self, conn) -> None:
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(generation_queue)")}
+    assert "idx_queue_status_model_created" in indexes
+
+
+# =============================================================================
+# Claiming
+# =============================================================================
+
+
+class TestClaimNextPendingItem:
+  """Tests for claim_next_pending_item_for_available_model."""
+
+  def test_claim_marks_processing(self, conn) -> None:
+    item_id = enqueue(conn, "a")
+
+    item = claim_next_pending_item_for_available_model(conn, set())
+    assert item is not None
+    assert item.id == item_id
+    assert item.status == QueueItemStatus.PROCESSING
+    assert item.started_at is not None
+    assert get_status(conn, item_id) == QueueItemStatus.PROCESSING.value
+
+  def test_claims_in_fifo_order_per_model(self, conn) -> None:
+    ids = [enqueue(conn, "a", x) for x in range(3)]
+
+    claimed = []
+    while (item := claim_next_pending_item_for_available_model(conn)) is not None:
+      claimed.append(item.id)
+      mark_item_complete(conn, item.id)
+    assert claimed == ids
+
+  def test_model_with_live_lease_is_busy(self, conn) -> None:
+    enqueue(conn, "a", 0)
+    enqueue(conn, "a", 10)
+    b_item = enqueue(conn, "b", 20)
+
+    # Another worker holds model "a" even though our busy set is empty
+    claim_next_pending_item_for_available_model(conn, worker_id="other")
+    item = claim_next_pending_item_for_available_model(conn, worker_id="me")
+    assert item is not None and item.id == b_item
+    assert claim_next_pending_item_for_available_model(conn, worker_id="me") is None
+
+  def test_claim_respects_busy_models(self, conn) -> None:
+    enqueue(conn, "a")
+    b_item = enqueue(conn, "b", 10)
+
+    item = claim_next_pending_item_for_available_model(conn, {"a"})
+    assert item is not None and item.id == b_item
+    assert claim_next_pending_item_for_available_model(conn, {"a", "b"}) is None
+
+  def test_concurrent_claims_never_share_items(self, tmp_path: Path) -> None:
+    db_path = tmp_path / "queue.db"
+    setup = sqlite3.connect(db_path)
+    init_queue_table(setup)
+    expected = {enqueue(setup, f"model-{i % 5}", i) for i in range(200)}
+    setup.close()
+
+    claimed: list[int] = []
+    lock = threading.Lock()
+
+    def worker() -> None:
+      conn = sqlite3.connect(db_path, timeout=30)
+      try:
+        while True:
+          item = claim_next_pending_item_for_available_model(conn, set())
+          if item is None:
+            return
+          with lock:
+            claimed.append(item.id)
+          mark_item_complete(conn, item.id)
+      finally:
+        conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+
+    assert sorted(claimed) == sorted(expected)
+
+
+def enqueue_block(
+  conn: sqlite3.Connection,
+  model_id: str | None,
+  x: int,
+  y: int = 0,
+  context: list[tuple[int, int]] | None = None,
+) -> int:
+  """Queue a 2x2 block with (x, y) at the top-left."""
+  quadrants = [(x, y), (x + 1, y), (x, y + 1), (x + 1, y + 1)]
+  item = add_to_queue(conn, QueueItemType.GENERATE, quadrants, model_id, context)
+  return item.id
+
+
+def claim(conn: sqlite3.Connection, limits: dict | None = None) -> int | None:
+  item = claim_next_pending_item_for_available_model(
+    conn, worker_id="worker", max_concurrency=limits
+  )
+  return item.id if item else None
+
+
+class TestMaxConcurrency:
+  """Tests for per-model in-flight limits and overlap exclusion."""
+
+  def test_default_limit_is_one(self, conn) -> None:
+    first = enqueue_block(conn, "a", 0)
+    enqueue_block(conn, "a", 10)
+
+    assert claim(conn) == first
+    assert claim(conn) is None
+
+  def test_model_runs_up_to_its_limit(self, conn) -> None:
+    ids = [enqueue_block(conn, "a", x) for x in (0, 10, 20, 30)]
+
+    claimed = [claim(conn, {"a": 3}) for _ in range(4)]
+    assert claimed == [*ids[:3], None]
+    assert get_in_flight_counts(conn) == {"a": 3}
+
+    mark_item_complete(conn, ids[0])
+    assert claim(conn, {"a": 3}) == ids[3]
+
+  def test_limits_are_per_model(self, conn) -> None:
+    a_items = [enqueue_block(conn, "a", x) for x in (0, 10)]
+    b_items = [enqueue_block(conn, "b", x) for x in (20, 30)]
+    default_items = [enqueue_block(conn, None, x) for x in (40, 50)]
+
+    claimed = set()
+    while (item_id := claim(conn, {"a": 2, None: 2})) is not None:
+      claimed.add(item_id)
+
+    assert claimed == {*a_items, b_items[0], *default_items}
+
+  def test_overlapping_items_never_run_together(self, conn) -> None:
+    first = enqueue_block(conn, "a", 0)
+    overlapping = enqueue_block(conn, "a", 1)
+
+    assert claim(conn, {"a": 4}) == first
+    assert claim(conn, {"a": 4}) is None
+
+    mark_item_complete(conn, first)
+    assert claim(conn, {"a": 4}) == overlapping
+
+  def test_adjacent_items_conflict(self, conn) -> None:
+    # The second block's neighbors (its lazy context) include the first
+    first = enqueue_block(conn, "a", 0)
+    enqueue_block(conn, "a", 2)
+
+    assert claim(conn, {"a": 4}) == first
+    assert claim(conn, {"a": 4}) is None
+
+  def test_explicit_context_conflicts(self, conn) -> None:
+    first = enqueue_block(conn, "a", 0)
+    enqueue_block(conn, "a", 10, context=[(1, 1)])
+
+    assert claim(conn, {"a": 4}) == first
+    assert claim(conn, {"a": 4}) is None
+
+  def test_overlap_is_checked_across_models(self, conn) -> None:
+    first = enqueue_block(conn, "a", 0)
+    enqueue_block(conn, "b", 1)
+
+    assert claim(conn) == first
+    assert claim(conn) is None
+
+  def test_blocked_item_is_not_overtaken(self, conn) -> None:
+    first = enqueue_block(conn, "a", 0)
+    blocked = enqueue_block(conn, "a", 1)
+    enqueue_block(conn, "a", 20)
+    other_model = enqueue_block(conn, "b", 40)
+
+    assert claim(conn, {"a": 4}) == first
+    # Model "a" waits for its blocked head; other models still run
+    assert claim(conn, {"a": 4}) == other_model
+    assert claim(conn, {"a": 4}) is None
+
+    mark_item_complete(conn, first)
+    assert claim(conn, {"a": 4}) == blocked
+
+
+class TestReleaseClaimedItem:
+  """Tests for release_claimed_item."""
+
+  def test_release_returns_item_to_queue(self, conn) -> None:
+    item_id = enqueue(conn, "a")
+    claim_next_pending_item_for_available_model(conn, set())
+
+    assert release_claimed_item(conn, item_id) is True
+    assert get_status(conn, item_id) == QueueItemStatus.PENDING.value
+    item = get_next_pending_item_for_available_model(conn, set())
+    assert item is not None and item.id == item_id
+
+  def test_release_leaves_cancelled_items(self, conn) -> None:
+    item_id = enqueue(conn, "a")
+    claim_next_pending_item_for_available_model(conn, set())
+    cancel_queue_item_by_id(conn, item_id)
+
+    assert release_claimed_item(conn, item_id) is False
+    assert get_status(conn, item_id) == QueueItemStatus.ERROR.value
+
+
+# =============================================================================
+# Leases
+# =============================================================================
+
+
+def get_lease(conn: sqlite3.Connection, item_id: int) -> tuple:
+  return conn.execute(
+    "SELECT worker_id, lease_expires_at FROM generation_queue WHERE id = ?",
+    (item_id,),
+  ).fetchone()
+
+
+def expire_lease(conn: sqlite3.Connection, item_id: int) -> None:
+  conn.execute(
+    "UPDATE generation_queue SET lease_expires_at = ? WHERE id = ?",
+    (time.time() - 1, item_id),
+  )
+  conn.commit()
+
+
+class TestLeases:
+  """Tests for worker ids, lease expiry and heartbeats."""
+
+  def test_claim_records_lease(self, conn) -> None:
+    item_id = enqueue(conn, "a")
+    before = time.time()
+
+    claim_next_pending_item_for_available_model(
+      conn, worker_id="worker-1", lease_seconds=30
+    )
+
+    worker_id, expires_at = get_lease(conn, item_id)
+    assert worker_id == "worker-1"
+    assert before + 30 <= expires_at <= time.time() + 30
+
+  def test_expired_lease_is_reclaimed_by_next_claim(self, conn) -> None:
+    item_id = enqueue(conn, "a")
+    claim_next_pending_item_for_available_model(conn, worker_id="crashed")
+    expire_lease(conn, item_id)
+
+    item = claim_next_pending_item_for_available_model(conn, worker_id="worker-2")
+    assert item is not None and item.id == item_id
+    assert get_lease(conn, item_id)[0] == "worker-2"
+
+  def test_live_lease_is_not_reclaimed(self, conn) -> None:
+    item_id = enqueue(conn, "a")
+    claim_next_pending_item_for_available_model(conn, worker_id="worker-1")
+
+    assert reclaim_expired_leases(conn) == 0
+    assert get_status(conn, item_id) == QueueItemStatus.PROCESSING.value
+
+  def test_reclaim_expired_leases(self, conn) -> None:
+    item_id = enqueue(conn, "a")
+    claim_next_pending_item_for_available_model(conn, worker_id="crashed")
+    expire_lease(conn, item_id)
+
+    assert reclaim_expired_leases(conn) == 1
+    assert get_status(conn, item_id) == QueueItemStatus.PENDING.value
+    assert get_lease(conn, item_id) == (None, None)
+
+  def test_renew_lease(self, conn) -> None:
+    item_id = enqueue(conn, "a")
+    claim_next_pending_item_for_available_model(
+      conn, worker_id="worker-1", lease_seconds=1
+    )
+    _, first_expiry = get_lease(conn, item_id)
+
+    assert renew_lease(conn, item_id, "worker-1", lease_seconds=60) is True
+    assert get_lease(conn, item_id)[1] > first_expiry + 30
+    assert renew_lease(conn, item_id, "worker-2") is False
+
+  def test_renew_fails_after_reclaim(self, conn) -> None:
+    item_id = enqueue(conn, "a")
+    claim_next_pending_item_for_available_model(conn, worker_id="slow")
+    expire_lease(conn, item_id)
+    claim_next_pending_item_for_available_model(conn, worker_id="worker-2")
+
+    assert renew_lease(conn, item_id, "slow") is False
+
+  def test_completion_requires_lease_when_worker_given(self, conn) -> None:
+    item_id = enqueue(conn, "a")
+    claim_next_pending_item_for_available_model(conn, worker_id="worker-1")
+
+    assert mark_item_complete(conn, item_id, "done", worker_id="worker-2") is False
+    assert mark_item_error(conn, item_id, "failed", worker_id="worker-2") is False
+    assert get_status(conn, item_id) == QueueItemStatus.PROCESSING.value
+
+    assert mark_item_complete(conn, item_id, "done", worker_id="worker-1") is True
+    assert get_status(conn, item_id) == QueueItemStatus.COMPLETE.value
+
+  def test_heartbeat_keeps_lease_alive(self, tmp_path: Path) -> None:
+    db_path = tmp_path / "queue.db"
+    conn = sqlite3.connect(db_path)
+    init_queue_table(conn)
+    item_id = enqueue(conn, "a")
+    claim_next_pending_item_for_available_model(
+      conn, worker_id="worker-1", lease_seconds=0.3
+    )
+
+    with LeaseHeartbeat(
+      lambda: sqlite3.connect(db_path), item_id, "worker-1", lease_seconds=0.3
+    ) as heartbeat:
+      time.sleep(0.6)
+      assert reclaim_expired_leases(conn) == 0
+    assert heartbeat.lost is False
+    conn.close()
+
+  def test_heartbeat_reports_lost_lease(self, tmp_path: Path) -> None:
+    db_path = tmp_path / "queue.db"
+    conn = sqlite3.connect(db_path)
+    init_queue_table(conn)
+    item_id = enqueue(conn, "a")
+    claim_next_pending_item_for_available_model(conn, worker_id="worker-1")
+    cancel_queue_item_by_id(conn, item_id)
+
+    with LeaseHeartbeat(
+      lambda: sqlite3.connect(db_path), item_id, "worker-1", interval=0.05
+    ) as heartbeat:
+      time.sleep(0.2)
+    assert heartbeat.lost is True
+    conn.close()
+
+
+# Claims items until the queue is drained and prints the claimed ids as JSON
+CLAIM_WORKER_SCRIPT = """
+import json, sqlite3, sys
+from isometric_hanford.generation.queue_db import (
+  claim_next_pending_item_for_available_model, make_worker_id, mark_item_complete,
+)
+conn = sqlite3.connect(sys.argv[1], timeout=30)
+worker_id = make_worker_id()
+claimed = []
+while (item := claim_next_pending_item_for_available_model(
+  conn, worker_id=worker_id
+)) is not None:
+  claimed.append(item.id)
+  mark_item_complete(conn, item.id, worker_id=worker_id)
+print(json.dumps(claimed))
+"""
+
+
+class TestMultiProcessClaiming:
+  """Several worker processes draining one queue.db."""
+
+  def test_processes_never_share_items(self, tmp_path: Path) -> None:
+    db_path = tmp_path / "queue.db"
+    conn = sqlite3.connect(db_path)
+    init_queue_table(conn)
+    conn.execute("PRAGMA journal_mode = WAL")
+    expected = [enqueue(conn, f"model-{i % 8}", i) for i in range(300)]
+    conn.close()
+
+    src_dir = str(Path(queue_db.__file__).parents[2])
+    env = {**os.environ, "PYTHONPATH": src_dir}
+    procs = [
+      subprocess.Popen(
+        [sys.executable, "-c", CLAIM_WORKER_SCRIPT, str(db_path)],
+        stdout=subprocess.PIPE,
+        text=True,
+        env=env,
+      )
+      for _ in range(3)
+    ]
+    claimed = []
+    for proc in procs:
+      out, _ = proc.communicate(timeout=60)
+      assert proc.returncode == 0
+      claimed.extend(json.loads(out))
+
+    assert len(claimed) == len(set(claimed))
+    assert sorted(claimed) == expected
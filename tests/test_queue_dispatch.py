@@ -0,0 +1,177 @@
+"""
+Tests for event-driven queue dispatch in the generation app
+
+These tests verify that the queue worker dispatches items as soon as they
+are queued or a model frees up, without waiting for the fallback poll, and
+that each model runs up to its max_concurrency items at once.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from isometric_hanford.generation import app as app_module
+from isometric_hanford.generation.model_config import AppConfig, ModelConfig
+from isometric_hanford.generation.queue_db import (
+  init_queue_table,
+  mark_item_complete,
+)
+
+# Long enough that a test only passes if dispatch was event-driven
+FALLBACK_POLL_SECONDS = 30.0
+
+
+@pytest.fixture
+def dispatched(tmp_path: Path, monkeypatch):
+  """
+  Run the queue worker against a temp DB with a fake item processor.
+
+  Yields a dict mapping item_id -> dispatch time, and a threading.Event per
+  item that the fake processor waits on before completing it.
+  """
+  conn = sqlite3.connect(tmp_path / "quadrants.db")
+  init_queue_table(conn)
+  conn.close()
+
+  started: dict[int, float] = {}
+  release: dict[int, threading.Event] = {}
+  lock = threading.Lock()
+
+  def fake_process(item_id: int) -> dict:
+    with lock:
+      started[item_id] = time.perf_counter()
+      event = release.setdefault(item_id, threading.Event())
+    conn = app_module.get_db_connection()
+    try:
+      event.wait(timeout=10)
+      mark_item_complete(conn, item_id)
+    finally:
+      conn.close()
+    return {"success": True}
+
+  monkeypatch.setattr(app_module, "GENERATION_DIR", tmp_path)
+  monkeypatch.setattr(app_module, "NO_GENERATE_MODE", False)
+  monkeypatch.setattr(app_module, "QUEUE_FALLBACK_POLL_SECONDS", FALLBACK_POLL_SECONDS)
+  monkeypatch.setattr(app_module, "process_queue_item_from_db", fake_process)
+  app_module.in_flight_items.clear()
+  app_module.start_queue_worker()
+  # Let the worker reach its first wait
+  time.sleep(0.1)
+
+  try:
+    yield started, release, lock
+  finally:
+    with lock:
+      for event in release.values():
+        event.set()
+    app_module.stop_queue_worker()
+    app_module.queue_worker_thread.join(timeout=5)
+    app_module.in_flight_items.clear()
+    app_module.close_db_pool()
+
+
+def wait_until(predicate, timeout: float = 2.0) -> bool:
+  deadline = time.monotonic() + timeout
+  while time.monotonic() < deadline:
+    if predicate():
+      return True
+    time.sleep(0.005)
+  return predicate()
+
+
+# =============================================================================
+# Wakeups
+# =============================================================================
+
+
+class TestQueueWakeup:
+  """Tests for notify_queue_worker / wait_for_queue_wakeup."""
+
+  def test_notification_before_wait_is_not_lost(self) -> None:
+    app_module.notify_queue_worker()
+    start = time.perf_counter()
+    assert app_module.wait_for_queue_wakeup(5.0) is True
+    assert time.perf_counter() - start < 1.0
+
+  def test_wait_times_out_without_notification(self) -> None:
+    # Consume any pending notification first
+    app_module.wait_for_queue_wakeup(0)
+    assert app_module.wait_for_queue_wakeup(0.01) is False
+
+
+# =============================================================================
+# Dispatch
+# =============================================================================
+
+
+class TestEventDrivenDispatch:
+  """Tests that the worker dispatches without waiting for the fallback poll."""
+
+  def test_enqueue_wakes_worker(self, dispatched) -> None:
+    started, _, lock = dispatched
+
+    enqueued_at = time.perf_counter()
+    result = app_module.add_to_queue_db([(0, 0)], "generate", model_id="a")
+
+    item_id = result["item_id"]
+    assert wait_until(lambda: item_id in started)
+    with lock:
+      assert started[item_id] - enqueued_at < 1.0
+
+  def test_model_completion_dispatches_next_item(self, dispatched) -> None:
+    started, release, lock = dispatched
+
+    first = app_module.add_to_queue_db([(0, 0)], "generate", model_id="a")
+    second = app_module.add_to_queue_db([(10, 0)], "generate", model_id="a")
+    assert wait_until(lambda: first["item_id"] in started)
+
+    # Same model is busy, so the second item must wait for the first
+    time.sleep(0.1)
+    assert second["item_id"] not in started
+
+    completed_at = time.perf_counter()
+    with lock:
+      release.setdefault(first["item_id"], threading.Event()).set()
+
+    assert wait_until(lambda: second["item_id"] in started)
+    with lock:
+      assert started[second["item_id"]] - completed_at < 1.0
+
+  def test_different_models_dispatch_together(self, dispatched) -> None:
+    started, _, _ = dispatched
+
+    items = [
+      app_module.add_to_queue_db([(i * 10, 0)], "generate", model_id=model)
+      for i, model in enumerate(["a", "b", "c"])
+    ]
+
+    assert wait_until(lambda: all(item["item_id"] in started for item in items))
+
+  def test_model_runs_up_to_max_concurrency(self, dispatched, monkeypatch) -> None:
+    started, _, _ = dispatched
+    monkeypatch.setattr(
+      app_module,
+      "APP_CONFIG",
+      AppConfig(
+        models=[ModelConfig(name="A", model_id="a", api_key_env="", max_concurrency=2)],
+        default_model_id="a",
+      ),
+    )
+
+    items = [
+      app_module.add_to_queue_db([(x, 0)], "generate", model_id="a")
+      for x in (0, 10, 20)
+    ]
+    assert wait_until(lambda: items[0]["item_id"] in started)
+    assert wait_until(lambda: items[1]["item_id"] in started)
+    time.sleep(0.1)
+    assert items[2]["item_id"] not in started
+
+    response = app_module.app.test_client().get("/api/status")
+    assert response.get_json()["in_flight_by_model"]["a"] == {
+      "in_flight": 2,
+      "max_concurrency": 2,
+    }
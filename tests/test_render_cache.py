@@ -0,0 +1,204 @@
+"""
+Tests for render_cache.py
+
+These tests verify render cache keys, LRU eviction and persistence, and that
+cached renders are served without launching a browser.
+"""
+
+import pytest
+from PIL import Image
+
+from isometric_hanford.generation import render_cache as render_cache_module
+from isometric_hanford.generation import shared
+from isometric_hanford.generation.render_cache import (
+  RenderCache,
+  configure_render_cache,
+  render_cache_key,
+  render_cache_key_for_url,
+)
+from isometric_hanford.generation.shared import (
+  build_tile_render_url,
+  image_to_png_bytes,
+)
+from isometric_hanford.generation.web_renderer import WebRenderer
+
+CAMERA = {
+  "lat": 46.5501234567,
+  "lng": -119.4987654321,
+  "width_px": 1024,
+  "height_px": 1024,
+  "azimuth": -15.0,
+  "elevation": -45.0,
+  "view_height": 300.0,
+}
+
+
+@pytest.fixture
+def global_cache(tmp_path, monkeypatch) -> RenderCache:
+  """Point the global render cache at a temp dir for the test."""
+  monkeypatch.setattr(render_cache_module, "_render_cache", None)
+  monkeypatch.setattr(render_cache_module, "_render_cache_configured", False)
+  return configure_render_cache(tmp_path / "cache")
+
+
+def make_png(width: int = 1024, height: int = 1024) -> bytes:
+  return image_to_png_bytes(Image.new("RGB", (width, height), (10, 20, 30)))
+
+
+# =============================================================================
+# Cache Key Tests
+# =============================================================================
+
+
+class TestRenderCacheKey:
+  def test_same_params_same_key(self) -> None:
+    assert render_cache_key(**CAMERA) == render_cache_key(**CAMERA)
+
+  def test_different_params_different_key(self) -> None:
+    other = {**CAMERA, "view_height": 301.0}
+    assert render_cache_key(**CAMERA) != render_cache_key(**other)
+
+  def test_url_key_matches_param_key(self) -> None:
+    url = build_tile_render_url(
+      port=5173,
+      lat=CAMERA["lat"],
+      lng=CAMERA["lng"],
+      width_px=CAMERA["width_px"],
+      height_px=CAMERA["height_px"],
+      azimuth=CAMERA["azimuth"],
+      elevation=CAMERA["elevation"],
+      view_height=CAMERA["view_height"],
+    )
+    assert render_cache_key_for_url(url, 1024, 1024) == render_cache_key(**CAMERA)
+
+  def test_url_key_ignores_port(self) -> None:
+    urls = [
+      build_tile_render_url(port, 1.0, 2.0, 512, 512, -15, -45, 300)
+      for port in (5173, 5174)
+    ]
+    keys = {render_cache_key_for_url(url, 512, 512) for url in urls}
+    assert len(keys) == 1
+
+  def test_non_tile_url_not_cached(self) -> None:
+    assert render_cache_key_for_url("http://localhost:5173/", 512, 512) is None
+    assert (
+      render_cache_key_for_url("http://localhost:5173/?export=true&lat=1", 512, 512)
+      is None
+    )
+
+
+# =============================================================================
+# RenderCache Tests
+# =============================================================================
+
+
+class TestRenderCache:
+  def test_get_miss_then_hit(self, tmp_path) -> None:
+    cache = RenderCache(tmp_path)
+    assert cache.get("ab" * 32) is None
+
+    cache.put("ab" * 32, b"png-data")
+    assert cache.get("ab" * 32) == b"png-data"
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["writes"] == 1
+    assert stats["hit_rate"] == 0.5
+
+  def test_persists_across_instances(self, tmp_path) -> None:
+    RenderCache(tmp_path).put("cd" * 32, b"png-data")
+
+    cache = RenderCache(tmp_path)
+    assert len(cache) == 1
+    assert cache.get("cd" * 32) == b"png-data"
+
+  def test_evicts_least_recently_used(self, tmp_path) -> None:
+    cache = RenderCache(tmp_path, max_bytes=30)
+    cache.put("a" * 64, b"x" * 10)
+    cache.put("b" * 64, b"x" * 10)
+    cache.put("c" * 64, b"x" * 10)
+
+    # Touch "a" so "b" becomes the least recently used entry
+    assert cache.get("a" * 64) is not None
+    cache.put("d" * 64, b"x" * 10)
+
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) is not None
+    assert cache.get("d" * 64) is not None
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["size_bytes"] == 30
+
+  def test_oversized_entry_not_stored(self, tmp_path) -> None:
+    cache = RenderCache(tmp_path, max_bytes=5)
+    cache.put("e" * 64, b"x" * 10)
+    assert len(cache) == 0
+
+  def test_clear(self, tmp_path) -> None:
+    cache = RenderCache(tmp_path)
+    cache.put("f" * 64, b"png-data")
+    assert cache.clear() == 1
+    assert len(cache) == 0
+    assert cache.get("f" * 64) is None
+
+
+# =============================================================================
+# Integration Tests
+# =============================================================================
+
+
+def fail_if_browser_used():
+  raise AssertionError("browser should not be used for a cached render")
+
+
+class TestCachedRenders:
+  def test_render_url_to_bytes_served_from_cache(
+    self, global_cache, monkeypatch
+  ) -> None:
+    url = build_tile_render_url(5173, 1.0, 2.0, 512, 512, -15, -45, 300)
+    png = make_png(512, 512)
+    global_cache.put(render_cache_key_for_url(url, 512, 512), png)
+
+    monkeypatch.setattr(shared, "get_thread_pooled_page", fail_if_browser_used)
+    assert shared.render_url_to_bytes(url, 512, 512) == png
+
+  def test_web_renderer_served_from_cache(self, global_cache) -> None:
+    global_cache.put(render_cache_key(**CAMERA), make_png())
+
+    # The renderer is never started, so a hit must not touch the queue
+    renderer = WebRenderer()
+    result = renderer.render_quadrant(
+      quadrant_x=0,
+      quadrant_y=0,
+      lat=CAMERA["lat"],
+      lng=CAMERA["lng"],
+      width_px=CAMERA["width_px"],
+      height_px=CAMERA["height_px"],
+      camera_azimuth_degrees=CAMERA["azimuth"],
+      camera_elevation_degrees=CAMERA["elevation"],
+      view_height_meters=CAMERA["view_height"],
+      timeout=1.0,
+    )
+
+    assert set(result) == {(0, 0), (1, 0), (0, 1), (1, 1)}
+    assert renderer.queue_size == 0
+    assert renderer.get_stats()["cache_hits"] == 1
+
+  def test_disabled_unless_configured(self, monkeypatch) -> None:
+    monkeypatch.setattr(render_cache_module, "_render_cache", None)
+    monkeypatch.setattr(render_cache_module, "_render_cache_configured", False)
+    monkeypatch.delenv("RENDER_CACHE_DIR", raising=False)
+    assert render_cache_module.get_render_cache() is None
+
+  def test_enabled_by_env(self, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(render_cache_module, "_render_cache", None)
+    monkeypatch.setattr(render_cache_module, "_render_cache_configured", False)
+    monkeypatch.setenv("RENDER_CACHE_DIR", str(tmp_path / "renders"))
+    cache = render_cache_module.get_render_cache()
+    assert cache is not None
+    assert cache.cache_dir == tmp_path / "renders"
+
+  def test_disabled_cache_misses(self, global_cache) -> None:
+    assert configure_render_cache(None) is None
+    assert render_cache_module.get_render_cache() is None
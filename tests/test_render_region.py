@@ -0,0 +1,120 @@
+"""
+Tests for render_region.py
+
+These tests verify super-tile batch planning, region camera parameters, and
+grid splitting without needing a browser or database.
+"""
+
+import pytest
+from PIL import Image
+
+from isometric_hanford.generation.make_rectangle_plan import Point
+from isometric_hanford.generation.render_region import (
+  count_tile_renders,
+  plan_region_batches,
+)
+from isometric_hanford.generation.shared import (
+  calculate_quadrant_lat_lng,
+  calculate_region_render_params,
+  split_image_into_quadrant_grid,
+  split_tile_into_quadrants,
+)
+
+
+@pytest.fixture
+def config() -> dict:
+  return {
+    "seed": {"lat": 46.55, "lng": -119.5},
+    "width_px": 1024,
+    "height_px": 1024,
+    "view_height_meters": 300,
+    "camera_azimuth_degrees": -15,
+    "camera_elevation_degrees": -45,
+    "tile_step": 0.5,
+  }
+
+
+# =============================================================================
+# Batch Planning Tests
+# =============================================================================
+
+
+class TestPlanRegionBatches:
+  def test_covers_rectangle_exactly(self) -> None:
+    tl, br = Point(-3, 2), Point(17, 12)
+    batches = plan_region_batches(tl, br, 8, 8)
+
+    covered = []
+    for x, y, nx, ny in batches:
+      covered.extend((x + dx, y + dy) for dx in range(nx) for dy in range(ny))
+
+    expected = {(x, y) for x in range(-3, 18) for y in range(2, 13)}
+    assert len(covered) == len(expected)
+    assert set(covered) == expected
+
+  def test_edge_blocks_are_clipped(self) -> None:
+    batches = plan_region_batches(Point(0, 0), Point(9, 4), 8, 8)
+    assert batches == [(0, 0, 8, 5), (8, 0, 2, 5)]
+
+  def test_fewer_page_loads_than_tiles(self) -> None:
+    tl, br = Point(0, 0), Point(499, 499)
+    assert count_tile_renders(tl, br) == 62500
+    assert len(plan_region_batches(tl, br, 8, 8)) == 63 * 63
+
+
+# =============================================================================
+# Region Render Params Tests
+# =============================================================================
+
+
+class TestCalculateRegionRenderParams:
+  def test_2x2_matches_regular_tile(self, config: dict) -> None:
+    params = calculate_region_render_params(config, 5, -3, 2, 2)
+    lat, lng = calculate_quadrant_lat_lng(config, 5, -3)
+
+    assert params["lat"] == pytest.approx(lat)
+    assert params["lng"] == pytest.approx(lng)
+    assert params["width_px"] == 1024
+    assert params["height_px"] == 1024
+    assert params["view_height_meters"] == pytest.approx(300)
+
+  def test_larger_region_keeps_meters_per_pixel(self, config: dict) -> None:
+    params = calculate_region_render_params(config, 0, 0, 8, 6)
+
+    assert params["width_px"] == 8 * 512
+    assert params["height_px"] == 6 * 512
+    assert params["view_height_meters"] / params["height_px"] == pytest.approx(
+      300 / 1024
+    )
+
+  def test_even_region_centered_on_anchor(self, config: dict) -> None:
+    params = calculate_region_render_params(config, 0, 0, 8, 8)
+    lat, lng = calculate_quadrant_lat_lng(config, 3, 3)
+
+    assert params["lat"] == pytest.approx(lat)
+    assert params["lng"] == pytest.approx(lng)
+
+
+# =============================================================================
+# Grid Split Tests
+# =============================================================================
+
+
+class TestSplitImageIntoQuadrantGrid:
+  def test_grid_sizes(self) -> None:
+    image = Image.new("RGB", (3 * 512, 2 * 512))
+    quadrants = split_image_into_quadrant_grid(image, 3, 2)
+
+    assert set(quadrants) == {(dx, dy) for dx in range(3) for dy in range(2)}
+    assert all(q.size == (512, 512) for q in quadrants.values())
+
+  def test_2x2_matches_tile_split(self) -> None:
+    image = Image.new("RGB", (1024, 1024))
+    for i, (px, py) in enumerate([(0, 0), (600, 0), (0, 600), (600, 600)]):
+      image.putpixel((px, py), (i * 60, 0, 0))
+
+    grid = split_image_into_quadrant_grid(image, 2, 2)
+    tile = split_tile_into_quadrants(image)
+
+    for key, quad in tile.items():
+      assert grid[key].tobytes() == quad.tobytes()
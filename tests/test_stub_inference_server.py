@@ -0,0 +1,190 @@
+"""
+Tests for stub_inference_server.py
+
+These tests verify that the stub serves the contracts the generation code
+calls, by pointing the real clients at it, including:
+- The local inference transports (edit_png, edit_b64, edit_batch)
+- The Oxen round trip: GCS upload, edit, and result download
+- Gemini generateContent with a Files API upload
+- Latency, error injection, and seeded determinism
+"""
+
+import time
+from io import BytesIO
+
+import pytest
+import requests
+from PIL import Image
+
+from isometric_hanford.generation import http_session
+from isometric_hanford.generation.gemini_rate_limiter import (
+  configure_gemini_rate_limiter,
+)
+from isometric_hanford.generation.gemini_upload_cache import (
+  configure_gemini_upload_cache,
+)
+from isometric_hanford.generation.generate_full_map_layer import call_gemini_api
+from isometric_hanford.generation.generate_omni import (
+  call_local_api_b64,
+  call_local_api_batch,
+  call_local_api_png,
+  call_oxen_api,
+  download_image_to_pil,
+)
+from isometric_hanford.generation.model_config import ModelConfig
+from isometric_hanford.generation.shared import reset_storage_client, upload_to_gcs
+from isometric_hanford.generation.stub_inference_server import (
+  StubBehavior,
+  StubInferenceServer,
+)
+
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+  http_session.configure_session(backoff_factor=0)
+  configure_gemini_upload_cache(tmp_path / "uploads.db")
+  configure_gemini_rate_limiter(tmp_path / "buckets.db")
+  with StubInferenceServer() as server:
+    for name, value in server.client_env().items():
+      monkeypatch.setenv(name, value)
+    monkeypatch.setenv("GEMINI_API_KEY", "stub")
+    monkeypatch.setenv("STUB_OXEN_API_KEY", "stub")
+    # The GCS client reads STORAGE_EMULATOR_HOST when it's created
+    reset_storage_client()
+    try:
+      yield server
+    finally:
+      reset_storage_client()
+      http_session.close_session()
+      configure_gemini_upload_cache(None)
+      configure_gemini_rate_limiter(None)
+
+
+def local_model(stub: StubInferenceServer) -> ModelConfig:
+  return ModelConfig(
+    name="local",
+    model_id="local",
+    api_key_env="",
+    endpoint=f"{stub.url}/edit-b64",
+    binary_endpoint=f"{stub.url}/edit-png",
+    batch_endpoint=f"{stub.url}/edit-batch",
+    model_type="url",
+  )
+
+
+def color_of(image: Image.Image) -> tuple[int, int, int]:
+  return image.convert("RGB").getpixel((0, 0))
+
+
+def edit_png(server: StubInferenceServer) -> requests.Response:
+  buffer = BytesIO()
+  Image.new("RGB", (8, 8)).save(buffer, format="PNG")
+  return requests.post(f"{server.url}/edit-png", data=buffer.getvalue())
+
+
+def failures(server: StubInferenceServer, count: int) -> list[bool]:
+  """Which of `count` sequential local requests the server failed."""
+  return [edit_png(server).status_code == 503 for _ in range(count)]
+
+
+# =============================================================================
+# Contract Tests
+# =============================================================================
+
+
+class TestLocalContract:
+  def test_png_and_b64_invert_the_template(self, stub) -> None:
+    template = Image.new("RGB", (16, 8), "red")
+    model = local_model(stub)
+
+    png = call_local_api_png(template, model, use_jpeg=False)
+    b64 = call_local_api_b64(template, model, use_jpeg=False)
+
+    assert png.size == b64.size == (16, 8)
+    assert color_of(png) == color_of(b64) == (0, 255, 255)
+    assert stub.stats["local"].requests == 2
+
+  def test_batch_returns_one_image_per_item(self, stub) -> None:
+    images = [Image.new("RGB", (8, 8), color) for color in ("red", "blue")]
+    results = call_local_api_batch(images, local_model(stub), use_jpeg=False)
+    assert [color_of(img) for img in results] == [(0, 255, 255), (255, 255, 0)]
+
+
+class TestOxenContract:
+  def test_upload_edit_download_round_trip(self, stub, tmp_path) -> None:
+    path = tmp_path / "template.png"
+    Image.new("RGB", (16, 16), "blue").save(path)
+    model = ModelConfig(
+      name="oxen",
+      model_id="oxen",
+      api_key_env="STUB_OXEN_API_KEY",
+      endpoint=f"{stub.url}/api/images/edit",
+    )
+
+    input_url = upload_to_gcs(path, "bench-bucket")
+    output_url = call_oxen_api(input_url, model)
+    result = download_image_to_pil(output_url)
+
+    assert input_url.startswith(f"{stub.url}/bench-bucket/")
+    assert color_of(result) == (255, 255, 0)
+    assert stub.stats["oxen"].requests == 1
+    assert stub.stats["download"].requests == 1
+
+  def test_requires_api_key(self, stub) -> None:
+    response = requests.post(f"{stub.url}/api/images/edit", json={})
+    assert response.status_code == 401
+
+
+class TestGeminiContract:
+  def test_generate_content_with_uploaded_file(self, stub) -> None:
+    result = call_gemini_api(Image.new("RGB", (32, 16), "white"), "make it snow")
+
+    assert result.size == (32, 16)
+    assert color_of(result) == (0, 0, 0)
+    assert stub.stats["gemini"].requests == 1
+    assert len(stub.files) == 1
+
+
+# =============================================================================
+# Behavior Tests
+# =============================================================================
+
+
+class TestBehavior:
+  def test_latency_is_applied_per_contract(self) -> None:
+    behaviors = {"local": StubBehavior(latency_ms=100)}
+    with StubInferenceServer(behaviors=behaviors) as server:
+      start = time.perf_counter()
+      requests.get(f"{server.url}/stub/stats")
+      fast = time.perf_counter() - start
+
+      start = time.perf_counter()
+      assert edit_png(server).ok
+      slow = time.perf_counter() - start
+
+    assert fast < slow
+    assert slow >= 0.1
+
+  def test_error_injection(self) -> None:
+    behaviors = {"local": StubBehavior(error_rate=1.0, error_status=503)}
+    with StubInferenceServer(behaviors=behaviors) as server:
+      assert failures(server, 3) == [True, True, True]
+      stats = requests.get(f"{server.url}/stub/stats").json()
+
+    assert stats["local"] == {"requests": 3, "errors": 3}
+    assert stats["oxen"] == {"requests": 0, "errors": 0}
+
+  def test_same_seed_fails_the_same_requests(self) -> None:
+    behaviors = {"local": StubBehavior(error_rate=0.5, error_status=503)}
+    runs = []
+    for seed in (7, 7, 8):
+      with StubInferenceServer(behaviors=behaviors, seed=seed) as server:
+        runs.append(failures(server, 20))
+
+    assert runs[0] == runs[1]
+    assert runs[0] != runs[2]
+    assert 0 < sum(runs[0]) < 20
+
+  def test_rejects_unknown_contracts(self) -> None:
+    with pytest.raises(ValueError, match="Unknown contract"):
+      StubInferenceServer(behaviors={"modal": StubBehavior()})
@@ -0,0 +1,208 @@
+"""
+Tests for stored content hashes and the /tile/<x>/<y> route
+
+These tests verify that save_quadrant_* store content hashes, that stale
+hashes are cleared by triggers, and that the tile route serves ETags and
+304s from the stored hash while streaming the blob body.
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from isometric_hanford.generation import app as app_module
+from isometric_hanford.generation import shared
+from isometric_hanford.generation.shared import (
+  content_hash,
+  ensure_content_hash_columns_exist,
+  save_quadrant_generation,
+  save_quadrant_render,
+)
+
+PNG_A = b"\x89PNG fake tile A" * 10_000
+PNG_B = b"\x89PNG fake tile B" * 10_000
+
+
+@pytest.fixture
+def db_path(quadrants_db: Path, monkeypatch) -> Path:
+  """A migrated generation DB with one empty quadrant at (0, 0)."""
+  conn = sqlite3.connect(quadrants_db)
+  conn.execute(
+    "INSERT INTO quadrants (quadrant_x, quadrant_y, lat, lng, tile_row, tile_col, "
+    "quadrant_index, render, generation) VALUES (0, 0, 0, 0, 0, 0, 0, NULL, NULL)"
+  )
+  app_module.run_schema_migrations(conn)
+  conn.commit()
+  conn.close()
+
+  monkeypatch.setattr(app_module, "GENERATION_DIR", quadrants_db.parent)
+  return quadrants_db
+
+
+def get_hash(db_path: Path, column: str = "generation") -> str | None:
+  conn = sqlite3.connect(db_path)
+  try:
+    return conn.execute(
+      f"SELECT {column}_hash FROM quadrants WHERE quadrant_x = 0 AND quadrant_y = 0"
+    ).fetchone()[0]
+  finally:
+    conn.close()
+
+
+# =============================================================================
+# Stored Hash Tests
+# =============================================================================
+
+
+class TestContentHashes:
+  def test_save_stores_hash(self, db_path: Path) -> None:
+    conn = sqlite3.connect(db_path)
+    save_quadrant_generation(conn, {}, 0, 0, PNG_A)
+    save_quadrant_render(conn, {}, 0, 0, PNG_B)
+    conn.close()
+
+    assert get_hash(db_path) == content_hash(PNG_A)
+    assert get_hash(db_path, "render") == content_hash(PNG_B)
+
+  def test_direct_write_clears_hash(self, db_path: Path) -> None:
+    conn = sqlite3.connect(db_path)
+    save_quadrant_generation(conn, {}, 0, 0, PNG_A)
+    conn.execute(
+      "UPDATE quadrants SET generation = ? WHERE quadrant_x = 0 AND quadrant_y = 0",
+      (PNG_B,),
+    )
+    conn.commit()
+    conn.close()
+
+    assert get_hash(db_path) is None
+
+  def test_identical_resave_keeps_hash(self, db_path: Path) -> None:
+    conn = sqlite3.connect(db_path)
+    save_quadrant_generation(conn, {}, 0, 0, PNG_A)
+    save_quadrant_generation(conn, {}, 0, 0, PNG_A)
+    conn.close()
+
+    assert get_hash(db_path) == content_hash(PNG_A)
+
+  def test_migration_adds_hash_columns(self, quadrants_db: Path) -> None:
+    conn = sqlite3.connect(quadrants_db)
+    ensure_content_hash_columns_exist(conn)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(quadrants)")}
+    conn.close()
+
+    assert {"render_hash", "generation_hash"} <= columns
+
+  def test_migration_runs_once_per_database(self, db_path: Path, monkeypatch) -> None:
+    calls = []
+    migrate = shared.ensure_content_hash_columns_exist
+    monkeypatch.setattr(
+      shared,
+      "ensure_content_hash_columns_exist",
+      lambda conn: calls.append(1) or migrate(conn),
+    )
+    conn = sqlite3.connect(db_path)
+    for _ in range(3):
+      save_quadrant_generation(conn, {}, 0, 0, PNG_A)
+    conn.close()
+
+    assert len(calls) == 1
+
+  def test_migrated_database_is_not_committed(self, db_path: Path) -> None:
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE quadrants SET notes = 'pending' WHERE quadrant_x = 0")
+    ensure_content_hash_columns_exist(conn)
+    assert conn.in_transaction
+    conn.rollback()
+    conn.close()
+
+
+# =============================================================================
+# Tile Route Tests
+# =============================================================================
+
+
+class TestTileRoute:
+  @pytest.fixture
+  def client(self, db_path: Path):
+    return app_module.app.test_client()
+
+  def test_serves_body_with_stored_etag(self, db_path: Path, client) -> None:
+    conn = sqlite3.connect(db_path)
+    save_quadrant_generation(conn, {}, 0, 0, PNG_A)
+    conn.close()
+
+    response = client.get("/tile/0/0")
+    assert response.status_code == 200
+    assert response.data == PNG_A
+    assert response.headers["ETag"] == content_hash(PNG_A)
+    assert response.headers["Content-Length"] == str(len(PNG_A))
+
+  def test_revalidation_returns_304(self, db_path: Path, client) -> None:
+    conn = sqlite3.connect(db_path)
+    save_quadrant_generation(conn, {}, 0, 0, PNG_A)
+    conn.close()
+
+    etag = content_hash(PNG_A)
+    for header in (etag, f'"{etag}"', f'"other", "{etag}"'):
+      response = client.get("/tile/0/0", headers={"If-None-Match": header})
+      assert response.status_code == 304
+
+  def test_missing_hash_is_backfilled(self, db_path: Path, client) -> None:
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+      "UPDATE quadrants SET render = ? WHERE quadrant_x = 0 AND quadrant_y = 0",
+      (PNG_B,),
+    )
+    conn.commit()
+    conn.close()
+    assert get_hash(db_path, "render") is None
+
+    response = client.get("/tile/0/0?tile_type=render")
+    assert response.data == PNG_B
+    assert response.headers["ETag"] == hashlib.sha256(PNG_B).hexdigest()
+    assert get_hash(db_path, "render") == content_hash(PNG_B)
+
+  def test_etag_matches_body_when_saved_concurrently(
+    self, db_path: Path, client, monkeypatch
+  ) -> None:
+    conn = sqlite3.connect(db_path)
+    save_quadrant_generation(conn, {}, 0, 0, PNG_A)
+    conn.close()
+
+    # Save a new image right after the route reads the hash, before it opens
+    # the blob
+    read_hash = app_module.get_quadrant_content_hash
+
+    def read_then_save(*args, **kwargs):
+      info = read_hash(*args, **kwargs)
+      writer = sqlite3.connect(db_path)
+      save_quadrant_generation(writer, {}, 0, 0, PNG_B)
+      writer.close()
+      return info
+
+    monkeypatch.setattr(app_module, "get_quadrant_content_hash", read_then_save)
+
+    response = client.get("/tile/0/0")
+    assert response.data == PNG_A
+    assert response.headers["ETag"] == content_hash(PNG_A)
+    assert get_hash(db_path) == content_hash(PNG_B)
+
+  def test_unread_bodies_release_the_connection(self, db_path: Path, client) -> None:
+    conn = sqlite3.connect(db_path)
+    save_quadrant_generation(conn, {}, 0, 0, PNG_A)
+    conn.close()
+
+    # The server closes the response without ever iterating the body
+    for method in (client.head, client.get):
+      response = method("/tile/0/0", buffered=False)
+      assert response.status_code == 200
+      response.close()
+
+    assert app_module.get_db_pool().get_stats()["in_use"] == 0
+
+  def test_not_found(self, db_path: Path, client) -> None:
+    assert client.get("/tile/0/0").status_code == 404
+    assert client.get("/tile/5/5").status_code == 404
+    assert client.get("/tile/a/b").status_code == 400
@@ -0,0 +1,249 @@
+"""
+Tests for web_renderer.py
+
+These tests replace the web server and PooledPage with fakes, and verify:
+- Renders are spread across the worker threads and run concurrently
+- Render errors reach the caller through the returned future
+- Worker health tracking (consecutive errors, recovery)
+- Restarting a web server that died, and failing requests if it can't
+- Passing max_renders_per_page to each worker's page
+"""
+
+import threading
+import time
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from isometric_hanford.generation import render_cache as render_cache_module
+from isometric_hanford.generation import web_renderer as web_renderer_module
+from isometric_hanford.generation.shared import RenderTimings
+from isometric_hanford.generation.web_renderer import (
+  UNHEALTHY_AFTER_ERRORS,
+  WebRenderer,
+)
+
+# Renders at this latitude fail
+BAD_LAT = -1.0
+
+
+def png(width: int = 64, height: int = 64) -> bytes:
+  buffer = BytesIO()
+  Image.new("RGB", (width, height), "white").save(buffer, format="PNG")
+  return buffer.getvalue()
+
+
+class FakeProcess:
+  """Stands in for the bun web server process."""
+
+  def __init__(self):
+    self.returncode: int | None = None
+
+  def poll(self) -> int | None:
+    return self.returncode
+
+  def terminate(self) -> None:
+    self.returncode = 0
+
+  def wait(self, timeout: float | None = None) -> int:
+    return self.returncode
+
+
+class FakePooledPage:
+  """Stands in for PooledPage, recording which worker thread renders."""
+
+  delay = 0.05
+  pages: list["FakePooledPage"] = []
+  lock = threading.Lock()
+  in_flight = 0
+  peak = 0
+
+  def __init__(self, max_renders: int):
+    self.max_renders = max_renders
+    self.launch_count = 0
+    self.threads: set[str] = set()
+    self.renders = 0
+    self.closed = False
+    with self.lock:
+      self.pages.append(self)
+
+  def render(self, url: str, width: int, height: int) -> tuple[bytes, RenderTimings]:
+    cls = type(self)
+    with cls.lock:
+      cls.in_flight += 1
+      cls.peak = max(cls.peak, cls.in_flight)
+    try:
+      self.threads.add(threading.current_thread().name)
+      if self.launch_count == 0:
+        self.launch_count = 1
+      time.sleep(self.delay)
+      if f"lat={BAD_LAT}" in url:
+        raise RuntimeError("Target crashed")
+      self.renders += 1
+      return png(width, height), RenderTimings(navigation_s=self.delay)
+    finally:
+      with cls.lock:
+        cls.in_flight -= 1
+
+  def close(self) -> None:
+    self.closed = True
+
+
+@pytest.fixture
+def renderer(monkeypatch):
+  """Yield a factory for started WebRenderers using the fakes."""
+  FakePooledPage.pages = []
+  FakePooledPage.in_flight = 0
+  FakePooledPage.peak = 0
+  monkeypatch.setattr(web_renderer_module, "PooledPage", FakePooledPage)
+  monkeypatch.setattr(web_renderer_module, "UNHEALTHY_BACKOFF_SECONDS", 0.0)
+  monkeypatch.setattr(render_cache_module, "_render_cache", None)
+  monkeypatch.setattr(render_cache_module, "_render_cache_configured", True)
+
+  starts = []
+
+  def start_web_server(self) -> None:
+    starts.append(time.monotonic())
+    self.web_process = FakeProcess()
+
+  monkeypatch.setattr(WebRenderer, "_start_web_server", start_web_server)
+  renderers = []
+
+  def make(**kwargs) -> WebRenderer:
+    instance = WebRenderer(**kwargs)
+    instance.server_starts = starts
+    instance.start()
+    renderers.append(instance)
+    return instance
+
+  try:
+    yield make
+  finally:
+    for instance in renderers:
+      instance.stop()
+
+
+def wait_for_pages(count: int, timeout: float = 2.0) -> bool:
+  """Wait for the worker threads to create their pages."""
+  deadline = time.monotonic() + timeout
+  while len(FakePooledPage.pages) < count:
+    if time.monotonic() > deadline:
+      return False
+    time.sleep(0.01)
+  return True
+
+
+def submit(renderer: WebRenderer, lat: float = 1.0):
+  return renderer.submit_render(
+    quadrant_x=0,
+    quadrant_y=0,
+    lat=lat,
+    lng=2.0,
+    width_px=64,
+    height_px=64,
+    camera_azimuth_degrees=-15.0,
+    camera_elevation_degrees=-45.0,
+    view_height_meters=300.0,
+  )
+
+
+# =============================================================================
+# Worker Pool Tests
+# =============================================================================
+
+
+class TestWorkers:
+  def test_renders_spread_across_workers(self, renderer) -> None:
+    web_renderer = renderer(num_workers=3)
+    futures = [submit(web_renderer, lat=1.0 + i) for i in range(9)]
+
+    for future in futures:
+      result = future.result(timeout=5)
+      assert set(result) == {(0, 0), (1, 0), (0, 1), (1, 1)}
+
+    assert wait_for_pages(3)
+    assert FakePooledPage.peak > 1
+    assert sum(page.renders for page in FakePooledPage.pages) == 9
+    # Each page is only used by the worker thread that owns it
+    assert all(len(page.threads) <= 1 for page in FakePooledPage.pages)
+
+    stats = web_renderer.get_stats()
+    assert stats["render_count"] == 9
+    assert stats["num_workers"] == 3
+    assert sum(worker["render_count"] for worker in stats["workers"]) == 9
+
+  def test_pages_use_max_renders_per_page(self, renderer) -> None:
+    renderer(num_workers=2, max_renders_per_page=7)
+    assert wait_for_pages(2)
+    assert [page.max_renders for page in FakePooledPage.pages] == [7, 7]
+
+  def test_stop_closes_pages(self, renderer) -> None:
+    web_renderer = renderer(num_workers=2)
+    assert wait_for_pages(2)
+    web_renderer.stop()
+    assert all(page.closed for page in FakePooledPage.pages)
+    assert not any(health.alive for health in web_renderer.worker_health)
+
+
+# =============================================================================
+# Error Tests
+# =============================================================================
+
+
+class TestErrors:
+  def test_errors_reach_the_future(self, renderer) -> None:
+    web_renderer = renderer(num_workers=2)
+    bad = submit(web_renderer, lat=BAD_LAT)
+    good = submit(web_renderer)
+
+    with pytest.raises(RuntimeError, match="Target crashed"):
+      bad.result(timeout=5)
+    assert good.result(timeout=5)
+
+    stats = web_renderer.get_stats()
+    assert stats["error_count"] == 1
+    assert stats["render_count"] == 1
+
+  def test_consecutive_errors_mark_worker_unhealthy(self, renderer) -> None:
+    web_renderer = renderer(num_workers=1)
+    for _ in range(UNHEALTHY_AFTER_ERRORS):
+      with pytest.raises(RuntimeError):
+        submit(web_renderer, lat=BAD_LAT).result(timeout=5)
+
+    health = web_renderer.worker_health[0]
+    assert not health.healthy
+    assert health.last_error == "Target crashed"
+
+    submit(web_renderer).result(timeout=5)
+    assert health.healthy
+    assert health.consecutive_errors == 0
+    assert health.error_count == UNHEALTHY_AFTER_ERRORS
+
+
+# =============================================================================
+# Web Server Restart Tests
+# =============================================================================
+
+
+class TestWebServerRestart:
+  def test_restarts_dead_web_server(self, renderer) -> None:
+    web_renderer = renderer(num_workers=1)
+    assert len(web_renderer.server_starts) == 1
+
+    web_renderer.web_process.returncode = 1
+    assert submit(web_renderer).result(timeout=5)
+    assert len(web_renderer.server_starts) == 2
+    assert web_renderer.web_process.poll() is None
+
+  def test_fails_requests_if_restart_fails(self, renderer, monkeypatch) -> None:
+    web_renderer = renderer(num_workers=1)
+
+    def fail_to_start(self) -> None:
+      raise RuntimeError("bun not found")
+
+    monkeypatch.setattr(WebRenderer, "_start_web_server", fail_to_start)
+    web_renderer.web_process.returncode = 1
+
+    with pytest.raises(RuntimeError, match="Web server not available"):
+      submit(web_renderer).result(timeout=5)